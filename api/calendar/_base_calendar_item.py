@@ -100,6 +100,7 @@ class BaseCalendarItem(Hosted, NestedSerializable):
         self._is_planned_item = False
         self._is_scheduled_item = False
         self._id = None
+        self._defer_tree_item_pairing = False
 
     @property
     def calendar(self):
@@ -356,22 +357,14 @@ class BaseCalendarItem(Hosted, NestedSerializable):
         """
         return constants.CALENDAR_ITEM_TREE_PAIRING
 
-    # TODO: I think there's a problem here with autosaves: the assumption
-    # with this _get_id method (and same for the ones in scheduled item class)
-    # was that it will only be called once, as the program is being closed,
-    # but because of autosaves, this isn't true. This just means the id name
-    # may be dodgy, but everything else should work afaik.
-    # To fix, I think we need to check if item currently exists in registry
-    # rather than check if self._id is set, and then we can make autosaves
-    # and saves both clear the id registry after each cache.
     # TODO: add this to serialization class
     def _get_id(self):
-        """Generate unique id for object.
+        """Get unique id for object, generating it if not yet set.
 
-        This should be used only during the serialization process, so that
-        the data used for the id string is up to date. Note that once this
-        is run the id string is fixed, allowing it to be referenced by other
-        classes during serialization (see the item_registry module for
+        Items read from a dict keep the id they were saved with, so the id
+        is only generated for new items, the first time they're serialized.
+        Once set, the id string is fixed, allowing it to be referenced by
+        other classes during serialization (see the item_registry module for
         more information on how this is done).
 
         Returns:
@@ -390,6 +383,33 @@ class BaseCalendarItem(Hosted, NestedSerializable):
             self._children.append(calendar_item)
             self._update_status_from_children()
 
+    def _iter_paired_data_containers(self):
+        """Iterate through all paired data containers in this class.
+
+        The tree item container is skipped while its pairing is deferred.
+
+        Yields:
+            (_BaseHostedContainer): paired data containers in class.
+        """
+        super_class = super(BaseCalendarItem, self)
+        for container in super_class._iter_paired_data_containers():
+            if container is self._tree_item and self._defer_tree_item_pairing:
+                continue
+            yield container
+
+    def _apply_tree_item_pairing(self):
+        """Pair item with its tree item, if this was deferred on activation.
+
+        This is used during deserialization, so that tasks (which may be in
+        use on the main thread) aren't modified until the deferred item
+        registry callbacks are run.
+        """
+        if not self._defer_tree_item_pairing:
+            return
+        self._defer_tree_item_pairing = False
+        if not super(BaseCalendarItem, self).defunct:
+            self._tree_item._apply_pairing()
+
     @classmethod
     def from_dict(cls, dict_repr, calendar, *init_args, **init_kwargs):
         """Initialize class from dict representation.
@@ -430,7 +450,11 @@ class BaseCalendarItem(Hosted, NestedSerializable):
             task_value_update=task_value_update,
             **init_kwargs,
         )
+        # pairing adds this item to its tree item, so it's run alongside
+        # any deferred callbacks
+        class_instance._defer_tree_item_pairing = True
         class_instance._activate()
+        item_registry.run_or_defer(class_instance._apply_tree_item_pairing)
 
         for item_id in dict_repr.get(cls.CHILDREN_KEY, []):
             item_registry.register_callback(
@@ -441,6 +465,8 @@ class BaseCalendarItem(Hosted, NestedSerializable):
         id = dict_repr.get(cls.ID_KEY, None)
         if id is not None:
             item_registry.register_item(id, class_instance)
+            item_registry.reserve_id(id)
+            class_instance._id = id
         return class_instance
 
     def to_dict(self):
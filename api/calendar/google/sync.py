@@ -1,28 +1,94 @@
-"""Functionality for syncing scheduled items with google calendar."""
+"""Functionality for syncing scheduled items with google calendar.
 
-from __future__ import print_function
+Syncing is done incrementally in both directions:
 
-# TODO: use my datetime wrapper instead (maybe just add a to_datettime func in)
-import datetime
+    - push: local scheduled items are converted to google events and diffed
+        against the state of the last sync, so only new, modified and
+        removed items are sent to google, grouped into batch requests.
+    - pull: events changed on google since the last sync are requested using
+        the sync token from the previous pull, and applied to the calendar.
+
+Repeat scheduled items are synced as recurring google events rather than
+being expanded into individual instances.
+
+The calendar api is called directly over http rather than through the
+google api client library, so the sync can be run against any server that
+implements the calendar api (such as a local fake server, for testing).
+"""
+
+from collections import OrderedDict
+import hashlib
+import json
 import os.path
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
 
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+from scheduler.api.common.date_time import Date, Time
+from scheduler.api.edit import edit_log
+from scheduler.api.edit.schedule_edit import (
+    AddScheduledItemEdit,
+    ModifyRepeatScheduledItemEdit,
+    ModifyScheduledItemEdit,
+    RemoveScheduledItemEdit,
+)
+from scheduler.api.serialization.serializable import BaseSerializable
+from ..repeat_pattern import RepeatPattern, RepeatPatternError
+from ..scheduled_item import (
+    RepeatScheduledItem,
+    ScheduledItem,
+    ScheduledItemType,
+)
 
 
 # If modifying these scopes, delete the file token.json.
 SCOPES = ['https://www.googleapis.com/auth/calendar']
+GOOGLE_API_URL = "https://www.googleapis.com"
+
+
+class GoogleCalendarError(Exception):
+    """Exception for failed google calendar api requests."""
+    def __init__(self, status, message):
+        """Initialise error.
+
+        Args:
+            status (int): http status code of the failed request.
+            message (str): error message.
+        """
+        super(GoogleCalendarError, self).__init__(
+            "Google calendar request failed ({0}): {1}".format(status, message)
+        )
+        self.status = status
+
+
+class SyncTokenExpiredError(GoogleCalendarError):
+    """Exception raised when a sync token is no longer valid."""
+
+
+class HttpStatus(object):
+    """Struct of http status codes used by the calendar api."""
+    OK = 200
+    NO_CONTENT = 204
+    NOT_FOUND = 404
+    CONFLICT = 409
+    GONE = 410
 
 
 def setp_credentials():
     """Setup google api authourisation and credentials.
 
+    This requires the google auth libraries, which are only imported here so
+    that the rest of the sync can be used without them.
+
     Returns:
-        (Credentials): credentials for using google calendar api.
+        (Credentials): credentials for using google calendar api. The access
+            token to pass to the GoogleCalendarClient is credentials.token.
     """
+    from google.auth.transport.requests import Request
+    from google.oauth2.credentials import Credentials
+    from google_auth_oauthlib.flow import InstalledAppFlow
+
     creds = None
     # The file token.json stores the user's access and refresh tokens, and is
     # created automatically when the authorization flow completes for the first
@@ -46,93 +112,825 @@ def setp_credentials():
     return creds
 
 
-def scheduled_item_to_google_event(scheduled_item):
-    """Convert scheduled item to google calendar event.
+class GoogleCalendarClient(object):
+    """Minimal http client for the google calendar events api."""
+    MAX_BATCH_SIZE = 50
+    PAGE_SIZE = 250
+
+    def __init__(
+            self,
+            access_token,
+            calendar_id="primary",
+            base_url=GOOGLE_API_URL,
+            batch_size=MAX_BATCH_SIZE):
+        """Initialise client.
+
+        Args:
+            access_token (str): oauth access token to authorise requests.
+            calendar_id (str): id of google calendar to sync with.
+            base_url (str): url of calendar api server.
+            batch_size (int): max number of requests to send in each batch
+                request. Google allows at most 50.
+        """
+        self._access_token = access_token
+        self._calendar_id = calendar_id
+        self._base_url = base_url.rstrip("/")
+        self._batch_size = min(batch_size, self.MAX_BATCH_SIZE)
+        self.num_http_requests = 0
+
+    def events_path(self, event_id=None):
+        """Get url path of calendar events, or of a single event.
+
+        Args:
+            event_id (str or None): id of event, if getting path of event.
+
+        Returns:
+            (str): url path.
+        """
+        path = "/calendar/v3/calendars/{0}/events".format(
+            urllib.parse.quote(self._calendar_id, safe="")
+        )
+        if event_id is not None:
+            path = "{0}/{1}".format(path, urllib.parse.quote(event_id))
+        return path
+
+    def _send(self, method, path, body=None, content_type=None):
+        """Send http request to calendar api.
+
+        Args:
+            method (str): http method.
+            path (str): url path, including any query string.
+            body (bytes or None): request body.
+            content_type (str or None): content type of body.
+
+        Raises:
+            (GoogleCalendarError): if the request fails.
+
+        Returns:
+            (bytes): response body.
+            (str): response content type.
+        """
+        request = urllib.request.Request(
+            self._base_url + path,
+            data=body,
+            method=method,
+        )
+        request.add_header(
+            "Authorization",
+            "Bearer {0}".format(self._access_token),
+        )
+        if content_type:
+            request.add_header("Content-Type", content_type)
+        self.num_http_requests += 1
+        try:
+            with urllib.request.urlopen(request) as response:
+                return (
+                    response.read(),
+                    response.headers.get("Content-Type", ""),
+                )
+        except urllib.error.HTTPError as error:
+            message = error.read().decode("utf-8", errors="replace")
+            if error.code == HttpStatus.GONE:
+                raise SyncTokenExpiredError(error.code, message)
+            raise GoogleCalendarError(error.code, message)
+        except urllib.error.URLError as error:
+            raise GoogleCalendarError(0, str(error.reason))
+
+    def list_events(self, sync_token=None):
+        """List events, following all pages of results.
+
+        Args:
+            sync_token (str or None): token from a previous list. If given,
+                only events changed since then are returned, including
+                cancelled ones. Otherwise all events are returned.
+
+        Raises:
+            (SyncTokenExpiredError): if the sync token has expired, in which
+                case a full list is needed.
+
+        Returns:
+            (list(dict)): list of google event dicts.
+            (str or None): sync token to use for the next list.
+        """
+        events = []
+        page_token = None
+        while True:
+            params = OrderedDict([("maxResults", self.PAGE_SIZE)])
+            if sync_token:
+                params["syncToken"] = sync_token
+            if page_token:
+                params["pageToken"] = page_token
+            body, _ = self._send(
+                "GET",
+                "{0}?{1}".format(
+                    self.events_path(),
+                    urllib.parse.urlencode(params),
+                ),
+            )
+            result = json.loads(body.decode("utf-8"))
+            events.extend(result.get("items", []))
+            page_token = result.get("nextPageToken")
+            if not page_token:
+                return events, result.get("nextSyncToken")
+
+    def batch(self, requests):
+        """Send requests grouped into batch requests.
+
+        Args:
+            requests (list(tuple(str, str, dict or None))): list of requests
+                to send, each given as a http method, url path and json body.
+
+        Returns:
+            (list(tuple(int, dict or None))): status code and json body of
+                the response to each request, in the same order as requests.
+        """
+        responses = []
+        for i in range(0, len(requests), self._batch_size):
+            responses.extend(
+                self._send_batch(requests[i:i+self._batch_size])
+            )
+        return responses
+
+    def _send_batch(self, requests):
+        """Send a single multipart batch request.
+
+        Args:
+            requests (list(tuple(str, str, dict or None))): list of requests,
+                no longer than the batch size.
+
+        Raises:
+            (GoogleCalendarError): if the response is missing a part.
+
+        Returns:
+            (list(tuple(int, dict or None))): status code and json body of
+                the response to each request.
+        """
+        boundary = "batch_{0}".format(uuid.uuid4().hex)
+        lines = []
+        for i, (method, path, json_body) in enumerate(requests):
+            lines.extend([
+                "--{0}".format(boundary),
+                "Content-Type: application/http",
+                "Content-ID: <item{0}>".format(i),
+                "",
+                "{0} {1} HTTP/1.1".format(method, path),
+            ])
+            if json_body is not None:
+                lines.extend([
+                    "Content-Type: application/json",
+                    "",
+                    json.dumps(json_body),
+                ])
+            else:
+                lines.append("")
+        lines.extend(["--{0}--".format(boundary), ""])
+        body, content_type = self._send(
+            "POST",
+            "/batch/calendar/v3",
+            "\r\n".join(lines).encode("utf-8"),
+            "multipart/mixed; boundary={0}".format(boundary),
+        )
+        responses = parse_batch_response(body, content_type)
+        missing = [i for i in range(len(requests)) if i not in responses]
+        if missing:
+            raise GoogleCalendarError(
+                0,
+                "Batch response is missing parts {0}".format(missing),
+            )
+        return [responses[i] for i in range(len(requests))]
+
+
+def parse_batch_response(body, content_type):
+    """Parse the multipart body of a batch response.
 
     Args:
-        scheduled_item (ScheduledItem): scheduled item.
+        body (bytes): response body.
+        content_type (str): response content type, including boundary.
 
     Returns:
-        (dict): google calendar event dict.
+        (dict(int, tuple(int, dict or None))): status code and json body of
+            each response part, keyed by the index of the matching request.
     """
+    boundary = content_type.split("boundary=")[-1].strip().strip('"')
+    responses = {}
+    for part in body.decode("utf-8").split("--{0}".format(boundary)):
+        if not part.strip() or part.strip() == "--":
+            continue
+        outer_headers, _, http_response = part.strip().partition("\r\n\r\n")
+        content_id = None
+        for header in outer_headers.split("\r\n"):
+            name, _, value = header.partition(":")
+            if name.strip().lower() == "content-id":
+                content_id = value.strip().strip("<>").split("item")[-1]
+        head, _, json_body = http_response.partition("\r\n\r\n")
+        status = int(head.split("\r\n")[0].split(" ")[1])
+        json_body = json_body.strip()
+        responses[int(content_id)] = (
+            status,
+            json.loads(json_body) if json_body else None,
+        )
+    return responses
+
+
+class GoogleSyncState(BaseSerializable):
+    """Record of the events synced with google at the end of the last sync.
+
+    Each synced event is stored under an event key, which is the id of the
+    scheduled item it represents (with an index suffix for any additional
+    events used to represent a single repeat item).
+    """
+    SYNC_TOKEN_KEY = "sync_token"
+    EVENTS_KEY = "events"
+
+    ITEM_ID_KEY = "item_id"
+    EVENT_ID_KEY = "event_id"
+    LOCAL_HASH_KEY = "local_hash"
+    REMOTE_HASH_KEY = "remote_hash"
+    DATE_KEY = "date"
+
+    def __init__(self):
+        """Initialise state.
+
+        Attributes:
+            sync_token (str or None): sync token from the last pull.
+            events (dict(str, dict)): dict of synced events keyed by event
+                key. Each value records the scheduled item id, the google
+                event id, the hash of the event as last sent from the
+                calendar and as last received from google, and the date of
+                the event (or None for recurring events).
+        """
+        super(GoogleSyncState, self).__init__()
+        self.sync_token = None
+        self.events = {}
+
+    def get_event_keys(self):
+        """Get dict of event keys, keyed by google event id.
 
+        Returns:
+            (dict(str, str)): event keys keyed by google event id.
+        """
+        return {
+            event_dict[self.EVENT_ID_KEY]: event_key
+            for event_key, event_dict in self.events.items()
+        }
 
-def google_event_to_scheduled_item(google_event):
-    """Convert scheduled item to google calendar event.
+    def set_event(
+            self,
+            event_key,
+            item_id,
+            event_id,
+            local_hash,
+            remote_hash,
+            date=None):
+        """Record synced event.
+
+        Args:
+            event_key (str): event key.
+            item_id (str): id of scheduled item.
+            event_id (str): id of google event.
+            local_hash (str): hash of event as sent from the calendar.
+            remote_hash (str): hash of event as received from google.
+            date (Date or None): date of event, if it's not recurring.
+        """
+        self.events[event_key] = {
+            self.ITEM_ID_KEY: item_id,
+            self.EVENT_ID_KEY: event_id,
+            self.LOCAL_HASH_KEY: local_hash,
+            self.REMOTE_HASH_KEY: remote_hash,
+            self.DATE_KEY: date.string() if date is not None else None,
+        }
+
+    @classmethod
+    def from_dict(cls, dictionary):
+        """Initialise class from dictionary.
+
+        Args:
+            dictionary (dict): the dictionary we're deserializing from.
+
+        Returns:
+            (GoogleSyncState): sync state.
+        """
+        sync_state = cls()
+        sync_state.sync_token = dictionary.get(cls.SYNC_TOKEN_KEY)
+        sync_state.events = dictionary.get(cls.EVENTS_KEY, {})
+        return sync_state
+
+    def to_dict(self):
+        """Serialize class as dictionary.
+
+        Returns:
+            (dict): the serialized dictionary.
+        """
+        return {
+            self.SYNC_TOKEN_KEY: self.sync_token,
+            self.EVENTS_KEY: self.events,
+        }
+
+
+def _get_event_hash(event):
+    """Get hash of the synced fields of a google event.
 
     Args:
-        google_event (dict): google calendar event dict.
+        event (dict): google event dict.
 
     Returns:
-        (ScheduledItem): scheduled item.
+        (str): hash of event summary, times and recurrence.
     """
+    def get_time(time_dict):
+        return {
+            "dateTime": time_dict.get("dateTime", "")[:19],
+            "date": time_dict.get("date", ""),
+        }
+    synced_fields = {
+        "summary": event.get("summary", ""),
+        "start": get_time(event.get("start", {})),
+        "end": get_time(event.get("end", {})),
+        "recurrence": sorted(event.get("recurrence", [])),
+    }
+    return hashlib.md5(
+        json.dumps(synced_fields, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
 
+def _get_event_id(event_key):
+    """Get google event id for a local event.
 
-def sync_scheduler_to_google_calendar(
-        scheduler_calendar,
-        credentials,
-        date_range,
-        include_repeat_items=True):
-    """Sync calendar events from scheduler to google calendar.
+    Google event ids must use base32hex characters, so we use a hash of
+    the event key to keep the id the same between syncs.
 
     Args:
-        scheduler_calendar (Calendar): the calendar.
-        credentials (Credentials): google api credentials.
-        date_range (tuple(Date, Date)): date to search for items within.
-        include_repeat_items (bool): if True, sync repeat items as well.
-    """
-    scheduled_items = scheduler_calendar.get_events_in_range(
-        date_range,
-        include_repeat_items=include_repeat_items,
-    )
-    google_events = [
-        scheduled_item_to_google_event(scheduled_item)
-        for scheduled_item in scheduled_items
-    ]
-    try:
-        service = build('calendar', 'v3', credentials=credentials)
-        all_google_calender_events = service.events()
-        for event in google_events:
-            all_google_calender_events.insert(
-                calendarId='primary',
-                body=event
-            ).execute()
+        event_key (str): event key.
 
-    except HttpError as error:
-        print('An error occurred: %s' % error)
+    Returns:
+        (str): google event id.
+    """
+    return hashlib.md5(event_key.encode("utf-8")).hexdigest()
 
 
-def sync_google_calendar_to_scheduler(
-        credentials,
-        date_range,
-        scheduler_calendar,
-        include_repeat_items=True):
-    """Sync calendar events from scheduler to google calendar.
+def _get_repeat_pattern(event, start_date):
+    """Get repeat pattern from recurrence of google event.
 
     Args:
-        scheduler_calendar (Calendar): the scheduler calendar.
-        credentials (Credentials): google api credentials.
-        date_range (tuple(Date, Date)): date to search for items within.
-        include_repeat_items (bool): if True, sync repeat items as well.
+        event (dict): google event dict.
+        start_date (Date): start date of the event.
+
+    Returns:
+        (RepeatPattern or None): repeat pattern, or None if the recurrence
+            can't be represented by a repeat pattern.
     """
+    recurrence = event.get("recurrence", [])
+    if len(recurrence) != 1 or not recurrence[0].startswith("RRULE:"):
+        return None
     try:
-        service = build('calendar', 'v3', credentials=credentials)
-
-        now = datetime.datetime.utcnow().isoformat() + 'Z'  # 'Z' indicates UTC time
-        events_result = service.events().list(
-            calendarId='primary',
-            timeMin=date_range[0],
-            timeMax=date_range[1],
-            singleEvents=(not include_repeat_items),
-            orderBy='startTime'
-        ).execute()
-        events = events_result.get('items', [])
-
-    except HttpError as error:
-        print('An error occurred: %s' % error)
-
-    scheduled_items = [
-        google_event_to_scheduled_item(event) for event in events
-    ]
-    for scheduled_item in scheduled_items:
-        scheduler_calendar.add_scheduled_item(scheduled_item)
+        return RepeatPattern.from_rrule(
+            recurrence[0],
+            start_date,
+            time_zone=event.get("start", {}).get("timeZone"),
+        )
+    except RepeatPatternError:
+        return None
+
+
+class GoogleCalendarSync(object):
+    """Incremental two-way sync between a calendar and a google calendar.
+
+    Items are only pushed to google if they have changed since the last sync,
+    and only events changed on google since the last pull are applied to the
+    calendar. Where both versions of an event have changed, the local one
+    wins and is pushed back to google.
+
+    Current limitations:
+        - all-day and multi-day google events are not imported.
+        - overrides of single instances of recurring events are not synced
+            in either direction.
+        - event times are synced as wall-clock times in a single time zone.
+    """
+    EVENT_CATEGORY = "Google Calendar"
+    SCHEDULER_ID_KEY = "scheduler_id"
+
+    def __init__(self, calendar, client, sync_state, time_zone="UTC"):
+        """Initialise sync.
+
+        Args:
+            calendar (Calendar): the calendar to sync.
+            client (GoogleCalendarClient): client to send requests with.
+            sync_state (GoogleSyncState): state of the last sync. This is
+                updated by each push and pull and should be written to disk
+                alongside the calendar.
+            time_zone (str): time zone of event times.
+        """
+        self._calendar = calendar
+        self._client = client
+        self._state = sync_state
+        self._time_zone = time_zone
+
+    def _get_event_time(self, date, time):
+        """Get google event time dict.
+
+        Args:
+            date (Date): date of event.
+            time (Time): time of event.
+
+        Returns:
+            (dict): google event time dict.
+        """
+        return {
+            "dateTime": "{0}T{1}:00".format(date.string(), time.string()),
+            "timeZone": self._time_zone,
+        }
+
+    def _get_item_events(self, item, date=None):
+        """Get google event dicts for scheduled item.
+
+        Args:
+            item (BaseScheduledItem): the scheduled item.
+            date (Date or None): date of item, if it's not a repeat item.
+
+        Returns:
+            (list(tuple(str, dict))): event key and google event dict of each
+                event representing the item. Repeat items are represented by
+                a recurring event for each start date of their rrule.
+        """
+        item_id = item._get_id()
+        events = []
+        if not item.is_repeat():
+            events.append((
+                item_id,
+                {
+                    "summary": item.name,
+                    "start": self._get_event_time(date, item.start_time),
+                    "end": self._get_event_time(date, item.end_time),
+                },
+            ))
+        else:
+            # google event starts have a time zone, so the rule must end at
+            # a UTC time
+            rrule = "RRULE:{0}".format(
+                item.repeat_pattern.to_rrule(time_zone=self._time_zone)
+            )
+            start_dates = item.repeat_pattern.get_rrule_start_dates()
+            for i, start_date in enumerate(start_dates):
+                event_key = item_id if i == 0 else "{0}/{1}".format(item_id, i)
+                events.append((
+                    event_key,
+                    {
+                        "summary": item.name,
+                        "start": self._get_event_time(
+                            start_date,
+                            item.start_time,
+                        ),
+                        "end": self._get_event_time(
+                            start_date,
+                            item.end_time,
+                        ),
+                        "recurrence": [rrule],
+                    },
+                ))
+        for event_key, event in events:
+            event["extendedProperties"] = {
+                "private": {self.SCHEDULER_ID_KEY: event_key}
+            }
+        return events
+
+    def _get_local_events(self, start_date=None, end_date=None):
+        """Get google event dicts for scheduled items in calendar.
+
+        Args:
+            start_date (Date or None): if given, ignore single items before
+                this date.
+            end_date (Date or None): if given, ignore single items after this
+                date.
+
+        Returns:
+            (OrderedDict(str, tuple(BaseScheduledItem, dict, Date or None))):
+                scheduled item, google event dict and date (for non-recurring
+                events) of each local event, keyed by event key.
+        """
+        local_events = OrderedDict()
+        for date in sorted(self._calendar._days.keys()):
+            if ((start_date is not None and date < start_date)
+                    or (end_date is not None and date > end_date)):
+                continue
+            for item in self._calendar._days[date]._scheduled_items:
+                for event_key, event in self._get_item_events(item, date):
+                    local_events[event_key] = (item, event, date)
+
+        for item in self._calendar._repeat_items:
+            for event_key, event in self._get_item_events(item):
+                local_events[event_key] = (item, event, None)
+        return local_events
+
+    def push(self, start_date, end_date):
+        """Push local changes to google.
+
+        Args:
+            start_date (Date): start of date range to push single scheduled
+                items within. Repeat items are always pushed.
+            end_date (Date): end of date range.
+
+        Raises:
+            (GoogleCalendarError): if any request fails. The state is still
+                updated with all requests that succeeded.
+
+        Returns:
+            (int): number of google events inserted, updated or deleted.
+        """
+        local_events = self._get_local_events(start_date, end_date)
+        events_path = self._client.events_path
+        requests = []
+        for event_key, (item, event, date) in local_events.items():
+            local_hash = _get_event_hash(event)
+            event_dict = self._state.events.get(event_key)
+            if event_dict is None:
+                event_body = dict(event, id=_get_event_id(event_key))
+                requests.append(
+                    (event_key, ("POST", events_path(), event_body))
+                )
+            elif event_dict[GoogleSyncState.LOCAL_HASH_KEY] != local_hash:
+                event_id = event_dict[GoogleSyncState.EVENT_ID_KEY]
+                requests.append(
+                    (event_key, ("PUT", events_path(event_id), event))
+                )
+
+        for event_key, event_dict in list(self._state.events.items()):
+            if event_key in local_events:
+                continue
+            date_string = event_dict[GoogleSyncState.DATE_KEY]
+            if (date_string is None or
+                    start_date.string() <= date_string <= end_date.string()):
+                event_id = event_dict[GoogleSyncState.EVENT_ID_KEY]
+                requests.append(
+                    (event_key, ("DELETE", events_path(event_id), None))
+                )
+
+        num_changes = 0
+        errors = []
+        while requests:
+            responses = self._client.batch(
+                [request for _, request in requests]
+            )
+            retries = []
+            for (event_key, request), response in zip(requests, responses):
+                method, _, event = request
+                status, response_body = response
+                if method == "DELETE":
+                    if status in (
+                            HttpStatus.NO_CONTENT,
+                            HttpStatus.OK,
+                            HttpStatus.NOT_FOUND,
+                            HttpStatus.GONE):
+                        del self._state.events[event_key]
+                        num_changes += 1
+                        continue
+                elif status == HttpStatus.CONFLICT and method == "POST":
+                    # the event id is already in use, so this event must
+                    # have been synced before without the state recording it
+                    event_id = event["id"]
+                    retries.append(
+                        (event_key, ("PUT", events_path(event_id), event))
+                    )
+                    continue
+                elif status == HttpStatus.OK:
+                    item, _, date = local_events[event_key]
+                    self._state.set_event(
+                        event_key,
+                        item._get_id(),
+                        response_body["id"],
+                        _get_event_hash(event),
+                        _get_event_hash(response_body),
+                        date,
+                    )
+                    num_changes += 1
+                    continue
+                errors.append("{0} {1}: {2}".format(method, status, event_key))
+            requests = retries
+
+        if errors:
+            raise GoogleCalendarError(
+                0,
+                "Failed to push events:\n{0}".format("\n".join(errors)),
+            )
+        return num_changes
+
+    def pull(self):
+        """Pull changes from google and apply them to the calendar.
+
+        The changes are all applied in a single edit log transaction, so
+        the pull can be undone in one go. As with other edits, changes are
+        only applied if the edit registry is open.
+
+        Returns:
+            (int): number of google events applied to the calendar.
+        """
+        try:
+            events, sync_token = self._client.list_events(
+                self._state.sync_token
+            )
+        except SyncTokenExpiredError:
+            # events that were deleted since the expired sync token are
+            # missed by a full list, so they're found by checking which
+            # synced events are no longer returned
+            events, sync_token = self._client.list_events()
+            listed_ids = set(event["id"] for event in events)
+            for event_id in self._state.get_event_keys():
+                if event_id not in listed_ids:
+                    events.append({"id": event_id, "status": "cancelled"})
+
+        with edit_log.transaction("Pull from Google Calendar"):
+            num_changes = self._apply_events(events)
+        self._state.sync_token = sync_token
+        return num_changes
+
+    def _apply_events(self, events):
+        """Apply google events changed since the last pull to the calendar.
+
+        Args:
+            events (list(dict)): the changed google event dicts.
+
+        Returns:
+            (int): number of google events applied to the calendar.
+        """
+        local_events = self._get_local_events()
+        event_keys = self._state.get_event_keys()
+        num_changes = 0
+        for event in events:
+            if event.get("recurringEventId"):
+                continue
+            event_key = event_keys.get(event["id"])
+            if event_key is None:
+                if event.get("status") != "cancelled":
+                    num_changes += self._import_event(event)
+                continue
+
+            event_dict = self._state.events[event_key]
+            local_event = local_events.get(event_key)
+            locally_changed = (
+                local_event is None or
+                _get_event_hash(local_event[1]) !=
+                event_dict[GoogleSyncState.LOCAL_HASH_KEY]
+            )
+            if event.get("status") == "cancelled":
+                # a repeat item represented by several events is only removed
+                # along with its first event
+                if (local_event is not None and not locally_changed
+                        and event_key == local_event[0]._get_id()
+                        and RemoveScheduledItemEdit.create_and_run(
+                            local_event[0])):
+                    num_changes += 1
+                del self._state.events[event_key]
+                continue
+            if (_get_event_hash(event) ==
+                    event_dict[GoogleSyncState.REMOTE_HASH_KEY]):
+                continue
+            if locally_changed:
+                # local changes win conflicts and are pushed back to google
+                continue
+            num_changes += self._apply_event(event, event_key, local_event[0])
+        return num_changes
+
+    def sync(self, start_date, end_date):
+        """Pull changes from google and then push local changes.
+
+        Args:
+            start_date (Date): start of date range to push items within.
+            end_date (Date): end of date range to push items within.
+
+        Returns:
+            (int): number of events pulled.
+            (int): number of events pushed.
+        """
+        return self.pull(), self.push(start_date, end_date)
+
+    def _get_event_times(self, event):
+        """Get date and times of google event.
+
+        Args:
+            event (dict): google event dict.
+
+        Returns:
+            (tuple(Date, Time, Time) or None): date, start time and end time
+                of event, or None if it's an all-day or multi-day event.
+        """
+        start = event.get("start", {}).get("dateTime")
+        end = event.get("end", {}).get("dateTime")
+        if not start or not end or start[:10] != end[:10]:
+            return None
+        date = Date(int(start[0:4]), int(start[5:7]), int(start[8:10]))
+        start_time = Time(int(start[11:13]), int(start[14:16]))
+        end_time = Time(int(end[11:13]), int(end[14:16]))
+        if end_time <= start_time:
+            return None
+        return date, start_time, end_time
+
+    def _record_pulled_event(self, event, event_key, item, date=None):
+        """Record google event that has been applied to scheduled item.
+
+        Args:
+            event (dict): google event dict.
+            event_key (str): event key.
+            item (BaseScheduledItem): scheduled item the event was applied to.
+            date (Date or None): date of event, if it's not recurring.
+        """
+        local_event = dict(self._get_item_events(item, date)).get(event_key)
+        self._state.set_event(
+            event_key,
+            item._get_id(),
+            event["id"],
+            _get_event_hash(local_event) if local_event else "",
+            _get_event_hash(event),
+            date,
+        )
+
+    def _import_event(self, event):
+        """Add scheduled item for new google event.
+
+        Args:
+            event (dict): google event dict.
+
+        Returns:
+            (int): 1 if the event was imported, otherwise 0.
+        """
+        event_times = self._get_event_times(event)
+        if event_times is None:
+            return 0
+        date, start_time, end_time = event_times
+        kwargs = {
+            "item_type": ScheduledItemType.EVENT,
+            "event_category": self.EVENT_CATEGORY,
+            "event_name": event.get("summary", ""),
+        }
+        if event.get("recurrence"):
+            repeat_pattern = _get_repeat_pattern(event, date)
+            if repeat_pattern is None:
+                return 0
+            item = RepeatScheduledItem(
+                self._calendar,
+                start_time,
+                end_time,
+                repeat_pattern,
+                **kwargs
+            )
+            date = None
+        else:
+            item = ScheduledItem(
+                self._calendar,
+                start_time,
+                end_time,
+                date,
+                **kwargs
+            )
+        if not AddScheduledItemEdit.create_and_run(item):
+            return 0
+        self._record_pulled_event(event, item._get_id(), item, date)
+        return 1
+
+    def _apply_event(self, event, event_key, item):
+        """Apply changes to google event to its scheduled item.
+
+        Args:
+            event (dict): google event dict.
+            event_key (str): event key of scheduled item.
+            item (BaseScheduledItem): scheduled item to update.
+
+        Returns:
+            (int): 1 if the changes were applied, otherwise 0.
+        """
+        event_times = self._get_event_times(event)
+        if event_times is None:
+            return 0
+        date, start_time, end_time = event_times
+        is_recurring = bool(event.get("recurrence"))
+        if is_recurring != item.is_repeat():
+            # event has been changed to or from a recurring event, so replace
+            # the item with a new one
+            if event_key != item._get_id():
+                return 0
+            if not RemoveScheduledItemEdit.create_and_run(item):
+                return 0
+            del self._state.events[event_key]
+            return self._import_event(event)
+
+        attr_dict = {
+            item._start_time: start_time,
+            item._end_time: end_time,
+        }
+        if item.type == ScheduledItemType.EVENT:
+            attr_dict[item._event_name] = event.get("summary", "")
+        if not is_recurring:
+            attr_dict[item._date] = date
+            if not ModifyScheduledItemEdit.create_and_run(item, attr_dict):
+                return 0
+            self._record_pulled_event(event, event_key, item, date)
+            return 1
+
+        # the repeat pattern can only be updated from google if the item is
+        # represented by a single recurring event
+        if len(item.repeat_pattern.get_rrule_start_dates()) == 1:
+            repeat_pattern = _get_repeat_pattern(event, date)
+            if (repeat_pattern is not None
+                    and repeat_pattern != item.repeat_pattern):
+                attr_dict[item._repeat_pattern] = repeat_pattern
+        if not ModifyRepeatScheduledItemEdit.create_and_run(item, attr_dict):
+            return 0
+        self._record_pulled_event(event, event_key, item)
+        return 1
@@ -0,0 +1,487 @@
+"""Import and export of scheduled items as iCalendar (.ics) files.
+
+Both directions are streamed, so memory use doesn't grow with file size:
+
+    - export writes each event as it's read from the calendar, rather than
+        building the whole file first.
+    - import parses one event at a time from the file, creating and adding
+        its scheduled item before moving on to the next one.
+
+Repeat scheduled items are written as recurring events with an RRULE
+rather than being expanded, and recurring events are read back in as
+repeat scheduled items. Event times are written as floating local times,
+so the RRULE end times are too.
+"""
+
+import datetime
+import os
+import re
+
+from scheduler.api.common.date_time import Date, Time
+from scheduler.api.edit import edit_log
+from scheduler.api.edit.schedule_edit import AddScheduledItemEdit
+from .repeat_pattern import RepeatPattern, RepeatPatternError
+from .scheduled_item import (
+    RepeatScheduledItem,
+    ScheduledItem,
+    ScheduledItemType,
+)
+
+
+class IcsError(Exception):
+    """Exception for invalid iCalendar files."""
+
+
+class IcsProperty(object):
+    """Struct of iCalendar property names used by import and export."""
+    BEGIN = "BEGIN"
+    END = "END"
+    VERSION = "VERSION"
+    PRODID = "PRODID"
+    UID = "UID"
+    DTSTAMP = "DTSTAMP"
+    DTSTART = "DTSTART"
+    DTEND = "DTEND"
+    DURATION = "DURATION"
+    SUMMARY = "SUMMARY"
+    CATEGORIES = "CATEGORIES"
+    RRULE = "RRULE"
+    TREE_ITEM = "X-SCHEDULER-TREE-ITEM"
+
+
+VCALENDAR = "VCALENDAR"
+VEVENT = "VEVENT"
+PRODID = "-//scheduler//scheduler calendar//EN"
+
+# lines are folded to this many bytes, as required by the iCalendar spec
+_MAX_LINE_LENGTH = 75
+_DURATION_REGEX = re.compile(
+    r"^PT?(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+)S)?$"
+)
+
+
+def _escape_text(text):
+    """Escape text property value.
+
+    Args:
+        text (str): text to escape.
+
+    Returns:
+        (str): escaped text.
+    """
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\n", "\\n")
+    )
+
+
+def _unescape_text(text):
+    """Unescape text property value.
+
+    Args:
+        text (str): text to unescape.
+
+    Returns:
+        (str): unescaped text.
+    """
+    return re.sub(
+        r"\\(.)",
+        lambda match: "\n" if match.group(1) in "nN" else match.group(1),
+        text,
+    )
+
+
+def _fold_line(line):
+    """Fold content line so no line is longer than the max length.
+
+    Args:
+        line (str): content line.
+
+    Returns:
+        (str): folded line, including the line break at the end.
+    """
+    if len(line.encode("utf-8")) <= _MAX_LINE_LENGTH:
+        return line + "\r\n"
+    lines = []
+    current = ""
+    current_length = 0
+    for char in line:
+        char_length = len(char.encode("utf-8"))
+        if current_length + char_length > _MAX_LINE_LENGTH:
+            lines.append(current)
+            # continuation lines start with a space, which counts to length
+            current = " "
+            current_length = 1
+        current += char
+        current_length += char_length
+    lines.append(current)
+    return "\r\n".join(lines) + "\r\n"
+
+
+def _date_time_string(date, time):
+    """Get iCalendar floating date-time string.
+
+    Args:
+        date (Date): the date.
+        time (Time): the time.
+
+    Returns:
+        (str): date-time string, eg. 20240101T093000.
+    """
+    return "{0}T{1}00".format(
+        date.string().replace("-", ""),
+        time.string().replace(":", ""),
+    )
+
+
+def _iter_item_events(scheduled_item):
+    """Get the iCalendar events representing a scheduled item.
+
+    Args:
+        scheduled_item (BaseScheduledItem): the scheduled item.
+
+    Yields:
+        (list(tuple(str, str))): property names and values of each event.
+    """
+    item_id = scheduled_item._get_id()
+    properties = [
+        (IcsProperty.SUMMARY, _escape_text(scheduled_item.name)),
+    ]
+    if scheduled_item.type == ScheduledItemType.TASK:
+        if scheduled_item.tree_item is not None:
+            properties.append(
+                (
+                    IcsProperty.TREE_ITEM,
+                    _escape_text(scheduled_item.tree_item.path),
+                )
+            )
+    elif scheduled_item.category:
+        properties.append(
+            (IcsProperty.CATEGORIES, _escape_text(scheduled_item.category))
+        )
+
+    if not scheduled_item.is_repeat():
+        dates = [scheduled_item.date]
+    else:
+        dates = scheduled_item.repeat_pattern.get_rrule_start_dates()
+        properties.append(
+            (IcsProperty.RRULE, scheduled_item.repeat_pattern.to_rrule())
+        )
+    for i, date in enumerate(dates):
+        uid = item_id if i == 0 else "{0}/{1}".format(item_id, i)
+        yield [
+            (IcsProperty.UID, _escape_text(uid)),
+            (
+                IcsProperty.DTSTART,
+                _date_time_string(date, scheduled_item.start_time),
+            ),
+            (
+                IcsProperty.DTEND,
+                _date_time_string(date, scheduled_item.end_time),
+            ),
+        ] + properties
+
+
+def iter_ics_lines(calendar, start_date=None, end_date=None):
+    """Iterate through lines of iCalendar file for scheduled items.
+
+    Args:
+        calendar (Calendar): calendar to export.
+        start_date (Date or None): if given, ignore items before this date.
+        end_date (Date or None): if given, ignore items after this date.
+
+    Yields:
+        (str): next (folded) line of file, including line break.
+    """
+    time_stamp = datetime.datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+    yield _fold_line("{0}:{1}".format(IcsProperty.BEGIN, VCALENDAR))
+    yield _fold_line("{0}:2.0".format(IcsProperty.VERSION))
+    yield _fold_line("{0}:{1}".format(IcsProperty.PRODID, PRODID))
+
+    def iter_items():
+        for repeat_item in calendar._repeat_items:
+            repeat_pattern = repeat_item.repeat_pattern
+            if end_date is not None and repeat_pattern.start_date > end_date:
+                continue
+            if (start_date is not None
+                    and repeat_pattern.end_date is not None
+                    and repeat_pattern.end_date < start_date):
+                continue
+            yield repeat_item
+        for date in sorted(calendar._days.keys()):
+            if ((start_date is not None and date < start_date)
+                    or (end_date is not None and date > end_date)):
+                continue
+            for scheduled_item in calendar._days[date]._scheduled_items:
+                yield scheduled_item
+
+    for scheduled_item in iter_items():
+        for properties in _iter_item_events(scheduled_item):
+            yield _fold_line("{0}:{1}".format(IcsProperty.BEGIN, VEVENT))
+            yield _fold_line(
+                "{0}:{1}".format(IcsProperty.DTSTAMP, time_stamp)
+            )
+            for name, value in properties:
+                yield _fold_line("{0}:{1}".format(name, value))
+            yield _fold_line("{0}:{1}".format(IcsProperty.END, VEVENT))
+    yield _fold_line("{0}:{1}".format(IcsProperty.END, VCALENDAR))
+
+
+def write_ics(calendar, file_path, start_date=None, end_date=None):
+    """Write scheduled items in calendar to iCalendar file.
+
+    Args:
+        calendar (Calendar): calendar to export.
+        file_path (str): path to .ics file to write.
+        start_date (Date or None): if given, ignore items before this date.
+        end_date (Date or None): if given, ignore items after this date.
+
+    Returns:
+        (int): number of events written.
+    """
+    num_events = 0
+    end_line = _fold_line("{0}:{1}".format(IcsProperty.END, VEVENT))
+    with open(file_path, "w", encoding="utf-8", newline="") as file_:
+        for line in iter_ics_lines(calendar, start_date, end_date):
+            file_.write(line)
+            if line == end_line:
+                num_events += 1
+    return num_events
+
+
+def _iter_unfolded_lines(lines):
+    """Iterate through content lines, unfolding any folded lines.
+
+    Args:
+        lines (iterable(str)): lines of file.
+
+    Yields:
+        (str): next unfolded content line.
+    """
+    current = None
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t"):
+            if current is None:
+                raise IcsError("File can't start with a folded line")
+            current += line[1:]
+            continue
+        if current:
+            yield current
+        current = line
+    if current:
+        yield current
+
+
+def _parse_content_line(line):
+    """Parse content line into property name, parameters and value.
+
+    Args:
+        line (str): unfolded content line.
+
+    Raises:
+        (IcsError): if line has no value.
+
+    Returns:
+        (str): property name, in upper case.
+        (dict(str, str)): property parameters.
+        (str): property value.
+    """
+    in_quotes = False
+    for i, char in enumerate(line):
+        if char == '"':
+            in_quotes = not in_quotes
+        elif char == ":" and not in_quotes:
+            break
+    else:
+        raise IcsError("Content line {0} has no value".format(line))
+    name_and_params = line[:i].split(";")
+    params = {}
+    for param in name_and_params[1:]:
+        key, _, value = param.partition("=")
+        params[key.upper()] = value.strip('"')
+    return name_and_params[0].upper(), params, line[i+1:]
+
+
+def iter_ics_events(lines):
+    """Iterate through the events of an iCalendar file.
+
+    Only one event is held in memory at a time, so this can be used to read
+    files of any size. Properties of components nested inside events (eg.
+    alarms) are ignored.
+
+    Args:
+        lines (iterable(str)): lines of the file. This can be an open file.
+
+    Raises:
+        (IcsError): if the file is malformed.
+
+    Yields:
+        (dict(str, tuple(dict, str))): parameters and value of each property
+            of the next event, keyed by property name. Only the first value
+            of properties that are given multiple times is kept.
+    """
+    components = []
+    event = None
+    for line in _iter_unfolded_lines(lines):
+        name, params, value = _parse_content_line(line)
+        if name == IcsProperty.BEGIN:
+            components.append(value.upper())
+            if components[-1] == VEVENT and len(components) == 2:
+                event = {}
+        elif name == IcsProperty.END:
+            if not components or components[-1] != value.upper():
+                raise IcsError(
+                    "Unexpected END:{0} in iCalendar file".format(value)
+                )
+            components.pop()
+            if value.upper() == VEVENT and event is not None:
+                yield event
+                event = None
+        elif event is not None and components[-1] == VEVENT:
+            event.setdefault(name, (params, value))
+    if components:
+        raise IcsError(
+            "iCalendar file ended inside {0} component".format(components[-1])
+        )
+
+
+def _parse_date_time(params, value):
+    """Parse date-time property value.
+
+    Times given in UTC or with a time zone are read as wall-clock times.
+
+    Args:
+        params (dict(str, str)): property parameters.
+        value (str): property value.
+
+    Returns:
+        (tuple(Date, Time or None)): date and time, or just date if the value
+            is a date with no time.
+    """
+    try:
+        date = Date(int(value[0:4]), int(value[4:6]), int(value[6:8]))
+        if params.get("VALUE") == "DATE" or len(value) == 8:
+            return date, None
+        return date, Time(int(value[9:11]), int(value[11:13]))
+    except ValueError:
+        raise IcsError("Invalid date-time value {0}".format(value))
+
+
+def scheduled_item_from_event(calendar, event):
+    """Create scheduled item from iCalendar event.
+
+    All-day events and events that don't start and end on the same day
+    can't be represented by scheduled items, so are ignored, along with
+    recurring events whose rule isn't supported by RepeatPattern.
+
+    Args:
+        calendar (Calendar): calendar to create item in.
+        event (dict(str, tuple(dict, str))): event, as given by the
+            iter_ics_events function.
+
+    Raises:
+        (IcsError): if the event has no start.
+
+    Returns:
+        (BaseScheduledItem or None): scheduled item, if the event can be
+            represented by one.
+    """
+    if IcsProperty.DTSTART not in event:
+        raise IcsError("Event has no {0}".format(IcsProperty.DTSTART))
+    date, start_time = _parse_date_time(*event[IcsProperty.DTSTART])
+    if start_time is None:
+        return None
+    if IcsProperty.DTEND in event:
+        end_date, end_time = _parse_date_time(*event[IcsProperty.DTEND])
+        if end_date != date:
+            return None
+    else:
+        match = _DURATION_REGEX.match(
+            event.get(IcsProperty.DURATION, ({}, ""))[1]
+        )
+        if not match:
+            return None
+        minutes = (
+            start_time.hour * 60 + start_time.minute
+            + int(match.group("hours") or 0) * 60
+            + int(match.group("minutes") or 0)
+        )
+        if minutes >= 24 * 60:
+            return None
+        end_time = Time(minutes // 60, minutes % 60)
+    if end_time is None or end_time <= start_time:
+        return None
+
+    kwargs = {
+        "item_type": ScheduledItemType.EVENT,
+        "event_name": _unescape_text(
+            event.get(IcsProperty.SUMMARY, ({}, ""))[1]
+        ),
+    }
+    if IcsProperty.TREE_ITEM in event:
+        tree_item = calendar.task_root.get_item_at_path(
+            _unescape_text(event[IcsProperty.TREE_ITEM][1]),
+            strict=True,
+        )
+        if tree_item is not None:
+            kwargs["item_type"] = ScheduledItemType.TASK
+            kwargs["tree_item"] = tree_item
+    if IcsProperty.CATEGORIES in event:
+        # categories are comma separated, we just use the first one
+        categories = re.split(r"(?<!\\),", event[IcsProperty.CATEGORIES][1])
+        kwargs["event_category"] = _unescape_text(categories[0])
+
+    if IcsProperty.RRULE in event:
+        try:
+            repeat_pattern = RepeatPattern.from_rrule(
+                event[IcsProperty.RRULE][1],
+                date,
+                time_zone=event[IcsProperty.DTSTART][0].get("TZID"),
+            )
+        except RepeatPatternError:
+            return None
+        return RepeatScheduledItem(
+            calendar,
+            start_time,
+            end_time,
+            repeat_pattern,
+            **kwargs
+        )
+    return ScheduledItem(calendar, start_time, end_time, date, **kwargs)
+
+
+def import_ics(calendar, file_path):
+    """Add scheduled items to calendar for events in an iCalendar file.
+
+    The file is read one event at a time, and the items are all added in a
+    single edit log transaction, so the import can be undone in one go.
+    As with other edits, items are only added if the edit registry is open.
+
+    Args:
+        calendar (Calendar): calendar to import to.
+        file_path (str): path to .ics file.
+
+    Raises:
+        (IcsError): if the file is malformed. In this case, no items are
+            added.
+
+    Returns:
+        (int): number of scheduled items added.
+        (int): number of events skipped, as they couldn't be represented
+            as scheduled items.
+    """
+    num_added = 0
+    num_skipped = 0
+    with open(file_path, "r", encoding="utf-8", newline="") as file_:
+        with edit_log.transaction(
+                "Import {0}".format(os.path.basename(file_path))):
+            for event in iter_ics_events(file_):
+                scheduled_item = scheduled_item_from_event(calendar, event)
+                if scheduled_item is None:
+                    num_skipped += 1
+                elif AddScheduledItemEdit.create_and_run(scheduled_item):
+                    num_added += 1
+    return num_added, num_skipped
@@ -278,12 +278,12 @@ class PlannedItem(BaseCalendarItem):
                 yield (task, self.date)
 
     def _get_id(self):
-        """Generate unique id for object.
+        """Get unique id for object, generating it if not yet set.
 
-        This should be used only during the serialization process, so that
-        the data used for the id string is up to date. Note that once this
-        is run the id string is fixed, allowing it to be referenced by other
-        classes during serialization (see the item_registry module for
+        Items read from a dict keep the id they were saved with, so the id
+        is only generated for new items, the first time they're serialized.
+        Once set, the id string is fixed, allowing it to be referenced by
+        other classes during serialization (see the item_registry module for
         more information on how this is done).
 
         Returns:
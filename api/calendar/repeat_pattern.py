@@ -1,5 +1,7 @@
 """Class to define a repeat pattern for scheduled and planned items."""
 
+import datetime
+
 from scheduler.api.common.date_time import Date, TimeDelta
 from scheduler.api.serialization.serializable import (
     NestedSerializable,
@@ -11,6 +13,32 @@ class RepeatPatternError(Exception):
     """Generic exception for repeat pattern errors."""
 
 
+def _get_time_zone(time_zone):
+    """Get time zone info for the given time zone name.
+
+    Args:
+        time_zone (str): IANA time zone name, eg. Europe/London.
+
+    Raises:
+        (RepeatPatternError): if the zoneinfo module isn't available or the
+            time zone isn't found.
+
+    Returns:
+        (datetime.tzinfo): the time zone info.
+    """
+    try:
+        import zoneinfo
+    except ImportError:
+        raise RepeatPatternError(
+            "Could not import zoneinfo module. Python 3.9 or later is "
+            "needed to use recurrence rules with time zones."
+        )
+    try:
+        return zoneinfo.ZoneInfo(time_zone)
+    except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+        raise RepeatPatternError("Unknown time zone {0}".format(time_zone))
+
+
 # TODO: for neatness, make this match with other classes that don't need
 # file serialization but do use to_dict and from_dict methods (eg.
 # TaskHistory, Filter and TrackerTarget classes) - either these should all
@@ -29,6 +57,15 @@ class RepeatPattern(NestedSerializable):
     MONTH_REPEAT = "month_repeat"
     YEAR_REPEAT = "year_repeat"
 
+    # iCalendar recurrence rule values
+    RRULE_FREQUENCIES = {
+        DAY_REPEAT: "DAILY",
+        WEEK_REPEAT: "WEEKLY",
+        MONTH_REPEAT: "MONTHLY",
+        YEAR_REPEAT: "YEARLY",
+    }
+    RRULE_WEEKDAYS = ["MO", "TU", "WE", "TH", "FR", "SA", "SU"]
+
     def __init__(
             self,
             inital_date_pattern,
@@ -358,6 +395,194 @@ class RepeatPattern(NestedSerializable):
         """
         return self.summary_string()
 
+    def get_rrule_start_dates(self):
+        """Get start dates of the recurrences needed to represent pattern.
+
+        A week repeat can be represented by a single recurrence rule, using
+        the weekdays of its initial dates. Other patterns with several
+        initial dates need one recurrence rule per initial date.
+
+        Returns:
+            (list(Date)): start date of each recurrence.
+        """
+        if self.repeat_type == self.WEEK_REPEAT:
+            return [self.start_date]
+        return list(self._initial_date_pattern)
+
+    def to_rrule(self, time_zone=None):
+        """Get iCalendar recurrence rule representing pattern.
+
+        The rule repeats from each of the dates given by the
+        get_rrule_start_dates method. Week repeats count their weeks from
+        their start date, so their rules set the week start (WKST) to the
+        weekday of the start date, as otherwise weeks are counted from
+        Monday and repeats with a gap of more than one week that include
+        days either side of a Monday would give different dates.
+
+        The end date is written as a time at the end of that day. This must
+        have the same form as the start of the recurrence, so it's a
+        floating local time unless a time zone is given, in which case it's
+        converted from that time zone to UTC.
+
+        Args:
+            time_zone (str or None): IANA name of the time zone the
+                recurrence start is given in, if it isn't floating.
+
+        Returns:
+            (str): recurrence rule value, eg. FREQ=WEEKLY;INTERVAL=1.
+        """
+        if self.repeat_type == self.WEEK_REPEAT:
+            interval = self._gap.days // 7
+        elif self.repeat_type == self.MONTH_REPEAT:
+            interval = self._gap.months
+        elif self.repeat_type == self.YEAR_REPEAT:
+            interval = self._gap.years
+        else:
+            interval = self._gap.days
+        rules = [
+            "FREQ={0}".format(self.RRULE_FREQUENCIES[self.repeat_type]),
+            "INTERVAL={0}".format(interval),
+        ]
+        if self.repeat_type == self.WEEK_REPEAT:
+            weekdays = sorted(
+                set(date.weekday for date in self._initial_date_pattern)
+            )
+            rules.append("BYDAY={0}".format(
+                ",".join(self.RRULE_WEEKDAYS[day] for day in weekdays)
+            ))
+            rules.append("WKST={0}".format(
+                self.RRULE_WEEKDAYS[self.start_date.weekday]
+            ))
+        if self._end_date is not None:
+            until = datetime.datetime(
+                self._end_date.year,
+                self._end_date.month,
+                self._end_date.day,
+                23,
+                59,
+                59,
+            )
+            if time_zone is None:
+                rules.append(until.strftime("UNTIL=%Y%m%dT%H%M%S"))
+            else:
+                until = until.replace(
+                    tzinfo=_get_time_zone(time_zone)
+                ).astimezone(datetime.timezone.utc)
+                rules.append(until.strftime("UNTIL=%Y%m%dT%H%M%SZ"))
+        return ";".join(rules)
+
+    @classmethod
+    def from_rrule(cls, rrule, start_date, time_zone=None):
+        """Initialise class from iCalendar recurrence rule.
+
+        Only rules with a frequency, interval, end date and (for weekly
+        rules) weekdays and week start can be represented as repeat
+        patterns. As week repeats count their weeks from the start date,
+        weekly rules with an interval of more than one week are only
+        supported if all their weekdays fall between the start date and
+        the next week start.
+
+        Args:
+            rrule (str): recurrence rule value, with or without the RRULE:
+                prefix.
+            start_date (Date): date the recurrence starts from.
+            time_zone (str or None): IANA name of the time zone the
+                recurrence start is given in, if known. This is used to get
+                the local end date from rules that end at a UTC time. If
+                not given, the end date is the UTC date.
+
+        Raises:
+            (RepeatPatternError): if the rule can't be represented by a
+                repeat pattern.
+
+        Returns:
+            (RepeatPattern): class instance.
+        """
+        if rrule.startswith("RRULE:"):
+            rrule = rrule[len("RRULE:"):]
+        rules = dict(rule.partition("=")[::2] for rule in rrule.split(";"))
+        repeat_types = {
+            frequency: repeat_type
+            for repeat_type, frequency in cls.RRULE_FREQUENCIES.items()
+        }
+        repeat_type = repeat_types.get(rules.pop("FREQ", None))
+        interval = rules.pop("INTERVAL", "1")
+        until = rules.pop("UNTIL", None)
+        weekdays = rules.pop("BYDAY", None)
+        week_start = rules.pop("WKST", "MO")
+        if (repeat_type is None or rules or not interval.isdigit()
+                or int(interval) < 1
+                or week_start not in cls.RRULE_WEEKDAYS
+                or (weekdays and repeat_type != cls.WEEK_REPEAT)):
+            raise RepeatPatternError(
+                "Recurrence rule {0} is not supported".format(rrule)
+            )
+        interval = int(interval)
+        end_date = None
+        if until is not None:
+            try:
+                if until.endswith("Z"):
+                    until_time = datetime.datetime.strptime(
+                        until,
+                        "%Y%m%dT%H%M%SZ",
+                    ).replace(tzinfo=datetime.timezone.utc)
+                    if time_zone is not None:
+                        until_time = until_time.astimezone(
+                            _get_time_zone(time_zone)
+                        )
+                    until = until_time.strftime("%Y%m%d")
+                end_date = Date(
+                    int(until[0:4]), int(until[4:6]), int(until[6:8])
+                )
+            except ValueError:
+                raise RepeatPatternError(
+                    "Recurrence rule end {0} is not a date".format(until)
+                )
+
+        if repeat_type == cls.WEEK_REPEAT:
+            if weekdays is None:
+                return cls.week_repeat(
+                    start_date,
+                    [start_date.weekday_string()],
+                    interval,
+                    end_date,
+                )
+            weekdays = weekdays.split(",")
+            if any(day not in cls.RRULE_WEEKDAYS for day in weekdays):
+                raise RepeatPatternError(
+                    "Recurrence rule weekdays {0} are not supported".format(
+                        weekdays
+                    )
+                )
+            weekdays = [cls.RRULE_WEEKDAYS.index(day) for day in weekdays]
+            if interval > 1:
+                week_length = (
+                    (cls.RRULE_WEEKDAYS.index(week_start) - start_date.weekday)
+                    % 7
+                ) or 7
+                if any(
+                        (day - start_date.weekday) % 7 >= week_length
+                        for day in weekdays):
+                    raise RepeatPatternError(
+                        "Recurrence rule weekdays {0} don't all fall in the "
+                        "week from {1} with week start {2}".format(
+                            ",".join(cls.RRULE_WEEKDAYS[d] for d in weekdays),
+                            start_date.string(),
+                            week_start,
+                        )
+                    )
+            return cls.week_repeat(
+                start_date,
+                [Date.weekday_string_from_int(day) for day in weekdays],
+                interval,
+                end_date,
+            )
+        elif repeat_type == cls.MONTH_REPEAT:
+            return cls.month_repeat([start_date], interval, end_date)
+        elif repeat_type == cls.YEAR_REPEAT:
+            return cls.year_repeat([start_date], interval, end_date)
+        return cls.day_repeat([start_date], interval, end_date)
+
     def to_dict(self):
         """Return dictionary representation of class.
 
@@ -883,6 +883,30 @@ class Date(BaseDateTimeWrapper):
                 )
             )
 
+    @classmethod
+    def from_day_number(cls, day_number):
+        """Get Date object from day number.
+
+        Args:
+            day_number (int): day number, as returned by the day_number
+                property.
+
+        Returns:
+            (Date): Date object.
+        """
+        return cls(_date=datetime.date.fromordinal(day_number))
+
+    @property
+    def day_number(self):
+        """Get day number, counting 1st January of year 1 as day 1.
+
+        This is useful for storing dates as integers, eg. in arrays.
+
+        Returns:
+            (int): day number of date object.
+        """
+        return self._datetime_obj.toordinal()
+
     @property
     def year(self):
         """Get year.
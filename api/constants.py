@@ -15,6 +15,13 @@ if DEV_MODE:
 USER_PREFS_FILE = os.path.join(SCHEDULER_PKG_DIR, "user_prefs.json")
 
 
+# Edit Log
+# max number of edits kept in the edit log (ie. the undo horizon) and max
+# approximate memory size of the edit log, in bytes.
+EDIT_LOG_MAX_LENGTH = 1000
+EDIT_LOG_MAX_SIZE = 64 * 1024 * 1024
+
+
 # Hosted Data Container Pairing
 CALENDAR_ITEM_TREE_PAIRING = "Calendar_Item_Tree_Pairing"
 CALENDAR_ITEM_PARENT_CHILD_PAIRING = "Calendar_Item_Parent_Child_Pairing"
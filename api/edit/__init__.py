@@ -1,9 +1,18 @@
 """Edit module for registering user edits."""
 
 from .edit_log import (
+    get_edit_log_size,
     latest_edit,
     open_edit_registry,
     print_edit_log,
     redo,
+    set_edit_log_budget,
+    transaction,
     undo,
 )
+from .edit_profiler import (
+    disable_edit_profiling,
+    enable_edit_profiling,
+    print_edit_profile,
+    write_edit_profile_trace,
+)
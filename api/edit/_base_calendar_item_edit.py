@@ -88,6 +88,31 @@ def _get_task_history_edits(ci, ad):
     return edits
 
 
+def _get_journal_item(ci, date=None):
+    """Get item whose serialized state includes the given calendar item.
+
+    This is used to find the items that calendar edits modify, for the edit
+    journal.
+
+    Args:
+        ci (BaseCalendarItem): planned or scheduled item.
+        date (Date or None): date to use for single scheduled items, if not
+            the item's current date.
+
+    Returns:
+        (BaseCalendarPeriod or RepeatScheduledItem): the calendar period
+            that the item is stored in, or the repeat scheduled item for
+            repeat items and their instances.
+    """
+    if ci.is_planned_item:
+        return ci.calendar_period
+    if ci.is_repeat():
+        return ci
+    if ci.is_repeat_instance():
+        return ci.repeat_scheduled_item
+    return ci.calendar.get_day(fallback_value(date, ci.date))
+
+
 class AddCalendarItemChildRelationshipEdit(CompositeEdit):
     """Add an associated child item to a planned or scheduled item."""
     def __init__(self, parent_item, child_item):
@@ -111,6 +136,7 @@ class AddCalendarItemChildRelationshipEdit(CompositeEdit):
             subedits,
             validity_check_edits=[list_edit],
         )
+        self._parent_item = parent_item
         self._name = "AddCalendarItemChildRelationshipEdit ({0})".format(
             parent_item.name
         )
@@ -123,6 +149,14 @@ class AddCalendarItemChildRelationshipEdit(CompositeEdit):
             )
         )
 
+    def _get_journal_items(self):
+        """Get items modified by edit.
+
+        Returns:
+            (list): the item that the parent item is stored in.
+        """
+        return [_get_journal_item(self._parent_item)]
+
 
 class RemoveCalendarItemChildRelationshipEdit(CompositeEdit):
     """Remove an associated scheduled item from a planned item."""
@@ -147,6 +181,7 @@ class RemoveCalendarItemChildRelationshipEdit(CompositeEdit):
             subedits,
             validity_check_edits=[list_edit],
         )
+        self._parent_item = parent_item
         self._name = "RemoveCalendarItemChildRelationshipEdit ({0})".format(
             parent_item.name
         )
@@ -158,3 +193,11 @@ class RemoveCalendarItemChildRelationshipEdit(CompositeEdit):
                 parent_item.name,
             )
         )
+
+    def _get_journal_items(self):
+        """Get items modified by edit.
+
+        Returns:
+            (list): the item that the parent item is stored in.
+        """
+        return [_get_journal_item(self._parent_item)]
@@ -1,6 +1,9 @@
 """Base edit class, containing edits that can be added to the edit log."""
 
+import sys
+
 from .edit_log import EDIT_LOG
+from .edit_profiler import EDIT_PROFILER, ProfileOp
 
 
 class EditError(Exception):
@@ -47,6 +50,8 @@ class BaseEdit(object):
             _description (str): description to use for edit in edit log.
             _edit_stack_name (str): name of any edit stack that contains this
                 edit.
+            _size_in_bytes (int or None): cached approximate memory size of
+                the edit, used by the edit log to keep within its budget.
         """
         self._register_edit = True
         self._registered = False
@@ -62,6 +67,7 @@ class BaseEdit(object):
         self._edit_stack_name = "{0} Edit Stack".format(
             self.__class__.__name__
         )
+        self._size_in_bytes = None
 
     @classmethod
     def create_and_run(cls, *args, stack=False, **kwargs):
@@ -160,9 +166,10 @@ class BaseEdit(object):
             # don't run registerable edits if they can't be added to log
             return False
         if self._is_valid:
-            EDIT_LOG.run_pre_edit_callbacks(self)
-            self._run()
-            EDIT_LOG.run_post_edit_callbacks(self)
+            with EDIT_PROFILER.edit_span(self, ProfileOp.RUN):
+                EDIT_LOG.run_pre_edit_callbacks(self)
+                self._run()
+                EDIT_LOG.run_post_edit_callbacks(self)
             if self._register_edit:
                 self._registered = EDIT_LOG.add_edit(self)
         self._has_been_done = True
@@ -197,9 +204,10 @@ class BaseEdit(object):
             raise EditError(
                 "Can't call undo on edit that's already been undone."
             )
-        EDIT_LOG.run_pre_undo_callbacks(self)
-        self._inverse_run()
-        EDIT_LOG.run_post_undo_callbacks(self)
+        with EDIT_PROFILER.edit_span(self, ProfileOp.UNDO):
+            EDIT_LOG.run_pre_undo_callbacks(self)
+            self._inverse_run()
+            EDIT_LOG.run_post_undo_callbacks(self)
         self._has_been_done = False
 
     def _redo(self):
@@ -208,9 +216,10 @@ class BaseEdit(object):
             raise EditError(
                 "Can't call redo on edit that's not been undone."
             )
-        EDIT_LOG.run_pre_edit_callbacks(self)
-        self._run()
-        EDIT_LOG.run_post_edit_callbacks(self)
+        with EDIT_PROFILER.edit_span(self, ProfileOp.REDO):
+            EDIT_LOG.run_pre_edit_callbacks(self)
+            self._run()
+            EDIT_LOG.run_post_edit_callbacks(self)
         self._has_been_done = True
 
     def _stacks_with(self, edit):
@@ -228,6 +237,74 @@ class BaseEdit(object):
         """
         return self._always_stack
 
+    def _merge_with(self, edit):
+        """Merge a later edit into this one, so it can replace them both.
+
+        This is used by the edit log to compact edit stacks: if an edit
+        stacks with this one and this method succeeds, the log keeps just
+        this edit, which must then represent the net change of both edits.
+        It should be reimplemented in any subclasses that allow merging.
+
+        Args:
+            edit (BaseEdit): edit that was run directly after this one.
+
+        Returns:
+            (bool): whether or not the edits were merged.
+        """
+        return False
+
+    def _get_size_in_bytes(self):
+        """Get approximate memory size of edit.
+
+        This should be reimplemented in subclasses that store data (eg. diff
+        containers), but shouldn't include the objects the edit modifies.
+
+        Returns:
+            (int): approximate size of edit in bytes.
+        """
+        return sys.getsizeof(self) + sys.getsizeof(self.__dict__)
+
+    def _get_journal_record(self):
+        """Get record of current state of the data this edit modifies.
+
+        This is used by the edit journal, and is called after the edit is
+        run, undone or redone. It should be reimplemented in subclasses
+        that modify small, easily serialized pieces of data.
+
+        Returns:
+            (dict or None): json-compatible record of the modified data, or
+                None if this edit can't be recorded this way, in which case
+                the journal will instead snapshot the components it modifies.
+        """
+        return None
+
+    def _get_journal_items(self):
+        """Get items whose serialized state this edit modifies.
+
+        This is used by the edit journal for edits that don't have their own
+        journal record, and is called after the edit is run, undone or
+        redone. The journal records the current state of each item (eg. a
+        tree item, calendar period or repeat scheduled item), so this should
+        be reimplemented in subclasses that only modify a few items.
+
+        Returns:
+            (list or None): the modified items, or None if this edit doesn't
+                know which items it modifies, in which case the journal will
+                instead snapshot the components it modifies.
+        """
+        return None
+
+    @property
+    def size_in_bytes(self):
+        """Get approximate memory size of edit.
+
+        Returns:
+            (int): approximate size of edit in bytes.
+        """
+        if self._size_in_bytes is None:
+            self._size_in_bytes = self._get_size_in_bytes()
+        return self._size_in_bytes
+
     @property
     def is_valid(self):
         """Check whether edit is valid (ie. actually changes underlying data).
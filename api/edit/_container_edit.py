@@ -8,7 +8,7 @@ from scheduler.api.common.object_wrappers import (
 )
 from scheduler.api.common.timeline import TimelineDict
 from scheduler.api.enums import OrderedStringEnum
-from scheduler.api.utils import add_key_at_start
+from scheduler.api.utils import add_key_at_start, get_size_in_bytes
 
 from ._base_edit import BaseEdit, EditError
 
@@ -270,6 +270,54 @@ class BaseContainerEdit(BaseEdit):
             self._inverse_operation_type,
         )
 
+    def _merge_with(self, edit):
+        """Merge a later edit into this one, so it can replace them both.
+
+        Currently this is only supported for non-recursive dict MODIFY
+        edits on the same dict, as these only ever change existing keys
+        so the net diff is just the later values for each key, and the
+        net inverse is the earliest value for each key.
+
+        Args:
+            edit (BaseEdit): edit that was run directly after this one.
+
+        Returns:
+            (bool): whether or not the edits were merged.
+        """
+        if (type(edit) != type(self)
+                or edit._container is not self._container
+                or not isinstance(self._container, DICT_TYPES)
+                or self._operation_type != ContainerOp.MODIFY
+                or edit._operation_type != ContainerOp.MODIFY
+                or self._recursive
+                or edit._recursive
+                or self._inverse_diff_container is None
+                or edit._inverse_diff_container is None):
+            return False
+        for key, value in edit._diff_container.items():
+            self._diff_container[key] = value
+        for key, value in edit._inverse_diff_container.items():
+            if key not in self._inverse_diff_container:
+                self._add_inverse_diff_dict_key(
+                    self._inverse_diff_container,
+                    key,
+                    value,
+                )
+        self._size_in_bytes = None
+        return True
+
+    def _get_size_in_bytes(self):
+        """Get approximate memory size of edit, including diff containers.
+
+        Returns:
+            (int): approximate size of edit in bytes.
+        """
+        return (
+            super(BaseContainerEdit, self)._get_size_in_bytes()
+            + get_size_in_bytes(self._diff_container)
+            + get_size_in_bytes(self._inverse_diff_container)
+        )
+
     def _recursion_required(self, key_or_index, container, diff_container):
         """Utility to check if we should apply an operation recursively.
 
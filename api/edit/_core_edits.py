@@ -5,6 +5,7 @@ from functools import partial
 from scheduler.api.common.object_wrappers import BaseObjectWrapper, Hosted
 from scheduler.api.utils import fallback_value
 from ._base_edit import BaseEdit, EditError
+from .edit_profiler import EDIT_PROFILER, ProfileOp
 
 
 class SimpleEdit(BaseEdit):
@@ -123,7 +124,8 @@ class CompositeEdit(BaseEdit):
     def _run(self):
         """Run each edit in turn."""
         for edit in self._edits_list:
-            edit._run()
+            with EDIT_PROFILER.subedit_span(edit, ProfileOp.RUN):
+                edit._run()
 
     def _inverse_run(self):
         """Run each inverse edit in reverse order of edits_list."""
@@ -136,7 +138,104 @@ class CompositeEdit(BaseEdit):
                 index = inverse_edits_list.index(edit)
                 inverse_edits_list.append(inverse_edits_list.pop(index))
         for edit in inverse_edits_list:
-            edit._inverse_run()
+            with EDIT_PROFILER.subedit_span(edit, ProfileOp.UNDO):
+                edit._inverse_run()
+
+    def _get_size_in_bytes(self):
+        """Get approximate memory size of edit, including subedits.
+
+        Returns:
+            (int): approximate size of edit in bytes.
+        """
+        return super(CompositeEdit, self)._get_size_in_bytes() + sum(
+            [edit.size_in_bytes for edit in self._edits_list]
+        )
+
+    def _get_subedit_journal_items(self):
+        """Get journal items of the subedits that know what they modify.
+
+        Subedits that don't define their journal items are skipped, so
+        this should only be used by subclasses that account for the items
+        modified by those subedits themselves.
+
+        Returns:
+            (list): the items modified by the subedits.
+        """
+        items = []
+        for edit in self._edits_list:
+            items.extend(edit._get_journal_items() or [])
+        return items
+
+
+class TransactionEdit(BaseEdit):
+    """Edit made up of the edits run in an edit log transaction.
+
+    Unlike CompositeEdit, the subedits have already been run by the time this
+    is created, so it starts off done. Its callbacks are the batch callbacks,
+    which are passed an EditSummary of all the subedits.
+    """
+
+    def __init__(self, edits_list, callback_edits_list=None, name=None):
+        """Initialize transaction edit.
+
+        Args:
+            edits_list (list(BaseEdit)): registerable edits run in the
+                transaction, which are undone and redone with this edit.
+            callback_edits_list (list(BaseEdit) or None): all edits run in
+                the transaction, including unregistered ones, to summarize
+                in the edit callbacks. Defaults to edits_list.
+            name (str or None): name of transaction, if given.
+        """
+        from .edit_callbacks import EditSummary
+        super(TransactionEdit, self).__init__()
+        self._edits_list = edits_list
+        self._is_valid = bool(edits_list)
+        self._has_been_done = True
+        self._callback_args = [
+            EditSummary(fallback_value(callback_edits_list, edits_list))
+        ]
+        self._undo_callback_args = [EditSummary(edits_list).inverse()]
+        self._name = name or "Transaction"
+        self._description = "Run edits: [{0}]".format(
+            ",".join([edit.name for edit in edits_list])
+        )
+
+    def _run(self):
+        """Run each edit in turn."""
+        for edit in self._edits_list:
+            with EDIT_PROFILER.subedit_span(edit, ProfileOp.RUN):
+                edit._run()
+
+    def _inverse_run(self):
+        """Run each inverse edit in reverse order."""
+        for edit in reversed(self._edits_list):
+            with EDIT_PROFILER.subedit_span(edit, ProfileOp.UNDO):
+                edit._inverse_run()
+
+    def _get_size_in_bytes(self):
+        """Get approximate memory size of edit, including subedits.
+
+        Returns:
+            (int): approximate size of edit in bytes.
+        """
+        return super(TransactionEdit, self)._get_size_in_bytes() + sum(
+            [edit.size_in_bytes for edit in self._edits_list]
+        )
+
+    def _get_journal_items(self):
+        """Get items modified by all the edits in the transaction.
+
+        Returns:
+            (list or None): the modified items, or None if any of the edits
+                don't know which items they modify.
+        """
+        items = []
+        for edit in self._edits_list:
+            edit_items = edit._get_journal_items()
+            if edit_items is None:
+                return None
+            items.extend(edit_items)
+        return items
 
 
 class AttributeEdit(BaseEdit):
@@ -5,6 +5,7 @@ from functools import partial
 from scheduler.api.enums import OrderedStringEnum
 
 from . import edit_log
+from ._core_edits import TransactionEdit
 from .filter_edit import (
     AddFilterEdit,
     RemoveFilterEdit,
@@ -60,6 +61,7 @@ class CallbackEditType(OrderedStringEnum):
     MODIFY = "modify"
     MOVE = "move"
     FULL_UPDATE = "full_update"
+    BATCH = "batch"
 
     @classmethod
     def inverse(cls, value):
@@ -152,6 +154,15 @@ class CallbackType(object):
         FILTER_MODIFY:
             Args:   (old_filter, modified_filter)
             Edits:  [ModifyFilterEdit]
+
+    Batch:
+        TREE_BATCH, SCHEDULER_BATCH, PLANNER_BATCH, FILTER_BATCH:
+            Args:   (edit_summary)
+            Edits:  [TransactionEdit]
+            These are run once for a whole edit transaction, instead of the
+            callbacks of each edit in it, and only if the transaction edited
+            items of the given type. As they all use the same edit class,
+            they're not included in the EDIT_CLASS_MAPPING.
     """
     TREE_ADD = (CallbackItemType.TREE, CallbackEditType.ADD)
     TREE_REMOVE = (CallbackItemType.TREE, CallbackEditType.REMOVE)
@@ -170,6 +181,10 @@ class CallbackType(object):
     FILTER_ADD = (CallbackItemType.FILTER, CallbackEditType.ADD)
     FILTER_REMOVE = (CallbackItemType.FILTER, CallbackEditType.REMOVE)
     FILTER_MODIFY = (CallbackItemType.FILTER, CallbackEditType.MODIFY)
+    TREE_BATCH = (CallbackItemType.TREE, CallbackEditType.BATCH)
+    SCHEDULER_BATCH = (CallbackItemType.SCHEDULER, CallbackEditType.BATCH)
+    PLANNER_BATCH = (CallbackItemType.PLANNER, CallbackEditType.BATCH)
+    FILTER_BATCH = (CallbackItemType.FILTER, CallbackEditType.BATCH)
 
     EDIT_CLASS_MAPPING = {
         TREE_ADD: [AddChildrenEdit, InsertChildrenEdit, UnarchiveTreeItemEdit],
@@ -199,6 +214,7 @@ class CallbackType(object):
         FILTER_REMOVE: [RemoveFilterEdit],
         FILTER_MODIFY: [ModifyFilterEdit],
     }
+    _CALLBACK_TYPES = {}
 
     @classmethod
     def inverse(cls, value):
@@ -225,8 +241,31 @@ class CallbackType(object):
         Returns:
             (list(class)): the edit classes for that callback type.
         """
+        if callback_type[1] == CallbackEditType.BATCH:
+            return [TransactionEdit]
         return cls.EDIT_CLASS_MAPPING.get(callback_type, [])
 
+    @classmethod
+    def get_callback_type(cls, edit_class):
+        """Get the callback type that given edit class runs.
+
+        Args:
+            edit_class (class): the edit class.
+
+        Returns:
+            (tuple(CallbackItemType, CallbackEditType) or None): the
+                callback type, if the edit class has one.
+        """
+        if edit_class in cls._CALLBACK_TYPES:
+            return cls._CALLBACK_TYPES[edit_class]
+        callback_type = None
+        for type_, edit_classes in cls.EDIT_CLASS_MAPPING.items():
+            if edit_class in edit_classes:
+                callback_type = type_
+                break
+        cls._CALLBACK_TYPES[edit_class] = callback_type
+        return callback_type
+
     @classmethod
     def get_inverse_edit_classes(cls, callback_type):
         """Get edit classes to register as undo for given callback type.
@@ -238,7 +277,208 @@ class CallbackType(object):
         Returns:
             (list(class)): the inverse edit classes for that callback type.
         """
-        return cls.EDIT_CLASS_MAPPING.get(cls.inverse(callback_type), [])
+        return cls.get_edit_classes(cls.inverse(callback_type))
+
+
+class EditSummary(object):
+    """Summary of the items added, removed and modified by some edits.
+
+    This is passed to the batch callbacks of a transaction edit, in place of
+    the callbacks of each edit in the transaction.
+    """
+    def __init__(self, edits=None):
+        """Initialize.
+
+        Args:
+            edits (list(BaseEdit) or None): edits to summarize, in the order
+                they were run.
+
+        Attributes:
+            _added_items (dict(CallbackItemType, list)): items added by the
+                edits, for each item type.
+            _removed_items (dict(CallbackItemType, list)): items removed by
+                the edits, for each item type.
+            _modified_items (dict(CallbackItemType, list)): items modified
+                or moved by the edits, for each item type.
+            _changed_parents (list(BaseTreeItem)): tree items that had
+                children added, removed or moved by the edits.
+            _item_types (list(CallbackItemType)): all item types edited.
+            _item_ids (dict(int, set(int))): ids of the items in each of the
+                above item lists, keyed by the id of the list, so we can
+                check if an item is already in a list in constant time.
+        """
+        self._added_items = {}
+        self._removed_items = {}
+        self._modified_items = {}
+        self._changed_parents = []
+        self._item_types = []
+        self._item_ids = {}
+        for edit in edits or []:
+            self._add_edit(edit)
+
+    def _append_unique(self, items, item):
+        """Append item to list of items, if it's not already in it.
+
+        Args:
+            items (list): list of items.
+            item (variant): item to append.
+        """
+        item_ids = self._item_ids.get(id(items))
+        if item_ids is None:
+            item_ids = set(id(item_) for item_ in items)
+            self._item_ids[id(items)] = item_ids
+        if id(item) not in item_ids:
+            item_ids.add(id(item))
+            items.append(item)
+
+    def _add_edit(self, edit):
+        """Add items from the callback args of given edit to the summary.
+
+        Args:
+            edit (BaseEdit): the edit.
+        """
+        callback_type = CallbackType.get_callback_type(type(edit))
+        if callback_type is None:
+            return
+        args_list = edit._callback_args or []
+        if callback_type[0] != CallbackItemType.TREE:
+            # tree edits have a list of arg tuples, one for each item
+            args_list = [args_list]
+        self._add_callback_args(callback_type, args_list)
+
+    def _add_callback_args(self, callback_type, args_list):
+        """Add items from the given callback args to the summary.
+
+        Args:
+            callback_type (CallbackType): the callback type.
+            args_list (list(tuple)): list of callback arg tuples.
+        """
+        item_type, edit_type = callback_type
+        if item_type not in self._item_types:
+            self._item_types.append(item_type)
+        items_dict = {
+            CallbackEditType.ADD: self._added_items,
+            CallbackEditType.REMOVE: self._removed_items,
+            CallbackEditType.MODIFY: self._modified_items,
+            CallbackEditType.MOVE: self._modified_items,
+        }.get(edit_type)
+        if items_dict is None:
+            return
+        items = items_dict.setdefault(item_type, [])
+        for args in args_list:
+            if not args:
+                continue
+            self._append_unique(items, args[0])
+            if item_type != CallbackItemType.TREE:
+                continue
+            if edit_type == CallbackEditType.MOVE:
+                parents = [args[1], args[3]]
+            elif edit_type != CallbackEditType.MODIFY:
+                parents = [args[1]]
+            elif args[1] is not args[0]:
+                # item has been replaced by a new item under its parent
+                self._append_unique(items, args[1])
+                parents = [args[1].parent]
+            else:
+                parents = []
+            for parent in parents:
+                if parent is not None:
+                    self._append_unique(self._changed_parents, parent)
+
+    def add_callback(self, callback_type, *args):
+        """Add items from the args of a callback to the summary.
+
+        This allows a summary to be built up from callbacks that have
+        already been run, eg. to defer updating a view until it's needed.
+
+        Args:
+            callback_type (CallbackType): the callback type.
+            *args: the callback args. For batch callbacks this is the edit
+                summary of the transaction, which is merged into this one.
+        """
+        if callback_type[1] != CallbackEditType.BATCH:
+            self._add_callback_args(callback_type, [args])
+            return
+        edit_summary = args[0]
+        for item_type in edit_summary.item_types:
+            if item_type not in self._item_types:
+                self._item_types.append(item_type)
+        for items_dict, other_items_dict in (
+                (self._added_items, edit_summary._added_items),
+                (self._removed_items, edit_summary._removed_items),
+                (self._modified_items, edit_summary._modified_items)):
+            for item_type, other_items in other_items_dict.items():
+                items = items_dict.setdefault(item_type, [])
+                for item in other_items:
+                    self._append_unique(items, item)
+        for parent in edit_summary._changed_parents:
+            self._append_unique(self._changed_parents, parent)
+
+    @property
+    def item_types(self):
+        """Get item types that were edited.
+
+        Returns:
+            (list(CallbackItemType)): the edited item types, in the order
+                they were first edited.
+        """
+        return self._item_types
+
+    def get_added_items(self, item_type):
+        """Get items of given type that were added.
+
+        Args:
+            item_type (CallbackItemType): the item type.
+
+        Returns:
+            (list): the added items.
+        """
+        return self._added_items.get(item_type, [])
+
+    def get_removed_items(self, item_type):
+        """Get items of given type that were removed.
+
+        Args:
+            item_type (CallbackItemType): the item type.
+
+        Returns:
+            (list): the removed items.
+        """
+        return self._removed_items.get(item_type, [])
+
+    def get_modified_items(self, item_type):
+        """Get items of given type that were modified or moved.
+
+        Args:
+            item_type (CallbackItemType): the item type.
+
+        Returns:
+            (list): the modified items.
+        """
+        return self._modified_items.get(item_type, [])
+
+    def get_changed_parents(self):
+        """Get tree items whose children were added, removed or moved.
+
+        Returns:
+            (list(BaseTreeItem)): the changed parent items.
+        """
+        return self._changed_parents
+
+    def inverse(self):
+        """Get summary of undoing the summarized edits.
+
+        Returns:
+            (EditSummary): summary with added and removed items swapped.
+        """
+        summary = EditSummary()
+        summary._added_items = self._removed_items
+        summary._removed_items = self._added_items
+        summary._modified_items = self._modified_items
+        summary._changed_parents = self._changed_parents
+        summary._item_types = self._item_types
+        summary._item_ids = self._item_ids
+        return summary
 
 
 def _modify_callback(callback_type, callback):
@@ -253,9 +493,17 @@ def _modify_callback(callback_type, callback):
         callback_type (CallbackType): callback type.
         callback (function): callback to modify.
 
+    Batch callbacks are also modified so that they're only run if the
+    transaction edited items of the callback's item type.
+
     Returns:
         (function): modified callback.
     """
+    if callback_type[1] == CallbackEditType.BATCH:
+        def batch_callback(edit_summary):
+            if callback_type[0] in edit_summary.item_types:
+                return callback(edit_summary)
+        return batch_callback
     if callback_type[0] == CallbackItemType.TREE:
         def modified_callback(arg_tuple):
             # Note that this won't work if tree edit is done on multiple items.
@@ -299,6 +547,22 @@ def register_post_callback(callback_type, id, callback):
         edit_class.register_post_undo_callback(id, callback)
 
 
+def _get_batch_callback(callback):
+    """Get callback for transaction edits from a general purpose callback.
+
+    Args:
+        callback (function): general purpose callback.
+
+    Returns:
+        (function): callback that runs the general purpose callback with
+            the batch callback type of each item type in the transaction.
+    """
+    def batch_callback(edit_summary):
+        for item_type in edit_summary.item_types:
+            callback((item_type, CallbackEditType.BATCH), edit_summary)
+    return batch_callback
+
+
 def register_general_purpose_pre_callback(id, callback):
     """Register a single function that can handle pre-callbacks for all edits.
 
@@ -314,6 +578,9 @@ def register_general_purpose_pre_callback(id, callback):
             id,
             partial(callback, callback_type),
         )
+    batch_callback = _get_batch_callback(callback)
+    TransactionEdit.register_pre_edit_callback(id, batch_callback)
+    TransactionEdit.register_pre_undo_callback(id, batch_callback)
 
 
 def register_general_purpose_post_callback(id, callback):
@@ -331,6 +598,9 @@ def register_general_purpose_post_callback(id, callback):
             id,
             partial(callback, callback_type),
         )
+    batch_callback = _get_batch_callback(callback)
+    TransactionEdit.register_post_edit_callback(id, batch_callback)
+    TransactionEdit.register_post_undo_callback(id, batch_callback)
 
 
 def remove_callbacks(id):
@@ -0,0 +1,635 @@
+"""Append-only journal of edits, used to recover unsaved changes on startup.
+
+Each edit added to the edit log (and each undo and redo) is recorded in the
+journal. Records are state-based, ie. they store the state of the modified
+data after the edit, rather than the edit itself, so they can be replayed
+without needing to reconstruct edit objects:
+
+    - edits that modify small pieces of data (eg. task history updates)
+        define their own records.
+    - other edits define the items they modify (eg. tree items, calendar
+        days or repeat scheduled items), and the journal records the key
+        path of each item in its component's serialized dict along with the
+        item's own serialized dict. These are replayed by patching the saved
+        component dict before it's deserialized.
+    - for any remaining edits, and items in components that aren't
+        recorded per item, the journal marks the project components they
+        modify as dirty and writes a snapshot of each dirty component.
+
+Records are serialized in batches, either after a given number of edits or
+after a given time interval has passed, and then appended to the journal
+file as json lines (with an fsync) on a background thread. The journal is
+cleared whenever the project is saved, and compacted if it grows too large
+in between saves.
+"""
+
+from collections import OrderedDict
+import json
+import os
+import queue
+import threading
+import time
+
+from scheduler.api.calendar.calendar import Calendar
+from scheduler.api.calendar.calendar_period import (
+    CalendarDay,
+    CalendarMonth,
+    CalendarWeek,
+    CalendarYear,
+)
+from scheduler.api.calendar.scheduled_item import RepeatScheduledItem
+from scheduler.api.common.date_time import Date
+from scheduler.api.tree._base_tree_item import BaseTreeItem
+from scheduler.api.tree.task_category import TaskCategory
+from .edit_callbacks import CallbackItemType, CallbackType
+from .tree_edit import ArchiveTreeItemEdit, UnarchiveTreeItemEdit
+
+
+class JournalComponent(object):
+    """Struct representing the project components recorded in the journal."""
+    TASK_ROOT = "task_root"
+    ARCHIVE_TASK_ROOT = "archive_task_root"
+    CALENDAR = "calendar"
+    ARCHIVE_CALENDAR = "archive_calendar"
+    TRACKER = "tracker"
+    FILTERER = "filterer"
+
+    ALL = [
+        TASK_ROOT,
+        ARCHIVE_TASK_ROOT,
+        CALENDAR,
+        ARCHIVE_CALENDAR,
+        TRACKER,
+        FILTERER,
+    ]
+
+    # components whose modified items are recorded individually. The
+    # archive components are read lazily, so these are always snapshotted.
+    ITEM_RECORD_COMPONENTS = [TASK_ROOT, CALENDAR]
+
+    # components modified by the edits of each callback item type. Edits
+    # that aren't registered to a callback type are assumed to modify all.
+    CALLBACK_ITEM_TYPE_MAPPING = {
+        CallbackItemType.TREE: [TASK_ROOT],
+        CallbackItemType.SCHEDULER: [TASK_ROOT, CALENDAR],
+        CallbackItemType.PLANNER: [TASK_ROOT, CALENDAR],
+        CallbackItemType.FILTER: [FILTERER],
+    }
+
+
+class JournalOp(object):
+    """Struct representing the operations recorded in the journal."""
+    RUN = "run"
+    UNDO = "undo"
+    REDO = "redo"
+    ITEM = "item"
+    SNAPSHOT = "snapshot"
+
+
+class EditJournal(object):
+    """Append-only journal of edits for a project."""
+    BATCH_SIZE = 20
+    BATCH_INTERVAL = 5.0
+    COMPACT_SIZE = 10 * 1024 ** 2
+
+    OP_KEY = "op"
+    EDIT_KEY = "edit"
+    COMPONENT_KEY = "component"
+    DATA_KEY = "data"
+    KEY_PATH_KEY = "key_path"
+    TASK_KEY = "task"
+    HISTORY_KEY = "history"
+
+    _EDIT_COMPONENTS = {}
+
+    def __init__(
+            self,
+            file_path,
+            components,
+            batch_size=None,
+            batch_interval=None,
+            compact_size=None):
+        """Initialize journal.
+
+        Args:
+            file_path (str): path to journal file.
+            components (dict(str, BaseSerializable)): dictionary of project
+                components to record, keyed by JournalComponent names.
+            batch_size (int or None): number of edits to record before
+                flushing to disk. Defaults to BATCH_SIZE.
+            batch_interval (float or None): max number of seconds to wait
+                after the last flush before flushing newly recorded edits.
+                Defaults to BATCH_INTERVAL.
+            compact_size (int or None): size in bytes that the journal file
+                can grow to before it's compacted. Defaults to COMPACT_SIZE.
+        """
+        self._file_path = file_path
+        self._components = components
+        self._batch_size = batch_size or self.BATCH_SIZE
+        if batch_interval is None:
+            batch_interval = self.BATCH_INTERVAL
+        self._batch_interval = batch_interval
+        self._compact_size = compact_size or self.COMPACT_SIZE
+        self._pending_records = []
+        self._pending_items = OrderedDict()
+        self._dirty_components = set()
+        self._num_pending_edits = 0
+        self._last_flush_time = time.time()
+        self._write_queue = queue.Queue()
+        self._writer_thread = threading.Thread(
+            target=self._run_writer,
+            name="EditJournalWriter",
+            daemon=True,
+        )
+        self._writer_thread.start()
+
+    @property
+    def file_path(self):
+        """Get path to journal file.
+
+        Returns:
+            (str): journal file path.
+        """
+        return self._file_path
+
+    @property
+    def num_pending_edits(self):
+        """Get number of recorded edits that haven't been flushed yet.
+
+        Returns:
+            (int): number of pending edits.
+        """
+        return self._num_pending_edits
+
+    @classmethod
+    def _get_edit_components(cls, edit):
+        """Get names of components modified by given edit.
+
+        Args:
+            edit (BaseEdit): the edit.
+
+        Returns:
+            (list(str)): names of modified components.
+        """
+        edit_class = type(edit)
+        if edit_class in cls._EDIT_COMPONENTS:
+            return cls._EDIT_COMPONENTS[edit_class]
+        components = JournalComponent.ALL
+        if edit_class not in (ArchiveTreeItemEdit, UnarchiveTreeItemEdit):
+            mapping = CallbackType.EDIT_CLASS_MAPPING
+            for callback_type, edit_classes in mapping.items():
+                if edit_class in edit_classes:
+                    components = JournalComponent.CALLBACK_ITEM_TYPE_MAPPING[
+                        callback_type[0]
+                    ]
+                    break
+        cls._EDIT_COMPONENTS[edit_class] = components
+        return components
+
+    def _get_task_component(self, task_path):
+        """Get name of the task root component that the given task is in.
+
+        Args:
+            task_path (str): path of task.
+
+        Returns:
+            (str): the task root component name.
+        """
+        archive_root = self._components.get(JournalComponent.ARCHIVE_TASK_ROOT)
+        if (archive_root is not None
+                and task_path.split(archive_root.TREE_PATH_SEPARATOR)[0]
+                == archive_root.name):
+            return JournalComponent.ARCHIVE_TASK_ROOT
+        return JournalComponent.TASK_ROOT
+
+    def _get_component_name(self, component):
+        """Get name of given project component.
+
+        Args:
+            component (BaseSerializable): the component.
+
+        Returns:
+            (str or None): the component name, if it's a component of this
+                journal's project.
+        """
+        for component_name, journal_component in self._components.items():
+            if journal_component is component:
+                return component_name
+        return None
+
+    def _get_item_location(self, item):
+        """Get component and key path of item in the component's dict.
+
+        Args:
+            item (variant): item modified by an edit. This can be a tree
+                item, calendar period, repeat scheduled item or component.
+
+        Returns:
+            (str or None): name of component the item is in, or None if it
+                isn't currently in any of the project's components (eg. a
+                tree item that's been removed from its tree).
+            (list or None): keys to the item's data in the component's dict,
+                or None if the component should be snapshotted instead.
+        """
+        if isinstance(item, BaseTreeItem):
+            component_name = self._get_component_name(item.root)
+            if component_name not in JournalComponent.ITEM_RECORD_COMPONENTS:
+                return component_name, None
+            key_path = []
+            while item.parent is not None:
+                parent = item.parent
+                if isinstance(item, TaskCategory):
+                    key_path[0:0] = [parent.CATEGORIES_KEY, item.name]
+                else:
+                    key_path[0:0] = [parent.TASKS_KEY, item.name]
+                item = parent
+            return component_name, key_path
+
+        if isinstance(item, RepeatScheduledItem):
+            component_name = self._get_component_name(item.calendar)
+            if component_name not in JournalComponent.ITEM_RECORD_COMPONENTS:
+                return component_name, None
+            return component_name, [Calendar.REPEAT_ITEMS_KEY]
+
+        if isinstance(item, CalendarWeek):
+            # week planned items are stored on the week's start day
+            item = item.start_day
+        if isinstance(item, (CalendarDay, CalendarMonth, CalendarYear)):
+            component_name = self._get_component_name(item.calendar)
+            if component_name not in JournalComponent.ITEM_RECORD_COMPONENTS:
+                return component_name, None
+            if isinstance(item, CalendarYear):
+                return component_name, [
+                    Calendar.YEARS_KEY,
+                    item.name,
+                    item.PLANNED_ITEMS_KEY,
+                ]
+            key_path = [Calendar.YEARS_KEY, item.calendar_year.name]
+            calendar_month = item.calendar_month
+            key_path.extend([CalendarYear.MONTHS_KEY, calendar_month.name])
+            if isinstance(item, CalendarMonth):
+                return component_name, key_path + [item.PLANNED_ITEMS_KEY]
+            for calendar_week in calendar_month.get_calendar_weeks():
+                if (calendar_week.start_date
+                        <= item.date
+                        <= calendar_week.end_date):
+                    break
+            return component_name, key_path + [
+                CalendarMonth.WEEKS_KEY,
+                calendar_week.name,
+                CalendarWeek.DAYS_KEY,
+                item.name,
+            ]
+
+        return self._get_component_name(item), None
+
+    @staticmethod
+    def _get_item_data(item):
+        """Get serialized data of item modified by an edit.
+
+        Args:
+            item (variant): tree item, calendar period or repeat scheduled
+                item, as passed to _get_item_location.
+
+        Returns:
+            (variant): json-compatible data to store at the item's key path.
+        """
+        if isinstance(item, RepeatScheduledItem):
+            repeat_items_list = []
+            for repeat_item in item.calendar._repeat_items:
+                repeat_item_dict = repeat_item.to_dict()
+                if repeat_item_dict:
+                    repeat_items_list.append(repeat_item_dict)
+            return repeat_items_list
+        if isinstance(item, CalendarWeek):
+            item = item.start_day
+        if isinstance(item, (CalendarMonth, CalendarYear)):
+            return [
+                planned_item.to_dict() for planned_item in item._planned_items
+            ]
+        return item.to_dict()
+
+    def record(self, edit, op):
+        """Record edit in journal.
+
+        This should be called after the edit is run, undone or redone. Items
+        modified by the edit are only serialized when the journal is flushed,
+        so an item modified by several edits in a batch is only written once.
+
+        Args:
+            edit (BaseEdit): the edit to record.
+            op (JournalOp): the operation that was done with the edit.
+        """
+        record = edit._get_journal_record()
+        if record is not None:
+            record[self.OP_KEY] = op
+            record[self.EDIT_KEY] = edit.name
+            if self.TASK_KEY in record:
+                record[self.COMPONENT_KEY] = self._get_task_component(
+                    record[self.TASK_KEY]
+                )
+            self._pending_records.append(record)
+        else:
+            items = edit._get_journal_items()
+            if items is None:
+                self._dirty_components.update(
+                    self._get_edit_components(edit)
+                )
+            else:
+                for item in items:
+                    self._pending_items[id(item)] = item
+        self._num_pending_edits += 1
+        time_since_flush = time.time() - self._last_flush_time
+        if (self._num_pending_edits >= self._batch_size
+                or time_since_flush >= self._batch_interval):
+            self.flush()
+
+    def record_run(self, edit):
+        """Record edit in journal after it's been run.
+
+        Args:
+            edit (BaseEdit): the edit to record.
+        """
+        self.record(edit, JournalOp.RUN)
+
+    def record_undo(self, edit):
+        """Record edit in journal after it's been undone.
+
+        Args:
+            edit (BaseEdit): the edit to record.
+        """
+        self.record(edit, JournalOp.UNDO)
+
+    def record_redo(self, edit):
+        """Record edit in journal after it's been redone.
+
+        Args:
+            edit (BaseEdit): the edit to record.
+        """
+        self.record(edit, JournalOp.REDO)
+
+    def set_component(self, component_name, component):
+        """Set project component, eg. after it's been lazily loaded.
+
+        Args:
+            component_name (JournalComponent): name of component.
+            component (BaseSerializable): the component.
+        """
+        self._components[component_name] = component
+
+    def flush(self):
+        """Serialize all pending records and pass them to the writer thread.
+
+        Components that have an is_modified property (eg. the lazily loaded
+        archive) are only snapshotted if they've been modified, to avoid
+        reading them in full. Items in snapshotted components aren't
+        recorded separately.
+        """
+        self._last_flush_time = time.time()
+        if (not self._pending_records
+                and not self._pending_items
+                and not self._dirty_components):
+            return
+        item_locations = []
+        for item in self._pending_items.values():
+            component_name, key_path = self._get_item_location(item)
+            if component_name is None:
+                continue
+            if key_path is None:
+                self._dirty_components.add(component_name)
+            else:
+                item_locations.append((item, component_name, key_path))
+
+        lines = [json.dumps(record) for record in self._pending_records]
+        for item, component_name, key_path in item_locations:
+            if component_name in self._dirty_components:
+                continue
+            lines.append(json.dumps({
+                self.OP_KEY: JournalOp.ITEM,
+                self.COMPONENT_KEY: component_name,
+                self.KEY_PATH_KEY: key_path,
+                self.DATA_KEY: self._get_item_data(item),
+            }))
+        for component_name in JournalComponent.ALL:
+            component = self._components.get(component_name)
+            if (component_name in self._dirty_components
+                    and component is not None
+                    and getattr(component, "is_modified", True)):
+                lines.append(json.dumps({
+                    self.OP_KEY: JournalOp.SNAPSHOT,
+                    self.COMPONENT_KEY: component_name,
+                    self.DATA_KEY: component.to_dict(),
+                }))
+        if lines:
+            self._write_queue.put((self._write_lines, lines))
+        self._pending_records = []
+        self._pending_items = OrderedDict()
+        self._dirty_components = set()
+        self._num_pending_edits = 0
+
+    def wait(self):
+        """Wait for the writer thread to write all flushed records."""
+        self._write_queue.join()
+
+    def clear(self):
+        """Clear journal, eg. after project has been saved.
+
+        The journal file is removed once any records that have already been
+        flushed are written, so they can't be written after it's cleared.
+        """
+        self._pending_records = []
+        self._pending_items = OrderedDict()
+        self._dirty_components = set()
+        self._num_pending_edits = 0
+        self._write_queue.put((self._remove_file, None))
+
+    def close(self):
+        """Write all flushed records and stop the writer thread."""
+        self._write_queue.put(None)
+        self._writer_thread.join()
+
+    def _run_writer(self):
+        """Run file operations passed to the write queue in order.
+
+        This is run on the writer thread, until it's passed None.
+        """
+        while True:
+            task = self._write_queue.get()
+            try:
+                if task is None:
+                    return
+                method, arg = task
+                method(arg)
+            finally:
+                self._write_queue.task_done()
+
+    def _write_lines(self, lines):
+        """Append lines to journal file, compacting it if it's too large.
+
+        Args:
+            lines (list(str)): json lines to write.
+        """
+        with open(self._file_path, "a") as file_:
+            file_.write("\n".join(lines) + "\n")
+            file_.flush()
+            os.fsync(file_.fileno())
+        if os.path.getsize(self._file_path) > self._compact_size:
+            self.compact(self._file_path)
+
+    def _remove_file(self, _):
+        """Remove journal file, if it exists."""
+        if os.path.isfile(self._file_path):
+            os.remove(self._file_path)
+
+    @classmethod
+    def compact(cls, file_path):
+        """Rewrite journal file with only the records needed for recovery.
+
+        Args:
+            file_path (str): path to journal file.
+        """
+        snapshots, item_records, history_records = cls.read_recovery_data(
+            file_path
+        )
+        records = [
+            {
+                cls.OP_KEY: JournalOp.SNAPSHOT,
+                cls.COMPONENT_KEY: component_name,
+                cls.DATA_KEY: snapshot,
+            }
+            for component_name, snapshot in snapshots.items()
+        ]
+        # drop item records that are overwritten by later records of the
+        # same item or one of its ancestors
+        for i, record in enumerate(item_records):
+            key_path = record[cls.KEY_PATH_KEY]
+            for later_record in item_records[i+1:]:
+                later_key_path = later_record[cls.KEY_PATH_KEY]
+                if (later_record[cls.COMPONENT_KEY]
+                        == record[cls.COMPONENT_KEY]
+                        and key_path[:len(later_key_path)] == later_key_path):
+                    break
+            else:
+                records.append(record)
+        records.extend(history_records)
+
+        temp_file_path = "{0}.tmp".format(file_path)
+        with open(temp_file_path, "w") as file_:
+            for record in records:
+                file_.write(json.dumps(record) + "\n")
+            file_.flush()
+            os.fsync(file_.fileno())
+        os.replace(temp_file_path, file_path)
+
+    @classmethod
+    def read_records(cls, file_path):
+        """Read records from journal file.
+
+        If the final line of the file is incomplete (eg. because the
+        application crashed while writing it) it is ignored.
+
+        Args:
+            file_path (str): path to journal file.
+
+        Returns:
+            (list(dict)): list of records in the journal.
+        """
+        records = []
+        if not os.path.isfile(file_path):
+            return records
+        with open(file_path, "r") as file_:
+            for line in file_:
+                if not line.strip():
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    break
+        return records
+
+    @classmethod
+    def read_recovery_data(cls, file_path):
+        """Read data needed to recover project state from journal file.
+
+        Args:
+            file_path (str): path to journal file.
+
+        Returns:
+            (dict(str, dict)): latest snapshot of each component, keyed by
+                component name.
+            (list(dict)): item records made after the latest snapshot of
+                the component they apply to.
+            (list(dict)): task history records made after the latest
+                snapshot of the task root they apply to.
+        """
+        snapshots = {}
+        item_records = []
+        history_records = []
+        for record in cls.read_records(file_path):
+            component_name = record.get(cls.COMPONENT_KEY)
+            op = record.get(cls.OP_KEY)
+            if op == JournalOp.SNAPSHOT:
+                snapshots[component_name] = record[cls.DATA_KEY]
+                item_records = [
+                    item_record for item_record in item_records
+                    if item_record[cls.COMPONENT_KEY] != component_name
+                ]
+                history_records = [
+                    history_record for history_record in history_records
+                    if history_record[cls.COMPONENT_KEY] != component_name
+                ]
+            elif op == JournalOp.ITEM:
+                item_records.append(record)
+            elif cls.HISTORY_KEY in record:
+                history_records.append(record)
+        return snapshots, item_records, history_records
+
+    @classmethod
+    def apply_item_records(cls, dict_repr, item_records):
+        """Apply item records to the serialized dict of a component.
+
+        Args:
+            dict_repr (dict): the component's dict, which is modified in
+                place.
+            item_records (list(dict)): the item records for that component.
+
+        Returns:
+            (dict): the modified dict. This is a new dict if any of the
+                records replace the whole component.
+        """
+        for record in item_records:
+            key_path = record[cls.KEY_PATH_KEY]
+            if not key_path:
+                dict_repr = record[cls.DATA_KEY]
+                continue
+            sub_dict = dict_repr
+            for key in key_path[:-1]:
+                sub_dict = sub_dict.setdefault(key, OrderedDict())
+            sub_dict[key_path[-1]] = record[cls.DATA_KEY]
+        return dict_repr
+
+    @classmethod
+    def apply_history_records(cls, task_root, history_records):
+        """Apply task history records to tasks.
+
+        Args:
+            task_root (TaskRoot): the task root. Tasks in the archive are
+                found through this root's archive root.
+            history_records (list(dict)): task history records to apply.
+        """
+        for record in history_records:
+            task = task_root.get_item_at_path(
+                record[cls.TASK_KEY],
+                search_archive=True,
+            )
+            if task is None or not hasattr(task, "history"):
+                continue
+            task.history.update_from_dict(record[cls.HISTORY_KEY])
+            if task.root._history_data is not None:
+                task.root._history_data._update_for_task_at_dates(
+                    task,
+                    [
+                        Date.from_string(date_str)
+                        for date_str in record[cls.HISTORY_KEY]
+                    ],
+                )
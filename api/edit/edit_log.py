@@ -3,6 +3,9 @@
 
 from contextlib import contextmanager
 
+from scheduler.api import constants
+from .edit_profiler import EDIT_PROFILER, ProfileOp
+
 
 class CallbackError(Exception):
     """Exception for callback class errors."""
@@ -31,6 +34,24 @@ class EditLog(object):
                 to be run before certain types of edit are undone.
             _post_undo_callback_dict (dict): dictionary representing callbacks
                 to be run after certain types of edit are undone.
+            _max_length (int or None): max number of edits to keep in the log,
+                if given. Older edits beyond this are dropped.
+            _max_size (int or None): max approximate size of the log in bytes,
+                if given. Older edits beyond this are dropped.
+            _compact_stacks (bool): if True, try to merge edits into the
+                previous edit in their stack when they're added.
+            _size_in_bytes (int): approximate total size in bytes of all
+                edits in the log and undo log.
+            _num_dropped_edits (int): number of edits dropped from the log
+                so far due to the budget.
+            _journal (EditJournal or None): journal to record edits in, if
+                used.
+            _transaction_depth (int): number of nested transactions
+                currently open.
+            _transaction_edits (list(BaseEdit)): registerable edits run in
+                the current transaction.
+            _transaction_callback_edits (list(BaseEdit)): all edits run in
+                the current transaction, whose callbacks are deferred.
         """
         self._log = []
         self._undo_log = []
@@ -39,6 +60,15 @@ class EditLog(object):
         self._post_edit_callback_dict = {}
         self._pre_undo_callback_dict = {}
         self._post_undo_callback_dict = {}
+        self._max_length = constants.EDIT_LOG_MAX_LENGTH
+        self._max_size = constants.EDIT_LOG_MAX_SIZE
+        self._compact_stacks = True
+        self._size_in_bytes = 0
+        self._num_dropped_edits = 0
+        self._journal = None
+        self._transaction_depth = 0
+        self._transaction_edits = []
+        self._transaction_callback_edits = []
 
     @property
     def is_locked(self):
@@ -49,6 +79,109 @@ class EditLog(object):
         """
         return self._registration_locked
 
+    @property
+    def in_transaction(self):
+        """Check whether a transaction is currently open.
+
+        Returns:
+            (bool): whether or not edits are being run in a transaction.
+        """
+        return self._transaction_depth > 0
+
+    @property
+    def size_in_bytes(self):
+        """Get approximate memory size of all edits in the log and undo log.
+
+        Returns:
+            (int): approximate size in bytes.
+        """
+        return self._size_in_bytes
+
+    @property
+    def num_dropped_edits(self):
+        """Get number of old edits dropped from the log to keep to budget.
+
+        Returns:
+            (int): number of dropped edits.
+        """
+        return self._num_dropped_edits
+
+    def set_budget(self, max_length=None, max_size=None, compact_stacks=True):
+        """Set budget for edit log.
+
+        Args:
+            max_length (int or None): max number of edits to keep in the log.
+                If None, the length is unbounded.
+            max_size (int or None): max approximate size of log in bytes. If
+                None, the size is unbounded.
+            compact_stacks (bool): whether or not to merge stacked edits
+                where possible.
+        """
+        self._max_length = max_length
+        self._max_size = max_size
+        self._compact_stacks = compact_stacks
+        self._enforce_budget()
+
+    def set_journal(self, journal):
+        """Set journal to record edits, undos and redos in.
+
+        Args:
+            journal (EditJournal or None): the journal, or None to stop
+                recording edits.
+        """
+        self._journal = journal
+
+    def _is_over_budget(self):
+        """Check if edit log is over its length or size budget.
+
+        Returns:
+            (bool): whether or not log is over budget.
+        """
+        if self._max_length is not None and len(self._log) > self._max_length:
+            return True
+        if self._max_size is not None and self._size_in_bytes > self._max_size:
+            return True
+        return False
+
+    def _enforce_budget(self):
+        """Drop oldest edit stacks from log until it's within budget.
+
+        Edits are dropped a full stack at a time, as stacks must be undone
+        together. The most recent stack is always kept.
+        """
+        while self._is_over_budget():
+            stack_length = 1
+            for edit in self._log:
+                if edit._next_edit_in_stack is None:
+                    break
+                stack_length += 1
+            if stack_length >= len(self._log):
+                return
+            for edit in self._log[:stack_length]:
+                self._size_in_bytes -= edit.size_in_bytes
+            del self._log[:stack_length]
+            self._num_dropped_edits += stack_length
+
+    def _clear_undo_log(self):
+        """Clear undo log."""
+        for edit in self._undo_log:
+            self._size_in_bytes -= edit.size_in_bytes
+        self._undo_log = []
+
+    def reset(self):
+        """Clear log and undo log and lock registry, as on initialization.
+
+        Callbacks, budget and journal are kept.
+        """
+        self._log = []
+        self._undo_log = []
+        self._size_in_bytes = 0
+        self._num_dropped_edits = 0
+        self._registration_locked = True
+        self._transaction_depth = 0
+        self._transaction_edits = []
+        self._transaction_callback_edits = []
+
     def register_pre_edit_callback(self, edit_class, callback_id, callback):
         """Register callback to be run before an an edit of given type is done.
 
@@ -116,22 +249,39 @@ class EditLog(object):
     def run_pre_edit_callbacks(self, edit):
         """Run callbacks before a given edit is done.
 
+        Callbacks of edits run in a transaction are deferred until it ends.
+
         Args:
             edit (BaseEdit): the edit to run for.
         """
+        if self.in_transaction:
+            return
         callbacks = self._pre_edit_callback_dict.get(type(edit), {})
-        for callback in callbacks.values():
-            callback(*edit._callback_args)
+        for callback_id, callback in callbacks.items():
+            with EDIT_PROFILER.callback_span(
+                    edit,
+                    callback_id,
+                    ProfileOp.PRE_EDIT):
+                callback(*edit._callback_args)
 
     def run_post_edit_callbacks(self, edit):
         """Run callbacks after a given edit is done.
 
+        Callbacks of edits run in a transaction are deferred until it ends.
+
         Args:
             edit (BaseEdit): the edit to run for.
         """
+        if self.in_transaction:
+            self._transaction_callback_edits.append(edit)
+            return
         callbacks = self._post_edit_callback_dict.get(type(edit), {})
-        for callback in callbacks.values():
-            callback(*edit._callback_args)
+        for callback_id, callback in callbacks.items():
+            with EDIT_PROFILER.callback_span(
+                    edit,
+                    callback_id,
+                    ProfileOp.POST_EDIT):
+                callback(*edit._callback_args)
 
     def run_pre_undo_callbacks(self, edit):
         """Run callbacks before a given edit is undone.
@@ -140,8 +290,12 @@ class EditLog(object):
             edit (BaseEdit): the edit to run for.
         """
         callbacks = self._pre_undo_callback_dict.get(type(edit), {})
-        for callback in callbacks.values():
-            callback(*edit._undo_callback_args)
+        for callback_id, callback in callbacks.items():
+            with EDIT_PROFILER.callback_span(
+                    edit,
+                    callback_id,
+                    ProfileOp.PRE_UNDO):
+                callback(*edit._undo_callback_args)
 
     def run_post_undo_callbacks(self, edit):
         """Run callbacks after a given edit is undone.
@@ -150,8 +304,12 @@ class EditLog(object):
             edit (BaseEdit): the edit to run for.
         """
         callbacks = self._post_undo_callback_dict.get(type(edit), {})
-        for callback in callbacks.values():
-            callback(*edit._undo_callback_args)
+        for callback_id, callback in callbacks.items():
+            with EDIT_PROFILER.callback_span(
+                    edit,
+                    callback_id,
+                    ProfileOp.POST_UNDO):
+                callback(*edit._undo_callback_args)
 
     def remove_callbacks(self, callback_id):
         """Remove all callbacks with the given callback id from the registry.
@@ -188,11 +346,73 @@ class EditLog(object):
         finally:
             self._registration_locked = _registration_locked
 
+    @contextmanager
+    def transaction(self, name=None):
+        """Context manager to run all edits inside it as one transaction.
+
+        The callbacks of edits run in a transaction are skipped. Instead,
+        when the transaction ends its edits are added to the log as a single
+        TransactionEdit, whose batch callbacks are run once with a summary of
+        all the edits, so views can update once for the whole transaction.
+        This edit is then undone and redone as one.
+
+        If an error is raised inside the transaction, its edits are undone
+        and nothing is added to the log. Nested transactions are merged into
+        the outermost one.
+
+        Args:
+            name (str or None): name of transaction edit in log, if given.
+        """
+        self._transaction_depth += 1
+        if self._transaction_depth > 1:
+            try:
+                yield
+            finally:
+                self._transaction_depth -= 1
+            return
+
+        self._transaction_edits = []
+        self._transaction_callback_edits = []
+        try:
+            yield
+        except BaseException:
+            callback_edits = self._end_transaction()[1]
+            for edit in reversed(callback_edits):
+                edit._inverse_run()
+                edit._has_been_done = False
+                edit._registered = False
+            raise
+        edits, callback_edits = self._end_transaction()
+        if not callback_edits:
+            return
+        # imported here to avoid circular import with _base_edit
+        from ._core_edits import TransactionEdit
+        edit = TransactionEdit(edits, callback_edits, name=name)
+        with EDIT_PROFILER.edit_span(edit, ProfileOp.RUN):
+            self.run_pre_edit_callbacks(edit)
+            self.run_post_edit_callbacks(edit)
+        self.add_edit(edit)
+
+    def _end_transaction(self):
+        """Close current transaction.
+
+        Returns:
+            (list(BaseEdit)): registerable edits run in the transaction.
+            (list(BaseEdit)): all edits run in the transaction.
+        """
+        edits = self._transaction_edits
+        callback_edits = self._transaction_callback_edits
+        self._transaction_depth = 0
+        self._transaction_edits = []
+        self._transaction_callback_edits = []
+        return edits, callback_edits
+
     def add_edit(self, edit):
         """Add edit object to list.
 
         This will also clear the undo log, as we can no longer redo
-        old undone edits once a new edit has been added.
+        old undone edits once a new edit has been added. Edits added during
+        a transaction are instead kept until the transaction ends.
 
         Args:
             edit (BaseEdit): edit object to add to list.
@@ -204,13 +424,27 @@ class EditLog(object):
             return False
         if not edit._is_valid:
             return False
+        if self.in_transaction:
+            self._transaction_edits.append(edit)
+            return True
         if self._undo_log:
-            self._undo_log = []
+            self._clear_undo_log()
         latest_edit = self.get_latest_edit()
         if latest_edit is not None and edit._stacks_with(latest_edit):
+            if self._compact_stacks:
+                old_size = latest_edit.size_in_bytes
+                if latest_edit._merge_with(edit):
+                    self._size_in_bytes += latest_edit.size_in_bytes - old_size
+                    if self._journal is not None:
+                        self._journal.record_run(edit)
+                    return True
             edit._previous_edit_in_stack = latest_edit
             latest_edit._next_edit_in_stack = edit
         self._log.append(edit)
+        self._size_in_bytes += edit.size_in_bytes
+        self._enforce_budget()
+        if self._journal is not None:
+            self._journal.record_run(edit)
         return True
 
     def undo(self):
@@ -219,6 +453,8 @@ class EditLog(object):
         Returns:
             (bool): whether or not undo was successful.
         """
+        if self.in_transaction:
+            return False
         with self.lock_registry():
             try:
                 edit = self._log.pop()
@@ -226,6 +462,8 @@ class EditLog(object):
                 return False
             edit._undo()
             self._undo_log.append(edit)
+            if self._journal is not None:
+                self._journal.record_undo(edit)
         if edit._previous_edit_in_stack is not None:
             self.undo()
         return True
@@ -236,6 +474,8 @@ class EditLog(object):
         Returns:
             (bool): whether or not redo was successful.
         """
+        if self.in_transaction:
+            return False
         with self.lock_registry():
             try:
                 edit = self._undo_log.pop()
@@ -243,6 +483,8 @@ class EditLog(object):
                 return False
             edit._redo()
             self._log.append(edit)
+            if self._journal is not None:
+                self._journal.record_redo(edit)
         if edit._next_edit_in_stack is not None:
             self.redo()
         return True
@@ -307,6 +549,18 @@ def open_edit_registry():
     EDIT_LOG.open_registry()
 
 
+def transaction(name=None):
+    """Get context manager to run edits as one transaction in edit log.
+
+    Args:
+        name (str or None): name of transaction edit in log, if given.
+
+    Returns:
+        (contextmanager): the transaction context manager.
+    """
+    return EDIT_LOG.transaction(name=name)
+
+
 def undo():
     """Run undo on edit log singleton.
 
@@ -334,6 +588,39 @@ def latest_edit():
     return EDIT_LOG.get_latest_edit()
 
 
+def set_edit_log_budget(max_length=None, max_size=None, compact_stacks=True):
+    """Set length and memory budget of edit log singleton.
+
+    Args:
+        max_length (int or None): max number of edits to keep in the log.
+            If None, the length is unbounded.
+        max_size (int or None): max approximate size of log in bytes. If
+            None, the size is unbounded.
+        compact_stacks (bool): whether or not to merge stacked edits
+            where possible.
+    """
+    EDIT_LOG.set_budget(max_length, max_size, compact_stacks)
+
+
+def get_edit_log_size():
+    """Get approximate memory size of edit log singleton.
+
+    Returns:
+        (int): approximate size in bytes.
+    """
+    return EDIT_LOG.size_in_bytes
+
+
+def set_edit_journal(journal):
+    """Set journal to record edits of edit log singleton in.
+
+    Args:
+        journal (EditJournal or None): the journal, or None to stop
+            recording edits.
+    """
+    EDIT_LOG.set_journal(journal)
+
+
 def remove_edit_callbacks(callback_id):
     """Remove all callbacks with the given callback id.
 
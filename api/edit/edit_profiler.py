@@ -0,0 +1,385 @@
+"""Opt-in profiler to record how long edits and edit callbacks take.
+
+When enabled, the profiler records a timed span for each edit that is run,
+undone or redone, for each subedit of a composite edit and for each edit
+callback (keyed by the id it was registered with). The results can be
+output as a summary table, or as a json file in the chrome trace event
+format, which can be opened in chrome://tracing or https://ui.perfetto.dev.
+
+When disabled (the default), the instrumented code just uses a shared no-op
+context manager, so the overhead is minimal.
+"""
+
+from contextlib import nullcontext
+import json
+import os
+import threading
+import time
+
+
+class ProfileCategory(object):
+    """Struct representing the categories of profiled spans."""
+    EDIT = "edit"
+    SUBEDIT = "subedit"
+    CALLBACK = "callback"
+
+
+class ProfileOp(object):
+    """Struct representing the edit operations that can be profiled."""
+    RUN = "run"
+    UNDO = "undo"
+    REDO = "redo"
+    PRE_EDIT = "pre_edit"
+    POST_EDIT = "post_edit"
+    PRE_UNDO = "pre_undo"
+    POST_UNDO = "post_undo"
+
+
+class _ProfileStats(object):
+    """Struct to store aggregated timings for a given span key."""
+    def __init__(self):
+        """Initialize struct."""
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, duration):
+        """Add timing.
+
+        Args:
+            duration (float): duration of span in seconds.
+        """
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+
+    @property
+    def mean(self):
+        """Get mean duration.
+
+        Returns:
+            (float): mean duration in seconds.
+        """
+        if not self.count:
+            return 0.0
+        return self.total / self.count
+
+
+class _ProfileSpan(object):
+    """Context manager to time a single span."""
+    def __init__(self, profiler, category, name, op):
+        """Initialize span.
+
+        Args:
+            profiler (EditProfiler): the profiler to record span in.
+            category (ProfileCategory): category of span.
+            name (str): name of span.
+            op (ProfileOp): the operation being profiled.
+        """
+        self._profiler = profiler
+        self._category = category
+        self._name = name
+        self._op = op
+        self._start_time = None
+
+    def __enter__(self):
+        """Start timing span."""
+        self._start_time = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        """Stop timing span and record it in the profiler."""
+        end_time = time.perf_counter()
+        self._profiler._add_span(
+            self._category,
+            self._name,
+            self._op,
+            self._start_time,
+            end_time - self._start_time,
+        )
+
+
+class EditProfiler(object):
+    """Profiler to record wall time of edits and edit callbacks."""
+    MAX_EVENTS = 100000
+    _NULL_SPAN = nullcontext()
+
+    def __init__(self, max_events=None):
+        """Initialize profiler.
+
+        Args:
+            max_events (int or None): max number of individual spans to keep
+                for trace output. Aggregated stats are still recorded for all
+                spans beyond this. Defaults to MAX_EVENTS.
+        """
+        self._enabled = False
+        self._max_events = max_events or self.MAX_EVENTS
+        self._start_time = time.perf_counter()
+        self._events = []
+        self._stats = {}
+        self._num_dropped_events = 0
+
+    @property
+    def is_enabled(self):
+        """Check whether profiler is currently recording.
+
+        Returns:
+            (bool): whether or not profiler is enabled.
+        """
+        return self._enabled
+
+    @property
+    def num_dropped_events(self):
+        """Get number of spans not kept for trace output due to max_events.
+
+        Returns:
+            (int): number of dropped spans.
+        """
+        return self._num_dropped_events
+
+    def enable(self, reset=True):
+        """Start recording.
+
+        Args:
+            reset (bool): if True, clear any previously recorded data.
+        """
+        if reset:
+            self.reset()
+        self._enabled = True
+
+    def disable(self):
+        """Stop recording."""
+        self._enabled = False
+
+    def reset(self):
+        """Clear all recorded data."""
+        self._start_time = time.perf_counter()
+        self._events = []
+        self._stats = {}
+        self._num_dropped_events = 0
+
+    def span(self, category, name, op=ProfileOp.RUN):
+        """Get context manager to time a span, if profiling is enabled.
+
+        Args:
+            category (ProfileCategory): category of span.
+            name (str): name of span.
+            op (ProfileOp): the operation being profiled.
+
+        Returns:
+            (contextmanager): context manager that records the time taken
+                for the code within it.
+        """
+        if not self._enabled:
+            return self._NULL_SPAN
+        return _ProfileSpan(self, category, name, op)
+
+    def edit_span(self, edit, op=ProfileOp.RUN):
+        """Get context manager to time running, undoing or redoing an edit.
+
+        Args:
+            edit (BaseEdit): the edit.
+            op (ProfileOp): the operation being profiled.
+
+        Returns:
+            (contextmanager): the span context manager.
+        """
+        if not self._enabled:
+            return self._NULL_SPAN
+        return _ProfileSpan(
+            self,
+            ProfileCategory.EDIT,
+            type(edit).__name__,
+            op,
+        )
+
+    def subedit_span(self, edit, op=ProfileOp.RUN):
+        """Get context manager to time a subedit of a composite edit.
+
+        Args:
+            edit (BaseEdit): the subedit.
+            op (ProfileOp): the operation being profiled.
+
+        Returns:
+            (contextmanager): the span context manager.
+        """
+        if not self._enabled:
+            return self._NULL_SPAN
+        return _ProfileSpan(
+            self,
+            ProfileCategory.SUBEDIT,
+            type(edit).__name__,
+            op,
+        )
+
+    def callback_span(self, edit, callback_id, op):
+        """Get context manager to time an edit callback.
+
+        Args:
+            edit (BaseEdit): the edit the callback is run for.
+            callback_id (variant): id the callback was registered with.
+            op (ProfileOp): the callback type being profiled.
+
+        Returns:
+            (contextmanager): the span context manager.
+        """
+        if not self._enabled:
+            return self._NULL_SPAN
+        if isinstance(callback_id, str):
+            callback_name = callback_id
+        else:
+            callback_name = type(callback_id).__name__
+        return _ProfileSpan(
+            self,
+            ProfileCategory.CALLBACK,
+            "{0} ({1})".format(callback_name, type(edit).__name__),
+            op,
+        )
+
+    def _add_span(self, category, name, op, start_time, duration):
+        """Record timed span.
+
+        Args:
+            category (ProfileCategory): category of span.
+            name (str): name of span.
+            op (ProfileOp): the operation that was profiled.
+            start_time (float): start time of span, from time.perf_counter.
+            duration (float): duration of span in seconds.
+        """
+        key = (category, name, op)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = _ProfileStats()
+        stats.add(duration)
+        if len(self._events) >= self._max_events:
+            self._num_dropped_events += 1
+            return
+        self._events.append(
+            (category, name, op, start_time, duration, threading.get_ident())
+        )
+
+    def get_stats(self, category=None):
+        """Get aggregated stats for all recorded spans.
+
+        Args:
+            category (ProfileCategory or None): if given, only get stats
+                for spans of this category.
+
+        Returns:
+            (list(tuple)): list of (category, name, op, count, total, mean,
+                max) tuples, with times in seconds, sorted by total time.
+        """
+        stats_list = [
+            (cat, name, op, stats.count, stats.total, stats.mean, stats.max)
+            for (cat, name, op), stats in self._stats.items()
+            if category is None or cat == category
+        ]
+        stats_list.sort(key=lambda stats_tuple: -stats_tuple[4])
+        return stats_list
+
+    def get_summary_text(self, category=None, limit=None):
+        """Get summary table of recorded spans, sorted by total time.
+
+        Args:
+            category (ProfileCategory or None): if given, only include spans
+                of this category.
+            limit (int or None): if given, max number of rows to include.
+
+        Returns:
+            (str): summary table text.
+        """
+        stats_list = self.get_stats(category)[:limit]
+        if not stats_list:
+            return "[NO PROFILE DATA]"
+        name_width = max([len(stats[1]) for stats in stats_list] + [4])
+        row_format = (
+            "{0:<8} {1:<%d} {2:<9} {3:>7} {4:>10} {5:>10} {6:>10}"
+            % name_width
+        )
+        lines = [
+            row_format.format(
+                "Category", "Name", "Op", "Count",
+                "Total(ms)", "Mean(ms)", "Max(ms)",
+            )
+        ]
+        lines.append("-" * len(lines[0]))
+        for cat, name, op, count, total, mean, max_ in stats_list:
+            lines.append(
+                row_format.format(
+                    cat,
+                    name,
+                    op,
+                    count,
+                    "{0:.3f}".format(total * 1000),
+                    "{0:.3f}".format(mean * 1000),
+                    "{0:.3f}".format(max_ * 1000),
+                )
+            )
+        return "\n".join(lines)
+
+    def get_chrome_trace(self):
+        """Get recorded spans in chrome trace event format.
+
+        Returns:
+            (dict): json-compatible chrome trace dict.
+        """
+        pid = os.getpid()
+        trace_events = []
+        for cat, name, op, start_time, duration, tid in self._events:
+            trace_events.append({
+                "name": name,
+                "cat": cat,
+                "ph": "X",
+                "ts": (start_time - self._start_time) * 1e6,
+                "dur": duration * 1e6,
+                "pid": pid,
+                "tid": tid,
+                "args": {"op": op},
+            })
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, file_path):
+        """Write recorded spans to file in chrome trace event format.
+
+        Args:
+            file_path (str): path to json file to write to.
+        """
+        with open(file_path, "w") as file_:
+            json.dump(self.get_chrome_trace(), file_)
+
+
+EDIT_PROFILER = EditProfiler()
+
+
+def enable_edit_profiling(reset=True):
+    """Start recording edit profile data.
+
+    Args:
+        reset (bool): if True, clear any previously recorded data.
+    """
+    EDIT_PROFILER.enable(reset=reset)
+
+
+def disable_edit_profiling():
+    """Stop recording edit profile data."""
+    EDIT_PROFILER.disable()
+
+
+def print_edit_profile(category=None, limit=None):
+    """Print summary table of recorded edit profile data.
+
+    Args:
+        category (ProfileCategory or None): if given, only include spans
+            of this category.
+        limit (int or None): if given, max number of rows to print.
+    """
+    print (EDIT_PROFILER.get_summary_text(category, limit))
+
+
+def write_edit_profile_trace(file_path):
+    """Write recorded edit profile data as chrome trace json.
+
+    Args:
+        file_path (str): path to json file to write to.
+    """
+    EDIT_PROFILER.write_chrome_trace(file_path)
@@ -100,6 +100,9 @@ class AddPlannedItemEdit(CompositeEdit):
         item_container = planned_item.get_item_container()
         if index is None:
             index = len(item_container)
+        self._journal_items = [planned_item.calendar_period]
+        if parent is not None:
+            self._journal_items.append(parent.calendar_period)
         subedits = []
         if activate:
             subedits.append(
@@ -150,6 +153,15 @@ class AddPlannedItemEdit(CompositeEdit):
             )
         )
 
+    def _get_journal_items(self):
+        """Get items modified by edit.
+
+        Returns:
+            (list(BaseCalendarPeriod)): the calendar periods of the planned
+                item and its parent.
+        """
+        return self._journal_items
+
 
 class RemovePlannedItemEdit(CompositeEdit):
     """Remove planned item from calendar."""
@@ -186,6 +198,9 @@ class RemovePlannedItemEdit(CompositeEdit):
             )
             subedits.append(parent_status_edit)
         super(RemovePlannedItemEdit, self).__init__(subedits)
+        self._journal_items = [planned_item.calendar_period] + [
+            parent.calendar_period for parent in planned_item._parents
+        ]
         self._callback_args = self._undo_callback_args = [
             planned_item,
             planned_item.calendar_period,
@@ -200,6 +215,15 @@ class RemovePlannedItemEdit(CompositeEdit):
             )
         )
 
+    def _get_journal_items(self):
+        """Get items modified by edit.
+
+        Returns:
+            (list): the calendar periods of the planned item and its parents,
+                and any tasks whose history it influenced.
+        """
+        return self._journal_items + self._get_subedit_journal_items()
+
 
 class MovePlannedItemEdit(CompositeEdit):
     """Move planned item either to new period or within internal list."""
@@ -212,6 +236,7 @@ class MovePlannedItemEdit(CompositeEdit):
                 move to, if used.
             index (int): index to move to, if used.
         """
+        self._journal_items = []
         calendar_period_type = type(planned_item.calendar_period)
         if (not isinstance(calendar_period, (type(None), calendar_period_type))
                 or (calendar_period is None and index is None)):
@@ -251,6 +276,10 @@ class MovePlannedItemEdit(CompositeEdit):
             calendar_period,
             planned_item.calendar_period
         )
+        self._journal_items = [
+            planned_item.calendar_period,
+            new_calendar_period,
+        ]
         self._callback_args = [
             planned_item,
             planned_item.calendar_period,
@@ -277,6 +306,16 @@ class MovePlannedItemEdit(CompositeEdit):
             )
         )
 
+    def _get_journal_items(self):
+        """Get items modified by edit.
+
+        Returns:
+            (list): the old and new calendar periods of the planned item and
+                the calendar periods of its parents, and any tasks whose
+                history it influences.
+        """
+        return self._journal_items + self._get_subedit_journal_items()
+
 
 class ModifyPlannedItemEdit(CompositeEdit):
     """Modify attributes of planned item."""
@@ -333,6 +372,10 @@ class ModifyPlannedItemEdit(CompositeEdit):
             )
 
         super(ModifyPlannedItemEdit, self).__init__(subedits)
+        self._journal_items = [
+            planned_item.calendar_period,
+            new_calendar_period,
+        ] + [parent.calendar_period for parent in planned_item._parents]
         self._callback_args = [
             planned_item,
             planned_item.calendar_period,
@@ -355,6 +398,16 @@ class ModifyPlannedItemEdit(CompositeEdit):
             planned_item.name,
         )
 
+    def _get_journal_items(self):
+        """Get items modified by edit.
+
+        Returns:
+            (list): the old and new calendar periods of the planned item and
+                the calendar periods of its parents, and any tasks whose
+                history it influences.
+        """
+        return self._journal_items + self._get_subedit_journal_items()
+
 
 class SortPlannedItemsEdit(ListEdit):
     """Sort planned items into new order."""
@@ -382,6 +435,15 @@ class SortPlannedItemsEdit(ListEdit):
             )
         )
         self._edit_stack_name = "SortPlannedItems Edit Stack"
+        self._calendar_period = calendar_period
+
+    def _get_journal_items(self):
+        """Get items modified by edit.
+
+        Returns:
+            (list(BaseCalendarPeriod)): the calendar period.
+        """
+        return [self._calendar_period]
 
     def _stacks_with(self, edit):
         """Check if this should stack with edit if added to the log after it.
@@ -16,7 +16,10 @@ from ._core_edits import (
     ReplaceHostedDataEdit,
     SelfInverseSimpleEdit,
 )
-from ._base_calendar_item_edit import AddCalendarItemChildRelationshipEdit
+from ._base_calendar_item_edit import (
+    AddCalendarItemChildRelationshipEdit,
+    _get_journal_item,
+)
 from .task_edit import UpdateTaskHistoryEdit
 
 
@@ -32,6 +35,9 @@ class AddScheduledItemEdit(CompositeEdit):
                 item, if given.
             activate (bool): if True, activate hosted data as part of edit.
         """
+        self._journal_items = [_get_journal_item(scheduled_item)]
+        if parent is not None:
+            self._journal_items.append(_get_journal_item(parent))
         subedits = []
         if activate:
             subedits.append(
@@ -72,6 +78,15 @@ class AddScheduledItemEdit(CompositeEdit):
             )
         )
 
+    def _get_journal_items(self):
+        """Get items modified by edit.
+
+        Returns:
+            (list): the items that the scheduled item and its parent are
+                stored in.
+        """
+        return self._journal_items
+
 
 class RemoveScheduledItemEdit(CompositeEdit):
     """Remove scheduled item from calendar."""
@@ -109,6 +124,9 @@ class RemoveScheduledItemEdit(CompositeEdit):
                 DeactivateHostedDataEdit.create_unregistered(scheduled_item)
             )
         super(RemoveScheduledItemEdit, self).__init__(subedits)
+        self._journal_items = [_get_journal_item(scheduled_item)] + [
+            _get_journal_item(parent) for parent in scheduled_item._parents
+        ]
         self._callback_args = self._undo_callback_args = [scheduled_item]
         self._name = "RemoveScheduledItem ({0})".format(scheduled_item.name)
         self._description = (
@@ -119,6 +137,15 @@ class RemoveScheduledItemEdit(CompositeEdit):
             )
         )
 
+    def _get_journal_items(self):
+        """Get items modified by edit.
+
+        Returns:
+            (list): the items that the scheduled item and its parents are
+                stored in, and any tasks whose history it influenced.
+        """
+        return self._journal_items + self._get_subedit_journal_items()
+
 
 class BaseModifyScheduledItemEdit(CompositeEdit):
     """Modify attributes (including date and time) of scheduled item.
@@ -195,12 +222,24 @@ class BaseModifyScheduledItemEdit(CompositeEdit):
             scheduled_item,
         ]
         self._is_valid = bool(self._modified_attrs())
+        self._journal_items = [_get_journal_item(scheduled_item)] + [
+            _get_journal_item(parent) for parent in scheduled_item._parents
+        ]
         self._name = "ModifyScheduledItem ({0})".format(scheduled_item.name)
         self._description = self._attribute_edit.get_description(
             self._scheduled_item,
             self._scheduled_item.name
         )
 
+    def _get_journal_items(self):
+        """Get items modified by edit.
+
+        Returns:
+            (list): the items that the scheduled item and its parents are
+                stored in, and any tasks whose history it influences.
+        """
+        return self._journal_items + self._get_subedit_journal_items()
+
     def _modified_attrs(self):
         """Get set of all attributes that are modified by edit.
 
@@ -423,6 +462,10 @@ class ModifyScheduledItemEdit(BaseModifyScheduledItemEdit):
             attr_dict,
             subedits=subedits,
         )
+        if self._add_edit is not None:
+            self._journal_items.append(
+                _get_journal_item(scheduled_item, new_date)
+            )
 
 
 class ModifyRepeatScheduledItemEdit(BaseModifyScheduledItemEdit):
@@ -714,3 +757,12 @@ class ReplaceScheduledItemEdit(CompositeEdit):
             old_scheduled_item.name,
             new_scheduled_item.name,
         )
+
+    def _get_journal_items(self):
+        """Get items modified by edit.
+
+        Returns:
+            (list): the items that the old and new scheduled items are
+                stored in, and any tasks whose history they influence.
+        """
+        return self._get_subedit_journal_items()
@@ -24,14 +24,16 @@ class ModifyTaskEdit(CompositeEdit):
                 is_tracked state of tasks.
         """
         subedits = []
+        self._modified_items = [task_item]
+        self._tracker = None
 
         # type edits apply to whole family
         # TODO: THEY SHOULDN'T! REMOVE THIS
         if is_task and task_item._type in attr_dict:
             new_type = attr_dict[task_item._type]
-            attr_dict.update(
-                {item._type: new_type for item in task_item.get_family()}
-            )
+            family = task_item.get_family()
+            attr_dict.update({item._type: new_type for item in family})
+            self._modified_items = family
 
         # if we change is_tracked, we need to add to/remove from tracker as well
         if (is_task
@@ -53,6 +55,7 @@ class ModifyTaskEdit(CompositeEdit):
                 ],
             )
             subedits.append(add_or_remove_task_edit)
+            self._tracker = tracker
 
         # rename edits need to rename item in parent dict as well
         if task_item._name in attr_dict:
@@ -83,6 +86,33 @@ class ModifyTaskEdit(CompositeEdit):
             task_item.name,
         )
 
+    def _run(self):
+        """Run edit and mark modified items for reindexing."""
+        super(ModifyTaskEdit, self)._run()
+        self._mark_items_modified()
+
+    def _inverse_run(self):
+        """Run edit inverse and mark modified items for reindexing."""
+        super(ModifyTaskEdit, self)._inverse_run()
+        self._mark_items_modified()
+
+    def _mark_items_modified(self):
+        """Mark modified items in their tree root's task index."""
+        for item in self._modified_items:
+            item.root._mark_descendants_modified([item])
+
+    def _get_journal_items(self):
+        """Get items modified by edit.
+
+        Returns:
+            (list): the modified task items, the parent of the task item if
+                it's renamed, and the tracker if its tracked tasks change.
+        """
+        items = self._modified_items + self._get_subedit_journal_items()
+        if self._tracker is not None:
+            items.append(self._tracker)
+        return items
+
 
 class UpdateTaskHistoryEdit(CompositeEdit):
     """Edit to update history for a task."""
@@ -147,6 +177,8 @@ class UpdateTaskHistoryEdit(CompositeEdit):
             new_datetime,
             core_field_updates,
         )
+        self._task_item = task_item
+        self._history_dates = list(diff_dict.keys()) if diff_dict else []
         if diff_dict is None:
             super(UpdateTaskHistoryEdit, self).__init__([])
             return
@@ -194,6 +226,27 @@ class UpdateTaskHistoryEdit(CompositeEdit):
             )
         )
 
+    def _get_journal_record(self):
+        """Get record of current history of task at the edited dates.
+
+        Returns:
+            (dict): json-compatible record of the modified data.
+        """
+        return {
+            "task": self._task_item.path,
+            "history": self._task_item.history.dates_to_dict(
+                self._history_dates
+            ),
+        }
+
+    def _get_journal_items(self):
+        """Get items modified by edit, for when it's part of a larger edit.
+
+        Returns:
+            (list(Task)): the task whose history is edited.
+        """
+        return [self._task_item]
+
 
 class ClearTaskHistoryEdit(DictEdit):
     """Clear task history dict."""
@@ -205,6 +258,8 @@ class ClearTaskHistoryEdit(DictEdit):
         """
         history_dict = task_item.history._dict
         diff_dict = {date: None for date in history_dict}
+        self._task_item = task_item
+        self._history_dates = list(diff_dict.keys())
         super(ClearTaskHistoryEdit, self).__init__(
             history_dict,
             diff_dict,
@@ -219,6 +274,37 @@ class ClearTaskHistoryEdit(DictEdit):
             "Clear task history for {0}".format(task_item.path)
         )
 
+    def _run(self):
+        """Run edit and mark task history as modified."""
+        super(ClearTaskHistoryEdit, self)._run()
+        self._task_item.history.mark_modified()
+
+    def _inverse_run(self):
+        """Run edit inverse and mark task history as modified."""
+        super(ClearTaskHistoryEdit, self)._inverse_run()
+        self._task_item.history.mark_modified()
+
+    def _get_journal_record(self):
+        """Get record of current history of task at the cleared dates.
+
+        Returns:
+            (dict): json-compatible record of the modified data.
+        """
+        return {
+            "task": self._task_item.path,
+            "history": self._task_item.history.dates_to_dict(
+                self._history_dates
+            ),
+        }
+
+    def _get_journal_items(self):
+        """Get items modified by edit, for when it's part of a larger edit.
+
+        Returns:
+            (list(Task)): the task whose history is edited.
+        """
+        return [self._task_item]
+
 
 # TODO: make these inherit from the modify_task edit above?
 # might need to think a bit about callbacks for both though as ideally this
@@ -244,6 +330,7 @@ class TrackTaskEdit(CompositeEdit):
             {task_item._is_tracked: True}
         )
         super(TrackTaskEdit, self).__init__([add_task_edit, attr_edit])
+        self._tracker = tracker
         #TODO: create tracker modify callback and add this edit to it
         self._callback_args = self._undo_callback_args = [(
             task_item,
@@ -254,6 +341,14 @@ class TrackTaskEdit(CompositeEdit):
             "Add task {0} to tracker".format(task_item.path)
         )
 
+    def _get_journal_items(self):
+        """Get items modified by edit.
+
+        Returns:
+            (list(Tracker)): the tracker.
+        """
+        return [self._tracker]
+
 
 class UntrackTaskEdit(CompositeEdit):
     """Edit to add task to tracker."""
@@ -274,6 +369,7 @@ class UntrackTaskEdit(CompositeEdit):
             {task_item._is_tracked: True}
         )
         super(UntrackTaskEdit, self).__init__([remove_task_edit, attr_edit])
+        self._tracker = tracker
         #TODO: create tracker modify callback and add this edit to it
         self._callback_args = self._undo_callback_args = [(
             task_item,
@@ -283,3 +379,11 @@ class UntrackTaskEdit(CompositeEdit):
         self._description = (
             "Remove task {0} from tracker".format(task_item.path)
         )
+
+    def _get_journal_items(self):
+        """Get items modified by edit.
+
+        Returns:
+            (list(Tracker)): the tracker.
+        """
+        return [self._tracker]
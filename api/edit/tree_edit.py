@@ -39,6 +39,12 @@ class BaseTreeEdit(CompositeEdit):
                 edits that are already taking care of the relevant attribute
                 updates.
         """
+        self._tree_item = tree_item
+        self._modified_children = self._get_modified_children(
+            tree_item,
+            diff_dict,
+            op_type,
+        )
         ordered_dict_edit = DictEdit.create_unregistered(
             tree_item._children,
             diff_dict,
@@ -120,6 +126,57 @@ class BaseTreeEdit(CompositeEdit):
             validity_check_edits=[ordered_dict_edit],
         )
 
+    @staticmethod
+    def _get_modified_children(tree_item, diff_dict, op_type):
+        """Get children that will be added, removed, replaced or renamed.
+
+        Args:
+            tree_item (BaseTreeItem): the tree item this edit is run on.
+            diff_dict (OrderedDict): the diff dict for the edit.
+            op_type (ContainerOp): the edit operation type.
+
+        Returns:
+            (list(BaseTreeItem)): the children, including both old and new
+                children of modify edits, and renamed children (as their
+                paths change).
+        """
+        if op_type == ContainerOp.ADD:
+            return list(diff_dict.values())
+        if op_type == ContainerOp.INSERT:
+            return [child for _, child in diff_dict.values()]
+        if op_type in (
+                ContainerOp.REMOVE,
+                ContainerOp.MODIFY,
+                ContainerOp.RENAME):
+            children = [
+                tree_item.get_child(name) for name in diff_dict
+                if tree_item.get_child(name)
+            ]
+            if op_type == ContainerOp.MODIFY:
+                children.extend(
+                    [child for _, child in diff_dict.values()]
+                )
+            return children
+        return []
+
+    def _run(self):
+        """Run edit and mark tree item's children as modified."""
+        super(BaseTreeEdit, self)._run()
+        self._tree_item._mark_children_modified(self._modified_children)
+
+    def _inverse_run(self):
+        """Run inverse edit and mark tree item's children as modified."""
+        super(BaseTreeEdit, self)._inverse_run()
+        self._tree_item._mark_children_modified(self._modified_children)
+
+    def _get_journal_items(self):
+        """Get items modified by edit.
+
+        Returns:
+            (list(BaseTreeItem)): the tree item whose children are edited.
+        """
+        return [self._tree_item]
+
 
 class AddChildrenEdit(BaseTreeEdit):
     """Tree edit for adding children."""
@@ -419,6 +476,14 @@ class MoveTreeItemEdit(CompositeEdit):
             )
         )
 
+    def _get_journal_items(self):
+        """Get items modified by edit.
+
+        Returns:
+            (list(BaseTreeItem)): the old and new parents of the tree item.
+        """
+        return self._get_subedit_journal_items()
+
 
 class ReplaceTreeItemEdit(CompositeEdit):
     """Replace one tree item with another."""
@@ -472,6 +537,15 @@ class ReplaceTreeItemEdit(CompositeEdit):
             new_tree_item.path,
         )
 
+    def _get_journal_items(self):
+        """Get items modified by edit.
+
+        Returns:
+            (list(BaseTreeItem)): the parent of the replaced tree item, and
+                the new tree item that its children are moved under.
+        """
+        return self._get_subedit_journal_items()
+
 
 class MergeTreeItemsEdit(CompositeEdit):
     """Merge one tree item into another."""
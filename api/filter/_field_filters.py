@@ -89,7 +89,18 @@ class FieldFilter(BaseFilter):
             (bool): True if item should stay in container, False if it should
                 be filtered out.
         """
-        field_value = self._field_getter(*args, **kwargs)
+        return self._field_value_matches(self._field_getter(*args, **kwargs))
+
+    def _field_value_matches(self, field_value):
+        """Check if given field value passes the field operator.
+
+        Args:
+            field_value (variant): the field value of an item.
+
+        Returns:
+            (bool): True if an item with this field value should stay in
+                container, False if it should be filtered out.
+        """
         field_maths_value = field_value
         if (self._math_ops_key is not None and
                 self._field_operator in FilterOperator.get_maths_ops()):
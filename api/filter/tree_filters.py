@@ -3,7 +3,14 @@
 from collections import OrderedDict
 
 from scheduler.api.tree.task import Task
-from scheduler.api.enums import ItemSize, ItemImportance, ItemStatus
+from scheduler.api.tree.task_index import TaskIndexAttribute
+from scheduler.api.tree.task_root import TaskRoot
+from scheduler.api.enums import (
+    CompositionOperator,
+    ItemImportance,
+    ItemSize,
+    ItemStatus,
+)
 from ._base_filter import (
     BaseFilter,
     CompositeFilter,
@@ -22,11 +29,13 @@ class BaseTreeFilter(BaseFilter):
         self._filter_type = FilterType.TREE
         self._composite_filter_class = CompositeTreeFilter
         self._recursive_cache = {}
+        self._filtered_children_cache = {}
 
     def clear_cache(self):
         """Clear cache."""
         super(BaseTreeFilter, self).clear_cache()
         self._recursive_cache = {}
+        self._filtered_children_cache = {}
 
     def recursive_filter(self, child_item):
         """Check if an item or any of its ancestors are filtered.
@@ -63,9 +72,49 @@ class BaseTreeFilter(BaseFilter):
             if self.filter_function(child)
         ])
 
+    def get_filtered_children_dict(self, tree_item):
+        """Get filtered child dict of given tree item.
+
+        The result is cached for each tree item until its children version
+        changes (ie. a child is added, removed or moved anywhere below it)
+        or the filter cache is cleared. The returned dict should not be
+        modified.
+
+        Args:
+            tree_item (BaseTreeItem): tree item to get filtered children of.
+
+        Returns:
+            (OrderedDict): filtered child dict.
+        """
+        version = tree_item.children_version
+        cached = self._filtered_children_cache.get(tree_item)
+        if cached is None or cached[0] != version:
+            cached = (version, self.get_filtered_dict(tree_item._children))
+            self._filtered_children_cache[tree_item] = cached
+        return cached[1]
+
+    def get_matching_tasks(self, task_root):
+        """Get tasks in tree that pass the filter, using the task index.
+
+        Args:
+            task_root (TaskRoot): root of tree to query.
+
+        Returns:
+            (set(Task) or None): tasks that pass the filter, or None if this
+                filter can't be answered from the task index.
+        """
+        return None
+
 
 class BaseTreeFieldFilter(FieldFilter, BaseTreeFilter):
-    """Tree field filter."""
+    """Tree field filter.
+
+    Subclasses that filter on an attribute in the task index can set the
+    INDEX_ATTRIBUTE class attribute, so that the filter is answered from
+    the index rather than by checking every item and its descendants.
+    """
+    INDEX_ATTRIBUTE = None
+
     def __init__(
             self,
             field_getter,
@@ -97,6 +146,75 @@ class BaseTreeFieldFilter(FieldFilter, BaseTreeFilter):
         )
         self._tasks_only = tasks_only
         self._check_descendants = check_descendants
+        self._index_matches = {}
+
+    def clear_cache(self):
+        """Clear cache."""
+        super(BaseTreeFieldFilter, self).clear_cache()
+        self._index_matches = {}
+
+    def get_matching_tasks(self, task_root):
+        """Get tasks in tree that pass the filter, using the task index.
+
+        As with the filter function, if the filter checks descendants then
+        this includes tasks with a subtask whose field passes the filter.
+
+        Args:
+            task_root (TaskRoot): root of tree to query.
+
+        Returns:
+            (set(Task) or None): tasks that pass the filter, or None if this
+                filter has no index attribute.
+        """
+        if self.INDEX_ATTRIBUTE is None:
+            return None
+        matches = task_root.task_index.get_matching_tasks(
+            self.INDEX_ATTRIBUTE,
+            self._field_value_matches,
+        )
+        if self._check_descendants:
+            for task in list(matches):
+                ancestors = task.iter_ancestors(reversed=True, strict=True)
+                for ancestor in ancestors:
+                    if not isinstance(ancestor, Task) or ancestor in matches:
+                        break
+                    matches.add(ancestor)
+        return matches
+
+    def _get_index_matches(self, item):
+        """Get all items in given item's tree that pass the filter.
+
+        This uses the task index to find the matching tasks and then adds
+        all their ancestors, which matches the result of the filter function
+        for filters that are tasks_only and check_descendants. The result is
+        cached until the task index changes.
+
+        Args:
+            item (BaseTreeItem): item whose tree we're checking.
+
+        Returns:
+            (set(BaseTreeItem) or None): items that pass the filter, or None
+                if the filter can't be answered from the task index.
+        """
+        if (self.INDEX_ATTRIBUTE is None
+                or not self._tasks_only
+                or not self._check_descendants):
+            return None
+        task_root = item.root
+        if not isinstance(task_root, TaskRoot):
+            return None
+        version = task_root.task_index.version
+        cached = self._index_matches.get(task_root)
+        if cached is None or cached[0] != version:
+            matches = set()
+            for task in self.get_matching_tasks(task_root):
+                for ancestor in task.iter_ancestors(reversed=True):
+                    if ancestor in matches:
+                        break
+                    matches.add(ancestor)
+            cached = (task_root.task_index.version, matches)
+            self._index_matches[task_root] = cached
+        return cached[1]
 
     def _filter_function(self, item):
         """Check if tree item is filtered.
@@ -104,6 +222,9 @@ class BaseTreeFieldFilter(FieldFilter, BaseTreeFilter):
         Args:
             item (bool): the item to filter.
         """
+        index_matches = self._get_index_matches(item)
+        if index_matches is not None:
+            return item in index_matches
         if self._tasks_only and not isinstance(item, Task):
             return any([
                 self._filter_function(child)
@@ -122,6 +243,39 @@ class BaseTreeFieldFilter(FieldFilter, BaseTreeFilter):
 @register_serializable_filter("CompositeTreeFilter")
 class CompositeTreeFilter(CompositeFilter, BaseTreeFilter):
     """Composite tree filter class."""
+    def get_matching_tasks(self, task_root):
+        """Get tasks in tree that pass all or any subfilters.
+
+        The matching tasks of each subfilter are intersected for 'AND'
+        composites and combined for 'OR' composites. As the subfilters
+        include every task that passes their filter function (including
+        tasks that only pass because of their descendants), this gives
+        the same tasks as the composite filter function.
+
+        Args:
+            task_root (TaskRoot): root of tree to query.
+
+        Returns:
+            (set(Task) or None): tasks that pass the filter, or None if any
+                subfilters can't be answered from the task index.
+        """
+        if not self.subfilters:
+            return None
+        matches = None
+        for subfilter in self.subfilters:
+            get_matching_tasks = getattr(subfilter, "get_matching_tasks", None)
+            if get_matching_tasks is None:
+                return None
+            subfilter_matches = get_matching_tasks(task_root)
+            if subfilter_matches is None:
+                return None
+            if matches is None:
+                matches = subfilter_matches
+            elif self.composition_operator == CompositionOperator.AND:
+                matches &= subfilter_matches
+            else:
+                matches |= subfilter_matches
+        return matches
 
 
 @register_serializable_filter("EmptyTreeFilter")
@@ -149,6 +303,8 @@ class FilterByItem(BaseTreeFilter):
 @register_serializable_filter("TaskStatusFilter")
 class TaskStatusFilter(BaseTreeFieldFilter):
     """Filter for given task statuses."""
+    INDEX_ATTRIBUTE = TaskIndexAttribute.STATUS
+
     def __init__(self, filter_operator, filter_value):
         """Initialize filter.
 
@@ -168,6 +324,8 @@ class TaskStatusFilter(BaseTreeFieldFilter):
 @register_serializable_filter("TaskTypeFilter")
 class TaskTypeFilter(BaseTreeFieldFilter):
     """Filter for given task types."""
+    INDEX_ATTRIBUTE = TaskIndexAttribute.TYPE
+
     def __init__(self, filter_operator, filter_value):
         """Initialize filter.
 
@@ -186,6 +344,8 @@ class TaskTypeFilter(BaseTreeFieldFilter):
 @register_serializable_filter("TaskSizeFilter")
 class TaskSizeFilter(BaseTreeFieldFilter):
     """Filter for task size."""
+    INDEX_ATTRIBUTE = TaskIndexAttribute.SIZE
+
     def __init__(self, filter_operator, filter_value):
         """Initialize filter.
 
@@ -205,6 +365,8 @@ class TaskSizeFilter(BaseTreeFieldFilter):
 @register_serializable_filter("TaskImportanceFilter")
 class TaskImportanceFilter(BaseTreeFieldFilter):
     """Filter for task importance."""
+    INDEX_ATTRIBUTE = TaskIndexAttribute.IMPORTANCE
+
     def __init__(self, filter_operator, filter_value):
         """Initialize filter.
 
@@ -0,0 +1,220 @@
+"""Git backup engine for backing up project data to a git repository."""
+
+import threading
+
+
+class GitBackupStage(object):
+    """Struct representing the stages of a git backup."""
+    STAGING = "Staging"
+    COMMITTING = "Committing"
+    PUSHING = "Pushing"
+    DONE = "Done"
+
+    PROGRESS = {
+        STAGING: 0.0,
+        COMMITTING: 0.3,
+        PUSHING: 0.5,
+        DONE: 1.0,
+    }
+
+
+class GitBackupEngine(object):
+    """Class to commit and push all changes in a git repo.
+
+    All changes are staged in a single git call and the resulting tree hash
+    is compared to the one from the last backup, so repeat backups with no
+    changes don't run any further git commands. Backups can be run either
+    synchronously, or on a background thread, in which case the progress
+    can be queried from the engine while it runs.
+    """
+    def __init__(self, repo_path, push=True):
+        """Initialize.
+
+        Args:
+            repo_path (str): path to local git repository.
+            push (bool): whether or not to push the changes after committing.
+        """
+        self.repo_path = repo_path
+        self.push = push
+        self.last_tree_hash = None
+        self.stage = None
+        self.error = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def progress(self):
+        """Get progress of current or most recent backup.
+
+        Returns:
+            (float): progress, as a fraction between 0 and 1.
+        """
+        return GitBackupStage.PROGRESS.get(self.stage, 0.0)
+
+    def is_running(self):
+        """Check if there's currently a backup running in the background.
+
+        Returns:
+            (bool): whether or not a background backup is running.
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def wait(self, timeout=None):
+        """Wait for background backup to finish.
+
+        Args:
+            timeout (float or None): max number of seconds to wait, if given.
+
+        Returns:
+            (bool): whether or not the background backup has finished.
+        """
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return not self.is_running()
+
+    def _set_stage(self, stage, progress_callback=None):
+        """Set current stage of backup and report progress.
+
+        Args:
+            stage (GitBackupStage): stage to set.
+            progress_callback (function or None): function to call with the
+                stage and progress fraction, if given.
+        """
+        self.stage = stage
+        if progress_callback is not None:
+            progress_callback(stage, self.progress)
+
+    def run(self, commit_message="backup", progress_callback=None):
+        """Attempt to commit and push all files in git repo.
+
+        Args:
+            commit_message (str): message for commit.
+            progress_callback (function or None): function to call with the
+                stage and progress fraction, after each stage begins.
+
+        Returns:
+            (str or None): error message, if backup was unsuccessful.
+        """
+        with self._lock:
+            self.error = self._run(commit_message, progress_callback)
+            self._set_stage(GitBackupStage.DONE, progress_callback)
+            return self.error
+
+    def run_in_background(
+            self,
+            commit_message="backup",
+            progress_callback=None,
+            finished_callback=None):
+        """Run backup on a background thread.
+
+        Note that the callbacks are called from the background thread, so
+        ui code should either query the progress property instead or make
+        sure any callbacks are passed safely to the main thread.
+
+        Args:
+            commit_message (str): message for commit.
+            progress_callback (function or None): function to call with the
+                stage and progress fraction, after each stage begins.
+            finished_callback (function or None): function to call with the
+                error message (or None) once the backup is finished.
+
+        Returns:
+            (bool): whether or not the backup was started. This is False if
+                there's already a backup running.
+        """
+        if self.is_running():
+            return False
+
+        def _run_backup():
+            error = self.run(commit_message, progress_callback)
+            if finished_callback is not None:
+                finished_callback(error)
+
+        self.stage = None
+        self.error = None
+        self._thread = threading.Thread(
+            target=_run_backup,
+            name="GitBackup",
+            daemon=True,
+        )
+        self._thread.start()
+        return True
+
+    def _run(self, commit_message, progress_callback=None):
+        """Run backup.
+
+        Args:
+            commit_message (str): message for commit.
+            progress_callback (function or None): progress callback.
+
+        Returns:
+            (str or None): error message, if backup was unsuccessful.
+        """
+        try:
+            import git
+        except ImportError:
+            return (
+                "Could not import GitPython module. Ensure python version "
+                ">= 3.7 and this is installed."
+            )
+        try:
+            git_repo = git.Repo(self.repo_path)
+        except (git.exc.InvalidGitRepositoryError, git.exc.NoSuchPathError):
+            return "Directory {0} is not a valid git repo".format(
+                self.repo_path
+            )
+
+        self._set_stage(GitBackupStage.STAGING, progress_callback)
+        try:
+            git_repo.git.add(all=True)
+            tree_hash = git_repo.git.write_tree()
+        except git.exc.GitCommandError as e:
+            return "Git error when staging files in repo {0}:\n{1}".format(
+                self.repo_path,
+                e.stderr
+            )
+        if tree_hash == self.last_tree_hash:
+            return None
+
+        self._set_stage(GitBackupStage.COMMITTING, progress_callback)
+        head_tree_hash = None
+        if git_repo.head.is_valid():
+            head_tree_hash = git_repo.head.commit.tree.hexsha
+        if tree_hash != head_tree_hash:
+            try:
+                git_repo.git.commit("-m", commit_message)
+            except git.exc.GitCommandError as e:
+                return (
+                    "Git error when committing changes for repo {0}:\n{1}"
+                    "".format(self.repo_path, e.stderr)
+                )
+
+        if self.push and git_repo.remotes and self._has_unpushed(git_repo):
+            self._set_stage(GitBackupStage.PUSHING, progress_callback)
+            try:
+                git_repo.git.push()
+            except git.exc.GitCommandError as e:
+                return (
+                    "Git error when pushing changes for repo {0}:\n{1}"
+                    "".format(self.repo_path, e.stderr)
+                )
+        self.last_tree_hash = tree_hash
+        return None
+
+    @staticmethod
+    def _has_unpushed(git_repo):
+        """Check if repo has commits that haven't been pushed to upstream.
+
+        Args:
+            git_repo (git.Repo): the git repo.
+
+        Returns:
+            (bool): whether or not there are unpushed commits. If there's
+                no upstream branch to compare to, we assume there are.
+        """
+        import git
+        try:
+            num_commits = git_repo.git.rev_list("--count", "@{u}..HEAD")
+        except git.exc.GitCommandError:
+            return True
+        return int(num_commits) > 0
@@ -77,10 +77,12 @@ class FilterManager(BaseManager):
                 currently selected field filter.
             _current_tree_item (BaseTaskItem): the currently selected task
                 item.
+            _filter_generation (int): counter that's incremented whenever
+                the combined filter changes, so that ui classes can cache
+                filtered results until it's next modified.
         """
         self._filterer = filterer
         self._tree_root = tree_root
-        self._archive_tree_root = tree_root.archive_root
         super(FilterManager, self).__init__(
             user_prefs,
             filter_type=filter_type,
@@ -94,6 +96,8 @@ class FilterManager(BaseManager):
         self._active_field_filter = None
         self._tree_item_filter = None
         self._combined_filter = None
+        self._tree_field_filter = None
+        self._filter_generation = 0
         self._setup_from_user_prefs()
 
     def _setup_from_user_prefs(self):
@@ -122,6 +126,10 @@ class FilterManager(BaseManager):
     def clear_filter_caches(self):
         """Clear all filter caches."""
         self._filterer.clear_filter_caches()
+        for filter_ in (self._combined_filter, self._tree_field_filter):
+            if filter_ is not None:
+                filter_.clear_cache()
+        self._filter_generation += 1
         # TODO: filterer only stores field filters I think?
         # so I need to also take the active filters and clear them
         # or maybe add the active filters to the filterer as well, in
@@ -130,6 +138,19 @@ class FilterManager(BaseManager):
         # owned by this manager? If so, need to pass the filter type
         # to clear filter_caches arg too
 
+    def _reset_combined_filter(self, reset_tree_item_filter=True):
+        """Reset combined filter, so it's rebuilt next time it's used.
+
+        Args:
+            reset_tree_item_filter (bool): if True, also reset the tree item
+                filter.
+        """
+        if reset_tree_item_filter:
+            self._tree_item_filter = None
+        self._combined_filter = None
+        self._tree_field_filter = None
+        self._filter_generation += 1
+
     def assert_filter_type(self, filter_type):
         """Assert that filter type of manager is correct one.
 
@@ -212,12 +233,9 @@ class FilterManager(BaseManager):
         Returns:
             (bool): whether or not the given item is being filtered out.
         """
-        tree_field_filter = quasiconvert_filter(
-            self.field_filter,
-            FilterType.TREE,
-        )
-        if (tree_item.parent is not None and tree_item not in
-                tree_item.parent.get_filtered_children(tree_field_filter)):
+        parent = tree_item.parent
+        if (parent is not None and tree_item.name not in
+                self.tree_field_filter.get_filtered_children_dict(parent)):
             return True
 
         if self.has_attribute(tree_item, self.IS_FILTERED_OUT):
@@ -310,8 +328,7 @@ class FilterManager(BaseManager):
             self.set_attribute(tree_item, self.IS_SELECTED_FOR_FILTERING, True)
         self.set_attribute(tree_item, self.IS_FILTERED_OUT, True)
         self._filtered_tree_items.add(tree_item)
-        self._tree_item_filter = None
-        self._combined_filter = None
+        self._reset_combined_filter()
         for child in tree_item.get_all_children():
             self.filter_item(child, from_user_selection=False)
 
@@ -338,8 +355,7 @@ class FilterManager(BaseManager):
 
         self.set_attribute(tree_item, self.IS_FILTERED_OUT, False)
         self._filtered_tree_items.discard(tree_item)
-        self._tree_item_filter = None
-        self._combined_filter = None
+        self._reset_combined_filter()
         for child in tree_item.get_all_children():
             self.unfilter_item(child, from_user_selection=False)
 
@@ -435,6 +451,16 @@ class FilterManager(BaseManager):
         return self._current_tree_item
 
     ### properties ###
+    @property
+    def filter_generation(self):
+        """Get filter generation number.
+
+        Returns:
+            (int): counter that's incremented each time the combined filter
+                changes.
+        """
+        return self._filter_generation
+
     @property
     def field_filters_dict(self):
         """Get dict of all field filters.
@@ -457,6 +483,23 @@ class FilterManager(BaseManager):
             return self._active_field_filter
         return convert_filter(NoFilter(), self._filter_type)
 
+    @property
+    def tree_field_filter(self):
+        """Get field filter quasiconverted to a tree filter.
+
+        This is cached so that the outliner and filter manager share the
+        same filter object, and hence its filtered children cache.
+
+        Returns:
+            (BaseTreeFilter): tree field filter.
+        """
+        if self._tree_field_filter is None:
+            self._tree_field_filter = quasiconvert_filter(
+                self.field_filter,
+                FilterType.TREE,
+            )
+        return self._tree_field_filter
+
     @property
     def combined_filter(self):
         """Get combination of field filter and tree item filter.
@@ -503,7 +546,7 @@ class FilterManager(BaseManager):
                 If None, delete the filter.
         """
         self._active_field_filter = field_filter
-        self._combined_filter = None
+        self._reset_combined_filter(reset_tree_item_filter=False)
         self._project_user_prefs.set_attribute(
             [self._name, self.ACTIVE_FIELD_FILTER_PREF],
             field_filter.name if field_filter is not None else None,
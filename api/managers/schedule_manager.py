@@ -1,5 +1,6 @@
 """Schedule manager class."""
 
+from scheduler.api.calendar.ics import import_ics, write_ics
 from scheduler.api.calendar.scheduled_item import(
     BaseScheduledItem,
     ScheduledItem,
@@ -389,6 +390,31 @@ class ScheduleManager(BaseCalendarManager):
         # TODO: find a way to trigger a task ui update after this too?
         # so that this still updates properly if we're in the task tab
 
+    def import_ics(self, file_path):
+        """Add scheduled items for events in an iCalendar file.
+
+        Args:
+            file_path (str): path to .ics file.
+
+        Returns:
+            (int): number of scheduled items added.
+            (int): number of events that couldn't be imported.
+        """
+        return import_ics(self.calendar, file_path)
+
+    def export_ics(self, file_path, start_date=None, end_date=None):
+        """Write scheduled items to an iCalendar file.
+
+        Args:
+            file_path (str): path to .ics file to write.
+            start_date (Date or None): if given, ignore items before this.
+            end_date (Date or None): if given, ignore items after this.
+
+        Returns:
+            (int): number of events written.
+        """
+        return write_ics(self.calendar, file_path, start_date, end_date)
+
     # ### Filter Methods ###
     # @property
     # def filter(self):
@@ -2,6 +2,7 @@
 
 from scheduler.api.common.date_time import Date, DateTime
 from scheduler.api.enums import ItemStatus
+from scheduler.api.edit import edit_log
 from scheduler.api.edit.tree_edit import (
     ArchiveTreeItemEdit,
     InsertChildrenEdit,
@@ -40,7 +41,6 @@ class TreeManager(BaseManager):     #BaseManagerWithFilter):
             tracker (Tracker): tracker to track tasks with.
         """
         self._tree_root = tree_root
-        self._archive_tree_root = tree_root.archive_root
         self._tracker = tracker
         super(TreeManager, self).__init__(
             user_prefs,
@@ -62,10 +62,12 @@ class TreeManager(BaseManager):     #BaseManagerWithFilter):
     def archive_tree_root(self):
         """Get archived tree root object.
 
+        This loads the whole archive, if it's not loaded already.
+
         Returns:
             (TaskRoot): archived tree root object.
         """
-        return self._archive_tree_root
+        return self._tree_root.archive_root
 
     def iter_tree(self, include_root=False):
         """Iterate through all tree items.
@@ -304,7 +306,10 @@ class TreeManager(BaseManager):     #BaseManagerWithFilter):
         )
 
     def remove_items(self, tree_items):
-        """Remove an existing tree item from its parent's children dict.
+        """Remove existing tree items from their parents' children dicts.
+
+        Multiple items are removed in a single edit transaction, so views
+        are only updated once.
 
         Args:
             tree_items (list(BaseTaskItem)): the tree items to remove.
@@ -313,9 +318,12 @@ class TreeManager(BaseManager):     #BaseManagerWithFilter):
             (bool): whether or not edit was successful (ie. at least one item
                 was removed).
         """
+        if len(tree_items) == 1:
+            return self.remove_item(tree_items[0])
         success = False
-        for tree_item in tree_items:
-            success = self.remove_item(tree_item, stack=success) or success
+        with edit_log.transaction("RemoveItems"):
+            for tree_item in tree_items:
+                success = self.remove_item(tree_item) or success
         return success
 
     @require_class((Task, TaskCategory), raise_error=True)
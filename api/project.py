@@ -4,7 +4,10 @@ import os
 
 from .calendar import Calendar
 from .common.user_prefs import ProjectUserPrefs
+from .edit import edit_log
+from .edit.edit_journal import EditJournal, JournalComponent
 from .filter import Filterer
+from .project_database import DatabaseLayout, ProjectDatabase
 from .managers import (
     FilterManager,
     HistoryManager,
@@ -22,7 +25,9 @@ from .serialization.serializable import (
 from .serialization import file_utils
 from .tracker import Tracker
 from .tree import TaskRoot
-from .utils import backup_git_repo
+from .tree.archive_task_root import ArchiveTaskRoot
+from .tree.history_store import HistoryStore
+from .git_backup import GitBackupEngine
 
 
 class ProjectTree(object):
@@ -41,6 +46,8 @@ class ProjectTree(object):
     FILTERER_FILE_NAME = "filterer.json"
     # NOTES_FILE_NAME = "notes.txt"
     USER_PREFS_FILE_NAME = "user_prefs.json"
+    EDIT_JOURNAL_FILE_NAME = "edit_journal.jsonl"
+    DATABASE_FILE_NAME = "project.sqlite"
 
     def __init__(self, project_root_path):
         """Initialize struct.
@@ -149,6 +156,56 @@ class ProjectTree(object):
         """
         return os.path.join(self._project_root_path, self.USER_PREFS_FILE_NAME)
 
+    @property
+    def edit_journal_file(self):
+        """Get file path for edit journal.
+
+        Returns:
+            (str): path to edit journal file.
+        """
+        return os.path.join(
+            self._project_root_path,
+            self.EDIT_JOURNAL_FILE_NAME,
+        )
+
+    @property
+    def database_file(self):
+        """Get file path for project database.
+
+        Returns:
+            (str): path to project database file.
+        """
+        return os.path.join(self._project_root_path, self.DATABASE_FILE_NAME)
+
+
+class ProjectLoadStage(object):
+    """Struct representing the stages of loading a project.
+
+    The core stages load everything needed to show and edit the task tree.
+    The calendar stages can then be loaded afterwards (eg. in the
+    background), as only the calendar-based tabs need them.
+    """
+    TASKS = "Tasks"
+    ARCHIVE_TASKS = "Archive Tasks"
+    TRACKER = "Tracker"
+    FILTERER = "Filterer"
+    USER_PREFS = "User Prefs"
+    CALENDAR = "Calendar"
+    ARCHIVE_CALENDAR = "Archive Calendar"
+
+    CORE_STAGES = [
+        TASKS,
+        ARCHIVE_TASKS,
+        TRACKER,
+        FILTERER,
+        USER_PREFS,
+    ]
+    CALENDAR_STAGES = [
+        CALENDAR,
+        ARCHIVE_CALENDAR,
+    ]
+    ALL = CORE_STAGES + CALENDAR_STAGES
+
 
 class Project(CustomSerializable):
     """Class representing a full scheduler project.
@@ -165,10 +222,35 @@ class Project(CustomSerializable):
         - Autosaves subtree
         - Archive subtree
         - User preferences
+        - Edit journal
+
+    The edit journal records all edits made since the project was last
+    saved. If the application closes without saving (eg. due to a crash)
+    the journal is replayed on top of the saved data the next time the
+    project is loaded.
+
+    The archive components are loaded lazily: archived task categories are
+    only read when items in them are needed, and the archive calendar is
+    only read when it's first accessed. Neither is rewritten on save unless
+    it has been loaded and (for the archive tasks) modified.
+
+    If the project directory contains a project database, the task root,
+    calendar, tracker and filterer are read from and written to that instead
+    of their json files and directories. Each load stage then only reads
+    the database rows of its own component, and saves only write the rows
+    that have changed. The archive, user prefs and edit journal are still
+    saved as files.
     """
     _SAVE_TYPE = SaveType.DIRECTORY
     _STORE_SAVE_PATH = True
     _MARKER_FILE = "scheduler_project{0}".format(SerializableFileTypes.MARKER)
+    COMPRESS_ARCHIVE_PREF = ["archive", "compress"]
+    _DATABASE_LAYOUTS = {
+        JournalComponent.TASK_ROOT: DatabaseLayout.TREE,
+        JournalComponent.CALENDAR: DatabaseLayout.CALENDAR,
+        JournalComponent.TRACKER: DatabaseLayout.COMPONENT,
+        JournalComponent.FILTERER: DatabaseLayout.COMPONENT,
+    }
 
     # # Component names
     # TASK_NAME = "tasks"
@@ -177,7 +259,7 @@ class Project(CustomSerializable):
     # TRACKER_NAME = "tracker"
     # HISTORY_NAME = "history"
 
-    def __init__(self, project_root_path):
+    def __init__(self, project_root_path, load_data=True):
         """Initialize project.
 
         Currently a project needs a directory path in order to be started.
@@ -188,15 +270,35 @@ class Project(CustomSerializable):
 
         Args:
             project_root_path (str): path to root of project.
-        """
+            load_data (bool): if False, don't load the project components
+                yet. They must then be loaded by calling load_stage for
+                each stage in turn (eg. using a ProjectLoader).
+        """
+        self._edit_journal = None
+        self._has_recovered_edits = False
+        self._journal_snapshots = {}
+        self._journal_item_records = []
+        self._journal_history_records = []
+        self._task_root = None
+        self._archive_task_root = None
+        self._calendar = None
+        self._archive_calendar = None
+        self._archive_calendar_directory = None
+        self._tracker = None
+        self._filterer = None
+        self._user_prefs = None
         self.set_project_path(project_root_path)
-        self._load_project_data()
+        self._use_database = os.path.isfile(self._project_tree.database_file)
+        if load_data:
+            self._load_project_data()
         self._filter_managers = {}
         self._tree_manager = None
         self._schedule_manager = None
         self._planner_manager = None
         self._history_manager = None
         self._tracker_manager = None
+        self._git_backup_engine = None
+        self._history_store = None
 
     def set_project_path(self, project_root_path):
         """Set project path to given directory.
@@ -213,38 +315,240 @@ class Project(CustomSerializable):
         self._autosaves_tree = self._project_tree.autosaves_tree
         self._archive_tree = self._project_tree.archive_tree
 
-    def _load_project_data(self):
-        """Load all project classes from files."""
-        self._task_root = TaskRoot.safe_read(
+    @property
+    def _save_type(self):
+        """Get save type of project.
+
+        Returns:
+            (SaveType): database save type if the project components are
+                stored in a project database, else directory save type.
+        """
+        if self._use_database:
+            return SaveType.DATABASE
+        return self._SAVE_TYPE
+
+    def get_database(self):
+        """Get database that project components are stored in, if used.
+
+        Returns:
+            (ProjectDatabase or None): the project database, if the project
+                is stored in one.
+        """
+        if not self._use_database:
+            return None
+        return ProjectDatabase(self._project_tree.database_file)
+
+    def _read_component(
+            self,
+            component_class,
+            component_name,
+            path,
+            snapshots,
+            *args,
+            **kwargs):
+        """Read project component, using edit journal snapshot if one exists.
+
+        Components stored in the project database are read from there,
+        and any that haven't yet been written to it are created empty.
+        Any journal item records for the component are applied to its dict
+        before it's deserialized.
+
+        Args:
+            component_class (class): BaseSerializable subclass to read.
+            component_name (JournalComponent): name of component in journal.
+            path (str): file or directory to read from.
+            snapshots (dict(str, dict)): latest journal snapshots of each
+                component, keyed by component name.
+            args (list): additional args to pass to read or from_dict.
+            kwargs (dict): additional kwargs to pass to read or from_dict.
+
+        Returns:
+            (BaseSerializable): the component.
+        """
+        item_records = [
+            record for record in self._journal_item_records
+            if record[EditJournal.COMPONENT_KEY] == component_name
+        ]
+        if component_name in snapshots:
+            dict_repr = snapshots[component_name]
+        elif self._use_database and component_name in self._DATABASE_LAYOUTS:
+            dict_repr = self.get_database().read_dict(
+                component_name,
+                self._DATABASE_LAYOUTS[component_name],
+            )
+            if dict_repr is None:
+                if not item_records:
+                    return component_class(*args, **kwargs)
+                dict_repr = component_class._DICT_TYPE()
+        elif not item_records:
+            return component_class.safe_read(path, *args, **kwargs)
+        else:
+            try:
+                if component_class._SAVE_TYPE.is_file_type():
+                    dict_repr = component_class._read_json_file(path)
+                else:
+                    dict_repr = component_class._read_directory(path)
+            except SerializationError:
+                dict_repr = component_class._DICT_TYPE()
+        dict_repr = EditJournal.apply_item_records(dict_repr, item_records)
+        component = component_class.from_dict(dict_repr, *args, **kwargs)
+        if component_class._STORE_SAVE_PATH:
+            component._save_path = path
+        return component
+
+    def _load_tasks(self):
+        """Load task root, applying any edits recorded in the edit journal.
+
+        This also reads the journal recovery data used by the later stages.
+        """
+        snapshots, item_records, history_records = (
+            EditJournal.read_recovery_data(
+                self._project_tree.edit_journal_file
+            )
+        )
+        self._has_recovered_edits = bool(
+            snapshots or item_records or history_records
+        )
+        self._journal_snapshots = snapshots
+        self._journal_item_records = item_records
+        self._journal_history_records = history_records
+        self._task_root = self._read_component(
+            TaskRoot,
+            JournalComponent.TASK_ROOT,
             self._project_tree.tasks_directory,
+            snapshots,
+        )
+        EditJournal.apply_history_records(
+            self._task_root,
+            self._get_journal_history_records(JournalComponent.TASK_ROOT),
         )
-        self._archive_task_root = TaskRoot.safe_read(
+
+    def _load_archive_tasks(self):
+        """Load archive task root and apply any journal edits to it.
+
+        Unless the journal has a snapshot of the archive, this only reads
+        the archive's category order and path index, and the categories
+        are read as they're needed.
+        """
+        self._archive_task_root = self._read_component(
+            ArchiveTaskRoot,
+            JournalComponent.ARCHIVE_TASK_ROOT,
             self._archive_tree.tasks_directory,
+            self._journal_snapshots,
             name=TaskRoot.ARCHIVE_ROOT_NAME,
         )
         self._task_root.set_archive_root(self._archive_task_root)
-
-        self._calendar = Calendar.safe_read(
-            self._project_tree.calendar_directory,
-            self._task_root,
-        )
-        self._archive_calendar = Calendar.safe_read(
-            self._archive_tree.calendar_directory,
+        EditJournal.apply_history_records(
             self._task_root,
+            self._get_journal_history_records(
+                JournalComponent.ARCHIVE_TASK_ROOT
+            ),
         )
 
-        self._tracker = Tracker.safe_read(
+    def _load_tracker(self):
+        """Load tracker."""
+        self._tracker = self._read_component(
+            Tracker,
+            JournalComponent.TRACKER,
             self._project_tree.tracker_file,
+            self._journal_snapshots,
             self._task_root,
         )
-        self._filterer = Filterer.safe_read(
+
+    def _load_filterer(self):
+        """Load filterer."""
+        self._filterer = self._read_component(
+            Filterer,
+            JournalComponent.FILTERER,
             self._project_tree.filterer_file,
+            self._journal_snapshots,
         )
+
+    def _load_user_prefs(self):
+        """Load project user prefs."""
         self._user_prefs = ProjectUserPrefs.safe_read(
             self._project_tree.project_user_prefs_file,
             self._task_root,
         )
 
+    def _load_calendar(self):
+        """Load calendar."""
+        self._calendar = self._read_component(
+            Calendar,
+            JournalComponent.CALENDAR,
+            self._project_tree.calendar_directory,
+            self._journal_snapshots,
+            self._task_root,
+        )
+
+    def _load_archive_calendar(self):
+        """Load archive calendar if the journal has a snapshot of it.
+
+        Otherwise, it's left to be read from disk when it's first accessed.
+        """
+        self._archive_calendar = None
+        self._archive_calendar_directory = self._archive_tree.calendar_directory
+        if JournalComponent.ARCHIVE_CALENDAR in self._journal_snapshots:
+            self._read_archive_calendar()
+
+    def _read_archive_calendar(self):
+        """Read archive calendar from directory project was loaded from."""
+        self._archive_calendar = self._read_component(
+            Calendar,
+            JournalComponent.ARCHIVE_CALENDAR,
+            self._archive_calendar_directory,
+            self._journal_snapshots,
+            self._task_root,
+        )
+
+    def _get_journal_history_records(self, component_name):
+        """Get journal task history records for the given task root.
+
+        Args:
+            component_name (JournalComponent): name of task root component.
+
+        Returns:
+            (list(dict)): the task history records for that component.
+        """
+        return [
+            record for record in self._journal_history_records
+            if record.get(EditJournal.COMPONENT_KEY) == component_name
+        ]
+
+    def load_stage(self, stage):
+        """Load the project components for the given load stage.
+
+        Stages must be loaded in the order given by ProjectLoadStage.ALL,
+        as later stages rely on the components loaded by earlier ones.
+
+        Args:
+            stage (ProjectLoadStage): the stage to load.
+        """
+        {
+            ProjectLoadStage.TASKS: self._load_tasks,
+            ProjectLoadStage.ARCHIVE_TASKS: self._load_archive_tasks,
+            ProjectLoadStage.TRACKER: self._load_tracker,
+            ProjectLoadStage.FILTERER: self._load_filterer,
+            ProjectLoadStage.USER_PREFS: self._load_user_prefs,
+            ProjectLoadStage.CALENDAR: self._load_calendar,
+            ProjectLoadStage.ARCHIVE_CALENDAR: self._load_archive_calendar,
+        }[stage]()
+        if stage == ProjectLoadStage.ALL[-1]:
+            self._journal_snapshots = {}
+            self._journal_item_records = []
+            self._journal_history_records = []
+            if self._edit_journal is not None:
+                self.start_edit_journal()
+
+    def _load_project_data(self):
+        """Load all project classes from files.
+
+        Any edits recorded in the edit journal since the last save are
+        also applied here.
+        """
+        for stage in ProjectLoadStage.ALL:
+            self.load_stage(stage)
+
     # TODO: this is work in progress - needs manager reload methods too
     # TODO: maybe allow to reload with no path?
     def reload(self, new_path):
@@ -254,6 +558,7 @@ class Project(CustomSerializable):
             new_path (str): new path to load.
         """
         self.set_project_path(new_path)
+        self._use_database = os.path.isfile(self._project_tree.database_file)
         self._load_project_data()
         self.reload_managers()
 
@@ -314,11 +619,19 @@ class Project(CustomSerializable):
 
     @property
     def archive_calendar(self):
-        """Get archive calendar.
+        """Get archive calendar, reading it from disk if not yet loaded.
 
         Returns:
             (Calendar): archived calendar object.
         """
+        if (self._archive_calendar is None
+                and self._archive_calendar_directory is not None):
+            self._read_archive_calendar()
+            if self._edit_journal is not None:
+                self._edit_journal.set_component(
+                    JournalComponent.ARCHIVE_CALENDAR,
+                    self._archive_calendar,
+                )
         return self._archive_calendar
 
     @property
@@ -330,6 +643,62 @@ class Project(CustomSerializable):
         """
         return self._user_prefs
 
+    @property
+    def has_recovered_edits(self):
+        """Check if unsaved edits were recovered from journal on load.
+
+        Returns:
+            (bool): whether or not project data includes recovered edits.
+        """
+        return self._has_recovered_edits
+
+    def start_edit_journal(self):
+        """Start recording edits from the edit log in the edit journal.
+
+        Returns:
+            (EditJournal): the edit journal.
+        """
+        if self._edit_journal is not None:
+            self._edit_journal.close()
+        self._edit_journal = EditJournal(
+            self._project_tree.edit_journal_file,
+            {
+                JournalComponent.TASK_ROOT: self._task_root,
+                JournalComponent.ARCHIVE_TASK_ROOT: self._archive_task_root,
+                JournalComponent.CALENDAR: self._calendar,
+                JournalComponent.ARCHIVE_CALENDAR: self._archive_calendar,
+                JournalComponent.TRACKER: self._tracker,
+                JournalComponent.FILTERER: self._filterer,
+            },
+        )
+        edit_log.set_edit_journal(self._edit_journal)
+        return self._edit_journal
+
+    def flush_edit_journal(self, wait=False):
+        """Write any pending edit journal records to disk.
+
+        Args:
+            wait (bool): if True, wait for the records to be written before
+                returning. Otherwise they're written in the background.
+        """
+        if self._edit_journal is not None:
+            self._edit_journal.flush()
+            if wait:
+                self._edit_journal.wait()
+
+    def discard_edit_journal(self):
+        """Discard all edits recorded in the edit journal.
+
+        This should be called when the user chooses not to save their
+        changes, so that they aren't recovered on the next load.
+        """
+        if self._edit_journal is not None:
+            self._edit_journal.clear()
+            self._edit_journal.wait()
+        elif os.path.isfile(self._project_tree.edit_journal_file):
+            os.remove(self._project_tree.edit_journal_file)
+        self._has_recovered_edits = False
+
     def get_filter_manager(self, filter_type):
         """Get a filter manager for this project with the given filter type.
 
@@ -423,31 +792,85 @@ class Project(CustomSerializable):
             )
         return self._history_manager
 
+    def get_history_store(self):
+        """Get columnar history store for batch queries of task histories.
+
+        Note that this requires numpy to be installed to run queries.
+
+        Returns:
+            (HistoryStore): history store.
+        """
+        if self._history_store is None:
+            self._history_store = HistoryStore()
+        return self._history_store
+
     # TODO: find a way to avoid writing entire tree, should be able to just
     # save edited components
     def _write_all_components(self, project_tree):
         """Write all components to the given project tree.
 
+        The archive components are skipped if they haven't changed since
+        they were read from or last written to that project tree.
+
         Args:
             project_tree (ProjectTree): project tree to write to.
         """
-        self._task_root.write(project_tree.tasks_directory)
-        self._calendar.write(project_tree.calendar_directory)
-        self._tracker.write(project_tree.tracker_file)
-        self._filterer.write(project_tree.filterer_file)
-        self._archive_task_root.write(
-            project_tree.archive_tree.tasks_directory
-        )
-        self._archive_calendar.write(
-            project_tree.archive_tree.calendar_directory
+        if self._use_database:
+            self._write_database_components(project_tree)
+        else:
+            self._task_root.write(project_tree.tasks_directory)
+            self._calendar.write(project_tree.calendar_directory)
+            self._tracker.write(project_tree.tracker_file)
+            self._filterer.write(project_tree.filterer_file)
+        self._write_archive_components(project_tree)
+
+    def _write_database_components(self, project_tree):
+        """Write database components to the given project tree's database.
+
+        Args:
+            project_tree (ProjectTree): project tree to write to.
+        """
+        components = {
+            JournalComponent.TASK_ROOT: self._task_root,
+            JournalComponent.CALENDAR: self._calendar,
+            JournalComponent.TRACKER: self._tracker,
+            JournalComponent.FILTERER: self._filterer,
+        }
+        ProjectDatabase(project_tree.database_file).write_dicts({
+            name: (self._DATABASE_LAYOUTS[name], component.to_dict())
+            for name, component in components.items()
+        })
+
+    def _write_archive_components(self, project_tree):
+        """Write archive components to the given project tree, if needed.
+
+        Args:
+            project_tree (ProjectTree): project tree to write to.
+        """
+        archive_tree = project_tree.archive_tree
+        if not os.path.exists(archive_tree.root_directory):
+            os.mkdir(archive_tree.root_directory)
+        self._archive_task_root.set_compress(
+            bool(self._user_prefs.get_attribute(self.COMPRESS_ARCHIVE_PREF))
         )
+        if self._archive_task_root.needs_write(archive_tree.tasks_directory):
+            self._archive_task_root.write(archive_tree.tasks_directory)
+
+        # an unloaded archive calendar is unchanged, so only needs writing
+        # if we're saving to a different directory
+        if (self._archive_calendar is not None
+                or os.path.normpath(archive_tree.calendar_directory)
+                != os.path.normpath(self._archive_calendar_directory)):
+            self.archive_calendar.write(archive_tree.calendar_directory)
 
     @classmethod
-    def from_directory(cls, project_root_path):
+    def from_directory(cls, project_root_path, load_data=True):
         """Read project from directory path.
 
         Args:
             project_root_path (str): path to root of project.
+            load_data (bool): if False, don't load the project components
+                yet.
 
         Returns:
             (Project): class instance.
@@ -462,7 +885,7 @@ class Project(CustomSerializable):
                     project_root_path
                 )
             )
-        return cls(project_root_path)
+        return cls(project_root_path, load_data=load_data)
 
     def to_directory(self, directory_path):
         """Write project to directory path.
@@ -476,6 +899,19 @@ class Project(CustomSerializable):
             with open(os.path.join(directory_path, self._MARKER_FILE), "w+"):
                 pass
         self._write_all_components(self._project_tree)
+        self.discard_edit_journal()
+        if self._edit_journal is not None:
+            self.start_edit_journal()
+
+    def convert_to_database(self):
+        """Store project components in a project database from now on.
+
+        The components are written to a new database in the project
+        directory, which is then used for all subsequent reads and writes.
+        The existing component files are left in place.
+        """
+        self._use_database = True
+        self._write_database_components(self._project_tree)
 
     # TODO: also autosave user prefs?
     def autosave(self):
@@ -488,10 +924,39 @@ class Project(CustomSerializable):
         """Write project user prefs file."""
         self._user_prefs.write(self._project_tree.project_user_prefs_file)
 
-    def git_backup(self):
-        """Backup project data with git push.
+    def get_git_backup_engine(self):
+        """Get git backup engine for project.
+
+        The engine is kept for the whole session so that it can skip
+        backups when nothing has changed since the last one.
 
         Returns:
-            (str or None): error message, if an error occurred.
+            (GitBackupEngine): the git backup engine.
         """
-        return backup_git_repo(self.root_directory)
+        if (self._git_backup_engine is None
+                or self._git_backup_engine.repo_path != self.root_directory):
+            self._git_backup_engine = GitBackupEngine(self.root_directory)
+        return self._git_backup_engine
+
+    def git_backup(self, background=False, progress_callback=None):
+        """Backup project data with git push.
+
+        Args:
+            background (bool): if True, run the backup on a background
+                thread. Its progress and result can then be queried from
+                the git backup engine.
+            progress_callback (function or None): function to call with the
+                backup stage and progress fraction as the backup runs.
+
+        Returns:
+            (str or None): error message, if an error occurred. When run in
+                the background, this is only returned if the backup couldn't
+                be started.
+        """
+        engine = self.get_git_backup_engine()
+        if background:
+            if not engine.run_in_background(
+                    progress_callback=progress_callback):
+                return "A git backup is already running"
+            return None
+        return engine.run(progress_callback=progress_callback)
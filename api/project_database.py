@@ -0,0 +1,713 @@
+"""Sqlite database for storing project components.
+
+This is an alternative to the json files and directories that the project
+components are usually saved to. Each component is still serialized to and
+from the same dict representation, but the dicts are split into rows of the
+following tables:
+    tree_items:         one row per task root, category or task.
+    history:            one row per field of each task history entry.
+    scheduled_items:    one row per scheduled item, keyed by date.
+    planned_items:      one row per planned item, keyed by period.
+    repeat_items:       one row per repeat scheduled item.
+    components:         one row for each other component (eg. the tracker
+        and filterer), storing its whole dict.
+
+Writes compare the new rows against the stored ones and only delete, insert
+or replace the rows that have changed, all in a single transaction. The
+history and scheduled item tables are indexed by date and task so that they
+can also be queried directly for a date range or task without reading the
+whole component.
+"""
+
+from collections import OrderedDict
+from contextlib import contextmanager
+import json
+import sqlite3
+
+from .calendar import Calendar
+from .calendar.calendar_period import (
+    CalendarDay,
+    CalendarMonth,
+    CalendarWeek,
+    CalendarYear,
+)
+from .common.date_time import Date
+from .serialization.serializable import SerializationError
+from .tree import Task, TaskCategory, TaskRoot
+from .tree.task_history import TaskHistory
+
+
+class DatabaseLayout(object):
+    """Struct representing the ways a component's dict is split into rows."""
+    TREE = "tree"
+    CALENDAR = "calendar"
+    COMPONENT = "component"
+
+
+class PlannedPeriodType(object):
+    """Struct representing the calendar periods planned items belong to."""
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+    YEAR = "year"
+
+
+_TABLES = OrderedDict([
+    (
+        "tree_items",
+        (
+            "component TEXT, path TEXT, name TEXT, parent_path TEXT, "
+            "child_key TEXT, position INTEGER, data TEXT, "
+            "PRIMARY KEY (component, path)"
+        ),
+    ),
+    (
+        "history",
+        (
+            "component TEXT, task_path TEXT, date TEXT, time TEXT, "
+            "field TEXT, value TEXT, "
+            "PRIMARY KEY (component, task_path, date, time, field)"
+        ),
+    ),
+    (
+        "scheduled_items",
+        (
+            "component TEXT, date TEXT, position INTEGER, data TEXT, "
+            "PRIMARY KEY (component, date, position)"
+        ),
+    ),
+    (
+        "planned_items",
+        (
+            "component TEXT, period_type TEXT, period TEXT, "
+            "position INTEGER, data TEXT, "
+            "PRIMARY KEY (component, period_type, period, position)"
+        ),
+    ),
+    (
+        "repeat_items",
+        (
+            "component TEXT, position INTEGER, data TEXT, "
+            "PRIMARY KEY (component, position)"
+        ),
+    ),
+    (
+        "components",
+        "component TEXT, data TEXT, PRIMARY KEY (component)",
+    ),
+])
+
+_INDEXES = [
+    "tree_items_parent ON tree_items (component, parent_path)",
+    "history_date ON history (component, date)",
+]
+
+# key columns of each table, after the component column
+_KEY_COLUMNS = {
+    "tree_items": ("path",),
+    "history": ("task_path", "date", "time", "field"),
+    "scheduled_items": ("date", "position"),
+    "planned_items": ("period_type", "period", "position"),
+    "repeat_items": ("position",),
+    "components": (),
+}
+
+# value columns of each table
+_VALUE_COLUMNS = {
+    "tree_items": ("name", "parent_path", "child_key", "position", "data"),
+    "history": ("value",),
+    "scheduled_items": ("data",),
+    "planned_items": ("data",),
+    "repeat_items": ("data",),
+    "components": ("data",),
+}
+
+_LAYOUT_TABLES = {
+    DatabaseLayout.TREE: ["tree_items", "history"],
+    DatabaseLayout.CALENDAR: [
+        "scheduled_items",
+        "planned_items",
+        "repeat_items",
+    ],
+    DatabaseLayout.COMPONENT: ["components"],
+}
+
+_TREE_CHILD_KEYS = [
+    TaskRoot.CATEGORIES_KEY,
+    TaskCategory.CATEGORIES_KEY,
+    TaskCategory.TASKS_KEY,
+    Task.TASKS_KEY,
+]
+_TREE_PATH_SEPARATOR = "/"
+_NO_TIME = ""
+
+
+def _to_json(value):
+    """Serialize value as json string for storing in database.
+
+    Args:
+        value (object): json-serializable value.
+
+    Returns:
+        (str): json string.
+    """
+    return json.dumps(value, separators=(",", ":"))
+
+
+def _from_json(json_string):
+    """Deserialize json string stored in database.
+
+    Args:
+        json_string (str): json string.
+
+    Returns:
+        (object): deserialized value, with dicts read as OrderedDicts.
+    """
+    return json.loads(json_string, object_pairs_hook=OrderedDict)
+
+
+def _get_tree_rows(tree_dict):
+    """Split task root dict into tree item and history rows.
+
+    Tree items are keyed by their path from the root, with the root itself
+    given an empty path.
+
+    Args:
+        tree_dict (dict): task root dict.
+
+    Returns:
+        (dict(str, dict(tuple, tuple))): rows for each table, keyed by their
+            key columns.
+    """
+    tree_rows = {}
+    history_rows = {}
+
+    def add_item(item_dict, path, name, parent_path, child_key, position):
+        data = OrderedDict()
+        for key, value in item_dict.items():
+            if key in _TREE_CHILD_KEYS and isinstance(value, dict):
+                for i, (child_name, child_dict) in enumerate(value.items()):
+                    child_path = child_name
+                    if path:
+                        child_path = _TREE_PATH_SEPARATOR.join(
+                            [path, child_name]
+                        )
+                    add_item(child_dict, child_path, child_name, path, key, i)
+            elif key == Task.HISTORY_KEY and isinstance(value, dict):
+                for date_str, date_dict in value.items():
+                    for field, field_value in date_dict.items():
+                        if field != TaskHistory.TIMES_KEY:
+                            history_rows[(path, date_str, _NO_TIME, field)] = (
+                                _to_json(field_value),
+                            )
+                            continue
+                        for time_str, time_dict in field_value.items():
+                            for time_field, time_value in time_dict.items():
+                                key_ = (path, date_str, time_str, time_field)
+                                history_rows[key_] = (_to_json(time_value),)
+            else:
+                data[key] = value
+        tree_rows[(path,)] = (
+            name,
+            parent_path,
+            child_key,
+            position,
+            _to_json(data),
+        )
+
+    add_item(tree_dict, "", "", None, None, 0)
+    return {"tree_items": tree_rows, "history": history_rows}
+
+
+def _get_calendar_rows(calendar_dict):
+    """Split calendar dict into scheduled, planned and repeat item rows.
+
+    Args:
+        calendar_dict (dict): calendar dict.
+
+    Returns:
+        (dict(str, dict(tuple, tuple))): rows for each table, keyed by their
+            key columns.
+    """
+    scheduled_rows = {}
+    planned_rows = {}
+    repeat_rows = {}
+
+    def add_planned_items(item_dicts, period_type, period):
+        for i, item_dict in enumerate(item_dicts):
+            planned_rows[(period_type, period, i)] = (_to_json(item_dict),)
+
+    for i, item_dict in enumerate(
+            calendar_dict.get(Calendar.REPEAT_ITEMS_KEY, [])):
+        repeat_rows[(i,)] = (_to_json(item_dict),)
+
+    years_dict = calendar_dict.get(Calendar.YEARS_KEY, {})
+    for year_name, year_dict in years_dict.items():
+        add_planned_items(
+            year_dict.get(CalendarYear.PLANNED_ITEMS_KEY, []),
+            PlannedPeriodType.YEAR,
+            year_name,
+        )
+        months_dict = year_dict.get(CalendarYear.MONTHS_KEY, {})
+        for month_name, month_dict in months_dict.items():
+            add_planned_items(
+                month_dict.get(CalendarMonth.PLANNED_ITEMS_KEY, []),
+                PlannedPeriodType.MONTH,
+                "{0}-{1:02d}".format(
+                    year_name,
+                    Date.month_int_from_string(month_name),
+                ),
+            )
+            weeks_dict = month_dict.get(CalendarMonth.WEEKS_KEY, {})
+            for week_dict in weeks_dict.values():
+                days_dict = week_dict.get(CalendarWeek.DAYS_KEY, {})
+                for day_name, day_dict in days_dict.items():
+                    for j, item_dict in enumerate(
+                            day_dict.get(CalendarDay.SCHEDULED_ITEMS_KEY, [])):
+                        scheduled_rows[(day_name, j)] = (_to_json(item_dict),)
+                    add_planned_items(
+                        day_dict.get(CalendarDay.PLANNED_ITEMS_KEY, []),
+                        PlannedPeriodType.DAY,
+                        day_name,
+                    )
+                    add_planned_items(
+                        day_dict.get(CalendarDay.PLANNED_WEEK_ITEMS_KEY, []),
+                        PlannedPeriodType.WEEK,
+                        day_name,
+                    )
+    return {
+        "scheduled_items": scheduled_rows,
+        "planned_items": planned_rows,
+        "repeat_items": repeat_rows,
+    }
+
+
+def _add_history_row(history_dict, date_str, time_str, field, value):
+    """Add history row to history dict.
+
+    Args:
+        history_dict (OrderedDict): history dict to add to.
+        date_str (str): date of history entry.
+        time_str (str): time of history entry, or empty if the field is for
+            the whole date.
+        field (str): name of field.
+        value (str): json string of field value.
+    """
+    date_dict = history_dict.setdefault(date_str, OrderedDict())
+    if time_str != _NO_TIME:
+        times_dict = date_dict.setdefault(TaskHistory.TIMES_KEY, OrderedDict())
+        date_dict = times_dict.setdefault(time_str, OrderedDict())
+    date_dict[field] = _from_json(value)
+
+
+class ProjectDatabase(object):
+    """Sqlite database storing the dict representations of components."""
+    def __init__(self, database_path):
+        """Initialize.
+
+        Args:
+            database_path (str): path to database file. This is created
+                on the first write if it doesn't exist.
+        """
+        self._database_path = database_path
+
+    @property
+    def database_path(self):
+        """Get path to database file.
+
+        Returns:
+            (str): database file path.
+        """
+        return self._database_path
+
+    @contextmanager
+    def _connect(self):
+        """Context manager to connect to database, within a transaction.
+
+        The transaction is committed if the block succeeds and rolled back
+        if it raises an exception.
+
+        Yields:
+            (sqlite3.Connection): the database connection.
+        """
+        try:
+            connection = sqlite3.connect(self._database_path)
+        except sqlite3.Error as e:
+            raise SerializationError(
+                "Could not open database {0}: {1}".format(
+                    self._database_path,
+                    e,
+                )
+            )
+        try:
+            with connection:
+                for table, columns in _TABLES.items():
+                    connection.execute(
+                        "CREATE TABLE IF NOT EXISTS {0} ({1})".format(
+                            table,
+                            columns,
+                        )
+                    )
+                for index in _INDEXES:
+                    connection.execute(
+                        "CREATE INDEX IF NOT EXISTS {0}".format(index)
+                    )
+                yield connection
+        finally:
+            connection.close()
+
+    def _select_rows(self, connection, table, component):
+        """Get all rows of the given component from a table.
+
+        Args:
+            connection (sqlite3.Connection): the database connection.
+            table (str): name of table.
+            component (str): name of component.
+
+        Returns:
+            (dict(tuple, tuple)): the rows' value columns, keyed by their
+                key columns.
+        """
+        key_columns = _KEY_COLUMNS[table]
+        value_columns = _VALUE_COLUMNS[table]
+        cursor = connection.execute(
+            "SELECT {0} FROM {1} WHERE component = ?".format(
+                ", ".join(key_columns + value_columns),
+                table,
+            ),
+            (component,),
+        )
+        num_keys = len(key_columns)
+        return {row[:num_keys]: row[num_keys:] for row in cursor}
+
+    def _write_rows(self, connection, table, component, rows):
+        """Update rows of the given component in a table.
+
+        Only rows that have been removed or changed are written.
+
+        Args:
+            connection (sqlite3.Connection): the database connection.
+            table (str): name of table.
+            component (str): name of component.
+            rows (dict(tuple, tuple)): the new rows' value columns, keyed by
+                their key columns.
+
+        Returns:
+            (int): number of rows deleted, inserted or replaced.
+        """
+        key_columns = _KEY_COLUMNS[table]
+        value_columns = _VALUE_COLUMNS[table]
+        old_rows = self._select_rows(connection, table, component)
+        deleted_keys = [key for key in old_rows if key not in rows]
+        changed_rows = [
+            (component,) + key + values
+            for key, values in rows.items()
+            if old_rows.get(key) != values
+        ]
+        if deleted_keys:
+            connection.executemany(
+                "DELETE FROM {0} WHERE {1}".format(
+                    table,
+                    " AND ".join(
+                        "{0} = ?".format(column)
+                        for column in ("component",) + key_columns
+                    ),
+                ),
+                [(component,) + key for key in deleted_keys],
+            )
+        if changed_rows:
+            columns = ("component",) + key_columns + value_columns
+            connection.executemany(
+                "INSERT OR REPLACE INTO {0} ({1}) VALUES ({2})".format(
+                    table,
+                    ", ".join(columns),
+                    ", ".join("?" for _ in columns),
+                ),
+                changed_rows,
+            )
+        return len(deleted_keys) + len(changed_rows)
+
+    def write_dicts(self, component_dicts):
+        """Write component dicts to the database in a single transaction.
+
+        Args:
+            component_dicts (dict(str, tuple(DatabaseLayout, dict))): the
+                layout and dict representation of each component to write,
+                keyed by component name.
+
+        Returns:
+            (int): number of rows deleted, inserted or replaced.
+        """
+        num_changes = 0
+        with self._connect() as connection:
+            for component, (layout, dict_repr) in component_dicts.items():
+                if layout == DatabaseLayout.TREE:
+                    table_rows = _get_tree_rows(dict_repr)
+                elif layout == DatabaseLayout.CALENDAR:
+                    table_rows = _get_calendar_rows(dict_repr)
+                else:
+                    table_rows = {"components": {(): (_to_json(dict_repr),)}}
+                for table, rows in table_rows.items():
+                    num_changes += self._write_rows(
+                        connection,
+                        table,
+                        component,
+                        rows,
+                    )
+        return num_changes
+
+    def has_component(self, component, layout):
+        """Check if database has any rows for the given component.
+
+        Args:
+            component (str): name of component.
+            layout (DatabaseLayout): layout of component.
+
+        Returns:
+            (bool): whether or not component is in database.
+        """
+        with self._connect() as connection:
+            for table in _LAYOUT_TABLES[layout]:
+                cursor = connection.execute(
+                    "SELECT 1 FROM {0} WHERE component = ? LIMIT 1".format(
+                        table
+                    ),
+                    (component,),
+                )
+                if cursor.fetchone() is not None:
+                    return True
+        return False
+
+    def read_dict(self, component, layout):
+        """Read dict representation of component from database.
+
+        Args:
+            component (str): name of component.
+            layout (DatabaseLayout): layout of component.
+
+        Returns:
+            (dict or None): dict representation of component, or None if
+                it isn't in the database.
+        """
+        if not self.has_component(component, layout):
+            return None
+        with self._connect() as connection:
+            if layout == DatabaseLayout.TREE:
+                return self._read_tree_dict(connection, component)
+            if layout == DatabaseLayout.CALENDAR:
+                return self._read_calendar_dict(connection, component)
+            cursor = connection.execute(
+                "SELECT data FROM components WHERE component = ?",
+                (component,),
+            )
+            return _from_json(cursor.fetchone()[0])
+
+    def _read_tree_dict(self, connection, component):
+        """Read task root dict from tree item and history rows.
+
+        Args:
+            connection (sqlite3.Connection): the database connection.
+            component (str): name of component.
+
+        Returns:
+            (OrderedDict): task root dict.
+        """
+        item_dicts = {}
+        cursor = connection.execute(
+            "SELECT path, name, parent_path, child_key, data "
+            "FROM tree_items WHERE component = ? "
+            "ORDER BY parent_path, child_key, position",
+            (component,),
+        )
+        child_rows = []
+        for path, name, parent_path, child_key, data in cursor:
+            item_dicts[path] = _from_json(data)
+            if parent_path is not None:
+                child_rows.append((path, name, parent_path, child_key))
+        for path, name, parent_path, child_key in child_rows:
+            parent_dict = item_dicts[parent_path]
+            children_dict = parent_dict.setdefault(child_key, OrderedDict())
+            children_dict[name] = item_dicts[path]
+
+        cursor = connection.execute(
+            "SELECT task_path, date, time, field, value "
+            "FROM history WHERE component = ? "
+            "ORDER BY task_path, date, time",
+            (component,),
+        )
+        for task_path, date_str, time_str, field, value in cursor:
+            history_dict = item_dicts[task_path].setdefault(
+                Task.HISTORY_KEY,
+                OrderedDict(),
+            )
+            _add_history_row(history_dict, date_str, time_str, field, value)
+        return item_dicts.get("", OrderedDict())
+
+    def _read_calendar_dict(self, connection, component):
+        """Read calendar dict from scheduled, planned and repeat item rows.
+
+        Each day is given its own single-day week in the calendar dict, as
+        the weeks are only used to group days when deserializing.
+
+        Args:
+            connection (sqlite3.Connection): the database connection.
+            component (str): name of component.
+
+        Returns:
+            (dict): calendar dict.
+        """
+        years_dict = OrderedDict()
+
+        def get_period_dict(year_name, month_int=None, day_name=None):
+            year_dict = years_dict.setdefault(year_name, OrderedDict())
+            if month_int is None:
+                return year_dict
+            months_dict = year_dict.setdefault(
+                CalendarYear.MONTHS_KEY,
+                OrderedDict(),
+            )
+            month_dict = months_dict.setdefault(
+                Date.month_string_from_int(month_int, short=False),
+                OrderedDict(),
+            )
+            if day_name is None:
+                return month_dict
+            weeks_dict = month_dict.setdefault(
+                CalendarMonth.WEEKS_KEY,
+                OrderedDict(),
+            )
+            week_dict = weeks_dict.setdefault(
+                "{0} to {0}".format(day_name),
+                OrderedDict(),
+            )
+            days_dict = week_dict.setdefault(
+                CalendarWeek.DAYS_KEY,
+                OrderedDict(),
+            )
+            return days_dict.setdefault(day_name, OrderedDict())
+
+        def get_day_dict(day_name):
+            return get_period_dict(day_name[:4], int(day_name[5:7]), day_name)
+
+        cursor = connection.execute(
+            "SELECT period_type, period, data FROM planned_items "
+            "WHERE component = ? ORDER BY period, period_type, position",
+            (component,),
+        )
+        for period_type, period, data in cursor:
+            if period_type == PlannedPeriodType.YEAR:
+                period_dict = get_period_dict(period)
+                key = CalendarYear.PLANNED_ITEMS_KEY
+            elif period_type == PlannedPeriodType.MONTH:
+                period_dict = get_period_dict(period[:4], int(period[5:7]))
+                key = CalendarMonth.PLANNED_ITEMS_KEY
+            elif period_type == PlannedPeriodType.WEEK:
+                period_dict = get_day_dict(period)
+                key = CalendarDay.PLANNED_WEEK_ITEMS_KEY
+            else:
+                period_dict = get_day_dict(period)
+                key = CalendarDay.PLANNED_ITEMS_KEY
+            period_dict.setdefault(key, []).append(_from_json(data))
+
+        cursor = connection.execute(
+            "SELECT date, data FROM scheduled_items "
+            "WHERE component = ? ORDER BY date, position",
+            (component,),
+        )
+        for date_str, data in cursor:
+            get_day_dict(date_str).setdefault(
+                CalendarDay.SCHEDULED_ITEMS_KEY,
+                [],
+            ).append(_from_json(data))
+
+        calendar_dict = {}
+        cursor = connection.execute(
+            "SELECT data FROM repeat_items "
+            "WHERE component = ? ORDER BY position",
+            (component,),
+        )
+        repeat_items = [_from_json(data) for data, in cursor]
+        if repeat_items:
+            calendar_dict[Calendar.REPEAT_ITEMS_KEY] = repeat_items
+        if years_dict:
+            calendar_dict[Calendar.YEARS_KEY] = OrderedDict(
+                sorted(years_dict.items())
+            )
+        return calendar_dict
+
+    def get_history(
+            self,
+            component,
+            task_path=None,
+            start_date=None,
+            end_date=None):
+        """Query task history entries, without reading the whole task root.
+
+        Args:
+            component (str): name of task root component.
+            task_path (str or None): path of task to get history for, from
+                the task root. If not given, get history for all tasks.
+            start_date (Date or None): first date to get history for.
+            end_date (Date or None): last date to get history for.
+
+        Returns:
+            (OrderedDict(str, OrderedDict)): history dicts, in the same
+                format as they're serialized, keyed by task path.
+        """
+        conditions = ["component = ?"]
+        values = [component]
+        if task_path is not None:
+            conditions.append("task_path = ?")
+            values.append(task_path)
+        if start_date is not None:
+            conditions.append("date >= ?")
+            values.append(start_date.string())
+        if end_date is not None:
+            conditions.append("date <= ?")
+            values.append(end_date.string())
+        histories = OrderedDict()
+        with self._connect() as connection:
+            cursor = connection.execute(
+                "SELECT task_path, date, time, field, value FROM history "
+                "WHERE {0} ORDER BY task_path, date, time".format(
+                    " AND ".join(conditions)
+                ),
+                values,
+            )
+            for task_path, date_str, time_str, field, value in cursor:
+                history_dict = histories.setdefault(task_path, OrderedDict())
+                _add_history_row(
+                    history_dict,
+                    date_str,
+                    time_str,
+                    field,
+                    value,
+                )
+        return histories
+
+    def get_scheduled_items(self, component, start_date, end_date):
+        """Query scheduled items in date range, without reading the calendar.
+
+        Args:
+            component (str): name of calendar component.
+            start_date (Date): first date to get items for.
+            end_date (Date): last date to get items for.
+
+        Returns:
+            (OrderedDict(str, list(dict))): scheduled item dicts, keyed by
+                date string.
+        """
+        scheduled_items = OrderedDict()
+        with self._connect() as connection:
+            cursor = connection.execute(
+                "SELECT date, data FROM scheduled_items "
+                "WHERE component = ? AND date >= ? AND date <= ? "
+                "ORDER BY date, position",
+                (component, start_date.string(), end_date.string()),
+            )
+            for date_str, data in cursor:
+                scheduled_items.setdefault(date_str, []).append(
+                    _from_json(data)
+                )
+        return scheduled_items
+
@@ -0,0 +1,203 @@
+"""Project loader, for loading project components on a background thread."""
+
+from collections import OrderedDict
+import threading
+import time
+
+from .project import Project, ProjectLoadStage
+from .serialization import item_registry
+
+
+class ProjectLoader(object):
+    """Class to load a project in stages on a background thread.
+
+    The project components are loaded in the order given by the stages in
+    ProjectLoadStage.ALL, with the progress and timings of each stage
+    recorded as they go. Clients can wait for a given stage (eg. for the
+    core stages, so the task tree can be shown) while the remaining stages
+    carry on loading in the background.
+
+    Item registry callbacks triggered while loading the calendar stages are
+    deferred, as they modify tasks that the main thread may already be
+    using. This includes pairing calendar items with their tasks, which
+    adds them to the tasks' lists of calendar items. These are then run on
+    the main thread by the finish method, which must be called once the
+    load is complete.
+    """
+    def __init__(self, project_root_path):
+        """Initialize.
+
+        Args:
+            project_root_path (str): path to root of project.
+        """
+        self.project_root_path = project_root_path
+        self.project = None
+        self.stage = None
+        self.error = None
+        self.timings = OrderedDict()
+        self._stage_events = OrderedDict(
+            (stage, threading.Event()) for stage in ProjectLoadStage.ALL
+        )
+        self._thread = None
+        self._is_finished = False
+
+    @property
+    def progress(self):
+        """Get progress of load.
+
+        Returns:
+            (float): progress, as a fraction between 0 and 1.
+        """
+        num_loaded = len([
+            stage for stage in ProjectLoadStage.ALL
+            if self.is_stage_loaded(stage)
+        ])
+        return num_loaded / len(ProjectLoadStage.ALL)
+
+    @property
+    def is_finished(self):
+        """Check if the load has been finished by calling finish.
+
+        Returns:
+            (bool): whether or not load has finished.
+        """
+        return self._is_finished
+
+    def is_running(self):
+        """Check if the load is currently running in the background.
+
+        Returns:
+            (bool): whether or not the load is running.
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def is_stage_loaded(self, stage):
+        """Check if the given stage has been loaded.
+
+        Note that if the load fails, all stages are marked as done so that
+        clients don't wait forever, so the error attribute should also be
+        checked.
+
+        Args:
+            stage (ProjectLoadStage): the stage to check.
+
+        Returns:
+            (bool): whether or not the stage has been loaded.
+        """
+        return self._stage_events[stage].is_set()
+
+    def wait_for_stage(self, stage=None, timeout=None):
+        """Wait for given stage to be loaded.
+
+        Args:
+            stage (ProjectLoadStage or None): the stage to wait for. If not
+                given, wait for all stages.
+            timeout (float or None): max number of seconds to wait, if given.
+
+        Returns:
+            (bool): whether or not the stage has been loaded.
+        """
+        stage = stage or ProjectLoadStage.ALL[-1]
+        return self._stage_events[stage].wait(timeout)
+
+    def _set_stage(self, stage, progress_callback=None):
+        """Set current stage of load and report progress.
+
+        Args:
+            stage (ProjectLoadStage): stage to set.
+            progress_callback (function or None): function to call with the
+                stage and progress fraction, if given.
+        """
+        self.stage = stage
+        if progress_callback is not None:
+            progress_callback(stage, self.progress)
+
+    def _load(self, progress_callback=None):
+        """Load all project stages.
+
+        Args:
+            progress_callback (function or None): progress callback.
+        """
+        try:
+            for stage in ProjectLoadStage.ALL:
+                self._set_stage(stage, progress_callback)
+                if stage in ProjectLoadStage.CALENDAR_STAGES:
+                    item_registry.ITEM_REGISTRY.set_defer_callbacks(True)
+                start_time = time.perf_counter()
+                self.project.load_stage(stage)
+                self.timings[stage] = time.perf_counter() - start_time
+                self._stage_events[stage].set()
+        except Exception as e:
+            self.error = e
+            for event in self._stage_events.values():
+                event.set()
+        self._set_stage(None, progress_callback)
+
+    def start(self, progress_callback=None):
+        """Start loading project on a background thread.
+
+        Note that the progress callback is called from the background thread,
+        so ui code should either query the progress property instead or make
+        sure any callbacks are passed safely to the main thread.
+
+        Args:
+            progress_callback (function or None): function to call with the
+                stage and progress fraction, after each stage begins.
+
+        Returns:
+            (Project): the project. Its components will be None until the
+                corresponding stages have been loaded.
+        """
+        self.project = Project.read(self.project_root_path, load_data=False)
+        self._thread = threading.Thread(
+            target=self._load,
+            args=(progress_callback,),
+            name="ProjectLoader",
+            daemon=True,
+        )
+        self._thread.start()
+        return self.project
+
+    def finish(self):
+        """Finish loading, once all stages are loaded.
+
+        This must be called from the main thread. It runs any deferred item
+        registry callbacks, and can safely be called multiple times.
+
+        Raises:
+            (Exception): any exception raised while loading the project.
+
+        Returns:
+            (bool): whether or not the load is finished. This is False if
+                there are still stages loading.
+        """
+        if self._is_finished:
+            return True
+        if not self.wait_for_stage(timeout=0):
+            return False
+        if self._thread is not None:
+            self._thread.join()
+        item_registry.ITEM_REGISTRY.set_defer_callbacks(False)
+        if self.error is not None:
+            raise self.error
+        item_registry.ITEM_REGISTRY.run_deferred_callbacks()
+        self._is_finished = True
+        return True
+
+    def get_timings_text(self):
+        """Get summary of how long each stage took to load.
+
+        Returns:
+            (str): summary text.
+        """
+        lines = [
+            "{0:<20} {1:>10.1f}ms".format(stage, duration * 1000)
+            for stage, duration in self.timings.items()
+        ]
+        lines.append(
+            "{0:<20} {1:>10.1f}ms".format(
+                "Total",
+                sum(self.timings.values()) * 1000,
+            )
+        )
+        return "\n".join(lines)
@@ -0,0 +1,768 @@
+"""Resident project server, for querying and editing a project over a socket.
+
+The server keeps a project loaded in memory and serves JSON-RPC 2.0 requests
+over a unix domain socket, so scripts can query and edit the project data
+without having to load it from disk each time. Each request and response is
+a single line of json.
+
+Edits are all run in order on a single edit thread, while reads are answered
+on the connection threads. A read-write lock makes sure reads never see a
+half-applied edit, and read results are cached until the next edit. Cached
+results are returned concurrently, but new results are computed one at a
+time, as computing them can lazily load or cache data on the project's
+items (eg. archive categories, task statuses and calendar days). Edits are
+recorded in the project's edit journal, which is flushed to
+disk once the server has been idle for a short time rather than after every
+edit, and the project is only fully written when the save method is called.
+"""
+
+from collections import OrderedDict
+import json
+import os
+import queue
+import socket
+import socketserver
+import stat
+import tempfile
+import threading
+
+from .common.date_time import Date, TimeDelta
+from .edit import edit_log
+from .enums import ItemStatus
+from .tree import Task, TaskCategory
+
+
+class ProjectServerError(Exception):
+    """Exception for when a project server request fails."""
+    def __init__(self, message, code=None):
+        """Initialize.
+
+        Args:
+            message (str): error message.
+            code (int or None): json-rpc error code, if given.
+        """
+        super(ProjectServerError, self).__init__(message)
+        self.code = code or JsonRpcErrorCode.INVALID_PARAMS
+
+
+class JsonRpcErrorCode(object):
+    """Struct representing json-rpc error codes."""
+    PARSE_ERROR = -32700
+    INVALID_REQUEST = -32600
+    METHOD_NOT_FOUND = -32601
+    INVALID_PARAMS = -32602
+    INTERNAL_ERROR = -32603
+
+
+class ReadWriteLock(object):
+    """Lock allowing any number of readers, or a single writer."""
+    def __init__(self):
+        """Initialize."""
+        self._condition = threading.Condition()
+        self._num_readers = 0
+        self._is_writing = False
+
+    def acquire_read(self):
+        """Acquire lock for reading."""
+        with self._condition:
+            while self._is_writing:
+                self._condition.wait()
+            self._num_readers += 1
+
+    def release_read(self):
+        """Release lock for reading."""
+        with self._condition:
+            self._num_readers -= 1
+            if not self._num_readers:
+                self._condition.notify_all()
+
+    def acquire_write(self):
+        """Acquire lock for writing."""
+        with self._condition:
+            while self._is_writing or self._num_readers:
+                self._condition.wait()
+            self._is_writing = True
+
+    def release_write(self):
+        """Release lock for writing."""
+        with self._condition:
+            self._is_writing = False
+            self._condition.notify_all()
+
+
+class _PendingEdit(object):
+    """Edit request waiting to be run on the edit thread."""
+    def __init__(self, method, params):
+        """Initialize.
+
+        Args:
+            method (function): edit method to run.
+            params (dict): params to run method with.
+        """
+        self.method = method
+        self.params = params
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Handler for a connection to the project server."""
+    def handle(self):
+        """Answer each line of the connection as a json-rpc request."""
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            response = self.server.project_server.handle_request_string(
+                line.decode("utf-8")
+            )
+            self.wfile.write((response + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+
+class _SocketServer(socketserver.ThreadingUnixStreamServer):
+    """Unix socket server that answers each connection on its own thread."""
+    daemon_threads = True
+
+
+class ProjectServer(object):
+    """Server to query and edit a loaded project over a unix socket."""
+    DEFAULT_SOCKET_NAME = "scheduler_project.sock"
+    JOURNAL_FLUSH_DELAY = 2.0
+
+    def __init__(self, project, socket_path=None, journal_flush_delay=None):
+        """Initialize.
+
+        Args:
+            project (Project): the project to serve. This should be fully
+                loaded.
+            socket_path (str or None): path of unix socket to serve on.
+                Defaults to DEFAULT_SOCKET_NAME in the temp directory.
+            journal_flush_delay (float or None): number of seconds to wait
+                after the last edit before flushing the edit journal.
+                Defaults to JOURNAL_FLUSH_DELAY.
+        """
+        self.project = project
+        self.socket_path = socket_path or self.get_default_socket_path()
+        if journal_flush_delay is None:
+            journal_flush_delay = self.JOURNAL_FLUSH_DELAY
+        self._journal_flush_delay = journal_flush_delay
+        self._tree_manager = project.get_tree_manager()
+        self._lock = ReadWriteLock()
+        self._compute_lock = threading.Lock()
+        self._read_cache = {}
+        self._edit_queue = queue.Queue()
+        self._edit_thread = None
+        self._flush_timer = None
+        self._socket_server = None
+        self._read_methods = {
+            "get_item": self.get_item,
+            "get_history": self.get_history,
+            "get_schedule": self.get_schedule,
+        }
+        self._edit_methods = {
+            "create_item": self.create_item,
+            "rename_item": self.rename_item,
+            "remove_item": self.remove_item,
+            "move_item": self.move_item,
+            "update_task": self.update_task,
+            "undo": self.undo,
+            "redo": self.redo,
+            "save": self.save,
+        }
+
+    @classmethod
+    def get_default_socket_path(cls):
+        """Get default path of server socket.
+
+        Returns:
+            (str): default socket path.
+        """
+        return os.path.join(tempfile.gettempdir(), cls.DEFAULT_SOCKET_NAME)
+
+    ### Server ###
+    def start(self):
+        """Start edit thread, so requests can be handled.
+
+        This also opens the edit registry and starts the project's edit
+        journal, so edits are recorded.
+        """
+        if self._edit_thread is not None:
+            return
+        edit_log.open_edit_registry()
+        self.project.start_edit_journal()
+        self._edit_thread = threading.Thread(
+            target=self._run_edits,
+            name="ProjectServerEdits",
+            daemon=True,
+        )
+        self._edit_thread.start()
+
+    def _remove_stale_socket(self):
+        """Remove socket file left behind by a server that's not running.
+
+        Raises:
+            (ProjectServerError): if the path isn't a socket, or a server is
+                already answering on it.
+        """
+        if not os.path.exists(self.socket_path):
+            return
+        if not stat.S_ISSOCK(os.stat(self.socket_path).st_mode):
+            raise ProjectServerError(
+                "Path {0} exists and is not a socket".format(
+                    self.socket_path
+                ),
+                JsonRpcErrorCode.INTERNAL_ERROR,
+            )
+        client_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            client_socket.connect(self.socket_path)
+        except OSError:
+            os.remove(self.socket_path)
+            return
+        finally:
+            client_socket.close()
+        raise ProjectServerError(
+            "A server is already running on socket {0}".format(
+                self.socket_path
+            ),
+            JsonRpcErrorCode.INTERNAL_ERROR,
+        )
+
+    def serve_forever(self):
+        """Start server and serve requests on socket until shut down.
+
+        Raises:
+            (ProjectServerError): if another server is already running on
+                the socket.
+        """
+        self._remove_stale_socket()
+        self.start()
+        self._socket_server = _SocketServer(self.socket_path, _RequestHandler)
+        self._socket_server.project_server = self
+        try:
+            self._socket_server.serve_forever()
+        finally:
+            self._socket_server.server_close()
+            self._socket_server = None
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+    def shutdown(self):
+        """Stop serving requests and flush any unrecorded edits to disk.
+
+        If the server is serving on a socket, this must be called from a
+        different thread to serve_forever.
+        """
+        if self._socket_server is not None:
+            self._socket_server.shutdown()
+        if self._edit_thread is not None:
+            self._edit_queue.put(None)
+            self._edit_thread.join()
+            self._edit_thread = None
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        self._flush_journal(wait=True)
+
+    def _run_edits(self):
+        """Run queued edits in order, until None is queued."""
+        while True:
+            pending_edit = self._edit_queue.get()
+            if pending_edit is None:
+                return
+            self._lock.acquire_write()
+            try:
+                pending_edit.result = pending_edit.method(
+                    **pending_edit.params
+                )
+            except Exception as error:
+                pending_edit.error = error
+            finally:
+                self._read_cache = {}
+                self._lock.release_write()
+            self._schedule_journal_flush()
+            pending_edit.done.set()
+
+    def _schedule_journal_flush(self):
+        """Schedule flush of edit journal, replacing any scheduled already.
+
+        This means the journal is only flushed once no edits have been made
+        for the flush delay.
+        """
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+        self._flush_timer = threading.Timer(
+            self._journal_flush_delay,
+            self._flush_journal,
+        )
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+
+    def _flush_journal(self, wait=False):
+        """Flush edit journal to disk.
+
+        This takes the write lock, as flushing serializes the items modified
+        by edits, and must not run alongside edits or other flushes.
+
+        Args:
+            wait (bool): if True, wait for the journal records to be written
+                before returning.
+        """
+        self._lock.acquire_write()
+        try:
+            self.project.flush_edit_journal(wait=wait)
+        finally:
+            self._lock.release_write()
+
+    ### Requests ###
+    def handle_request(self, method_name, params=None):
+        """Handle request to run a method.
+
+        Args:
+            method_name (str): name of method to run.
+            params (dict or None): params to pass to method.
+
+        Raises:
+            (ProjectServerError): if the request can't be handled.
+
+        Returns:
+            (variant): json-serializable result of method.
+        """
+        params = params or {}
+        if not isinstance(params, dict):
+            raise ProjectServerError(
+                "Params must be passed by name",
+                JsonRpcErrorCode.INVALID_PARAMS,
+            )
+        if method_name in self._read_methods:
+            return self._run_read(method_name, params)
+        if method_name in self._edit_methods:
+            return self._run_edit(method_name, params)
+        raise ProjectServerError(
+            "Method {0} not found".format(method_name),
+            JsonRpcErrorCode.METHOD_NOT_FOUND,
+        )
+
+    def handle_request_string(self, request_string):
+        """Handle a json-rpc request string.
+
+        Args:
+            request_string (str): the json-rpc request.
+
+        Returns:
+            (str): the json-rpc response.
+        """
+        response = OrderedDict([("jsonrpc", "2.0"), ("id", None)])
+        try:
+            request = json.loads(request_string)
+        except ValueError:
+            response["error"] = {
+                "code": JsonRpcErrorCode.PARSE_ERROR,
+                "message": "Invalid json",
+            }
+            return json.dumps(response)
+        if not isinstance(request, dict) or "method" not in request:
+            response["error"] = {
+                "code": JsonRpcErrorCode.INVALID_REQUEST,
+                "message": "Request must be an object with a method",
+            }
+            return json.dumps(response)
+        response["id"] = request.get("id")
+        try:
+            response["result"] = self.handle_request(
+                request["method"],
+                request.get("params"),
+            )
+        except ProjectServerError as error:
+            response["error"] = {"code": error.code, "message": str(error)}
+        except Exception as error:
+            response["error"] = {
+                "code": JsonRpcErrorCode.INTERNAL_ERROR,
+                "message": "{0}: {1}".format(type(error).__name__, error),
+            }
+        return json.dumps(response)
+
+    def _run_read(self, method_name, params):
+        """Run read method, or get its result from the cache.
+
+        Read methods are only run one at a time, as they can modify shared
+        data on the project's items while computing their results.
+
+        Args:
+            method_name (str): name of read method.
+            params (dict): params to pass to method.
+
+        Returns:
+            (variant): result of method.
+        """
+        key = (method_name, json.dumps(params, sort_keys=True))
+        self._lock.acquire_read()
+        try:
+            if key in self._read_cache:
+                return self._read_cache[key]
+            with self._compute_lock:
+                if key not in self._read_cache:
+                    try:
+                        result = self._read_methods[method_name](**params)
+                    except TypeError as error:
+                        raise ProjectServerError(str(error))
+                    self._read_cache[key] = result
+                return self._read_cache[key]
+        finally:
+            self._lock.release_read()
+
+    def _run_edit(self, method_name, params):
+        """Queue edit method to run on edit thread and wait for the result.
+
+        Args:
+            method_name (str): name of edit method.
+            params (dict): params to pass to method.
+
+        Raises:
+            (ProjectServerError): if the server hasn't been started.
+
+        Returns:
+            (variant): result of method.
+        """
+        if self._edit_thread is None:
+            raise ProjectServerError(
+                "Server must be started before running edits",
+                JsonRpcErrorCode.INTERNAL_ERROR,
+            )
+        pending_edit = _PendingEdit(self._edit_methods[method_name], params)
+        self._edit_queue.put(pending_edit)
+        pending_edit.done.wait()
+        if isinstance(pending_edit.error, TypeError):
+            raise ProjectServerError(str(pending_edit.error))
+        if pending_edit.error is not None:
+            raise pending_edit.error
+        return pending_edit.result
+
+    ### Utils ###
+    def _get_item(self, path):
+        """Get tree item at given path.
+
+        Args:
+            path (str): path of item. This can optionally omit the root name.
+
+        Raises:
+            (ProjectServerError): if no item exists at the path.
+
+        Returns:
+            (BaseTaskItem): the tree item.
+        """
+        task_root = self.project.task_root
+        item = task_root.get_item_at_path(
+            path,
+            strict=True,
+            search_archive=True,
+        )
+        if item is None:
+            item = task_root.get_item_at_path(
+                [task_root.name] + path.split(task_root.TREE_PATH_SEPARATOR),
+                search_archive=True,
+            )
+        if item is None:
+            raise ProjectServerError("No item found at path {0}".format(path))
+        return item
+
+    def _get_task(self, path):
+        """Get task at given path.
+
+        Args:
+            path (str): path of task.
+
+        Raises:
+            (ProjectServerError): if no task exists at the path.
+
+        Returns:
+            (Task): the task.
+        """
+        task = self._get_item(path)
+        if not isinstance(task, Task):
+            raise ProjectServerError("Item {0} is not a task".format(path))
+        return task
+
+    @staticmethod
+    def _get_date(date_str):
+        """Get date from string.
+
+        Args:
+            date_str (str or None): date string in form yyyy-mm-dd, if given.
+
+        Raises:
+            (ProjectServerError): if the string isn't a valid date.
+
+        Returns:
+            (Date or None): the date, if given.
+        """
+        if date_str is None:
+            return None
+        try:
+            return Date.from_string(date_str)
+        except ValueError:
+            raise ProjectServerError("Invalid date {0}".format(date_str))
+
+    ### Read Methods ###
+    def get_item(self, path):
+        """Get data for tree item.
+
+        Args:
+            path (str): path of item.
+
+        Returns:
+            (dict): item data.
+        """
+        item = self._get_item(path)
+        item_dict = OrderedDict([
+            ("name", item.name),
+            ("path", item.path),
+            ("type", type(item).__name__),
+            ("children", [child.name for child in item.get_all_children()]),
+        ])
+        if isinstance(item, Task):
+            item_dict["task_type"] = str(item.type)
+            item_dict["status"] = str(item.status)
+            item_dict["is_tracked"] = item.is_tracked
+        return item_dict
+
+    def get_history(self, path, start=None, end=None):
+        """Get history of task between the given dates.
+
+        Args:
+            path (str): path of task.
+            start (str or None): first date to get history for, if given.
+            end (str or None): last date to get history for, if given.
+
+        Returns:
+            (list(dict)): history dict for each date with history.
+        """
+        history = self._get_task(path).history
+        start_date = self._get_date(start)
+        end_date = self._get_date(end)
+        history_list = []
+        for date, subdict in history.iter_date_dicts():
+            if start_date is not None and date < start_date:
+                continue
+            if end_date is not None and date > end_date:
+                break
+            date_dict = OrderedDict([("date", date.string())])
+            for key in (
+                    history.STATUS_KEY,
+                    history.VALUE_KEY,
+                    history.COMMENT_KEY):
+                if subdict.get(key) is not None:
+                    date_dict[key] = subdict[key]
+            history_list.append(date_dict)
+        return history_list
+
+    def get_schedule(self, start, end=None):
+        """Get scheduled items between the given dates.
+
+        Args:
+            start (str): first date to get items for.
+            end (str or None): last date to get items for. Defaults to start.
+
+        Returns:
+            (list(dict)): data for each scheduled item.
+        """
+        date = self._get_date(start)
+        end_date = self._get_date(end) or date
+        scheduled_items = []
+        while date <= end_date:
+            calendar_day = self.project.calendar.get_day(date)
+            day_items = sorted(
+                calendar_day.iter_scheduled_items(),
+                key=lambda item: item.start_time,
+            )
+            for item in day_items:
+                scheduled_items.append(OrderedDict([
+                    ("date", date.string()),
+                    ("start", item.start_time.string()),
+                    ("end", item.end_time.string()),
+                    ("name", item.name),
+                ]))
+            date += TimeDelta(days=1)
+        return scheduled_items
+
+    ### Edit Methods ###
+    def create_item(self, parent_path, name, item_type="task"):
+        """Create new tree item.
+
+        Args:
+            parent_path (str): path of parent item.
+            name (str): name of new item.
+            item_type (str): type of item to create (task or category).
+
+        Returns:
+            (bool): whether or not edit was successful.
+        """
+        child_type = {"task": Task, "category": TaskCategory}.get(item_type)
+        if child_type is None:
+            raise ProjectServerError(
+                "Invalid item type {0}".format(item_type)
+            )
+        parent = self._get_item(parent_path)
+        if child_type not in parent._allowed_child_types:
+            return False
+        return self._tree_manager.create_child(parent, name, child_type)
+
+    def rename_item(self, path, name):
+        """Rename tree item.
+
+        Args:
+            path (str): path of item.
+            name (str): new name.
+
+        Returns:
+            (bool): whether or not edit was successful.
+        """
+        return self._tree_manager.set_item_name(self._get_item(path), name)
+
+    def remove_item(self, path):
+        """Remove tree item.
+
+        Args:
+            path (str): path of item.
+
+        Returns:
+            (bool): whether or not edit was successful.
+        """
+        return self._tree_manager.remove_item(self._get_item(path))
+
+    def move_item(self, path, parent_path, index=None):
+        """Move tree item under new parent.
+
+        Args:
+            path (str): path of item.
+            parent_path (str): path of new parent.
+            index (int or None): index to move to. Defaults to the end.
+
+        Returns:
+            (bool): whether or not edit was successful.
+        """
+        return self._tree_manager.move_item(
+            self._get_item(path),
+            self._get_item(parent_path),
+            index,
+        )
+
+    def update_task(self, path, date=None, status=None, value=None):
+        """Update task history.
+
+        Args:
+            path (str): path of task.
+            date (str or None): date to update at. Defaults to today.
+            status (str or None): status to set, if given.
+            value (variant or None): value to set, if given.
+
+        Returns:
+            (bool): whether or not edit was successful.
+        """
+        item_status = None
+        if status is not None:
+            item_status = ItemStatus.from_string(status)
+            if item_status is None:
+                raise ProjectServerError("Invalid status {0}".format(status))
+        return self._tree_manager.update_task(
+            self._get_task(path),
+            date_time=self._get_date(date) or Date.now(),
+            status=item_status,
+            value=value,
+            ignore_status=True,
+        )
+
+    def undo(self):
+        """Undo last edit.
+
+        Returns:
+            (bool): whether or not undo was successful.
+        """
+        return edit_log.undo()
+
+    def redo(self):
+        """Redo last undone edit.
+
+        Returns:
+            (bool): whether or not redo was successful.
+        """
+        return edit_log.redo()
+
+    def save(self):
+        """Write project to disk.
+
+        Returns:
+            (bool): whether or not project was saved.
+        """
+        self.project.write()
+        return True
+
+
+class ProjectClient(object):
+    """Client to send requests to a project server."""
+    def __init__(self, socket_path=None):
+        """Initialize.
+
+        Args:
+            socket_path (str or None): path of server socket. Defaults to
+                the server's default socket path.
+        """
+        self.socket_path = (
+            socket_path or ProjectServer.get_default_socket_path()
+        )
+        self._socket = None
+        self._file = None
+        self._request_id = 0
+
+    def connect(self):
+        """Connect to server, if not already connected."""
+        if self._socket is not None:
+            return
+        client_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            client_socket.connect(self.socket_path)
+        except OSError:
+            client_socket.close()
+            raise
+        self._socket = client_socket
+        self._file = client_socket.makefile("rwb")
+
+    def close(self):
+        """Close connection to server."""
+        if self._socket is not None:
+            self._file.close()
+            self._socket.close()
+            self._socket = None
+            self._file = None
+
+    def call(self, method_name, **params):
+        """Run method on server.
+
+        Args:
+            method_name (str): name of method to run.
+            **params: params to pass to method.
+
+        Raises:
+            (ProjectServerError): if the request failed.
+
+        Returns:
+            (variant): result of method.
+        """
+        self.connect()
+        self._request_id += 1
+        request = {
+            "jsonrpc": "2.0",
+            "id": self._request_id,
+            "method": method_name,
+            "params": params,
+        }
+        self._file.write((json.dumps(request) + "\n").encode("utf-8"))
+        self._file.flush()
+        response = json.loads(self._file.readline().decode("utf-8"))
+        if "error" in response:
+            raise ProjectServerError(
+                response["error"]["message"],
+                response["error"]["code"],
+            )
+        return response["result"]
@@ -173,6 +173,38 @@ KEY_TYPE_MAPPINGS = OrderedDict([
 ])
 
 
+_SERIALIZER_CLASSES = {}
+
+
+def serializer_class_from_type(type_, as_key=False):
+    """Get default serializer class for given type.
+
+    The result is cached for each type, so the type mappings only need to be
+    searched the first time a type is serialized.
+
+    Args:
+        type_ (type): type to get serializer class for.
+        as_key (bool): if True, use KEY_TYPE_MAPPINGS as well as
+            normal type mappings.
+
+    Returns:
+        (type): the default serializer class for that type.
+    """
+    serializer_class = _SERIALIZER_CLASSES.get((type_, as_key))
+    if serializer_class is not None:
+        return serializer_class
+    type_mappings = list(TYPE_MAPPINGS.items())
+    if as_key:
+        type_mappings = list(KEY_TYPE_MAPPINGS.items()) + list(type_mappings)
+    serializer_class = BaseSerializer
+    for serializer, type_tuple in type_mappings:
+        if issubclass(type_, type_tuple):
+            serializer_class = serializer
+            break
+    _SERIALIZER_CLASSES[(type_, as_key)] = serializer_class
+    return serializer_class
+
+
 def serializer_from_type(type_, as_key=False, *args, **kwargs):
     """Get default serializer for given type.
 
@@ -186,14 +218,10 @@ def serializer_from_type(type_, as_key=False, *args, **kwargs):
     Returns:
         (BaseSerializer): the default serializer for that type.
     """
-    type_mappings = list(TYPE_MAPPINGS.items())
-    if as_key:
-        type_mappings = list(KEY_TYPE_MAPPINGS.items()) + list(type_mappings)
-    for serializer, type_tuple in type_mappings:
-        for base_type in type_tuple:
-            if issubclass(type_, base_type):
-                return serializer(*args, **kwargs)
-    return BaseSerializer()
+    serializer_class = serializer_class_from_type(type_, as_key)
+    if serializer_class == BaseSerializer:
+        return BaseSerializer()
+    return serializer_class(*args, **kwargs)
 
 
 def default_serializer(value, as_key=False, *args, **kwargs):
@@ -212,7 +240,135 @@ def default_serializer(value, as_key=False, *args, **kwargs):
     return serializer_from_type(type(value), as_key, *args, **kwargs)
 
 
-def serialize_dict(dictionary, tree_root=None, delete_empty_containers=False):
+class SerializerTable(object):
+    """Table of the default serializers to use for each type.
+
+    This is used to serialize and deserialize all the values in a dict or
+    list, in the same way as the SerializableValue class, but without making
+    a new SerializableValue and serializer for every value. Instead, each
+    type's serializer and serializer string are created the first time the
+    type is found and then reused for any other values of that type, and
+    values of plain json types are passed straight through.
+    """
+    def __init__(self, *args, **kwargs):
+        """Initialize table.
+
+        Args:
+            args (list): args to pass to serializer inits.
+            kwargs (dict): kwargs to pass to serializer inits.
+        """
+        self._serializer_args = args
+        self._serializer_kwargs = kwargs
+        self._serializers = {}
+        self._deserializers = {}
+
+    def _get_serializer(self, type_, as_key):
+        """Get serializer and serializer string for given type.
+
+        Args:
+            type_ (type): type to get serializer for.
+            as_key (bool): whether the type is being serialized as a key.
+
+        Returns:
+            (BaseSerializer or None): serializer for the type, or None if
+                it's a plain json type that doesn't need serializing.
+            (str or None): string used to mark values serialized with the
+                serializer. For keys, this is the whole suffix added to the
+                serialized value.
+        """
+        serializer_tuple = self._serializers.get((type_, as_key))
+        if serializer_tuple is not None:
+            return serializer_tuple
+        serializer_class = serializer_class_from_type(type_, as_key)
+        if serializer_class == BaseSerializer:
+            serializer_tuple = (None, None)
+        else:
+            serializer = serializer_class(
+                *self._serializer_args,
+                **self._serializer_kwargs
+            )
+            serializer_string = convert_serializer_to_string(serializer)
+            if as_key:
+                serializer_string = "<{0}{1}>".format(
+                    SerializableValue.SERIALIZER_KEY,
+                    serializer_string,
+                )
+            serializer_tuple = (serializer, serializer_string)
+        self._serializers[(type_, as_key)] = serializer_tuple
+        return serializer_tuple
+
+    def serialize(self, value, as_key=False):
+        """Serialize value using the default serializer for its type.
+
+        Args:
+            value (variant): the value to serialize.
+            as_key (bool): if True, the value is serialized as a string to
+                be used as a dictionary key.
+
+        Returns:
+            (dict, str or variant): serialized value, as described in the
+                SerializableValue.serialize method.
+        """
+        serializer, serializer_string = self._get_serializer(
+            type(value),
+            as_key,
+        )
+        if serializer is None:
+            return value
+        if as_key:
+            return "{0}{1}".format(
+                serializer.serialize(value),
+                serializer_string,
+            )
+        return {
+            SerializableValue.VALUE_KEY: serializer.serialize(value),
+            SerializableValue.SERIALIZER_KEY: serializer_string,
+        }
+
+    def deserialize(self, json_obj, as_key=False):
+        """Deserialize value, as described in SerializableValue.deserialize.
+
+        Args:
+            json_obj (dict, str or variant): serialized value.
+            as_key (bool): if True, the value was serialized as a string to
+                be used as a dictionary key.
+
+        Returns:
+            (variant): the deserialized value.
+        """
+        if as_key:
+            if (not isinstance(json_obj, str)
+                    or SerializableValue.SERIALIZER_KEY not in json_obj):
+                return json_obj
+            split_json_obj = json_obj.split(SerializableValue.SERIALIZER_KEY)
+            if len(split_json_obj) != 2:
+                return json_obj
+            # split_json_obj should equal ["value_obj<", "serializer_string>"]
+            value_obj = split_json_obj[0][:-1]
+            serializer_string = split_json_obj[1][:-1]
+        else:
+            if not SerializableValue.is_serialized_serializable_value(
+                    json_obj):
+                return json_obj
+            value_obj = json_obj.get(SerializableValue.VALUE_KEY)
+            serializer_string = json_obj.get(SerializableValue.SERIALIZER_KEY)
+
+        serializer = self._deserializers.get(serializer_string)
+        if serializer is None:
+            serializer = get_serializer_from_string(
+                serializer_string,
+                *self._serializer_args,
+                **self._serializer_kwargs
+            )
+            self._deserializers[serializer_string] = serializer
+        return serializer.deserialize(value_obj)
+
+
+def serialize_dict(
+        dictionary,
+        tree_root=None,
+        delete_empty_containers=False,
+        serializer_table=None):
     """Serialize dictionary using default type serializers.
 
     Args:
@@ -221,25 +377,27 @@ def serialize_dict(dictionary, tree_root=None, delete_empty_containers=False):
             serializers.
         delete_empty_containers (bool): if True, we delete any empty lists or
             keys from the serialized dict.
+        serializer_table (SerializerTable or None): table of serializers to
+            use, so it can be shared with nested containers. If not given, a
+            new one is created.
 
     Returns:
         (dict): serialized dictionary, containing serialized SerializableValue
             objects for each object that didn't use the BaseSerializer.
     """
+    if serializer_table is None:
+        serializer_table = SerializerTable(tree_root=tree_root)
     return_dict = type(dictionary)()
     for key, value in dictionary.items():
         if key is None:
             continue
-        key = SerializableValue(
-            key,
-            as_key=True,
-            tree_root=tree_root
-        ).serialize()
+        key = serializer_table.serialize(key, as_key=True)
         if isinstance(value, MutableMapping):
             value = serialize_dict(
                 value,
                 tree_root=tree_root,
                 delete_empty_containers=delete_empty_containers,
+                serializer_table=serializer_table,
             )
             if delete_empty_containers and not value:
                 continue
@@ -248,11 +406,12 @@ def serialize_dict(dictionary, tree_root=None, delete_empty_containers=False):
                 value,
                 tree_root=tree_root,
                 delete_empty_containers=delete_empty_containers,
+                serializer_table=serializer_table,
             )
             if delete_empty_containers and not value:
                 continue
         else:
-            value = SerializableValue(value, tree_root=tree_root).serialize()
+            value = serializer_table.serialize(value)
         if value is None:
             # we don't support None type serialization
             continue
@@ -260,7 +419,11 @@ def serialize_dict(dictionary, tree_root=None, delete_empty_containers=False):
     return return_dict
 
 
-def serialize_list(list_, tree_root=None, delete_empty_containers=False):
+def serialize_list(
+        list_,
+        tree_root=None,
+        delete_empty_containers=False,
+        serializer_table=None):
     """Serialize list using default type serializers.
 
     Args:
@@ -269,18 +432,24 @@ def serialize_list(list_, tree_root=None, delete_empty_containers=False):
             serializers.
         delete_empty_containers (bool): if True, we delete any empty lists or
             keys from the serialized dict.
+        serializer_table (SerializerTable or None): table of serializers to
+            use, so it can be shared with nested containers. If not given, a
+            new one is created.
 
     Returns:
         (list): serialized list, containing serialized SerializableValue
             objects for each object that didn't use the BaseSerializer.
     """
+    if serializer_table is None:
+        serializer_table = SerializerTable(tree_root=tree_root)
     return_list = type(list_)()
     for value in list_:
         if isinstance(value, MutableMapping):
             value = serialize_dict(
                 value,
                 tree_root=tree_root,
-                delete_empty_containers=delete_empty_containers
+                delete_empty_containers=delete_empty_containers,
+                serializer_table=serializer_table,
             )
             if delete_empty_containers and not value:
                 continue
@@ -288,12 +457,13 @@ def serialize_list(list_, tree_root=None, delete_empty_containers=False):
             value = serialize_list(
                 value,
                 tree_root=tree_root,
-                delete_empty_containers=delete_empty_containers
+                delete_empty_containers=delete_empty_containers,
+                serializer_table=serializer_table,
             )
             if delete_empty_containers and not value:
                 continue
         else:
-            value = SerializableValue(value, tree_root=tree_root).serialize()
+            value = serializer_table.serialize(value)
         if value is None:
             # we don't support None type serialization
             continue
@@ -301,7 +471,7 @@ def serialize_list(list_, tree_root=None, delete_empty_containers=False):
     return return_list
 
 
-def deserialize_dict(dictionary, tree_root=None):
+def deserialize_dict(dictionary, tree_root=None, serializer_table=None):
     """Deserialize dictionary using default type serializers.
 
     Args:
@@ -310,32 +480,35 @@ def deserialize_dict(dictionary, tree_root=None):
             BaseSerializer.
         tree_root (TaskRoot or None): tree root, needed for certain
             serializers.
+        serializer_table (SerializerTable or None): table of serializers to
+            use, so it can be shared with nested containers. If not given, a
+            new one is created.
 
     Returns:
         (dict): deserialized dictionary.
     """
+    if serializer_table is None:
+        serializer_table = SerializerTable(tree_root=tree_root)
     return_dict = type(dictionary)()
     for key, value in dictionary.items():
-        key = SerializableValue.deserialize(
-            key,
-            as_key=True,
-            tree_root=tree_root
-        ).value
+        key = serializer_table.deserialize(key, as_key=True)
         if isinstance(value, MutableMapping):
             if SerializableValue.is_serialized_serializable_value(value):
-                value = SerializableValue.deserialize(
+                value = serializer_table.deserialize(value)
+            else:
+                value = deserialize_dict(
                     value,
                     tree_root=tree_root,
-                ).value
-            else:
-                value = deserialize_dict(value, tree_root=tree_root)
+                    serializer_table=serializer_table,
+                )
         elif isinstance(value, MutableSequence):
-            value = deserialize_list(value, tree_root=tree_root)
-        else:
-            value = SerializableValue.deserialize(
+            value = deserialize_list(
                 value,
                 tree_root=tree_root,
-            ).value
+                serializer_table=serializer_table,
+            )
+        else:
+            value = serializer_table.deserialize(value)
         if key is None or value is None:
             # ignore None types (eg. for tree path that no longer exists)
             continue
@@ -343,7 +516,7 @@ def deserialize_dict(dictionary, tree_root=None):
     return return_dict
 
 
-def deserialize_list(list_, tree_root=None):
+def deserialize_list(list_, tree_root=None, serializer_table=None):
     """Deserialize dictionary using default type serializers.
 
     Args:
@@ -351,27 +524,34 @@ def deserialize_list(list_, tree_root=None):
             objects for each object that didn't use the BaseSerializer.
         tree_root (TaskRoot or None): tree root, needed for certain
             serializers.
+        serializer_table (SerializerTable or None): table of serializers to
+            use, so it can be shared with nested containers. If not given, a
+            new one is created.
 
     Returns:
         (list): deserialized list.
     """
+    if serializer_table is None:
+        serializer_table = SerializerTable(tree_root=tree_root)
     return_list = type(list_)()
     for value in list_:
         if isinstance(value, MutableMapping):
             if SerializableValue.is_serialized_serializable_value(value):
-                value = SerializableValue.deserialize(
+                value = serializer_table.deserialize(value)
+            else:
+                value = deserialize_dict(
                     value,
                     tree_root=tree_root,
-                ).value
-            else:
-                value = deserialize_dict(value, tree_root=tree_root)
+                    serializer_table=serializer_table,
+                )
         elif isinstance(value, MutableSequence):
-            value = deserialize_list(value, tree_root=tree_root)
-        else:
-            value = SerializableValue.deserialize(
+            value = deserialize_list(
                 value,
                 tree_root=tree_root,
-            ).value
+                serializer_table=serializer_table,
+            )
+        else:
+            value = serializer_table.deserialize(value)
         if value is None:
             # ignore None types (eg. for tree path that no longer exists)
             continue
@@ -66,14 +66,27 @@ class ItemRegistry(object):
                 need to be touched again after that.
             _callbacks (dict(str, list(function))): dictionary of callbacks to
                 run when an item of the given id is registered.
-            _new_ids (list(str)): this is used to store newly generated ids
-                made during serialization. It allows us to ensure all new ids
-                created are unique. It's independent of the id keys in the
-                _items dict, so ids can change between sessions.
+            _used_ids (set(str)): all ids in use, ie. those newly generated
+                during serialization and those reserved by items that keep
+                the id they were deserialized with. It allows us to ensure
+                all new ids created are unique. Unlike the _items dict, this
+                isn't cleared with the registry, as the items still keep
+                the ids they were given.
+            _id_suffixes (dict(str, int)): next suffix to try for each base
+                name that's been used to generate ids, so we don't need to
+                check every previous suffix each time.
+            _defer_callbacks (bool): if True, callbacks aren't run when their
+                items are registered, and are instead queued up to be run
+                later by run_deferred_callbacks.
+            _deferred_callbacks (list(ItemCallback or function)): queue of
+                callbacks and functions waiting to be run.
         """
         self._items = {}
         self._callbacks = {}
-        self._new_ids = []
+        self._used_ids = set()
+        self._id_suffixes = {}
+        self._defer_callbacks = False
+        self._deferred_callbacks = []
 
     def generate_unique_id(self, base_name):
         """Generate a unique id string using the base_name.
@@ -84,13 +97,16 @@ class ItemRegistry(object):
         Returns:
             (str): unique id starting with base name.
         """
-        id = base_name
-        suffix = 1
-        while id in self._new_ids:
-            id = "{0}{1}".format(base_name, str(suffix).zfill(2))
-            suffix += 1
-        self._new_ids.append(id)
-        return id
+        id_ = base_name
+        if id_ in self._used_ids:
+            suffix = self._id_suffixes.get(base_name, 1)
+            id_ = "{0}{1}".format(base_name, str(suffix).zfill(2))
+            while id_ in self._used_ids:
+                suffix += 1
+                id_ = "{0}{1}".format(base_name, str(suffix).zfill(2))
+            self._id_suffixes[base_name] = suffix + 1
+        self._used_ids.add(id_)
+        return id_
 
     def register_item(self, id_, item):
         """Register item at given id.
@@ -102,7 +118,7 @@ class ItemRegistry(object):
             id_ (str): id to register item with.
             item (variant): item to register at id.
         """
-        if id_ in self._items.keys():
+        if id_ in self._items:
             # TODO: need better way to handle serialization errors, tool
             # shouldn't crash if code is saved dodgily
             # Maybe keep this error though and just have some catches in
@@ -113,9 +129,70 @@ class ItemRegistry(object):
             )
         self._items[id_] = item
         for callback in self._callbacks.get(id_, []):
-            callback.run()
+            self._run_callback(callback)
         # TODO: we could delete the callbacks from the dict now they've run
 
+    def reserve_id(self, id_):
+        """Reserve id so that no newly generated ids can match it.
+
+        This is used for items that keep the id they were deserialized
+        with, rather than generating a new one each time they're saved.
+
+        Args:
+            id_ (str): id to reserve.
+        """
+        self._used_ids.add(id_)
+
+    def _run_callback(self, callback):
+        """Run callback, or queue it to be run later if deferring callbacks.
+
+        Args:
+            callback (ItemCallback): callback to run.
+        """
+        if self._defer_callbacks:
+            self._deferred_callbacks.append(callback)
+        else:
+            callback.run()
+
+    def set_defer_callbacks(self, value):
+        """Set whether or not to defer running callbacks.
+
+        This is used when deserializing on a background thread, as the
+        callbacks modify items (eg. tasks) that may already be in use by
+        the main thread. The main thread can then run the queued callbacks
+        with run_deferred_callbacks.
+
+        Args:
+            value (bool): whether or not to defer callbacks.
+        """
+        self._defer_callbacks = value
+
+    def run_or_defer(self, function):
+        """Run function, or queue it to be run later if deferring callbacks.
+
+        This is used for deserialization steps that access items which may
+        be in use by the main thread, but that don't rely on any ids. The
+        function is queued in order with the deferred callbacks.
+
+        Args:
+            function (function): function to run, with no arguments.
+        """
+        if self._defer_callbacks:
+            self._deferred_callbacks.append(function)
+        else:
+            function()
+
+    def run_deferred_callbacks(self):
+        """Run all callbacks queued while callbacks were being deferred."""
+        callbacks = self._deferred_callbacks
+        self._deferred_callbacks = []
+        for callback in callbacks:
+            if not isinstance(callback, ItemCallback):
+                callback()
+            # the same callback may have been queued for several ids
+            elif not callback._has_been_run:
+                callback.run()
+
     def _add_callback_at_id(self, id_, callback):
         """Helper method to add callback at given id in correct order.
 
@@ -162,7 +239,7 @@ class ItemRegistry(object):
             self._add_callback_at_id(id_, callback)
         if main_id in self._items:
             if not required_ids:
-                callback.run()
+                self._run_callback(callback)
         else:
             self._add_callback_at_id(main_id, callback)
 
@@ -170,6 +247,7 @@ class ItemRegistry(object):
         """Clear registry, for use with a new project."""
         self._items = {}
         self._callbacks = {}
+        self._deferred_callbacks = []
 
 
 ITEM_REGISTRY = ItemRegistry()
@@ -200,6 +278,15 @@ def register_item(id_, item):
     ITEM_REGISTRY.register_item(id_, item)
 
 
+def reserve_id(id_):
+    """Reserve id so that no newly generated ids can match it.
+
+    Args:
+        id_ (str): id to reserve.
+    """
+    ITEM_REGISTRY.reserve_id(id_)
+
+
 def register_callback(id_, callback, required_ids=None, order=None):
     """Register callback to be run when given id is registered.
 
@@ -215,6 +302,15 @@ def register_callback(id_, callback, required_ids=None, order=None):
     ITEM_REGISTRY.register_callback(id_, callback, required_ids)
 
 
+def run_or_defer(function):
+    """Run function, or queue it to be run later if deferring callbacks.
+
+    Args:
+        function (function): function to run, with no arguments.
+    """
+    ITEM_REGISTRY.run_or_defer(function)
+
+
 def clear_registry():
     """Clear registry, for use with a new project."""
     ITEM_REGISTRY.clear()
@@ -67,11 +67,15 @@ class SaveType(OrderedStringEnum):
             classes that can only be written to a dictionary and read from a
             dictionary, and will be saved as a subdict in another serialized
             class's json file.
+        DATABASE:   written as rows of an sqlite database rather than json
+            files. This is used by projects that store their components in
+            a project database (see the project_database module).
     """
     FILE = "File"
     DIRECTORY = "Directory"
     EITHER = "Either"
     NESTED = "Nested"
+    DATABASE = "Database"
 
     def is_file_type(self):
         """Check if save type is a file save type.
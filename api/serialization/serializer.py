@@ -143,7 +143,6 @@ class TreeSerializer(BaseSerializer):
         """
         super(TreeSerializer, self).__init__(*args, **kwargs)
         self._tree_root = tree_root
-        self._achive_tree_root = tree_root.archive_root
 
     def serialize(self, obj):
         return obj.path
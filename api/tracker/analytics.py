@@ -0,0 +1,314 @@
+"""Tracker analytics, for computing statistics over tracked task histories.
+
+All statistics are computed for every tracked task at once, from the
+completion and value matrices of the history store, using numpy cumulative
+sums rather than looping over each task and date in python. The exception
+is rolling percentiles, which are computed one window at a time (for all
+tasks at once), as sorting every window up front would need a copy of the
+values for each date in the window.
+
+This requires numpy, which is an optional dependency, so is only imported
+when the statistics are computed.
+"""
+
+from scheduler.api.common.date_time import Date
+from scheduler.api.enums import TimePeriod
+from scheduler.api.tree.history_store import HistoryStore
+
+
+class TrackerAnalyticsError(Exception):
+    """Exception class for tracker analytics errors."""
+
+
+def _import_numpy():
+    """Import numpy.
+
+    Raises:
+        (TrackerAnalyticsError): if numpy isn't installed.
+
+    Returns:
+        (module): the numpy module.
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise TrackerAnalyticsError(
+            "Could not import numpy module. Ensure this is installed to "
+            "use tracker analytics."
+        )
+    return numpy
+
+
+class TrackerAnalytics(object):
+    """Class to compute statistics for all tasks in a tracker.
+
+    Each method takes a start and end date and returns numpy arrays with a
+    row for each tracked task (in the order given by the tasks property).
+    A task counts as completed on a date if its history sets a complete
+    status at that date. Statuses carried forward from earlier dates (as
+    they are for non-routine tasks) don't count.
+    """
+    def __init__(self, tracker, history_store=None, filter=None):
+        """Initialize.
+
+        Args:
+            tracker (Tracker): the tracker whose tasks we're analysing.
+            history_store (HistoryStore or None): history store to query
+                task histories from. If not given, a new one is created.
+            filter (function, BaseFilter or None): filter to apply to
+                tracked tasks, if given.
+        """
+        self._tasks = list(tracker.iter_tracked_tasks(filter))
+        self._history_store = history_store or HistoryStore()
+
+    @property
+    def tasks(self):
+        """Get tasks that the analytics are computed for.
+
+        Returns:
+            (list(Task)): list of tracked tasks.
+        """
+        return self._tasks
+
+    def get_completion_matrix(self, start, end):
+        """Get whether each task was completed at each date.
+
+        Args:
+            start (Date): first date to check.
+            end (Date): last date to check (inclusive).
+
+        Returns:
+            (numpy.ndarray): 2d boolean array, with a row for each task and
+                a column for each date.
+        """
+        return self._history_store.completion_matrix(self._tasks, start, end)
+
+    @staticmethod
+    def _get_run_lengths(completion_matrix):
+        """Get length of run of consecutive completions ending at each date.
+
+        Args:
+            completion_matrix (numpy.ndarray): 2d boolean completion array.
+
+        Returns:
+            (numpy.ndarray): 2d int array of run lengths.
+        """
+        numpy = _import_numpy()
+        completions = numpy.cumsum(completion_matrix, axis=1)
+        # total completions at the most recent missed date, to subtract
+        completions_at_last_miss = numpy.maximum.accumulate(
+            numpy.where(completion_matrix, 0, completions),
+            axis=1,
+        )
+        return completions - completions_at_last_miss
+
+    def get_streaks(self, start, end):
+        """Get current and longest streaks of consecutive daily completions.
+
+        The current streak is the streak ending at the end date. If the
+        task hasn't been completed yet on the end date (eg. if it's today),
+        the streak ending the day before is used instead.
+
+        Args:
+            start (Date): first date to check.
+            end (Date): last date to check (inclusive).
+
+        Returns:
+            (numpy.ndarray): current streak length for each task.
+            (numpy.ndarray): longest streak length for each task.
+        """
+        numpy = _import_numpy()
+        completion_matrix = self.get_completion_matrix(start, end)
+        if not completion_matrix.size:
+            empty = numpy.zeros(len(self._tasks), dtype=numpy.int64)
+            return empty, empty.copy()
+        run_lengths = self._get_run_lengths(completion_matrix)
+        current_streaks = run_lengths[:, -1]
+        if run_lengths.shape[1] > 1:
+            current_streaks = numpy.where(
+                completion_matrix[:, -1],
+                current_streaks,
+                run_lengths[:, -2],
+            )
+        return current_streaks, run_lengths.max(axis=1)
+
+    def _get_period_start_indexes(self, dates, period, week_start_day):
+        """Get indexes of the dates that start each period in a date range.
+
+        Args:
+            dates (list(Date)): the dates in the range.
+            period (TimePeriod): the period type.
+            week_start_day (str): weekday that weeks start on.
+
+        Returns:
+            (list(int)): indexes of the first date of each period. The first
+                date of the range always starts a period, even if it's
+                partway through one.
+        """
+        if period == TimePeriod.DAY:
+            return list(range(len(dates)))
+        week_start = Date.WEEKDAYS.index(week_start_day)
+        indexes = []
+        for i, date in enumerate(dates):
+            if i == 0:
+                indexes.append(i)
+            elif period == TimePeriod.WEEK and date.weekday == week_start:
+                indexes.append(i)
+            elif period == TimePeriod.MONTH and date.day == 1:
+                indexes.append(i)
+            elif period == TimePeriod.YEAR and date.day == 1 and (
+                    date.month == 1):
+                indexes.append(i)
+        return indexes
+
+    def get_completion_rates(
+            self,
+            start,
+            end,
+            period=TimePeriod.WEEK,
+            week_start_day=Date.MON):
+        """Get fraction of days that each task was completed in each period.
+
+        Args:
+            start (Date): first date to check.
+            end (Date): last date to check (inclusive).
+            period (TimePeriod): period to compute rates for.
+            week_start_day (str): weekday that weeks start on, if using
+                weekly periods.
+
+        Returns:
+            (list(Date)): first date of each period in the range.
+            (numpy.ndarray): 2d float array of completion rates, with a row
+                for each task and a column for each period. The first and
+                last periods may be partial, in which case the rate is over
+                the days of that period within the date range.
+        """
+        numpy = _import_numpy()
+        dates = self._history_store.get_dates(start, end)
+        completion_matrix = self.get_completion_matrix(start, end)
+        start_indexes = self._get_period_start_indexes(
+            dates,
+            period,
+            week_start_day,
+        )
+        boundaries = numpy.array(start_indexes + [len(dates)])
+        completions = numpy.concatenate(
+            [
+                numpy.zeros((len(self._tasks), 1), dtype=numpy.int64),
+                numpy.cumsum(completion_matrix, axis=1),
+            ],
+            axis=1,
+        )
+        period_completions = (
+            completions[:, boundaries[1:]] - completions[:, boundaries[:-1]]
+        )
+        period_lengths = boundaries[1:] - boundaries[:-1]
+        return (
+            [dates[i] for i in start_indexes],
+            period_completions / period_lengths[None, :],
+        )
+
+    def get_value_matrix(self, start, end):
+        """Get value of each task at each date.
+
+        Args:
+            start (Date): first date to get values at.
+            end (Date): last date to get values at (inclusive).
+
+        Returns:
+            (numpy.ndarray): 2d float array of values, with NaN where no
+                value is set.
+        """
+        return self._history_store.value_matrix(self._tasks, start, end)
+
+    def get_rolling_means(self, start, end, window):
+        """Get rolling mean of task values over the given window.
+
+        Dates with no value are ignored, so each mean is over the values
+        set within the window.
+
+        Args:
+            start (Date): first date to get means at.
+            end (Date): last date to get means at (inclusive).
+            window (int): number of days in window, ending at each date.
+                Windows at the start of the range include values from
+                before the start date.
+
+        Returns:
+            (numpy.ndarray): 2d float array of means, with a row for each
+                task and a column for each date, and NaN where the window
+                contains no values.
+        """
+        numpy = _import_numpy()
+        values = self._get_windowed_values(start, end, window)
+        has_value = ~numpy.isnan(values)
+        zeros = numpy.zeros((len(self._tasks), 1))
+        sums = numpy.concatenate(
+            [zeros, numpy.cumsum(numpy.where(has_value, values, 0), axis=1)],
+            axis=1,
+        )
+        counts = numpy.concatenate(
+            [zeros, numpy.cumsum(has_value, axis=1)],
+            axis=1,
+        )
+        window_sums = sums[:, window:] - sums[:, :-window]
+        window_counts = counts[:, window:] - counts[:, :-window]
+        with numpy.errstate(invalid="ignore", divide="ignore"):
+            return numpy.where(
+                window_counts > 0,
+                window_sums / window_counts,
+                numpy.nan,
+            )
+
+    def get_rolling_percentiles(self, start, end, window, percentiles):
+        """Get rolling percentiles of task values over the given window.
+
+        Args:
+            start (Date): first date to get percentiles at.
+            end (Date): last date to get percentiles at (inclusive).
+            window (int): number of days in window, ending at each date.
+            percentiles (list(float)): percentiles to compute, between 0
+                and 100.
+
+        Returns:
+            (numpy.ndarray): 3d float array of percentiles, indexed by
+                percentile, task and date, with NaN where the window
+                contains no values.
+        """
+        numpy = _import_numpy()
+        values = self._get_windowed_values(start, end, window)
+        num_dates = values.shape[1] - window + 1
+        result = numpy.full(
+            (len(percentiles), len(self._tasks), num_dates),
+            numpy.nan,
+        )
+        for i in range(num_dates):
+            window_values = values[:, i:i+window]
+            has_values = ~numpy.all(numpy.isnan(window_values), axis=1)
+            if numpy.any(has_values):
+                result[:, has_values, i] = numpy.nanpercentile(
+                    window_values[has_values],
+                    percentiles,
+                    axis=1,
+                )
+        return result
+
+    def _get_windowed_values(self, start, end, window):
+        """Get value matrix extended back to include the first window.
+
+        Raises:
+            (TrackerAnalyticsError): if window is less than one day.
+
+        Args:
+            start (Date): first date of range.
+            end (Date): last date of range (inclusive).
+            window (int): number of days in window.
+
+        Returns:
+            (numpy.ndarray): value matrix from window - 1 days before the
+                start date up to the end date.
+        """
+        if window < 1:
+            raise TrackerAnalyticsError("Window must be at least one day")
+        window_start = Date.from_day_number(start.day_number - window + 1)
+        return self.get_value_matrix(window_start, end)
@@ -41,11 +41,17 @@ class Tracker(BaseSerializable):
         """
         tracker = cls(task_root)
         task_paths = dictionary.get(cls.TRACKED_TASKS_KEY, [])
+        root_tasks = {}
         for task_path in task_paths:
             task = task_root.get_item_at_path(task_path, search_archive=True)
             if task:
                 tracker._tracked_tasks.append(task)
                 task._is_tracked.set_value(True)
+                root_tasks.setdefault(task.root, []).append(task)
+        # tracking isn't set by an edit, so reindex the tasks here (without
+        # marking the roots as modified, as the tracking isn't saved there)
+        for root, tasks in root_tasks.items():
+            root.task_index.mark_dirty(tasks)
         return tracker
 
     def to_dict(self):
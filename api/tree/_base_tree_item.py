@@ -23,6 +23,7 @@ class BaseTreeItem(Hosted, NestedSerializable):
         self._name = MutableAttribute(name, "name")
         self._parent = MutableAttribute(parent, "parent")
         self._children = OrderedDict()
+        self._children_version = 0
         # base class must be overridden, has no allowed child types.
         self._allowed_child_types = []
 
@@ -81,6 +82,45 @@ class BaseTreeItem(Hosted, NestedSerializable):
         """
         return self._parent.value
 
+    @property
+    def children_version(self):
+        """Get version number of this item's descendants.
+
+        This is incremented whenever children are added, removed or moved
+        under this item or any of its descendants, so filters can cache
+        their filtered children until the next change.
+
+        Returns:
+            (int): children version number.
+        """
+        return self._children_version
+
+    def _mark_children_modified(self, children=None):
+        """Increment children version of this item and its ancestors.
+
+        Args:
+            children (list(BaseTreeItem) or None): children that have been
+                added, removed or replaced, if any.
+        """
+        for item in self.iter_ancestors():
+            item._children_version += 1
+        if children:
+            self.root._mark_descendants_modified(children, recursive=True)
+
+    def _mark_descendants_modified(self, items, recursive=False):
+        """Mark items in this tree as modified, to update any indexes.
+
+        This should be called on the root item. In the base class it does
+        nothing, as indexes are maintained by subclasses.
+
+        Args:
+            items (list(BaseTreeItem)): items that have been modified, added
+                to the tree or removed from it.
+            recursive (bool): if True, descendants of the items have also
+                been modified.
+        """
+        pass
+
     @property
     def path_list(self):
         """Get path to self from root tree item as list.
@@ -134,9 +174,7 @@ class BaseTreeItem(Hosted, NestedSerializable):
         """
         _children = self._children
         try:
-            self._children = child_filter.get_filtered_dict(
-                self._children,
-            )
+            self._children = child_filter.get_filtered_children_dict(self)
             yield
         finally:
             self._children = _children
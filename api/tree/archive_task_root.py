@@ -0,0 +1,420 @@
+"""Archive task root, which is read from disk lazily.
+
+The archive can hold far more items than the main task tree, but is rarely
+used. So rather than reading all of it when a project is loaded, only the
+order of its categories and a small index of the paths of all archived
+items are read. Each category is then read the first time an item in it is
+looked up by path (eg. when a calendar item refers to an archived task), and
+the rest of the archive is only read when it's accessed as a whole (eg. to
+archive or unarchive items, or to serialize it).
+
+Categories can optionally be stored as gzipped json files rather than as
+the usual directories of json files, and the archive is only rewritten if
+it has been modified since it was last read from or written to a directory.
+"""
+
+from collections import OrderedDict
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+from scheduler.api.serialization.file_utils import is_serialize_directory
+from scheduler.api.serialization.serializable import SerializationError
+
+from .task_category import TaskCategory
+from .task_root import HistoryData, TaskRoot
+
+
+class ArchiveTaskRoot(TaskRoot):
+    """Root item for archived task data, whose categories load on demand."""
+    PATH_INDEX_FILE = "path_index.json"
+    COMPRESSED_FILE_EXTENSION = ".json.gz"
+    _BACKUP_DIR_NAME = "backup"
+
+    def __init__(self, name=None, *args, **kwargs):
+        """Initialise archive root item.
+
+        Args:
+            name (str or None): name. If None, use ARCHIVE_ROOT_NAME.
+            args (tuple): additional args to allow super class classmethod
+                to use this init.
+            kwargs (dict): additional kwargs to allow super class classmethod
+                to use this init.
+
+        Attributes:
+            _directory_path (str or None): directory that unloaded categories
+                are read from.
+            _category_order (list(str)): order of categories on disk.
+            _unloaded_categories (set(str)): names of categories that haven't
+                been read yet.
+            _path_index (set(str) or None): paths of all items on disk,
+                relative to the root, if an index was found.
+            _compress (bool): whether to write categories as gzipped files.
+            _edit_version (int): counter incremented whenever items in the
+                archive are modified.
+            _written_states (dict(str, tuple(int, bool))): the edit version
+                and compression of the archive as last read from or written
+                to each directory.
+            _load_lock (threading.RLock): lock used when loading categories,
+                as lookups can come from background threads (eg. the project
+                loader and the project server's read threads).
+        """
+        name = name or self.ARCHIVE_ROOT_NAME
+        super(ArchiveTaskRoot, self).__init__(name, *args, **kwargs)
+        self._history_data = HistoryData()
+        self._directory_path = None
+        self._category_order = []
+        self._unloaded_categories = set()
+        self._path_index = None
+        self._compress = False
+        self._edit_version = 0
+        self._written_states = {}
+        self._load_lock = threading.RLock()
+
+    @property
+    def is_loaded(self):
+        """Check if all categories have been read.
+
+        Returns:
+            (bool): whether or not the whole archive is loaded.
+        """
+        return not self._unloaded_categories
+
+    @property
+    def is_modified(self):
+        """Check if archive may differ from the directory it was read from.
+
+        Returns:
+            (bool): True if the archive wasn't read from a directory, or has
+                been modified since.
+        """
+        return self._directory_path is None or self._edit_version > 0
+
+    @property
+    def compress(self):
+        """Check if categories are written as gzipped files.
+
+        Returns:
+            (bool): whether or not the archive is compressed.
+        """
+        return self._compress
+
+    def set_compress(self, compress):
+        """Set whether or not to write categories as gzipped files.
+
+        Args:
+            compress (bool): whether or not to compress the archive.
+        """
+        self._compress = compress
+
+    def _mark_descendants_modified(self, items, recursive=False):
+        """Mark items in this tree as modified.
+
+        Args:
+            items (list(BaseTreeItem)): items that have been modified, added
+                to the tree or removed from it.
+            recursive (bool): if True, descendants of the items have also
+                been modified.
+        """
+        if items:
+            self._edit_version += 1
+        super(ArchiveTaskRoot, self)._mark_descendants_modified(
+            items,
+            recursive=recursive,
+        )
+
+    def needs_write(self, directory_path):
+        """Check if archive needs writing to given directory.
+
+        Args:
+            directory_path (str): directory to write to.
+
+        Returns:
+            (bool): True unless the archive was last read from or written
+                to this directory and has not changed since.
+        """
+        return self._written_states.get(
+            os.path.normpath(directory_path)
+        ) != (self._edit_version, self._compress)
+
+    def _record_written_state(self, directory_path):
+        """Record that archive matches the data in given directory.
+
+        Args:
+            directory_path (str): directory read from or written to.
+        """
+        self._written_states[os.path.normpath(directory_path)] = (
+            self._edit_version,
+            self._compress,
+        )
+
+    ### Lazy Loading ###
+    def _get_compressed_file(self, directory_path, category_name):
+        """Get path of compressed file for category.
+
+        Args:
+            directory_path (str): archive directory.
+            category_name (str): name of category.
+
+        Returns:
+            (str): path to gzipped json file.
+        """
+        return os.path.join(
+            directory_path,
+            "{0}{1}".format(category_name, self.COMPRESSED_FILE_EXTENSION),
+        )
+
+    def _read_category_dict(self, category_name):
+        """Read dict of category from disk.
+
+        Args:
+            category_name (str): name of category to read.
+
+        Raises:
+            (SerializationError): if the category can't be read.
+
+        Returns:
+            (OrderedDict): the serialized category dict.
+        """
+        path = os.path.join(self._directory_path, category_name)
+        if is_serialize_directory(path, TaskCategory._MARKER_FILE):
+            return TaskCategory._read_directory(path)
+        compressed_file = self._get_compressed_file(
+            self._directory_path,
+            category_name,
+        )
+        try:
+            with gzip.open(compressed_file, "rt") as file_:
+                return json.load(file_, object_pairs_hook=OrderedDict)
+        except (OSError, ValueError):
+            raise SerializationError(
+                "Could not read archive category {0}".format(compressed_file)
+            )
+
+    def _load_category(self, category_name):
+        """Read category from disk and add it to the archive.
+
+        Args:
+            category_name (str): name of category to load.
+        """
+        category = TaskCategory.from_dict(
+            self._read_category_dict(category_name),
+            category_name,
+            history_data=self._history_data,
+            parent=self,
+        )
+        self._children[category_name] = category
+        # update the indexes for the new items, without counting this as a
+        # modification of the archive
+        super(ArchiveTaskRoot, self)._mark_descendants_modified(
+            [category],
+            recursive=True,
+        )
+        # only mark as loaded once the category can be found, so concurrent
+        # lookups that skip the lock still find it
+        self._unloaded_categories.discard(category_name)
+
+    def _sort_categories(self):
+        """Sort loaded categories into the order they have on disk."""
+        children = OrderedDict()
+        for name in self._category_order:
+            if name in self._children:
+                children[name] = self._children[name]
+        for name, child in self._children.items():
+            children.setdefault(name, child)
+        self._children = children
+        self._mark_children_modified()
+
+    def load_category(self, category_name):
+        """Load category with given name, if it hasn't been loaded yet.
+
+        Args:
+            category_name (str): name of category to load.
+        """
+        with self._load_lock:
+            if category_name in self._unloaded_categories:
+                self._load_category(category_name)
+                self._sort_categories()
+
+    def load_all(self):
+        """Load all categories that haven't been loaded yet."""
+        if not self._unloaded_categories:
+            return
+        with self._load_lock:
+            for name in self._category_order:
+                if name in self._unloaded_categories:
+                    self._load_category(name)
+            self._sort_categories()
+
+    def get_item_at_path(self, path, strict=False, search_archive=False):
+        """Get item at given path, loading its category if needed.
+
+        If a path index was found on disk, categories are only loaded for
+        paths that are in it.
+
+        Args:
+            path (list(str) or str): path to item as a list or a string.
+            strict (bool): if True, require that root names of path match
+                as well.
+            search_archive (bool): unused, as this is the archive root.
+
+        Returns:
+            (BaseTaskItem or None): tree item at given path, if one exists.
+        """
+        if isinstance(path, str):
+            path_list = path.split(self.TREE_PATH_SEPARATOR)
+        else:
+            path_list = path
+        if (isinstance(path_list, list)
+                and len(path_list) > 1
+                and path_list[1] in self._unloaded_categories):
+            relative_path = self.TREE_PATH_SEPARATOR.join(path_list[1:])
+            if self._path_index is None or relative_path in self._path_index:
+                self.load_category(path_list[1])
+        return super(ArchiveTaskRoot, self).get_item_at_path(
+            path,
+            strict=strict,
+        )
+
+    ### Serialization ###
+    @classmethod
+    def from_directory(cls, directory_path, name=None, *args, **kwargs):
+        """Initialise archive from directory, without reading categories.
+
+        Args:
+            directory_path (str): directory to read from.
+            name (str or None): name of root - if none, use
+                cls.ARCHIVE_ROOT_NAME.
+            args (list): additional args, to be ignored.
+            kwargs (dict): additional kwargs, to be ignored.
+
+        Raises:
+            (SerializationError): if the directory isn't an archive.
+
+        Returns:
+            (ArchiveTaskRoot): archive root, with no categories loaded.
+        """
+        if not is_serialize_directory(directory_path, cls._MARKER_FILE):
+            raise SerializationError(
+                "Directory path {0} is not a serialized class "
+                "directory".format(directory_path)
+            )
+        archive_root = cls(name)
+        archive_root._directory_path = directory_path
+        order = cls._read_json_file(
+            os.path.join(directory_path, cls._ORDER_FILE)
+        )
+        if not isinstance(order, list):
+            raise SerializationError(
+                "Order file in {0} is not formatted as json list".format(
+                    directory_path
+                )
+            )
+        for name in order:
+            if not name:
+                continue
+            if os.path.isfile(
+                    archive_root._get_compressed_file(directory_path, name)):
+                archive_root._compress = True
+            elif not is_serialize_directory(
+                    os.path.join(directory_path, name),
+                    TaskCategory._MARKER_FILE):
+                continue
+            archive_root._category_order.append(name)
+            archive_root._unloaded_categories.add(name)
+
+        path_index_file = os.path.join(directory_path, cls.PATH_INDEX_FILE)
+        if os.path.isfile(path_index_file):
+            archive_root._path_index = set(
+                cls._read_json_file(path_index_file)
+            )
+        archive_root._record_written_state(directory_path)
+        return archive_root
+
+    def to_dict(self):
+        """Create json dict from archive, loading all categories first.
+
+        Returns:
+            (OrderedDict): json dict of archive.
+        """
+        self.load_all()
+        return super(ArchiveTaskRoot, self).to_dict()
+
+    def to_directory(self, directory_path):
+        """Write archive to directory path, along with its path index.
+
+        Args:
+            directory_path (str): directory to write to.
+        """
+        self.load_all()
+        if not self._compress:
+            super(ArchiveTaskRoot, self).to_directory(directory_path)
+            self._write_path_index(directory_path)
+        else:
+            self._write_compressed_directory(directory_path)
+        self._record_written_state(directory_path)
+
+    def _write_path_index(self, directory_path):
+        """Write index of the paths of all archived items.
+
+        Args:
+            directory_path (str): archive directory.
+        """
+        path_index = [
+            self.TREE_PATH_SEPARATOR.join(item.path_list[1:])
+            for item in self.iter_descendants()
+        ]
+        path_index_file = os.path.join(directory_path, self.PATH_INDEX_FILE)
+        with open(path_index_file, "w") as file_:
+            json.dump(path_index, file_)
+
+    def _write_compressed_directory(self, directory_path):
+        """Write archive to directory path, with categories as gzip files.
+
+        The whole archive is written to a temp directory alongside the
+        given one first, which then replaces it. This means the existing
+        archive is only removed once the new one has been written in full.
+
+        Args:
+            directory_path (str): directory to write to.
+        """
+        self._run_directory_checks()
+        self._check_directory_can_be_written_to(directory_path)
+        dict_repr = self.to_dict()
+        categories = dict_repr.get(self._SUBDIR_KEY, {})
+        dict_repr[self._SUBDIR_KEY] = OrderedDict()
+
+        directory_path = os.path.abspath(directory_path)
+        tmp_dir = tempfile.mkdtemp(
+            suffix="{0}_tmp_".format(os.path.basename(directory_path)),
+            dir=os.path.dirname(directory_path),
+        )
+        write_path = os.path.join(tmp_dir, os.path.basename(directory_path))
+        try:
+            self._dict_to_directory(write_path, dict_repr)
+            order_file = os.path.join(write_path, self._ORDER_FILE)
+            with open(order_file, "w") as file_:
+                json.dump(list(categories.keys()), file_, indent=4)
+            for name, category_dict in categories.items():
+                if not name:
+                    # can't save empty name
+                    continue
+                compressed_file = self._get_compressed_file(write_path, name)
+                with gzip.open(compressed_file, "wt") as file_:
+                    json.dump(category_dict, file_)
+            self._write_path_index(write_path)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        # swap in new archive, keeping the old one as a backup until done
+        if os.path.exists(directory_path):
+            os.replace(
+                directory_path,
+                os.path.join(tmp_dir, self._BACKUP_DIR_NAME),
+            )
+        os.replace(write_path, directory_path)
+        shutil.rmtree(tmp_dir)
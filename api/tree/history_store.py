@@ -0,0 +1,394 @@
+"""Columnar store of task history data, for fast batch queries.
+
+The task history classes store their data in nested dictionaries, which
+are convenient for editing but slow to query across many tasks and dates.
+This module provides a columnar version of the core history fields, with
+parallel numpy arrays of day numbers, task indexes, status codes, override
+flags and values, and batch methods to query them over a grid of tasks and
+dates in a single vectorized pass.
+
+This requires numpy, which is an optional dependency, so is only imported
+when the store is used.
+"""
+
+from scheduler.api.common.date_time import Date, Time, TimeDelta
+from scheduler.api.enums import ItemStatus
+from .task_history import TaskType
+
+
+class HistoryStoreError(Exception):
+    """Exception class for history store errors."""
+
+
+def _import_numpy():
+    """Import numpy.
+
+    Raises:
+        (HistoryStoreError): if numpy isn't installed.
+
+    Returns:
+        (module): the numpy module.
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise HistoryStoreError(
+            "Could not import numpy module. Ensure this is installed to "
+            "use the history store."
+        )
+    return numpy
+
+
+class HistoryStore(object):
+    """Columnar store of task history core fields.
+
+    The columns for each task are built from its history the first time
+    they're needed and then cached until the history is modified (which is
+    determined from the task history version number), so the store can be
+    kept for a whole session.
+
+    Statuses are stored as integer codes (see STATUSES), with NO_STATUS for
+    dates that have history but no status. Values are stored as floats,
+    with NaN for dates that have no value or a non-numeric value.
+    """
+    NO_STATUS = -1
+    STATUSES = [
+        ItemStatus.UNSTARTED,
+        ItemStatus.IN_PROGRESS,
+        ItemStatus.COMPLETE,
+    ]
+    STATUS_CODES = {status: i for i, status in enumerate(STATUSES)}
+    COMPLETE_CODE = STATUS_CODES[ItemStatus.COMPLETE]
+
+    def __init__(self):
+        """Initialize store.
+
+        Attributes:
+            _task_columns (dict(Task, tuple)): cached columns for each task,
+                along with the task history version they were built from.
+        """
+        self._task_columns = {}
+
+    @staticmethod
+    def _value_to_float(value):
+        """Convert history value to float, for storing in value column.
+
+        Args:
+            value (variant): value to convert.
+
+        Returns:
+            (float): the value as a float. Times and time deltas are given
+                in minutes, statuses by their code and any other non-numeric
+                value as NaN.
+        """
+        if isinstance(value, (int, float)):
+            return float(value)
+        if isinstance(value, ItemStatus):
+            return float(HistoryStore.STATUS_CODES.get(value, -1))
+        if isinstance(value, Time):
+            return value.hour * 60 + value.minute + value.second / 60
+        if isinstance(value, TimeDelta):
+            return value.total_seconds() / 60
+        return float("nan")
+
+    def _build_task_columns(self, task):
+        """Build columns for given task from its history.
+
+        Args:
+            task (Task): task to build columns for.
+
+        Returns:
+            (tuple(numpy.ndarray)): day numbers, status codes, override
+                flags and values for each date in the task history, ordered
+                by date.
+        """
+        numpy = _import_numpy()
+        history = task.history
+        day_numbers = []
+        status_codes = []
+        overrides = []
+        values = []
+        for date, subdict in history.iter_date_dicts():
+            day_numbers.append(date.day_number)
+            status_codes.append(
+                self.STATUS_CODES.get(
+                    subdict.get(history.STATUS_KEY),
+                    self.NO_STATUS,
+                )
+            )
+            overrides.append(
+                bool(subdict.get(history.STATUS_OVERRIDE_KEY, False))
+            )
+            value = subdict.get(history.VALUE_KEY)
+            values.append(
+                float("nan") if value is None else self._value_to_float(value)
+            )
+        return (
+            numpy.array(day_numbers, dtype=numpy.int64),
+            numpy.array(status_codes, dtype=numpy.int8),
+            numpy.array(overrides, dtype=bool),
+            numpy.array(values, dtype=numpy.float64),
+        )
+
+    def get_task_columns(self, task):
+        """Get columns for given task, rebuilding them if out of date.
+
+        Args:
+            task (Task): task to get columns for.
+
+        Returns:
+            (tuple(numpy.ndarray)): day numbers, status codes, override
+                flags and values for each date in the task history, ordered
+                by date.
+        """
+        version = task.history.version
+        cached = self._task_columns.get(task)
+        if cached is None or cached[0] != version:
+            cached = (version, self._build_task_columns(task))
+            self._task_columns[task] = cached
+        return cached[1]
+
+    def get_columns(self, tasks):
+        """Get combined columns for the given tasks.
+
+        Args:
+            tasks (list(Task)): tasks to get columns for.
+
+        Returns:
+            (tuple(numpy.ndarray)): parallel arrays of day numbers, task
+                indexes (ie. the index of each entry's task in the tasks
+                list), status codes, override flags and values, ordered by
+                task index and then date.
+        """
+        numpy = _import_numpy()
+        task_columns = [self.get_task_columns(task) for task in tasks]
+        if not task_columns:
+            return (
+                numpy.zeros(0, dtype=numpy.int64),
+                numpy.zeros(0, dtype=numpy.int64),
+                numpy.zeros(0, dtype=numpy.int8),
+                numpy.zeros(0, dtype=bool),
+                numpy.zeros(0, dtype=numpy.float64),
+            )
+        task_indexes = numpy.repeat(
+            numpy.arange(len(tasks), dtype=numpy.int64),
+            [len(columns[0]) for columns in task_columns],
+        )
+        return (
+            numpy.concatenate([columns[0] for columns in task_columns]),
+            task_indexes,
+            numpy.concatenate([columns[1] for columns in task_columns]),
+            numpy.concatenate([columns[2] for columns in task_columns]),
+            numpy.concatenate([columns[3] for columns in task_columns]),
+        )
+
+    def _find_entries(self, day_numbers, task_indexes, num_tasks, start, end):
+        """Find the latest entry on or before each date, for each task.
+
+        Args:
+            day_numbers (numpy.ndarray): day number column. This must be
+                non-empty.
+            task_indexes (numpy.ndarray): task index column.
+            num_tasks (int): number of tasks.
+            start (Date): first date of grid.
+            end (Date): last date of grid.
+
+        Returns:
+            (numpy.ndarray): 2d array of entry positions in the columns for
+                each task (row) and date (column), or -1 if the task has no
+                entry on or before that date.
+            (numpy.ndarray): 2d boolean array, True where the entry is
+                exactly at the given date.
+        """
+        numpy = _import_numpy()
+        grid_days = numpy.arange(start.day_number, end.day_number + 1)
+        # combine task index and day number into a single sorted key
+        key_scale = int(max(end.day_number, day_numbers.max())) + 1
+        keys = task_indexes * key_scale + day_numbers
+        row_indexes = numpy.arange(num_tasks, dtype=numpy.int64)[:, None]
+        grid_keys = row_indexes * key_scale + grid_days[None, :]
+        positions = numpy.searchsorted(keys, grid_keys, side="right") - 1
+        positions = self._mask_positions(positions, task_indexes, row_indexes)
+        exact = (positions >= 0) & (
+            day_numbers[numpy.clip(positions, 0, None)] == grid_days[None, :]
+        )
+        return positions, exact
+
+    @staticmethod
+    def _mask_positions(positions, task_indexes, row_indexes):
+        """Set entry positions that belong to a different task to -1.
+
+        Args:
+            positions (numpy.ndarray): 2d array of entry positions.
+            task_indexes (numpy.ndarray): task index column.
+            row_indexes (numpy.ndarray): column array of the task index of
+                each row.
+
+        Returns:
+            (numpy.ndarray): masked positions array.
+        """
+        numpy = _import_numpy()
+        clipped = numpy.clip(positions, 0, None)
+        valid = (positions >= 0) & (task_indexes[clipped] == row_indexes)
+        return numpy.where(valid, positions, -1)
+
+    def status_matrix(self, tasks, start, end):
+        """Get status codes for the given tasks at each date in a range.
+
+        This matches the logic of TaskHistory.get_status_at_date: each
+        task's status at a date is the most complete status set since the
+        last status override or completion, except for routines, which only
+        use the status set at that date.
+
+        Args:
+            tasks (list(Task)): tasks to get statuses for.
+            start (Date): first date to get statuses at.
+            end (Date): last date to get statuses at (inclusive).
+
+        Returns:
+            (numpy.ndarray): 2d int array of status codes, with a row for each
+                task and a column for each date. The codes are indexes into
+                STATUSES.
+        """
+        numpy = _import_numpy()
+        day_numbers, task_indexes, codes, overrides, _ = self.get_columns(
+            tasks
+        )
+        num_days = end.day_number - start.day_number + 1
+        if not len(codes):
+            return numpy.zeros((len(tasks), num_days), dtype=numpy.int64)
+        positions, exact = self._find_entries(
+            day_numbers,
+            task_indexes,
+            len(tasks),
+            start,
+            end,
+        )
+        status_codes = numpy.maximum(codes, 0).astype(numpy.int64)
+        breaks = overrides | (codes == self.COMPLETE_CODE)
+
+        # each break (and the first entry of each task) starts a segment, so
+        # a cumulative max over values offset by segment gives a running max
+        # that resets at the start of each segment
+        new_segments = breaks.copy()
+        new_segments[0] = True
+        new_segments[1:] |= task_indexes[1:] != task_indexes[:-1]
+        segment_offsets = numpy.cumsum(new_segments) * len(self.STATUSES)
+        segment_maxes = (
+            numpy.maximum.accumulate(segment_offsets + status_codes)
+            - segment_offsets
+        )
+
+        # status at date itself overrides previous ones if it's a break
+        clipped = numpy.clip(positions, 0, None)
+        own_codes = numpy.where(exact, status_codes[clipped], 0)
+        own_breaks = exact & (codes[clipped] != self.NO_STATUS) & (
+            overrides[clipped] | (codes[clipped] == self.COMPLETE_CODE)
+        )
+        # otherwise use the max since the last break before the date
+        row_indexes = numpy.arange(len(tasks), dtype=numpy.int64)[:, None]
+        prev_positions = self._mask_positions(
+            numpy.where(exact, positions - 1, positions),
+            task_indexes,
+            row_indexes,
+        )
+        prev_maxes = numpy.where(
+            prev_positions >= 0,
+            segment_maxes[numpy.clip(prev_positions, 0, None)],
+            0,
+        )
+        statuses = numpy.where(
+            own_breaks,
+            own_codes,
+            numpy.maximum(own_codes, prev_maxes),
+        )
+        routine_rows = numpy.array(
+            [task.type == TaskType.ROUTINE for task in tasks],
+            dtype=bool,
+        )
+        return numpy.where(routine_rows[:, None], own_codes, statuses)
+
+    def completion_matrix(self, tasks, start, end):
+        """Get whether the given tasks were completed at each date in a range.
+
+        Unlike status_matrix, completions aren't carried forward to later
+        dates, so a task only counts as completed at the dates where its
+        history sets a complete status.
+
+        Args:
+            tasks (list(Task)): tasks to check.
+            start (Date): first date to check.
+            end (Date): last date to check (inclusive).
+
+        Returns:
+            (numpy.ndarray): 2d boolean array, with a row for each task and
+                a column for each date.
+        """
+        numpy = _import_numpy()
+        day_numbers, task_indexes, codes, _, _ = self.get_columns(tasks)
+        num_days = end.day_number - start.day_number + 1
+        if not len(codes):
+            return numpy.zeros((len(tasks), num_days), dtype=bool)
+        positions, exact = self._find_entries(
+            day_numbers,
+            task_indexes,
+            len(tasks),
+            start,
+            end,
+        )
+        return exact & (
+            codes[numpy.clip(positions, 0, None)] == self.COMPLETE_CODE
+        )
+
+    def value_matrix(self, tasks, start, end):
+        """Get values for the given tasks at each date in a range.
+
+        This matches the logic of TaskHistory.get_value_at_date, ie. values
+        only apply to the date they're set at.
+
+        Args:
+            tasks (list(Task)): tasks to get values for.
+            start (Date): first date to get values at.
+            end (Date): last date to get values at (inclusive).
+
+        Returns:
+            (numpy.ndarray): 2d float array of values, with a row for each
+                task and a column for each date, and NaN where no numeric
+                value is set.
+        """
+        numpy = _import_numpy()
+        day_numbers, task_indexes, _, _, values = self.get_columns(tasks)
+        num_days = end.day_number - start.day_number + 1
+        if not len(values):
+            return numpy.full((len(tasks), num_days), numpy.nan)
+        positions, exact = self._find_entries(
+            day_numbers,
+            task_indexes,
+            len(tasks),
+            start,
+            end,
+        )
+        return numpy.where(
+            exact,
+            values[numpy.clip(positions, 0, None)],
+            numpy.nan,
+        )
+
+    def get_dates(self, start, end):
+        """Get list of dates corresponding to the columns of a matrix.
+
+        Args:
+            start (Date): first date of matrix.
+            end (Date): last date of matrix.
+
+        Returns:
+            (list(Date)): the dates.
+        """
+        return [
+            Date.from_day_number(day_number)
+            for day_number in range(start.day_number, end.day_number + 1)
+        ]
+
+    def clear(self):
+        """Clear all cached columns."""
+        self._task_columns = {}
@@ -0,0 +1,423 @@
+"""Full-text search index over task item names, paths and history comments.
+
+This is an inverted index from lowercase word tokens to the items whose
+names, display names or history comments contain that token. A sorted list
+of all tokens is kept alongside it, so each query word can be matched as a
+prefix with a binary search rather than by scanning every item. Paths are
+searched by checking the ancestors of matching items, rather than indexing
+the full path of every item, so each ancestor's tokens aren't duplicated
+across all its descendants.
+
+Like the task index, this is maintained by the TaskRoot: edits mark the
+items they modify as dirty, and these are reindexed at the next query.
+"""
+
+from bisect import bisect_left, insort
+import heapq
+import re
+
+
+class SearchField(object):
+    """Struct representing the item fields that are searched."""
+    NAME = "name"
+    DISPLAY_NAME = "display_name"
+    PATH = "path"
+    COMMENT = "comment"
+
+    # token scores for each field - a token's score for an item is the
+    # highest score of all fields it appears in
+    WEIGHTS = {
+        NAME: 8,
+        DISPLAY_NAME: 6,
+        PATH: 2,
+        COMMENT: 1,
+    }
+
+
+class SearchResult(object):
+    """Class representing a single search result."""
+    def __init__(self, item, score, dates=None):
+        """Initialize.
+
+        Args:
+            item (BaseTaskItem): the matching item.
+            score (int): the item's score for the search.
+            dates (list(Date) or None): dates of history comments that
+                matched the search, if any.
+        """
+        self._item = item
+        self._score = score
+        self._dates = dates or []
+
+    @property
+    def item(self):
+        """Get matching item.
+
+        Returns:
+            (BaseTaskItem): the item.
+        """
+        return self._item
+
+    @property
+    def score(self):
+        """Get score of item for search.
+
+        Returns:
+            (int): the score.
+        """
+        return self._score
+
+    @property
+    def dates(self):
+        """Get dates of matching history comments.
+
+        Returns:
+            (list(Date)): the dates, in order.
+        """
+        return self._dates
+
+
+class SearchIndex(object):
+    """Inverted index from word tokens to task items."""
+    TOKEN_REGEX = re.compile(r"\w+")
+    # multiplier for tokens that exactly match a query word
+    EXACT_MATCH_MULTIPLIER = 2
+
+    def __init__(self, task_root):
+        """Initialize.
+
+        Args:
+            task_root (TaskRoot): the task root whose items we're indexing.
+
+        Attributes:
+            _postings (dict(str, dict(BaseTaskItem, int)) or None): dict
+                mapping each token to the items it appears in, with the
+                token score for each item, or None if not yet built.
+            _comment_dates (dict(str, dict(BaseTaskItem, set(Date)))): dates
+                of the history comments each token appears in, for each item.
+            _sorted_tokens (list(str)): all tokens, in order.
+            _item_tokens (dict(BaseTaskItem, list(str))): the tokens that
+                each item is currently indexed under.
+            _item_ancestors (dict(BaseTaskItem, tuple(BaseTreeItem))): the
+                ancestors of each item, for matching query words to paths.
+                As moving or renaming an item also marks its descendants
+                as dirty, these stay valid until each item is reindexed.
+            _item_sort_names (dict(BaseTaskItem, str)): lowercase name of
+                each item, used to order results with the same score.
+            _dirty_items (set(BaseTaskItem)): items that need reindexing.
+        """
+        self._task_root = task_root
+        self._postings = None
+        self._comment_dates = {}
+        self._sorted_tokens = []
+        self._item_tokens = {}
+        self._item_ancestors = {}
+        self._item_sort_names = {}
+        self._dirty_items = set()
+
+    @classmethod
+    def tokenize(cls, text):
+        """Split text into lowercase word tokens.
+
+        Args:
+            text (str): text to split.
+
+        Returns:
+            (list(str)): the tokens.
+        """
+        return cls.TOKEN_REGEX.findall(text.lower())
+
+    def _get_item_tokens(self, item):
+        """Get tokens for given item, with their scores and comment dates.
+
+        Args:
+            item (BaseTaskItem): item to get tokens for.
+
+        Returns:
+            (dict(str, int)): score of each token in the item's fields.
+            (dict(str, set(Date))): dates of comments each token appears in.
+        """
+        fields = [(SearchField.NAME, item.name, None)]
+        display_name = getattr(item, "display_name", None)
+        if display_name:
+            fields.append((SearchField.DISPLAY_NAME, display_name, None))
+        history = getattr(item, "history", None)
+        if history is not None:
+            fields.extend([
+                (SearchField.COMMENT, comment, date)
+                for date, _, comment in history.iter_comments()
+            ])
+        scores = {}
+        dates = {}
+        for field, text, date in fields:
+            weight = SearchField.WEIGHTS[field]
+            for token in self.tokenize(text):
+                if weight > scores.get(token, 0):
+                    scores[token] = weight
+                if date is not None:
+                    dates.setdefault(token, set()).add(date)
+        return scores, dates
+
+    def _add_item(self, item):
+        """Add item to index.
+
+        Args:
+            item (BaseTaskItem): item to add.
+        """
+        scores, dates = self._get_item_tokens(item)
+        for token, score in scores.items():
+            token_postings = self._postings.get(token)
+            if token_postings is None:
+                token_postings = self._postings[token] = {}
+                insort(self._sorted_tokens, token)
+            token_postings[item] = score
+        for token, token_dates in dates.items():
+            self._comment_dates.setdefault(token, {})[item] = token_dates
+        self._add_item_data(item, scores)
+
+    def _add_item_data(self, item, scores):
+        """Store tokens, ancestors and sort name of item.
+
+        Args:
+            item (BaseTaskItem): item being added to index.
+            scores (dict(str, int)): the item's token scores.
+        """
+        self._item_tokens[item] = list(scores.keys())
+        self._item_ancestors[item] = tuple(item.iter_ancestors(strict=True))
+        self._item_sort_names[item] = item.name.lower()
+
+    def _remove_item(self, item):
+        """Remove item from index, if it's there.
+
+        Args:
+            item (BaseTaskItem): item to remove.
+        """
+        self._item_ancestors.pop(item, None)
+        self._item_sort_names.pop(item, None)
+        for token in self._item_tokens.pop(item, []):
+            token_dates = self._comment_dates.get(token)
+            if token_dates is not None:
+                token_dates.pop(item, None)
+                if not token_dates:
+                    del self._comment_dates[token]
+            token_postings = self._postings[token]
+            del token_postings[item]
+            if not token_postings:
+                del self._postings[token]
+                index = bisect_left(self._sorted_tokens, token)
+                del self._sorted_tokens[index]
+
+    def _build(self):
+        """Build index from scratch."""
+        self._postings = {}
+        self._comment_dates = {}
+        self._item_tokens = {}
+        self._item_ancestors = {}
+        self._item_sort_names = {}
+        self._dirty_items = set()
+        for item in self._task_root.iter_descendants():
+            scores, dates = self._get_item_tokens(item)
+            for token, score in scores.items():
+                self._postings.setdefault(token, {})[item] = score
+            for token, token_dates in dates.items():
+                self._comment_dates.setdefault(token, {})[item] = token_dates
+            self._add_item_data(item, scores)
+        self._sorted_tokens = sorted(self._postings.keys())
+
+    def _update(self):
+        """Build index if needed, and reindex any dirty items."""
+        if self._postings is None:
+            self._build()
+            return
+        dirty_items = self._dirty_items
+        self._dirty_items = set()
+        for item in dirty_items:
+            self._remove_item(item)
+            # items that have been removed from the tree have a new root
+            if item.root is self._task_root and item is not self._task_root:
+                self._add_item(item)
+
+    def mark_dirty(self, items, recursive=False):
+        """Mark items as modified, so they're reindexed at the next query.
+
+        Args:
+            items (list(BaseTaskItem)): items that have been modified, added
+                to the tree or removed from it.
+            recursive (bool): if True, also mark descendants of the items.
+        """
+        if self._postings is None:
+            return
+        for item in items:
+            if recursive:
+                self._dirty_items.update(item.iter_descendants(strict=False))
+            else:
+                self._dirty_items.add(item)
+
+    def iter_prefix_tokens(self, prefix):
+        """Iterate through all tokens in index starting with given prefix.
+
+        Args:
+            prefix (str): the prefix to match.
+
+        Yields:
+            (str): the matching tokens, in order.
+        """
+        self._update()
+        index = bisect_left(self._sorted_tokens, prefix)
+        while index < len(self._sorted_tokens):
+            token = self._sorted_tokens[index]
+            if not token.startswith(prefix):
+                return
+            yield token
+            index += 1
+
+    def _get_query_token_scores(self, query_token):
+        """Get scores of items that directly match a query token.
+
+        Args:
+            query_token (str): the query token, which is matched against
+                all tokens it's a prefix of.
+
+        Returns:
+            (dict(BaseTaskItem, int)): score of each matching item.
+            (list(dict(BaseTaskItem, set(Date)))): comment dates of items
+                for each matching token that appears in comments.
+        """
+        scores = None
+        dates = []
+        for token in self.iter_prefix_tokens(query_token):
+            token_postings = self._postings[token]
+            if token == query_token:
+                token_postings = {
+                    item: score * self.EXACT_MATCH_MULTIPLIER
+                    for item, score in token_postings.items()
+                }
+            if scores is None:
+                scores = dict(token_postings)
+            else:
+                for item, score in token_postings.items():
+                    if score > scores.get(item, 0):
+                        scores[item] = score
+            if token in self._comment_dates:
+                dates.append(self._comment_dates[token])
+        return scores or {}, dates
+
+    def search(self, query, limit=None):
+        """Search index for items matching query.
+
+        Each word in the query must match the start of a word in the name,
+        display name or history comments of the item or the name of one of
+        its ancestors, and at least one word must match the item itself.
+        Items are ranked by the sum of the scores of their best match for
+        each query word, where name matches score highest, then display
+        names, then ancestor names and finally comments. Exact word matches
+        score double.
+
+        Args:
+            query (str): the search query.
+            limit (int or None): maximum number of results to return, if
+                given.
+
+        Returns:
+            (list(SearchResult)): the results, best first.
+        """
+        query_tokens = set(self.tokenize(query))
+        if not query_tokens:
+            return []
+        token_scores_list = []
+        token_dates_list = []
+        for query_token in query_tokens:
+            scores, dates = self._get_query_token_scores(query_token)
+            if not scores:
+                return []
+            token_scores_list.append(scores)
+            token_dates_list.extend(dates)
+
+        path_score = SearchField.WEIGHTS[SearchField.PATH]
+        results = {}
+        for scores in token_scores_list:
+            for item in scores:
+                if item in results:
+                    continue
+                total_score = 0
+                for token_scores in token_scores_list:
+                    score = token_scores.get(item)
+                    if score is None:
+                        if any(ancestor in token_scores
+                               for ancestor in self._item_ancestors[item]):
+                            score = path_score
+                        else:
+                            total_score = None
+                            break
+                    total_score += score
+                results[item] = total_score
+        items = self._rank_items(results, limit)
+        return [
+            SearchResult(item, results[item], self._get_dates(
+                item,
+                token_dates_list,
+            ))
+            for item in items
+        ]
+
+    def _rank_items(self, scores, limit=None):
+        """Get items in order of score, then name.
+
+        Scores only take a few distinct values, so items are grouped by
+        score and only the groups needed to reach the limit are sorted.
+
+        Args:
+            scores (dict(BaseTaskItem, int or None)): score of each item,
+                or None if the item didn't match.
+            limit (int or None): maximum number of items to return.
+
+        Returns:
+            (list(BaseTaskItem)): the ranked items.
+        """
+        score_groups = {}
+        for item, score in scores.items():
+            if score is not None:
+                score_groups.setdefault(score, []).append(item)
+        items = []
+        for score in sorted(score_groups, reverse=True):
+            group = score_groups[score]
+            if limit is None:
+                items.extend(sorted(group, key=self._item_sort_names.get))
+                continue
+            items.extend(
+                heapq.nsmallest(
+                    limit - len(items),
+                    group,
+                    key=self._item_sort_names.get,
+                )
+            )
+            if len(items) >= limit:
+                break
+        return items
+
+    @staticmethod
+    def _get_dates(item, token_dates_list):
+        """Get dates of matching comments for given item.
+
+        Args:
+            item (BaseTaskItem): the item.
+            token_dates_list (list(dict(BaseTaskItem, set(Date)))): comment
+                dates of items for each matching token.
+
+        Returns:
+            (list(Date)): dates of comments on the item that matched.
+        """
+        dates = set()
+        for token_dates in token_dates_list:
+            dates.update(token_dates.get(item, []))
+        return sorted(dates)
+
+    def clear(self):
+        """Clear index, so it's rebuilt at the next query."""
+        self._postings = None
+        self._comment_dates = {}
+        self._sorted_tokens = []
+        self._item_tokens = {}
+        self._item_ancestors = {}
+        self._item_sort_names = {}
+        self._dirty_items = set()
@@ -122,14 +122,13 @@ class Task(BaseTaskItem):
         Returns:
             (ItemStatus): current status.
         """
-        return self.history.get_status_at_date(Date.now())
+        return self.history.get_current_status()
         # TODO: keep an eye that it's fine to use date not datetime
         # return self.history.get_status_at_datetime(DateTime.now())
 
         # I'm changing this to just find status at the current datetime, as it
-        # needs to update as the time changes.
-        # TODO: keep an eye on if this seems to slow stuff down considerably.
-        # there's definitely stuff I can do with caching to speed it up
+        # needs to update as the time changes. The history caches this status
+        # until the task history or type changes, or the date changes.
         # TODO: delete below and notes above when I'm more confident, and
         # delete the _status attribute, plus its corresponding logic in the
         # to_dict and from_dict methods
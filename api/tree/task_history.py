@@ -103,6 +103,8 @@ class TaskHistory(object):
         """
         self._task = task
         self._dict = TimelineDict()
+        self._current_status = None
+        self._version = 0
 
     def __bool__(self):
         """Override bool operator to indicate whether dictionary is filled.
@@ -180,9 +182,26 @@ class TaskHistory(object):
             (Date): date of history.
             (dict): subdict of internal dict for that date.
         """
-        for date, subdict in self._dict.items():
+        for date, subdict in self._dict.iter_items():
             yield date, subdict
 
+    def iter_comments(self):
+        """Iterate through all comments in task history.
+
+        Yields:
+            (Date): date of comment.
+            (Time or None): time of comment, if it's at time level.
+            (str): the comment.
+        """
+        for date, subdict in self._dict.iter_items():
+            comment = subdict.get(self.COMMENT_KEY)
+            if comment:
+                yield date, None, comment
+            for time, time_subdict in subdict.get(self.TIMES_KEY, {}).items():
+                comment = time_subdict.get(self.COMMENT_KEY)
+                if comment:
+                    yield date, time, comment
+
     ### Core Field Getters ###
     def get_status_at_date(self, date, start=False):
         """Get task status at given date.
@@ -233,6 +252,66 @@ class TaskHistory(object):
                     break
         return status
 
+    def get_current_status(self):
+        """Get task status at the current date.
+
+        This is cached, as it's queried whenever a task is drawn or filtered.
+        The cache is keyed by date and task type, and is cleared when the
+        history is marked as modified.
+
+        Returns:
+            (ItemStatus): current task status.
+        """
+        date = Date.now()
+        task_type = self._task.type
+        if (self._current_status is None
+                or self._current_status[0] != date
+                or self._current_status[1] != task_type):
+            self._current_status = (
+                date,
+                task_type,
+                self.get_status_at_date(date),
+            )
+        return self._current_status[2]
+
+    @property
+    def version(self):
+        """Get version number of history, incremented whenever it's modified.
+
+        This can be used by clients that cache data derived from the history
+        to check if their cache is still valid.
+
+        Returns:
+            (int): version number.
+        """
+        return self._version
+
+    def mark_modified(self):
+        """Mark history as modified, clearing any cached data derived from it.
+
+        This must be called by anything that modifies the history dict.
+        """
+        self._version += 1
+        self.clear_status_cache()
+        self._task.root._mark_descendants_modified([self._task])
+
+    def clear_status_cache(self):
+        """Clear cached current status."""
+        self._current_status = None
+
+    def update_status_cache(self):
+        """Recalculate cached current status, eg. after the date has changed.
+
+        Returns:
+            (bool): whether or not the cached status has changed. If there
+                was no cached status, this returns False.
+        """
+        if self._current_status is None:
+            return False
+        old_status = self._current_status[2]
+        self._current_status = None
+        return self.get_current_status() != old_status
+
     def get_value_at_date(self, date):
         """Get task value at given date.
 
@@ -969,6 +1048,114 @@ class TaskHistory(object):
         )
         influencers_dict[influencer] = influence_dict
 
+    def _date_subdict_to_json_dict(self, subdict):
+        """Utility to get a json dict from the history subdict at a date.
+
+        Args:
+            subdict (dict): history subdict at a given date.
+
+        Returns:
+            (OrderedDict): json dict for that date.
+        """
+        json_subdict = self._subdict_to_json_dict(subdict, True)
+        if self.TIMES_KEY in subdict:
+            json_times_subdict = OrderedDict()
+            for time, time_subdict in subdict[self.TIMES_KEY].items():
+                json_time_subdict = self._subdict_to_json_dict(
+                    time_subdict,
+                    include_influencers_key=True,
+                )
+                if not json_time_subdict:
+                    continue
+                json_times_subdict[time.string()] = json_time_subdict
+            if json_times_subdict:
+                json_subdict[self.TIMES_KEY] = json_times_subdict
+        return json_subdict
+
+    @classmethod
+    def _date_subdict_from_json_dict(
+            cls,
+            task,
+            task_history_item,
+            date,
+            json_subdict):
+        """Utility to add the history subdict at a date from a json dict.
+
+        The subdict is added directly into the task history's internal dict
+        so that any influencers registered during deserialization are added
+        to the same subdict.
+
+        Args:
+            task (Task): task this history dict is for.
+            task_history_item (TaskHistory): the history item being updated.
+            date (Date): the date of the subdict.
+            json_subdict (dict): json subdict for the given date.
+        """
+        class_subdict = task_history_item._dict.setdefault(date, {})
+        class_subdict.update(
+            cls._subdict_from_json_dict(
+                task,
+                json_subdict,
+                include_influencers_key=True,
+                task_history_item=task_history_item,
+                date_time_obj=date,
+            )
+        )
+        if cls.TIMES_KEY in json_subdict:
+            class_times_subdict = class_subdict.setdefault(
+                cls.TIMES_KEY,
+                TimelineDict(),
+            )
+            for time_str, time_subdict in json_subdict[cls.TIMES_KEY].items():
+                time = Time.from_string(time_str)
+                class_times_subdict.setdefault(time, {}).update(
+                    cls._subdict_from_json_dict(
+                        task,
+                        time_subdict,
+                        include_influencers_key=True,
+                        task_history_item=task_history_item,
+                        date_time_obj=DateTime.from_date_and_time(date, time),
+                    )
+                )
+
+    def dates_to_dict(self, dates):
+        """Convert history at the given dates to serialized json dict.
+
+        Args:
+            dates (iterable(Date)): dates to serialize.
+
+        Returns:
+            (OrderedDict): json dict, with a None value for any date that
+                has no history.
+        """
+        json_dict = OrderedDict()
+        for date in dates:
+            subdict = self._dict.get(date)
+            json_subdict = None
+            if subdict is not None:
+                json_subdict = self._date_subdict_to_json_dict(subdict)
+            json_dict[date.string()] = json_subdict or None
+        return json_dict
+
+    def update_from_dict(self, json_dict):
+        """Update history at the dates in the given serialized json dict.
+
+        Args:
+            json_dict (OrderedDict): json dict, as returned by dates_to_dict.
+                Any dates with None values are removed from the history.
+        """
+        self.mark_modified()
+        for date_str, json_subdict in json_dict.items():
+            date = Date.from_string(date_str)
+            self._dict.pop(date, None)
+            if json_subdict is not None:
+                self._date_subdict_from_json_dict(
+                    self._task,
+                    self,
+                    date,
+                    json_subdict,
+                )
+
     def to_dict(self):
         """Convert class to serialized json dict.
 
@@ -980,19 +1167,7 @@ class TaskHistory(object):
         try:
             json_dict = OrderedDict()
             for date, subdict in self._dict.items():
-                json_subdict = self._subdict_to_json_dict(subdict, True)
-                if self.TIMES_KEY in subdict:
-                    json_times_subdict = OrderedDict()
-                    for time, time_subdict in subdict[self.TIMES_KEY].items():
-                        json_time_subdict = self._subdict_to_json_dict(
-                            time_subdict,
-                            include_influencers_key=True,
-                        )
-                        if not json_time_subdict:
-                            continue
-                        json_times_subdict[time.string()] = json_time_subdict
-                    if json_times_subdict:
-                        json_subdict[self.TIMES_KEY] = json_times_subdict
+                json_subdict = self._date_subdict_to_json_dict(subdict)
                 if json_subdict:
                     json_dict[date.string()] = json_subdict
             return json_dict
@@ -1012,29 +1187,11 @@ class TaskHistory(object):
             (TaskHistory): task history class with given dict.
         """
         task_history = cls(task)
-        class_dict = TimelineDict()
-        task_history._dict = class_dict
         for date_str, subdict in json_dict.items():
-            date = Date.from_string(date_str)
-            class_subdict = cls._subdict_from_json_dict(
+            cls._date_subdict_from_json_dict(
                 task,
+                task_history,
+                Date.from_string(date_str),
                 subdict,
-                include_influencers_key=True,
-                task_history_item=task_history,
-                date_time_obj=date,
             )
-            class_dict[date] = class_subdict
-            if cls.TIMES_KEY in subdict:
-                class_times_subdict = TimelineDict()
-                class_subdict[cls.TIMES_KEY] = class_times_subdict
-                for time_str, time_subdict in subdict[cls.TIMES_KEY].items():
-                    time = Time.from_string(time_str)
-                    class_time_subdict = cls._subdict_from_json_dict(
-                        task,
-                        time_subdict,
-                        include_influencers_key=True,
-                        task_history_item=task_history,
-                        date_time_obj=DateTime.from_date_and_time(date, time),
-                    )
-                    class_times_subdict[time] = class_time_subdict
         return task_history
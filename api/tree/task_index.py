@@ -0,0 +1,187 @@
+"""Secondary indexes of task attributes, for fast queries over a task tree.
+
+Each index maps the values of a task attribute to the set of tasks with
+that value, so queries like 'all unstarted tasks' can be answered without
+walking the whole tree. The indexes are maintained by the TaskRoot: edits
+mark the tasks they modify as dirty, and these are reindexed the next time
+the index is queried.
+"""
+
+from .task import Task
+
+
+class TaskIndexAttribute(object):
+    """Struct representing the task attributes that are indexed."""
+    STATUS = "status"
+    TYPE = "type"
+    IMPORTANCE = "importance"
+    SIZE = "size"
+    IS_TRACKED = "is_tracked"
+
+    ALL = [STATUS, TYPE, IMPORTANCE, SIZE, IS_TRACKED]
+
+
+class TaskIndex(object):
+    """Secondary indexes from task attribute values to sets of tasks."""
+    def __init__(self, task_root):
+        """Initialize.
+
+        Args:
+            task_root (TaskRoot): the task root whose tasks we're indexing.
+
+        Attributes:
+            _indexes (dict(str, dict(variant, set(Task))) or None): the
+                indexes for each attribute, or None if not yet built.
+            _task_values (dict(Task, tuple)): the attribute values that each
+                task is currently indexed under.
+            _dirty_items (set(BaseTaskItem)): items that need reindexing.
+            _version (int): counter incremented whenever items are marked
+                dirty, so classes can cache results derived from the index.
+        """
+        self._task_root = task_root
+        self._indexes = None
+        self._task_values = {}
+        self._dirty_items = set()
+        self._version = 0
+
+    @property
+    def version(self):
+        """Get index version.
+
+        Returns:
+            (int): version number.
+        """
+        return self._version
+
+    @staticmethod
+    def _get_task_values(task):
+        """Get values of indexed attributes for given task.
+
+        Args:
+            task (Task): task to get values for.
+
+        Returns:
+            (tuple): value of each attribute in TaskIndexAttribute.ALL.
+        """
+        return tuple(
+            getattr(task, attribute) for attribute in TaskIndexAttribute.ALL
+        )
+
+    def _add_task(self, task):
+        """Add task to indexes.
+
+        Args:
+            task (Task): task to add.
+        """
+        values = self._get_task_values(task)
+        for attribute, value in zip(TaskIndexAttribute.ALL, values):
+            self._indexes[attribute].setdefault(value, set()).add(task)
+        self._task_values[task] = values
+
+    def _remove_task(self, task):
+        """Remove task from indexes, if it's there.
+
+        Args:
+            task (Task): task to remove.
+        """
+        values = self._task_values.pop(task, None)
+        if values is None:
+            return
+        for attribute, value in zip(TaskIndexAttribute.ALL, values):
+            tasks = self._indexes[attribute].get(value)
+            if tasks is not None:
+                tasks.discard(task)
+                if not tasks:
+                    del self._indexes[attribute][value]
+
+    def _build(self):
+        """Build indexes from scratch."""
+        self._indexes = {attribute: {} for attribute in TaskIndexAttribute.ALL}
+        self._task_values = {}
+        self._dirty_items = set()
+        for item in self._task_root.iter_descendants():
+            if isinstance(item, Task):
+                self._add_task(item)
+
+    def _update(self):
+        """Build indexes if needed, and reindex any dirty items."""
+        if self._indexes is None:
+            self._build()
+            return
+        dirty_items = self._dirty_items
+        self._dirty_items = set()
+        for item in dirty_items:
+            self._remove_task(item)
+            # items that have been removed from the tree have a new root
+            if isinstance(item, Task) and item.root is self._task_root:
+                self._add_task(item)
+
+    def mark_dirty(self, items, recursive=False):
+        """Mark items as modified, so they're reindexed at the next query.
+
+        Args:
+            items (list(BaseTaskItem)): items that have been modified, added
+                to the tree or removed from it.
+            recursive (bool): if True, also mark descendants of the items.
+        """
+        self._version += 1
+        if self._indexes is None:
+            return
+        for item in items:
+            if recursive:
+                self._dirty_items.update(item.iter_descendants(strict=False))
+            else:
+                self._dirty_items.add(item)
+
+    def get_tasks(self, attribute, value):
+        """Get tasks with given attribute value.
+
+        Args:
+            attribute (TaskIndexAttribute): attribute to query.
+            value (variant): value to look for.
+
+        Returns:
+            (set(Task)): tasks with that value.
+        """
+        self._update()
+        return set(self._indexes[attribute].get(value, set()))
+
+    def get_values(self, attribute):
+        """Get all values of given attribute in the tree.
+
+        Args:
+            attribute (TaskIndexAttribute): attribute to query.
+
+        Returns:
+            (list(variant)): values of that attribute.
+        """
+        self._update()
+        return list(self._indexes[attribute].keys())
+
+    def get_matching_tasks(self, attribute, value_check):
+        """Get tasks whose attribute value passes the given check.
+
+        As the indexed attributes only have a few distinct values, this
+        only needs to run the check once per value.
+
+        Args:
+            attribute (TaskIndexAttribute): attribute to query.
+            value_check (function): function that accepts an attribute value
+                and returns whether tasks with that value should be included.
+
+        Returns:
+            (set(Task)): the matching tasks.
+        """
+        self._update()
+        matches = set()
+        for value, tasks in self._indexes[attribute].items():
+            if value_check(value):
+                matches.update(tasks)
+        return matches
+
+    def clear(self):
+        """Clear indexes, so they're rebuilt at the next query."""
+        self._indexes = None
+        self._task_values = {}
+        self._dirty_items = set()
+        self._version += 1
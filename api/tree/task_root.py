@@ -11,7 +11,9 @@ from scheduler.api.serialization.serializable import (
 )
 from scheduler.api.utils import fallback_value
 
+from .search_index import SearchIndex
 from .task_category import TaskCategory
+from .task_index import TaskIndex
 
 
 class TaskRoot(TaskCategory):
@@ -43,6 +45,8 @@ class TaskRoot(TaskCategory):
         self._allowed_child_types = [TaskCategory]
         self._history_data = None
         self._archive_root = None
+        self._task_index = None
+        self._search_index = None
 
     @property
     def _categories(self):
@@ -57,9 +61,14 @@ class TaskRoot(TaskCategory):
     def archive_root(self):
         """Get corresponding archive tree root for this tree.
 
+        If the archive is loaded lazily, this loads all of it, so items
+        should be looked up with get_item_at_path where possible instead.
+
         Returns:
             (TaskRoot): archive root.
         """
+        if self._archive_root is not None:
+            self._archive_root.load_all()
         return self._archive_root
 
     def set_archive_root(self, archive_root):
@@ -70,6 +79,74 @@ class TaskRoot(TaskCategory):
         """
         self._archive_root = archive_root
 
+    def load_all(self):
+        """Load any parts of the tree that haven't been read from disk yet.
+
+        Standard task roots are read in full, so this does nothing here,
+        but is reimplemented by lazily loaded roots.
+        """
+        pass
+
+    @property
+    def task_index(self):
+        """Get secondary indexes of task attributes for this tree.
+
+        Returns:
+            (TaskIndex): the task index. This is built the first time it's
+                queried.
+        """
+        if self._task_index is None:
+            self._task_index = TaskIndex(self)
+        return self._task_index
+
+    @property
+    def search_index(self):
+        """Get full-text search index for this tree.
+
+        Returns:
+            (SearchIndex): the search index. This is built the first time
+                it's queried.
+        """
+        if self._search_index is None:
+            self._search_index = SearchIndex(self)
+        return self._search_index
+
+    def _mark_descendants_modified(self, items, recursive=False):
+        """Mark items in this tree as modified, to update the indexes.
+
+        Args:
+            items (list(BaseTreeItem)): items that have been modified, added
+                to the tree or removed from it.
+            recursive (bool): if True, descendants of the items have also
+                been modified.
+        """
+        if self._task_index is not None:
+            self._task_index.mark_dirty(items, recursive=recursive)
+        if self._search_index is not None:
+            self._search_index.mark_dirty(items, recursive=recursive)
+
+    def update_status_caches(self):
+        """Update cached current status of all tasks, eg. at a day change.
+
+        This includes the tasks in the archive root, if one is set.
+
+        Returns:
+            (list(Task)): tasks whose current status has changed.
+        """
+        changed_tasks = []
+        roots = [self]
+        if self._archive_root is not None:
+            roots.append(self._archive_root)
+        for root in roots:
+            root_changed_tasks = []
+            for item in root.iter_descendants():
+                history = getattr(item, "history", None)
+                if history is not None and history.update_status_cache():
+                    root_changed_tasks.append(item)
+            root._mark_descendants_modified(root_changed_tasks)
+            changed_tasks.extend(root_changed_tasks)
+        return changed_tasks
+
     def get_item_at_path(self, path, strict=False, search_archive=False):
         """Get item at given path.
 
@@ -78,6 +155,8 @@ class TaskRoot(TaskCategory):
             strict (bool): if True, require that root names of path match
                 as well.
             search_archive (bool): if True, search archive root as well.
+                This only loads the parts of the archive needed to find
+                the item.
 
         Returns:
             (BaseTaskItem or None): tree item at given path, if one exists.
@@ -93,9 +172,9 @@ class TaskRoot(TaskCategory):
         tree_item = self
         if path_list[0] != self.name:
             if (search_archive
-                    and self.archive_root is not None
+                    and self._archive_root is not None
                     and path_list[0] == self.ARCHIVE_ROOT_NAME):
-                tree_item = self.archive_root
+                return self._archive_root.get_item_at_path(path_list)
             elif strict:
                 return None
         for name in path_list[1:]:
@@ -250,6 +329,8 @@ class HistoryData(object):
             task (Task): task to get history for.
             dates (list(Date)): dates to update at.
         """
+        # this is called whenever the task's history is modified
+        task.history.mark_modified()
         for date in dates:
             history_dict = task.history.get_dict_at_date(date)
             if history_dict != self._dict.get(date, {}).get(task):
@@ -1,6 +1,6 @@
 """Utility functions for scheduler api."""
 
-from collections.abc import MutableMapping
+from collections.abc import Mapping, MutableMapping
 from contextlib import contextmanager
 import datetime
 import sys
@@ -211,6 +211,37 @@ def get_class_name_from_method(method):
         return type(method.__im_class__).__name__
 
 
+def get_size_in_bytes(obj, _seen=None):
+    """Get approximate memory size of an object, including nested containers.
+
+    Only mappings and builtin list, tuple and set types are recursed into.
+    Any other objects are counted by their shallow size, so that we don't
+    follow references out into the rest of the data model.
+
+    Args:
+        obj (variant): object to get size of.
+        _seen (set or None): ids of objects already counted, used when
+            calling recursively.
+
+    Returns:
+        (int): approximate size of object in bytes.
+    """
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, Mapping):
+        for key, value in obj.items():
+            size += get_size_in_bytes(key, _seen)
+            size += get_size_in_bytes(value, _seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += get_size_in_bytes(item, _seen)
+    return size
+
+
 def backup_git_repo(repo_path, commit_message="backup"):
     """Attempt to commit and push all files in git repo at given path.
 
@@ -221,47 +252,5 @@ def backup_git_repo(repo_path, commit_message="backup"):
     Returns:
         (str or None): error message, if save was unsuccessful.
     """
-    try:
-        import git
-    except ImportError:
-        return (
-            "Could not import GitPython module. Ensure python version >= 3.7 "
-            "and this is installed."
-        )
-    try:
-        git_repo = git.Repo(repo_path)
-    except git.exc.InvalidGitRepositoryError:
-        return "Directory {0} is not a valid git repo".format(repo_path)
-    modified_files = [
-        x for x in git_repo.git.diff(None, name_only=True).split("\n") if x
-    ]
-    untracked_files = git_repo.untracked_files
-    files_to_stage = modified_files + untracked_files
-    if not files_to_stage:
-        return None
-
-    for file_ in files_to_stage:
-        try:
-            git_repo.git.add(file_)
-        except git.exc.GitCommandError as e:
-            return "Git error when staging file {0} in repo {1}:\n{2}".format(
-                file_,
-                repo_path,
-                e.stderr
-            )
-    try:
-        git_repo.git.commit("-m", commit_message)
-    except git.exc.GitCommandError as e:
-        return "Git error when committing changes for repo {0}:\n{1}".format(
-            repo_path,
-            e.stderr
-        )
-    try:
-        git_repo.git.push()
-    except git.exc.GitCommandError as e:
-        return "Git error when pushing changes for repo {0}:\n{1}".format(
-            repo_path,
-            e.stderr
-        )
-
-    return None
+    from .git_backup import GitBackupEngine
+    return GitBackupEngine(repo_path).run(commit_message)
@@ -1,12 +1,24 @@
-"""Commandline interface for launching scheduler application."""
+"""Commandline interface for the scheduler application.
+
+Running with no subcommand (or with the gui subcommand) launches the
+application. All other subcommands run headlessly: they only import the
+api, rather than the ui and PyQt5, and only load the project components
+they need, so they can start up quickly.
+"""
 
 import argparse
+from collections import OrderedDict
+import importlib
+import sys
+import time
 
-from scheduler.ui import run_application
 
+def _get_parser():
+    """Get argument parser for the commandline interface.
 
-def process_commandline():
-    """Run application from command line."""
+    Returns:
+        (argparse.ArgumentParser): the parser.
+    """
     parser = argparse.ArgumentParser(description='Scheduler Tool')
     parser.add_argument(
         "-p", "--project-dir",
@@ -17,5 +29,171 @@ def process_commandline():
             "prefs, or prompts user to save a new one if not found."
         ),
     )
-    args = parser.parse_args()
-    run_application(project=(args.project_dir or None))
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help=(
+            "Print report of time taken to import modules and load each "
+            "project component, for headless commands."
+        ),
+    )
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.add_parser("gui", help="Launch scheduler application.")
+    subparsers.add_parser("status", help="Print summary of project tasks.")
+
+    history_parser = subparsers.add_parser(
+        "history",
+        help="Print history of a task.",
+    )
+    history_parser.add_argument(
+        "--task",
+        metavar="<path>",
+        required=True,
+        help="Path of task, eg. 'category/task'.",
+    )
+    history_parser.add_argument(
+        "--from",
+        dest="from_date",
+        metavar="<yyyy-mm-dd>",
+        help="Only show history from this date onwards.",
+    )
+    history_parser.add_argument(
+        "--to",
+        dest="to_date",
+        metavar="<yyyy-mm-dd>",
+        help="Only show history up to this date.",
+    )
+
+    schedule_parser = subparsers.add_parser(
+        "schedule",
+        help="Print scheduled items for a week.",
+    )
+    schedule_parser.add_argument(
+        "--week",
+        metavar="<yyyy-mm-dd>",
+        help="Show the week containing this date. Defaults to this week.",
+    )
+
+    export_parser = subparsers.add_parser(
+        "export",
+        help="Export a project component as json.",
+    )
+    export_parser.add_argument(
+        "component",
+        nargs="?",
+        default="tasks",
+        choices=["tasks", "calendar", "tracker", "filterer"],
+        help="Component to export. Defaults to tasks.",
+    )
+    export_parser.add_argument(
+        "-o", "--output",
+        metavar="<path>",
+        help="File to write to. Defaults to stdout.",
+    )
+
+    bench_parser = subparsers.add_parser(
+        "bench",
+        help="Time project load and some common queries.",
+    )
+    bench_parser.add_argument(
+        "--repeat",
+        type=int,
+        default=10,
+        help="Number of times to run each query.",
+    )
+
+    daemon_parser = subparsers.add_parser(
+        "daemon",
+        help="Keep project loaded and serve requests on a unix socket.",
+    )
+    daemon_parser.add_argument(
+        "--socket",
+        metavar="<path>",
+        help="Socket path to serve on. Defaults to one in the temp directory.",
+    )
+
+    call_parser = subparsers.add_parser(
+        "call",
+        help="Send a json-rpc request to a running project daemon.",
+    )
+    call_parser.add_argument(
+        "method",
+        help="Name of method to run, eg. 'get_item'.",
+    )
+    call_parser.add_argument(
+        "--params",
+        metavar="<json>",
+        default="{}",
+        help="Json object of params to pass to the method.",
+    )
+    call_parser.add_argument(
+        "--socket",
+        metavar="<path>",
+        help="Socket path of daemon. Defaults to one in the temp directory.",
+    )
+    return parser
+
+
+def _get_timings_text(timings):
+    """Get report of startup timings.
+
+    Args:
+        timings (OrderedDict(str, float)): durations of each startup step.
+
+    Returns:
+        (str): report text.
+    """
+    lines = [
+        "{0:<20} {1:>10.1f}ms".format(name, duration * 1000)
+        for name, duration in timings.items()
+    ]
+    lines.append(
+        "{0:<20} {1:>10.1f}ms".format(
+            "Total",
+            sum(timings.values()) * 1000,
+        )
+    )
+    return "\n".join(lines)
+
+
+def run_command(args):
+    """Run headless command.
+
+    Args:
+        args (argparse.Namespace): parsed commandline args.
+
+    Returns:
+        (int): exit code.
+    """
+    timings = OrderedDict()
+    start_time = time.perf_counter()
+    # imported here so that only the commands being run import the api
+    commands = importlib.import_module("scheduler.cli.commands")
+    timings["Import api"] = time.perf_counter() - start_time
+    try:
+        stages = commands.get_stages(args.command, args)
+        project = None
+        if stages is not None:
+            project = commands.load_project(args.project_dir, stages, timings)
+        start_time = time.perf_counter()
+        commands.COMMANDS[args.command](project, args)
+        timings["Run {0}".format(args.command)] = (
+            time.perf_counter() - start_time
+        )
+    except commands.CommandError as error:
+        sys.stderr.write("Error: {0}\n".format(error))
+        return 1
+    if args.timings or args.command == "bench":
+        sys.stderr.write(_get_timings_text(timings) + "\n")
+    return 0
+
+
+def process_commandline():
+    """Run application or headless command from command line."""
+    args = _get_parser().parse_args()
+    if args.command in (None, "gui"):
+        # imported here to avoid importing PyQt5 for headless commands
+        from scheduler.ui import run_application
+        run_application(project=(args.project_dir or None))
+    else:
+        sys.exit(run_command(args))
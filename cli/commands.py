@@ -0,0 +1,365 @@
+"""Headless commands for the scheduler commandline interface.
+
+These only use the api (so PyQt5 is never imported), and each command
+only loads the project components it needs.
+"""
+
+from collections import OrderedDict
+import json
+import sys
+import time
+
+from scheduler.api.common import user_prefs
+from scheduler.api.common.date_time import Date, TimeDelta
+from scheduler.api.project import Project, ProjectLoadStage
+from scheduler.api.project_server import (
+    ProjectClient,
+    ProjectServer,
+    ProjectServerError,
+)
+from scheduler.api.serialization.serializable import SerializationError
+from scheduler.api.tree.task_index import TaskIndexAttribute
+
+
+class CommandError(Exception):
+    """Exception for when a command can't be run."""
+
+
+class ExportComponent(object):
+    """Struct representing the project components that can be exported."""
+    TASKS = "tasks"
+    CALENDAR = "calendar"
+    TRACKER = "tracker"
+    FILTERER = "filterer"
+
+    ALL = [TASKS, CALENDAR, TRACKER, FILTERER]
+
+    STAGES = {
+        TASKS: [ProjectLoadStage.TASKS],
+        CALENDAR: [ProjectLoadStage.TASKS, ProjectLoadStage.CALENDAR],
+        TRACKER: [ProjectLoadStage.TASKS, ProjectLoadStage.TRACKER],
+        FILTERER: [ProjectLoadStage.FILTERER],
+    }
+
+
+def get_stages(command, args):
+    """Get project load stages needed for the given command.
+
+    Args:
+        command (str): name of command.
+        args (argparse.Namespace): parsed commandline args.
+
+    Returns:
+        (list(ProjectLoadStage) or None): the stages to load, or None if the
+            command doesn't need a project.
+    """
+    if command == "export":
+        return ExportComponent.STAGES[args.component]
+    if command == "call":
+        return None
+    return {
+        "status": [ProjectLoadStage.TASKS, ProjectLoadStage.TRACKER],
+        "history": [
+            ProjectLoadStage.TASKS,
+            ProjectLoadStage.ARCHIVE_TASKS,
+        ],
+        "schedule": [
+            ProjectLoadStage.TASKS,
+            ProjectLoadStage.CALENDAR,
+        ],
+        "bench": ProjectLoadStage.ALL,
+        "daemon": ProjectLoadStage.ALL,
+    }[command]
+
+
+def load_project(project_dir, stages, timings):
+    """Load the given stages of a project.
+
+    The stages are loaded in the order given by ProjectLoadStage.ALL. As
+    the final stage is only loaded when all stages are requested, the edit
+    journal is never started by the read-only commands.
+
+    Args:
+        project_dir (str or None): project directory. If not given, use the
+            active project from the app user prefs.
+        stages (list(ProjectLoadStage)): stages to load.
+        timings (OrderedDict): dict to record the load time of each stage in.
+
+    Raises:
+        (CommandError): if no project directory could be found, or the
+            project couldn't be read.
+
+    Returns:
+        (Project): the project.
+    """
+    project_dir = project_dir or user_prefs.get_active_project()
+    if project_dir is None:
+        raise CommandError(
+            "No project directory given and no active project set"
+        )
+    start_time = time.perf_counter()
+    try:
+        project = Project.read(project_dir, load_data=False)
+        timings["Read project"] = time.perf_counter() - start_time
+        for stage in ProjectLoadStage.ALL:
+            if stage in stages:
+                start_time = time.perf_counter()
+                project.load_stage(stage)
+                timings[stage] = time.perf_counter() - start_time
+    except SerializationError as error:
+        raise CommandError(str(error))
+    return project
+
+
+def _parse_date(date_str):
+    """Get date from commandline string.
+
+    Args:
+        date_str (str or None): date string in form yyyy-mm-dd, if given.
+
+    Raises:
+        (CommandError): if the string isn't a valid date.
+
+    Returns:
+        (Date or None): the date, if given.
+    """
+    if date_str is None:
+        return None
+    try:
+        return Date.from_string(date_str)
+    except ValueError:
+        raise CommandError(
+            "Invalid date {0}: dates must be in form yyyy-mm-dd".format(
+                date_str
+            )
+        )
+
+
+def status(project, args, output=sys.stdout):
+    """Print summary of the tasks in the project.
+
+    Args:
+        project (Project): the project.
+        args (argparse.Namespace): parsed commandline args.
+        output (file): file to write to.
+    """
+    task_root = project.task_root
+    task_index = task_root.task_index
+    num_tasks = len(
+        task_index.get_matching_tasks(
+            TaskIndexAttribute.STATUS,
+            lambda value: True,
+        )
+    )
+    num_categories = len(list(task_root.iter_descendants())) - num_tasks
+    output.write("Project: {0}\n".format(project.root_directory))
+    output.write("Categories: {0}\n".format(num_categories))
+    output.write("Tasks: {0}\n".format(num_tasks))
+    for value in sorted(task_index.get_values(TaskIndexAttribute.TYPE)):
+        output.write("{0} tasks: {1}\n".format(
+            str(value).capitalize(),
+            len(task_index.get_tasks(TaskIndexAttribute.TYPE, value)),
+        ))
+    for value in sorted(task_index.get_values(TaskIndexAttribute.STATUS)):
+        output.write("  {0}: {1}\n".format(
+            value,
+            len(task_index.get_tasks(TaskIndexAttribute.STATUS, value)),
+        ))
+    output.write("Tracked tasks: {0}\n".format(
+        len(task_index.get_tasks(TaskIndexAttribute.IS_TRACKED, True))
+    ))
+    output.write("Unsaved edits: {0}\n".format(
+        "yes" if project.has_recovered_edits else "no"
+    ))
+
+
+def history(project, args, output=sys.stdout):
+    """Print history of a task between the given dates.
+
+    Args:
+        project (Project): the project.
+        args (argparse.Namespace): parsed commandline args.
+        output (file): file to write to.
+
+    Raises:
+        (CommandError): if the task can't be found.
+    """
+    task_root = project.task_root
+    task = task_root.get_item_at_path(args.task, search_archive=True)
+    if task is None:
+        # allow paths that don't include the root name
+        task = task_root.get_item_at_path(
+            [task_root.name] + args.task.split(task_root.TREE_PATH_SEPARATOR),
+            search_archive=True,
+        )
+    if task is None or not hasattr(task, "history"):
+        raise CommandError("No task found at path {0}".format(args.task))
+    start_date = _parse_date(args.from_date)
+    end_date = _parse_date(args.to_date)
+    history_ = task.history
+    for date, subdict in history_.iter_date_dicts():
+        if start_date is not None and date < start_date:
+            continue
+        if end_date is not None and date > end_date:
+            break
+        fields = [date.string()]
+        for key in (
+                history_.STATUS_KEY,
+                history_.VALUE_KEY,
+                history_.COMMENT_KEY):
+            value = subdict.get(key)
+            if value is not None:
+                fields.append("{0}={1}".format(key, value))
+        output.write("  ".join(fields) + "\n")
+
+
+def schedule(project, args, output=sys.stdout):
+    """Print scheduled items for the week containing the given date.
+
+    Args:
+        project (Project): the project.
+        args (argparse.Namespace): parsed commandline args.
+        output (file): file to write to.
+    """
+    date = _parse_date(args.week) or Date.now()
+    calendar_week = project.calendar.get_week_containing_date(date)
+    for calendar_day in calendar_week.iter_days():
+        output.write("{0}\n".format(calendar_day.header_name))
+        scheduled_items = sorted(
+            calendar_day.iter_scheduled_items(),
+            key=lambda item: item.start_time,
+        )
+        for item in scheduled_items:
+            output.write("  {0}-{1}  {2}\n".format(
+                item.start_time.string(),
+                item.end_time.string(),
+                item.name,
+            ))
+
+
+def export(project, args, output=sys.stdout):
+    """Export a project component as json.
+
+    Args:
+        project (Project): the project.
+        args (argparse.Namespace): parsed commandline args.
+        output (file): file to write to, if no output path given in args.
+    """
+    component = {
+        ExportComponent.TASKS: project.task_root,
+        ExportComponent.CALENDAR: project.calendar,
+        ExportComponent.TRACKER: project.tracker,
+        ExportComponent.FILTERER: project.filterer,
+    }[args.component]
+    json_dict = component.to_dict()
+    if args.output:
+        with open(args.output, "w") as file_:
+            json.dump(json_dict, file_, indent=4)
+    else:
+        json.dump(json_dict, output, indent=4)
+        output.write("\n")
+
+
+def bench(project, args, output=sys.stdout):
+    """Time some common queries on a fully loaded project.
+
+    The stage load times are reported along with the import times, so this
+    just adds the timings of the queries.
+
+    Args:
+        project (Project): the project.
+        args (argparse.Namespace): parsed commandline args.
+        output (file): file to write to.
+    """
+    task_root = project.task_root
+    date = Date.now()
+    queries = OrderedDict([
+        (
+            "Task index",
+            lambda: task_root.task_index.get_values(TaskIndexAttribute.STATUS),
+        ),
+        (
+            "Day history",
+            lambda: task_root.get_history_for_date(date),
+        ),
+        (
+            "Week schedule",
+            lambda: [
+                list(day.iter_scheduled_items())
+                for day in project.calendar.get_week_containing_date(
+                    date
+                ).iter_days()
+            ],
+        ),
+        (
+            "Month history",
+            lambda: [
+                task_root.get_history_for_date(date - TimeDelta(days=i))
+                for i in range(30)
+            ],
+        ),
+    ])
+    for name, query in queries.items():
+        start_time = time.perf_counter()
+        for _ in range(args.repeat):
+            query()
+        duration = (time.perf_counter() - start_time) / args.repeat
+        output.write("{0:<20} {1:>10.3f}ms\n".format(name, duration * 1000))
+
+
+def daemon(project, args, output=sys.stdout):
+    """Serve requests for the project on a unix socket until interrupted.
+
+    Args:
+        project (Project): the project.
+        args (argparse.Namespace): parsed commandline args.
+        output (file): file to write to.
+    """
+    server = ProjectServer(project, socket_path=args.socket)
+    output.write("Serving project on {0}\n".format(server.socket_path))
+    output.flush()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+
+
+def call(project, args, output=sys.stdout):
+    """Send request to project daemon and print the result as json.
+
+    Args:
+        project (None): unused, as this command doesn't load a project.
+        args (argparse.Namespace): parsed commandline args.
+        output (file): file to write to.
+
+    Raises:
+        (CommandError): if the request fails.
+    """
+    try:
+        params = json.loads(args.params)
+    except ValueError:
+        raise CommandError("Params must be a json object")
+    if not isinstance(params, dict):
+        raise CommandError("Params must be a json object")
+    client = ProjectClient(args.socket)
+    try:
+        result = client.call(args.method, **params)
+    except (ProjectServerError, OSError) as error:
+        raise CommandError(str(error))
+    finally:
+        client.close()
+    json.dump(result, output, indent=4)
+    output.write("\n")
+
+
+COMMANDS = OrderedDict([
+    ("status", status),
+    ("history", history),
+    ("schedule", schedule),
+    ("export", export),
+    ("bench", bench),
+    ("daemon", daemon),
+    ("call", call),
+])
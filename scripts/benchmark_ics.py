@@ -0,0 +1,117 @@
+"""Benchmark exporting and importing a large iCalendar file.
+
+This writes a calendar of the given number of events to a temp .ics file,
+then times parsing it and importing it into an empty calendar, along with
+the peak memory used by the parser:
+
+    python -m scheduler.scripts.benchmark_ics --num-events 50000
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+# the filter package must be imported before the tree and calendar modules
+# to avoid a circular import through the object wrappers module
+import scheduler.api.filter
+from scheduler.api.calendar.calendar import Calendar
+from scheduler.api.calendar.ics import import_ics, iter_ics_events, write_ics
+from scheduler.api.calendar.scheduled_item import (
+    ScheduledItem,
+    ScheduledItemType,
+)
+from scheduler.api.common.date_time import Date, Time, TimeDelta
+from scheduler.api.edit import edit_log
+from scheduler.api.tree import HistoryData, TaskRoot
+
+
+def build_calendar(num_events, events_per_day=10):
+    """Build calendar with given number of hour long events.
+
+    Args:
+        num_events (int): number of events to add.
+        events_per_day (int): number of events on each day.
+
+    Returns:
+        (Calendar): the calendar.
+    """
+    task_root = TaskRoot()
+    task_root._history_data = HistoryData()
+    calendar = Calendar(task_root)
+    date = Date(2020, 1, 1)
+    for i in range(num_events):
+        if i and i % events_per_day == 0:
+            date += TimeDelta(days=1)
+        hour = 8 + i % events_per_day
+        item = ScheduledItem(
+            calendar,
+            Time(hour),
+            Time(hour + 1),
+            date,
+            item_type=ScheduledItemType.EVENT,
+            event_category="category{0}".format(i % 5),
+            event_name="event{0}".format(i),
+        )
+        item._activate()
+        calendar.get_day(date)._scheduled_items.append(item)
+    return calendar
+
+
+def main():
+    """Run benchmark from commandline args."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--num-events",
+        type=int,
+        default=50000,
+        help="Number of events in the file.",
+    )
+    args = parser.parse_args()
+
+    temp_directory = tempfile.mkdtemp()
+    file_path = os.path.join(temp_directory, "calendar.ics")
+    try:
+        calendar = build_calendar(args.num_events)
+        start_time = time.perf_counter()
+        write_ics(calendar, file_path)
+        export_time = time.perf_counter() - start_time
+        del calendar
+
+        tracemalloc.start()
+        start_time = time.perf_counter()
+        with open(file_path, "r", encoding="utf-8", newline="") as file_:
+            num_parsed = sum(1 for _ in iter_ics_events(file_))
+        parse_time = time.perf_counter() - start_time
+        parse_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        edit_log.open_edit_registry()
+        calendar = build_calendar(0)
+        start_time = time.perf_counter()
+        num_imported, _ = import_ics(calendar, file_path)
+        import_time = time.perf_counter() - start_time
+
+        print ("Events: {0} ({1:.1f}MB file)".format(
+            num_parsed,
+            os.path.getsize(file_path) / 1024 ** 2,
+        ))
+        print ("{0:<12} {1:>10.2f}s".format("export", export_time))
+        print ("{0:<12} {1:>10.2f}s (peak memory {2:.2f}MB)".format(
+            "parse",
+            parse_time,
+            parse_peak / 1024 ** 2,
+        ))
+        print ("{0:<12} {1:>10.2f}s ({2} items)".format(
+            "import",
+            import_time,
+            num_imported,
+        ))
+    finally:
+        shutil.rmtree(temp_directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
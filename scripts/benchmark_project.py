@@ -0,0 +1,329 @@
+"""Benchmark loading, saving, querying and editing a whole project.
+
+This runs against an existing project directory, or else generates a
+synthetic project of the given preset size in a temp directory. Timings
+are printed and can be written to a json file, and a previous json file
+can be passed in to compare against, eg. to check the effect of a change:
+
+    python -m scheduler.scripts.benchmark_project --output before.json
+    <make change>
+    python -m scheduler.scripts.benchmark_project --compare before.json
+"""
+
+import argparse
+from collections import OrderedDict
+import json
+import os
+import platform
+import shutil
+import tempfile
+import time
+
+# the filter package must be imported before the tree and calendar modules
+# to avoid a circular import through the object wrappers module
+from scheduler.api.filter import FilterOperator
+from scheduler.api.filter.tree_filters import TaskStatusFilter, TaskTypeFilter
+from scheduler.api.common.date_time import Date, TimeDelta
+from scheduler.api.edit import edit_log
+from scheduler.api.enums import ItemStatus
+from scheduler.api.project import Project
+from scheduler.api.serialization import item_registry
+from scheduler.api.tree import Task, TaskType
+from scheduler.scripts.generate_project import generate_project, ProjectSize
+
+
+def time_function(function, repeat):
+    """Time repeated calls of a function.
+
+    Args:
+        function (function): function to call, with no args.
+        repeat (int): number of times to call it.
+
+    Returns:
+        (list(float)): time taken by each call, in seconds.
+    """
+    durations = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start_time)
+    return durations
+
+
+def read_project(directory):
+    """Read project, clearing the item registry from any previous reads.
+
+    Args:
+        directory (str): project directory.
+
+    Returns:
+        (Project): the project.
+    """
+    item_registry.clear_registry()
+    return Project.read(directory)
+
+
+def get_project_sizes(project):
+    """Get counts of the items in a project.
+
+    Args:
+        project (Project): the project.
+
+    Returns:
+        (OrderedDict(str, int)): number of each type of item.
+    """
+    task_root = project.task_root
+    tree_items = list(task_root.iter_descendants())
+    tasks = [item for item in tree_items if isinstance(item, Task)]
+    calendar = project.calendar
+    return OrderedDict([
+        ("tree_items", len(tree_items)),
+        ("tasks", len(tasks)),
+        (
+            "history_entries",
+            sum(len(task.history._dict) for task in tasks),
+        ),
+        (
+            "scheduled_items",
+            sum(len(day._scheduled_items) for day in calendar._days.values()),
+        ),
+        ("repeat_items", len(calendar._repeat_items)),
+        (
+            "planned_items",
+            sum(len(day._planned_items) for day in calendar._days.values()),
+        ),
+        ("tracked_tasks", len(list(project.tracker.iter_tracked_tasks()))),
+    ])
+
+
+def run_edits(project, tasks):
+    """Run a representative set of edits on the given tasks.
+
+    Args:
+        project (Project): the project.
+        tasks (list(Task)): tasks to edit.
+
+    Returns:
+        (int): number of edits run.
+    """
+    tree_manager = project.get_tree_manager()
+    date = Date.now()
+    num_edits = 0
+    for i, task in enumerate(tasks):
+        num_edits += tree_manager.update_task(
+            task,
+            date_time=date,
+            status=ItemStatus.COMPLETE,
+            ignore_status=True,
+        )
+        num_edits += tree_manager.create_child(
+            task,
+            "benchmark_subtask{0}".format(i),
+            Task,
+        )
+        num_edits += tree_manager.set_item_name(
+            task,
+            "{0}_renamed".format(task.name),
+        )
+    return num_edits
+
+
+def undo_edits(num_edits):
+    """Undo the given number of edits.
+
+    Args:
+        num_edits (int): number of edits to undo.
+    """
+    for _ in range(num_edits):
+        edit_log.undo()
+
+
+def run_benchmarks(directory, repeat):
+    """Run benchmarks on project in given directory.
+
+    Args:
+        directory (str): project directory.
+        repeat (int): number of times to run each benchmark.
+
+    Returns:
+        (OrderedDict(str, list(float))): durations of each benchmark run,
+            keyed by benchmark name.
+        (OrderedDict(str, int)): number of each type of item in project.
+    """
+    results = OrderedDict()
+    results["project_read"] = time_function(
+        lambda: read_project(directory),
+        repeat,
+    )
+    project = read_project(directory)
+    task_root = project.task_root
+    calendar = project.calendar
+    tree_items = list(task_root.iter_descendants())
+    tracked_tasks = list(project.tracker.iter_tracked_tasks())
+    today = Date.now()
+    month_dates = [today - TimeDelta(days=i) for i in range(30)]
+
+    # writes to the autosaves directory so the project files are unchanged
+    results["write_all_components"] = time_function(project.autosave, repeat)
+
+    def iter_scheduled_items():
+        for date in month_dates:
+            list(calendar.get_day(date).iter_scheduled_items())
+    results["iter_scheduled_items_month"] = time_function(
+        iter_scheduled_items,
+        repeat,
+    )
+
+    def get_history_for_dates():
+        for date in month_dates:
+            task_root.get_history_for_date(date)
+    results["history_for_date_month"] = time_function(
+        get_history_for_dates,
+        repeat,
+    )
+
+    def get_statuses():
+        for task in tracked_tasks:
+            for date in month_dates:
+                task.history.get_status_at_date(date)
+    results["tracked_status_month"] = time_function(get_statuses, repeat)
+
+    tree_filter = (
+        TaskStatusFilter(FilterOperator.EQUALS, ItemStatus.COMPLETE)
+        | TaskTypeFilter(FilterOperator.EQUALS, TaskType.ROUTINE)
+    )
+
+    def evaluate_filter():
+        tree_filter.clear_cache()
+        for item in tree_items:
+            tree_filter.recursive_filter(item)
+    results["filter_tree"] = time_function(evaluate_filter, repeat)
+    results["filter_task_index"] = time_function(
+        lambda: tree_filter.get_matching_tasks(task_root),
+        repeat,
+    )
+
+    edit_log.open_edit_registry()
+    edit_tasks = [
+        task for category in task_root.get_all_children()
+        for task in category.get_all_children()
+    ][:20]
+    results["edits"] = []
+    results["undo"] = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        num_edits = run_edits(project, edit_tasks)
+        results["edits"].append(time.perf_counter() - start_time)
+        start_time = time.perf_counter()
+        undo_edits(num_edits)
+        results["undo"].append(time.perf_counter() - start_time)
+    return results, get_project_sizes(project)
+
+
+def get_report(results, sizes, directory, repeat):
+    """Get json-serializable report of benchmark results.
+
+    Args:
+        results (OrderedDict(str, list(float))): benchmark durations.
+        sizes (OrderedDict(str, int)): counts of project items.
+        directory (str): project directory.
+        repeat (int): number of times each benchmark was run.
+
+    Returns:
+        (OrderedDict): the report.
+    """
+    return OrderedDict([
+        ("project", directory),
+        ("date", Date.now().string()),
+        ("python", platform.python_version()),
+        ("repeat", repeat),
+        ("sizes", sizes),
+        (
+            "results",
+            OrderedDict([
+                (
+                    name,
+                    OrderedDict([
+                        ("min_ms", min(durations) * 1000),
+                        ("mean_ms", sum(durations) / len(durations) * 1000),
+                    ]),
+                )
+                for name, durations in results.items()
+            ]),
+        ),
+    ])
+
+
+def print_report(report, baseline_report=None):
+    """Print benchmark report, optionally comparing it to a previous one.
+
+    Args:
+        report (OrderedDict): the report.
+        baseline_report (dict or None): previous report to compare to.
+    """
+    print ("Project: {0}".format(report["project"]))
+    for name, count in report["sizes"].items():
+        print ("  {0:<20} {1:>10}".format(name, count))
+    baseline_results = (baseline_report or {}).get("results", {})
+    for name, result in report["results"].items():
+        line = "{0:<28} {1:>10.2f}ms".format(name, result["mean_ms"])
+        baseline_result = baseline_results.get(name)
+        if baseline_result:
+            line += "  (was {0:.2f}ms, x{1:.2f})".format(
+                baseline_result["mean_ms"],
+                result["mean_ms"] / (baseline_result["mean_ms"] or 1e-9),
+            )
+        print (line)
+
+
+def main():
+    """Run benchmarks from commandline args."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--project",
+        help="Project directory. Defaults to generating a synthetic one.",
+    )
+    parser.add_argument(
+        "--size",
+        choices=ProjectSize.ALL,
+        default=ProjectSize.MEDIUM,
+        help="Size of project to generate. Defaults to medium.",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Number of times to run each benchmark.",
+    )
+    parser.add_argument("--output", help="Json file to write results to.")
+    parser.add_argument(
+        "--compare",
+        help="Json file of previous results to compare to.",
+    )
+    args = parser.parse_args()
+
+    directory = args.project
+    temp_directory = None
+    if directory is None:
+        temp_directory = tempfile.mkdtemp()
+        directory = os.path.join(temp_directory, "project")
+        generate_project(directory, **ProjectSize.SETTINGS[args.size])
+    try:
+        results, sizes = run_benchmarks(directory, args.repeat)
+    finally:
+        if temp_directory is not None:
+            shutil.rmtree(temp_directory, ignore_errors=True)
+
+    report = get_report(results, sizes, args.project or args.size, args.repeat)
+    baseline_report = None
+    if args.compare:
+        with open(args.compare, "r") as file_:
+            baseline_report = json.load(file_)
+    print_report(report, baseline_report)
+    if args.output:
+        with open(args.output, "w") as file_:
+            json.dump(report, file_, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Benchmark default serialization of a large tree-item keyed dict.
+
+This mimics the user prefs dicts that are keyed by tree items (eg. the
+expanded state of each task in the outliner) and times how long it takes
+to serialize and deserialize one with the given number of keys:
+
+    python -m scheduler.scripts.benchmark_serialization --num-keys 10000
+"""
+
+import argparse
+
+# the filter package must be imported before the tree modules to avoid a
+# circular import through the object wrappers module
+import scheduler.api.filter
+from scheduler.api.serialization.default import (
+    deserialize_dict,
+    serialize_dict,
+)
+from scheduler.api.tree import Task, TaskCategory, TaskRoot
+from scheduler.scripts.benchmark_project import time_function
+
+
+def build_prefs_dict(num_keys, tasks_per_category=100):
+    """Build task root and a prefs dict keyed by its tasks.
+
+    Args:
+        num_keys (int): number of tasks to key the dict by.
+        tasks_per_category (int): number of tasks in each category.
+
+    Returns:
+        (TaskRoot): the task root.
+        (dict): the prefs dict.
+    """
+    task_root = TaskRoot()
+    tasks = []
+    for i in range(0, num_keys, tasks_per_category):
+        category = TaskCategory("category{0}".format(i), parent=task_root)
+        task_root._children[category.name] = category
+        for j in range(min(tasks_per_category, num_keys - i)):
+            task = Task("task{0}".format(j), parent=category)
+            category._children[task.name] = task
+            tasks.append(task)
+    prefs_dict = {
+        "outliner": {
+            "expanded": {task: bool(i % 2) for i, task in enumerate(tasks)},
+            "selected": tasks[:10],
+        },
+        "splitter_sizes": [200, 800],
+    }
+    return task_root, prefs_dict
+
+
+def main():
+    """Run benchmark from commandline args."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--num-keys",
+        type=int,
+        default=10000,
+        help="Number of tree item keys in the dict.",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Number of times to run each benchmark.",
+    )
+    args = parser.parse_args()
+
+    task_root, prefs_dict = build_prefs_dict(args.num_keys)
+    serialized_dict = serialize_dict(prefs_dict, tree_root=task_root)
+    results = [
+        (
+            "serialize_dict",
+            time_function(
+                lambda: serialize_dict(prefs_dict, tree_root=task_root),
+                args.repeat,
+            ),
+        ),
+        (
+            "deserialize_dict",
+            time_function(
+                lambda: deserialize_dict(serialized_dict, tree_root=task_root),
+                args.repeat,
+            ),
+        ),
+    ]
+    print ("Tree item keys: {0}".format(args.num_keys))
+    for name, durations in results:
+        print ("{0:<28} {1:>10.2f}ms".format(
+            name,
+            sum(durations) / len(durations) * 1000,
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""Benchmark tracker analytics against per-day python loops.
+
+This builds a tracker with synthetic routine histories (by default 50
+tracked tasks over 5 years) and times the vectorized analytics against
+equivalent loops over the task history methods.
+"""
+
+import random
+import sys
+import time
+
+from scheduler.api.common.date_time import Date, TimeDelta
+from scheduler.api.enums import ItemStatus, TimePeriod
+from scheduler.api.tracker import Tracker
+from scheduler.api.tracker.analytics import TrackerAnalytics
+from scheduler.api.tree import Task, TaskRoot, TaskType
+
+
+def build_tracker(num_tasks, num_days, start, seed=0):
+    """Build tracker with random routine histories.
+
+    Args:
+        num_tasks (int): number of tracked tasks.
+        num_days (int): number of days of history for each task.
+        start (Date): first date of history.
+        seed (int): random seed.
+
+    Returns:
+        (Tracker): the tracker.
+    """
+    randomizer = random.Random(seed)
+    tracker = Tracker(TaskRoot())
+    dates = [start + TimeDelta(days=day) for day in range(num_days)]
+    for i in range(num_tasks):
+        task = Task("task{0}".format(i), task_type=TaskType.ROUTINE)
+        task._activate()
+        history = task.history
+        completion_chance = randomizer.uniform(0.3, 0.95)
+        for date in dates:
+            if randomizer.random() > completion_chance:
+                continue
+            # append directly, as the dates are already in order
+            history._dict._key_list.append(date)
+            history._dict._value_list.append({
+                history.STATUS_KEY: ItemStatus.COMPLETE,
+                history.VALUE_KEY: randomizer.randint(0, 60),
+            })
+        history.mark_modified()
+        tracker._tracked_tasks.append(task)
+    return tracker
+
+
+def python_streaks(tasks, dates):
+    """Compute current and longest streaks with python loops.
+
+    Args:
+        tasks (list(Task)): tasks to compute for.
+        dates (list(Date)): dates to compute over.
+
+    Returns:
+        (list(tuple(int, int))): current and longest streak for each task.
+    """
+    streaks = []
+    for task in tasks:
+        current = longest = 0
+        for date in dates:
+            if task.history.get_status_at_date(date) == ItemStatus.COMPLETE:
+                current += 1
+                longest = max(longest, current)
+            else:
+                current = 0
+        streaks.append((current, longest))
+    return streaks
+
+
+def python_rolling_means(tasks, dates, window):
+    """Compute rolling means of values with python loops.
+
+    Args:
+        tasks (list(Task)): tasks to compute for.
+        dates (list(Date)): dates to compute over.
+        window (int): window size in days.
+
+    Returns:
+        (list(list(float or None))): rolling means for each task and date.
+    """
+    means = []
+    for task in tasks:
+        values = [task.history.get_value_at_date(date) for date in dates]
+        task_means = []
+        for i in range(len(values)):
+            window_values = [
+                value for value in values[max(0, i - window + 1):i + 1]
+                if value is not None
+            ]
+            task_means.append(
+                sum(window_values) / len(window_values)
+                if window_values else None
+            )
+        means.append(task_means)
+    return means
+
+
+def time_function(function, *args, **kwargs):
+    """Time a function call.
+
+    Args:
+        function (function): function to call.
+        args (list): args to pass to function.
+        kwargs (dict): kwargs to pass to function.
+
+    Returns:
+        (float): time taken in seconds.
+    """
+    start_time = time.perf_counter()
+    function(*args, **kwargs)
+    return time.perf_counter() - start_time
+
+
+def run_benchmark(num_tasks=50, num_years=5, window=30):
+    """Run benchmark and print results.
+
+    Args:
+        num_tasks (int): number of tracked tasks.
+        num_years (int): number of years of history.
+        window (int): window size for rolling stats.
+    """
+    start = Date(2020, 1, 1)
+    num_days = num_years * 365
+    end = start + TimeDelta(days=num_days - 1)
+    tracker = build_tracker(num_tasks, num_days, start)
+    analytics = TrackerAnalytics(tracker)
+    tasks = analytics.tasks
+    dates = [start + TimeDelta(days=day) for day in range(num_days)]
+
+    results = [
+        (
+            "history store build",
+            time_function(analytics.get_completion_matrix, start, end),
+        ),
+        ("streaks", time_function(analytics.get_streaks, start, end)),
+        (
+            "weekly completion rates",
+            time_function(
+                analytics.get_completion_rates,
+                start,
+                end,
+                TimePeriod.WEEK,
+            ),
+        ),
+        (
+            "monthly completion rates",
+            time_function(
+                analytics.get_completion_rates,
+                start,
+                end,
+                TimePeriod.MONTH,
+            ),
+        ),
+        (
+            "rolling means",
+            time_function(analytics.get_rolling_means, start, end, window),
+        ),
+        (
+            "rolling percentiles",
+            time_function(
+                analytics.get_rolling_percentiles,
+                start,
+                end,
+                window,
+                [10, 50, 90],
+            ),
+        ),
+        ("python streaks", time_function(python_streaks, tasks, dates)),
+        (
+            "python rolling means",
+            time_function(python_rolling_means, tasks, dates, window),
+        ),
+    ]
+    print (
+        "{0} tracked tasks x {1} days, window {2}".format(
+            num_tasks,
+            num_days,
+            window,
+        )
+    )
+    for name, duration in results:
+        print ("{0:<28} {1:>10.1f}ms".format(name, duration * 1000))
+
+
+if __name__ == "__main__":
+    run_benchmark(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,365 @@
+"""Generate synthetic scheduler projects for benchmarking.
+
+The generated project has a task tree of categories, tasks and subtasks,
+with years of task history, plus scheduled, repeat scheduled and planned
+calendar items and a tracker. Everything is generated from a seeded random
+number generator, so the same arguments always give the same project.
+
+Usage:
+    python -m scheduler.scripts.generate_project <directory> [--size SIZE]
+"""
+
+import argparse
+import os
+import random
+import shutil
+
+# the filter package must be imported before the tree and calendar modules
+# to avoid a circular import through the object wrappers module
+import scheduler.api.filter
+from scheduler.api.calendar.calendar import Calendar
+from scheduler.api.calendar.planned_item import PlannedItem
+from scheduler.api.calendar.repeat_pattern import RepeatPattern
+from scheduler.api.calendar.scheduled_item import (
+    RepeatScheduledItem,
+    ScheduledItem,
+    ScheduledItemType,
+)
+from scheduler.api.common.date_time import Date, Time, TimeDelta
+from scheduler.api.enums import ItemStatus
+from scheduler.api.project import Project, ProjectTree
+from scheduler.api.tracker import Tracker
+from scheduler.api.tree import Task, TaskCategory, TaskRoot, TaskType
+
+
+class ProjectSize(object):
+    """Struct representing preset sizes of generated projects."""
+    SMALL = "small"
+    MEDIUM = "medium"
+    LARGE = "large"
+
+    ALL = [SMALL, MEDIUM, LARGE]
+
+    SETTINGS = {
+        SMALL: {
+            "num_categories": 5,
+            "tasks_per_category": 10,
+            "subtasks_per_task": 2,
+            "num_years": 1,
+            "scheduled_items_per_day": 3,
+            "num_repeat_items": 5,
+            "planned_items_per_day": 1,
+        },
+        MEDIUM: {
+            "num_categories": 20,
+            "tasks_per_category": 25,
+            "subtasks_per_task": 3,
+            "num_years": 3,
+            "scheduled_items_per_day": 6,
+            "num_repeat_items": 20,
+            "planned_items_per_day": 2,
+        },
+        LARGE: {
+            "num_categories": 50,
+            "tasks_per_category": 40,
+            "subtasks_per_task": 4,
+            "num_years": 5,
+            "scheduled_items_per_day": 10,
+            "num_repeat_items": 50,
+            "planned_items_per_day": 3,
+        },
+    }
+
+
+def build_task_root(
+        num_categories,
+        tasks_per_category,
+        subtasks_per_task,
+        dates,
+        randomizer,
+        routine_fraction=0.3):
+    """Build task tree with random task histories.
+
+    Routine tasks get a history entry on most dates, while general tasks
+    get a few entries each, ending in completion for some of them.
+
+    Args:
+        num_categories (int): number of top-level categories.
+        tasks_per_category (int): number of tasks in each category.
+        subtasks_per_task (int): number of subtasks of each task.
+        dates (list(Date)): dates to generate history over.
+        randomizer (random.Random): random number generator.
+        routine_fraction (float): fraction of tasks that are routines.
+
+    Returns:
+        (TaskRoot): the task root.
+    """
+    task_root = TaskRoot()
+    for i in range(num_categories):
+        category = TaskCategory("category{0}".format(i), parent=task_root)
+        task_root._children[category.name] = category
+        for j in range(tasks_per_category):
+            is_routine = randomizer.random() < routine_fraction
+            task = Task(
+                "task{0}".format(j),
+                parent=category,
+                task_type=TaskType.ROUTINE if is_routine else TaskType.GENERAL,
+            )
+            category._children[task.name] = task
+            for k in range(subtasks_per_task):
+                subtask = Task(
+                    "subtask{0}".format(k),
+                    parent=task,
+                    task_type=task.type,
+                )
+                task._children[subtask.name] = subtask
+            if is_routine:
+                _add_routine_history(task, dates, randomizer)
+            else:
+                _add_general_history(task, dates, randomizer)
+    return task_root
+
+
+def _add_history_entry(history, date, status, value=None, comment=None):
+    """Add entry to end of task history.
+
+    The entries are appended directly, as they're generated in date order.
+
+    Args:
+        history (TaskHistory): history to add to.
+        date (Date): date of entry.
+        status (ItemStatus): status at date.
+        value (int or None): value at date, if given.
+        comment (str or None): comment at date, if given.
+    """
+    subdict = {history.STATUS_KEY: status}
+    if value is not None:
+        subdict[history.VALUE_KEY] = value
+    if comment is not None:
+        subdict[history.COMMENT_KEY] = comment
+    history._dict._key_list.append(date)
+    history._dict._value_list.append(subdict)
+
+
+def _add_routine_history(task, dates, randomizer):
+    """Add random routine history to task.
+
+    Args:
+        task (Task): task to add history to.
+        dates (list(Date)): dates to generate history over.
+        randomizer (random.Random): random number generator.
+    """
+    completion_chance = randomizer.uniform(0.3, 0.95)
+    for date in dates:
+        if randomizer.random() > completion_chance:
+            continue
+        comment = None
+        if randomizer.random() < 0.05:
+            comment = "comment on {0}".format(date.string())
+        _add_history_entry(
+            task.history,
+            date,
+            ItemStatus.COMPLETE,
+            value=randomizer.randint(0, 60),
+            comment=comment,
+        )
+    task.history.mark_modified()
+
+
+def _add_general_history(task, dates, randomizer):
+    """Add random general task history to task.
+
+    Args:
+        task (Task): task to add history to.
+        dates (list(Date)): dates to generate history over.
+        randomizer (random.Random): random number generator.
+    """
+    num_entries = min(randomizer.randint(0, 4), len(dates))
+    entry_dates = sorted(randomizer.sample(dates, num_entries))
+    for i, date in enumerate(entry_dates):
+        status = ItemStatus.IN_PROGRESS
+        if i == len(entry_dates) - 1 and randomizer.random() < 0.5:
+            status = ItemStatus.COMPLETE
+        _add_history_entry(task.history, date, status)
+    task.history.mark_modified()
+
+
+def build_calendar(
+        task_root,
+        dates,
+        scheduled_items_per_day,
+        num_repeat_items,
+        planned_items_per_day,
+        randomizer):
+    """Build calendar with random scheduled and planned items.
+
+    Args:
+        task_root (TaskRoot): task root to schedule and plan tasks from.
+        dates (list(Date)): dates to add items to.
+        scheduled_items_per_day (int): number of scheduled items per day.
+        num_repeat_items (int): number of repeat scheduled items.
+        planned_items_per_day (int): number of planned items per day.
+        randomizer (random.Random): random number generator.
+
+    Returns:
+        (Calendar): the calendar.
+    """
+    calendar = Calendar(task_root)
+    tasks = [
+        task for category in task_root.get_all_children()
+        for task in category.get_all_children()
+    ]
+    for date in dates:
+        calendar_day = calendar.get_day(date)
+        hours = sorted(
+            randomizer.sample(range(6, 23), scheduled_items_per_day)
+        )
+        for hour in hours:
+            start_time = Time(hour, randomizer.choice([0, 15, 30]))
+            end_time = Time(hour, 45)
+            if randomizer.random() < 0.7:
+                item = ScheduledItem(
+                    calendar,
+                    start_time,
+                    end_time,
+                    date,
+                    tree_item=randomizer.choice(tasks),
+                )
+            else:
+                item = ScheduledItem(
+                    calendar,
+                    start_time,
+                    end_time,
+                    date,
+                    item_type=ScheduledItemType.EVENT,
+                    event_category="events",
+                    event_name="event{0}".format(hour),
+                )
+            item._activate()
+            calendar_day._scheduled_items.append(item)
+        for task in randomizer.sample(tasks, planned_items_per_day):
+            planned_item = PlannedItem(calendar, calendar_day, tree_item=task)
+            planned_item._activate()
+            calendar_day._planned_items.append(planned_item)
+
+    for i in range(num_repeat_items):
+        hour = randomizer.randint(6, 22)
+        weekdays = randomizer.sample(Date.WEEKDAYS, randomizer.randint(1, 5))
+        repeat_pattern = RepeatPattern.week_repeat(
+            dates[0],
+            weekdays,
+            week_gap=randomizer.randint(1, 2),
+        )
+        repeat_item = RepeatScheduledItem(
+            calendar,
+            Time(hour, 0),
+            Time(hour, 30),
+            repeat_pattern,
+            tree_item=randomizer.choice(tasks),
+        )
+        repeat_item._activate()
+        calendar._repeat_items.append(repeat_item)
+    return calendar
+
+
+def build_tracker(task_root):
+    """Build tracker that tracks all routine tasks.
+
+    Args:
+        task_root (TaskRoot): task root to track tasks from.
+
+    Returns:
+        (Tracker): the tracker.
+    """
+    tracker = Tracker(task_root)
+    for category in task_root.get_all_children():
+        for task in category.get_all_children():
+            if task.type == TaskType.ROUTINE:
+                tracker._tracked_tasks.append(task)
+    return tracker
+
+
+def generate_project(
+        directory,
+        num_categories=20,
+        tasks_per_category=25,
+        subtasks_per_task=3,
+        num_years=3,
+        scheduled_items_per_day=6,
+        num_repeat_items=20,
+        planned_items_per_day=2,
+        end_date=None,
+        seed=0):
+    """Generate synthetic project in given directory.
+
+    Any existing directory at the path is replaced.
+
+    Args:
+        directory (str): directory to write project to.
+        num_categories (int): number of top-level categories.
+        tasks_per_category (int): number of tasks in each category.
+        subtasks_per_task (int): number of subtasks of each task.
+        num_years (float): number of years of history and calendar items.
+        scheduled_items_per_day (int): number of scheduled items per day.
+        num_repeat_items (int): number of repeat scheduled items.
+        planned_items_per_day (int): number of planned items per day.
+        end_date (Date or None): last date of history and calendar items.
+            Defaults to today.
+        seed (int): random seed.
+    """
+    randomizer = random.Random(seed)
+    end_date = end_date or Date.now()
+    num_days = max(int(num_years * 365), 1)
+    dates = [
+        end_date - TimeDelta(days=num_days - 1 - day)
+        for day in range(num_days)
+    ]
+    if os.path.exists(directory):
+        shutil.rmtree(directory)
+    os.makedirs(directory)
+    open(os.path.join(directory, Project._MARKER_FILE), "w").close()
+    project_tree = ProjectTree(directory)
+
+    task_root = build_task_root(
+        num_categories,
+        tasks_per_category,
+        subtasks_per_task,
+        dates,
+        randomizer,
+    )
+    task_root.write(project_tree.tasks_directory)
+    # reread the task root so the calendar references registered items
+    task_root = TaskRoot.from_directory(project_tree.tasks_directory)
+    calendar = build_calendar(
+        task_root,
+        dates,
+        scheduled_items_per_day,
+        num_repeat_items,
+        planned_items_per_day,
+        randomizer,
+    )
+    calendar.write(project_tree.calendar_directory)
+    build_tracker(task_root).write(project_tree.tracker_file)
+
+
+def main():
+    """Generate project from commandline args."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("directory", help="Directory to write project to.")
+    parser.add_argument(
+        "--size",
+        choices=ProjectSize.ALL,
+        default=ProjectSize.MEDIUM,
+        help="Preset project size. Defaults to medium.",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+    args = parser.parse_args()
+    generate_project(
+        args.directory,
+        seed=args.seed,
+        **ProjectSize.SETTINGS[args.size]
+    )
+
+
+if __name__ == "__main__":
+    main()
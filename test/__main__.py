@@ -2,10 +2,31 @@
 
 import unittest
 
+from .archive_task_root_test import ArchiveTaskRootTest
+from .cli_commands_test import CliCommandsTest
+from .edit_journal_test import EditJournalTest
+from .edit_log_test import EditLogBudgetTest
+from .edit_profiler_test import EditProfilerTest
+from .edit_transaction_test import EditTransactionTest
+from .filtered_children_test import FilteredChildrenCacheTest
+from .git_backup_test import GitBackupTest
+from .google_sync_test import GoogleSyncTest
+from .history_store_test import HistoryStoreTest
+from .ics_test import IcsTest
+from .item_registry_test import ItemRegistryTest
 from .ordered_dict_edit_test import (
     OrderedDictEditTest,
     OrderedDictRecursiveEditTest
 )
+from .project_database_test import ProjectDatabaseTest
+from .project_generator_test import ProjectGeneratorTest
+from .project_loader_test import ProjectLoaderTest
+from .project_server_test import ProjectServerTest
+from .search_index_test import SearchIndexTest
+from .serializer_test import SerializerTableTest
+from .task_index_test import TaskIndexTest
+from .task_status_test import TaskStatusCacheTest
+from .tracker_analytics_test import TrackerAnalyticsTest
 from .tree_edit_test import BaseTreeEditTest, TaskEditTest
 from .tree_test import TaskTreeTest
 
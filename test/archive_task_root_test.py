@@ -0,0 +1,154 @@
+"""Test for lazily loaded archive task root."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from scheduler.api.edit.task_edit import ModifyTaskEdit
+from scheduler.api.tree import Task, TaskCategory, TaskRoot
+from scheduler.api.tree.archive_task_root import ArchiveTaskRoot
+from scheduler.api.tree.task_index import TaskIndexAttribute
+
+
+class ArchiveTaskRootTest(unittest.TestCase):
+    """Test archive categories are loaded on demand and written if needed."""
+
+    def setUp(self, *args):
+        """Run before each test."""
+        self.directory = os.path.join(tempfile.mkdtemp(), "tasks")
+        archive_root = ArchiveTaskRoot()
+        for category_name in ["category1", "category2"]:
+            category = TaskCategory(category_name, parent=archive_root)
+            archive_root._children[category_name] = category
+            for task_name in ["task1", "task2"]:
+                task = Task(task_name, parent=category)
+                category._children[task_name] = task
+        self.archive_root = archive_root
+        return super(ArchiveTaskRootTest, self).setUp(*args)
+
+    def tearDown(self, *args):
+        """Run after each test."""
+        shutil.rmtree(os.path.dirname(self.directory), ignore_errors=True)
+        return super(ArchiveTaskRootTest, self).tearDown(*args)
+
+    def read_archive(self):
+        """Read archive from directory and set it on a new task root.
+
+        Returns:
+            (TaskRoot): the task root.
+            (ArchiveTaskRoot): the archive root.
+        """
+        task_root = TaskRoot()
+        archive_root = ArchiveTaskRoot.read(self.directory)
+        task_root.set_archive_root(archive_root)
+        return task_root, archive_root
+
+    def test_lazy_load(self):
+        """Test categories are only loaded when items in them are needed."""
+        self.archive_root.write(self.directory)
+        task_root, archive_root = self.read_archive()
+        self.assertFalse(archive_root.is_loaded)
+        self.assertEqual(archive_root.num_children(), 0)
+
+        task = task_root.get_item_at_path(
+            "ARCHIVE/category2/task1",
+            search_archive=True,
+        )
+        self.assertEqual(task.path, "ARCHIVE/category2/task1")
+        self.assertEqual(list(archive_root._children.keys()), ["category2"])
+        # paths missing from the path index don't load their category
+        self.assertIsNone(
+            task_root.get_item_at_path(
+                "ARCHIVE/category1/task3",
+                search_archive=True,
+            )
+        )
+        self.assertEqual(list(archive_root._children.keys()), ["category2"])
+
+        self.assertIs(task_root.archive_root, archive_root)
+        self.assertTrue(archive_root.is_loaded)
+        self.assertEqual(
+            list(archive_root._children.keys()),
+            ["category1", "category2"],
+        )
+
+    def test_lazy_load_indexes(self):
+        """Test lazily loaded items are added to existing indexes."""
+        self.archive_root.write(self.directory)
+        _, archive_root = self.read_archive()
+        task_index = archive_root.task_index
+        self.assertEqual(
+            task_index.get_tasks(TaskIndexAttribute.IS_TRACKED, False),
+            set(),
+        )
+        self.assertEqual(archive_root.search_index.search("task1"), [])
+
+        archive_root.load_category("category1")
+        self.assertEqual(
+            len(task_index.get_tasks(TaskIndexAttribute.IS_TRACKED, False)),
+            2,
+        )
+        self.assertEqual(
+            [
+                result.item.path
+                for result in archive_root.search_index.search("task1")
+            ],
+            ["ARCHIVE/category1/task1"],
+        )
+        self.assertFalse(archive_root.is_modified)
+
+    def test_write(self):
+        """Test compressed archives and skipping writes of unchanged ones."""
+        self.archive_root.set_compress(True)
+        self.archive_root.write(self.directory)
+        self.assertTrue(
+            os.path.isfile(os.path.join(self.directory, "category1.json.gz"))
+        )
+        task_root, archive_root = self.read_archive()
+        self.assertTrue(archive_root.compress)
+        self.assertFalse(archive_root.needs_write(self.directory))
+        self.assertFalse(archive_root.is_modified)
+
+        task = task_root.get_item_at_path(
+            "ARCHIVE/category1/task2",
+            search_archive=True,
+        )
+        self.assertFalse(archive_root.needs_write(self.directory))
+        ModifyTaskEdit.create_unregistered(
+            task,
+            {task._name: "task3"},
+        )._run()
+        self.assertTrue(archive_root.needs_write(self.directory))
+        self.assertTrue(archive_root.is_modified)
+
+        archive_root.set_compress(False)
+        archive_root.write(self.directory)
+        self.assertFalse(archive_root.needs_write(self.directory))
+        _, archive_root = self.read_archive()
+        self.assertFalse(archive_root.compress)
+        archive_root.load_all()
+        self.assertEqual(
+            list(archive_root.get_child("category1")._children.keys()),
+            ["task1", "task3"],
+        )
+
+    def test_failed_compressed_write(self):
+        """Test existing archive is kept if writing compressed one fails."""
+        self.archive_root.set_compress(True)
+        self.archive_root.write(self.directory)
+        self.archive_root.get_child("category1")._children.pop("task1")
+        with mock.patch("gzip.open", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                self.archive_root.write(self.directory)
+        self.assertEqual(
+            os.listdir(os.path.dirname(self.directory)),
+            [os.path.basename(self.directory)],
+        )
+        _, archive_root = self.read_archive()
+        archive_root.load_all()
+        self.assertEqual(
+            list(archive_root.get_child("category1")._children.keys()),
+            ["task1", "task2"],
+        )
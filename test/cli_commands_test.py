@@ -0,0 +1,160 @@
+"""Test for the headless commandline commands."""
+
+import argparse
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from collections import OrderedDict
+
+from scheduler.api.calendar.calendar import Calendar
+from scheduler.api.calendar.scheduled_item import ScheduledItem
+from scheduler.api.common.date_time import Date, Time
+from scheduler.api.enums import ItemStatus
+from scheduler.api.project import Project
+from scheduler.api.serialization import item_registry
+from scheduler.api.tracker import Tracker
+from scheduler.api.tree import HistoryData, Task, TaskCategory, TaskRoot
+from scheduler.cli import commands
+
+
+class CliCommandsTest(unittest.TestCase):
+    """Test output of commands run on a project loaded in stages."""
+
+    def setUp(self, *args):
+        """Run before each test."""
+        self.project_dir = tempfile.mkdtemp()
+        open(os.path.join(self.project_dir, Project._MARKER_FILE), "w").close()
+        task_root = TaskRoot()
+        category = TaskCategory("category", parent=task_root)
+        task_root._children[category.name] = category
+        for name in ("task", "tracked_task"):
+            task = Task(name, parent=category)
+            category._children[task.name] = task
+        task._history._dict[Date(2024, 1, 1)] = {
+            task.history.STATUS_KEY: ItemStatus.COMPLETE,
+        }
+        task._history._dict[Date(2024, 1, 3)] = {
+            task.history.COMMENT_KEY: "comment",
+        }
+        task_root.write(os.path.join(self.project_dir, "tasks"))
+        task_root._history_data = HistoryData()
+        task_root._activate()
+        tracker = Tracker(task_root)
+        tracker._tracked_tasks.append(task)
+        tracker.write(os.path.join(self.project_dir, "tracker.json"))
+        calendar = Calendar(task_root)
+        scheduled_item = ScheduledItem(
+            calendar,
+            Time(9),
+            Time(10),
+            Date(2024, 1, 2),
+            tree_item=task,
+        )
+        scheduled_item._activate()
+        calendar.get_day(Date(2024, 1, 2))._scheduled_items.append(
+            scheduled_item
+        )
+        calendar.write(os.path.join(self.project_dir, "calendar"))
+        item_registry.clear_registry()
+        return super(CliCommandsTest, self).setUp(*args)
+
+    def tearDown(self, *args):
+        """Run after each test."""
+        item_registry.clear_registry()
+        shutil.rmtree(self.project_dir, ignore_errors=True)
+        return super(CliCommandsTest, self).tearDown(*args)
+
+    def run_command(self, command, **kwargs):
+        """Run command on project loaded with the stages it needs.
+
+        Args:
+            command (str): name of command.
+            kwargs (dict): commandline args for the command.
+
+        Returns:
+            (list(str)): lines written by the command.
+        """
+        item_registry.clear_registry()
+        args = argparse.Namespace(**kwargs)
+        project = commands.load_project(
+            self.project_dir,
+            commands.get_stages(command, args),
+            OrderedDict(),
+        )
+        output = io.StringIO()
+        commands.COMMANDS[command](project, args, output=output)
+        return output.getvalue().splitlines()
+
+    def test_status(self):
+        """Test status command counts tasks, statuses and tracked tasks."""
+        lines = self.run_command("status")
+        self.assertEqual(
+            lines[0],
+            "Project: {0}".format(self.project_dir),
+        )
+        self.assertIn("Categories: 1", lines)
+        self.assertIn("Tasks: 2", lines)
+        self.assertIn("General tasks: 2", lines)
+        self.assertIn("Tracked tasks: 1", lines)
+        self.assertEqual(lines[-1], "Unsaved edits: no")
+
+    def test_history(self):
+        """Test history command prints history in date range."""
+        self.assertEqual(
+            self.run_command(
+                "history",
+                task="category/tracked_task",
+                from_date=None,
+                to_date=None,
+            ),
+            [
+                "2024-01-01  status=Complete",
+                "2024-01-03  comment=comment",
+            ],
+        )
+        self.assertEqual(
+            self.run_command(
+                "history",
+                task="category/tracked_task",
+                from_date="2024-01-02",
+                to_date=None,
+            ),
+            ["2024-01-03  comment=comment"],
+        )
+        with self.assertRaises(commands.CommandError):
+            self.run_command(
+                "history",
+                task="category/missing",
+                from_date=None,
+                to_date=None,
+            )
+
+    def test_schedule(self):
+        """Test schedule command prints the items in the given week."""
+        lines = self.run_command("schedule", week="2024-01-02")
+        self.assertEqual(len(lines), 8)
+        self.assertEqual(lines[2], "  09:00-10:00  tracked_task")
+
+    def test_export(self):
+        """Test export command writes component as json."""
+        lines = self.run_command(
+            "export",
+            component=commands.ExportComponent.TRACKER,
+            output=None,
+        )
+        self.assertEqual(
+            json.loads("\n".join(lines)),
+            {Tracker.TRACKED_TASKS_KEY: ["/category/tracked_task"]},
+        )
+
+    def test_invalid_project(self):
+        """Test loading a directory that isn't a project raises an error."""
+        with self.assertRaises(commands.CommandError):
+            commands.load_project(
+                os.path.join(self.project_dir, "missing"),
+                commands.get_stages("status", None),
+                OrderedDict(),
+            )
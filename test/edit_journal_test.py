@@ -0,0 +1,253 @@
+"""Test for edit journal recording and replay."""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from scheduler.api.common.date_time import Date, Time
+from scheduler.api.edit.edit_journal import EditJournal, JournalOp
+from scheduler.api.edit.edit_log import EDIT_LOG
+from scheduler.api.enums import ItemStatus
+from scheduler.api.project import Project
+from scheduler.api.serialization import item_registry
+from scheduler.api.tree import Task, TaskCategory, TaskRoot
+
+
+class EditJournalTest(unittest.TestCase):
+    """Test edits recorded in journal are recovered when project reloads."""
+
+    def setUp(self, *args):
+        """Run before each test."""
+        self.project_dir = tempfile.mkdtemp()
+        open(os.path.join(self.project_dir, Project._MARKER_FILE), "w").close()
+        task_root = TaskRoot()
+        category = TaskCategory("category", parent=task_root)
+        task_root._children[category.name] = category
+        task = Task("task", parent=category)
+        category._children[task.name] = task
+        task_root.write(os.path.join(self.project_dir, "tasks"))
+        self.project = self._load_project()
+        self.journal = self.project.start_edit_journal()
+        self.tree_manager = self.project.get_tree_manager()
+        self.task = self.project.task_root.get_item_at_path("/category/task")
+        EDIT_LOG.open_registry()
+        return super(EditJournalTest, self).setUp(*args)
+
+    def tearDown(self, *args):
+        """Run after each test."""
+        EDIT_LOG.set_journal(None)
+        EDIT_LOG.reset()
+        self.journal.close()
+        item_registry.clear_registry()
+        shutil.rmtree(self.project_dir, ignore_errors=True)
+        return super(EditJournalTest, self).tearDown(*args)
+
+    def _load_project(self):
+        """Load project from test directory.
+
+        Returns:
+            (Project): the project.
+        """
+        item_registry.clear_registry()
+        return Project(self.project_dir)
+
+    def _get_status(self, project, path, date):
+        """Get status set for task at given date.
+
+        Args:
+            project (Project): project to check.
+            path (str): path of task.
+            date (Date): date to check at.
+
+        Returns:
+            (ItemStatus or None): the task status, if set at that date.
+        """
+        task = project.task_root.get_item_at_path(path)
+        return task.history.get_dict_at_date(date).get(
+            task.history.STATUS_KEY
+        )
+
+    def test_history_records(self):
+        """Test task history updates and undos are recovered."""
+        date_1 = Date(2024, 1, 1)
+        date_2 = Date(2024, 1, 2)
+        self.tree_manager.update_task(
+            self.task,
+            date_1,
+            status=ItemStatus.COMPLETE,
+        )
+        self.tree_manager.update_task(
+            self.task,
+            date_2,
+            status=ItemStatus.COMPLETE,
+        )
+        EDIT_LOG.undo()
+        self.assertEqual(self.journal.num_pending_edits, 3)
+        self.journal.flush()
+        self.journal.wait()
+        records = EditJournal.read_records(self.journal.file_path)
+        self.assertEqual(len(records), 3)
+
+        project = self._load_project()
+        self.assertTrue(project.has_recovered_edits)
+        self.assertEqual(
+            self._get_status(project, "/category/task", date_1),
+            ItemStatus.COMPLETE,
+        )
+        self.assertEqual(
+            self._get_status(project, "/category/task", date_2),
+            None,
+        )
+
+    def test_item_records(self):
+        """Test edits without their own records are recovered by item."""
+        date = Date(2024, 1, 1)
+        self.tree_manager.update_task(
+            self.task,
+            date,
+            status=ItemStatus.COMPLETE,
+        )
+        self.tree_manager.create_child(
+            self.task.parent,
+            "new_task",
+            child_type=Task,
+        )
+        self.tree_manager.create_child(
+            self.task.parent,
+            "new_task_2",
+            child_type=Task,
+        )
+        self.journal.flush()
+        self.journal.wait()
+        records = EditJournal.read_records(self.journal.file_path)
+        self.assertEqual(len(records), 2)
+
+        project = self._load_project()
+        self.assertIsNotNone(
+            project.task_root.get_item_at_path("/category/new_task_2")
+        )
+        self.assertEqual(
+            self._get_status(project, "/category/task", date),
+            ItemStatus.COMPLETE,
+        )
+
+    def test_transaction_records(self):
+        """Test edits run in a transaction are recorded per item."""
+        with EDIT_LOG.transaction("Add tasks"):
+            self.tree_manager.create_child(
+                self.task.parent,
+                "new_task",
+                child_type=Task,
+            )
+            self.tree_manager.create_child(
+                self.task,
+                "subtask",
+                child_type=Task,
+            )
+        self.journal.flush()
+        self.journal.wait()
+        records = EditJournal.read_records(self.journal.file_path)
+        self.assertEqual(
+            [record[EditJournal.OP_KEY] for record in records],
+            [JournalOp.ITEM, JournalOp.ITEM],
+        )
+        self.assertEqual(
+            [record[EditJournal.KEY_PATH_KEY] for record in records],
+            [
+                [TaskRoot.CATEGORIES_KEY, "category"],
+                [
+                    TaskRoot.CATEGORIES_KEY,
+                    "category",
+                    TaskCategory.TASKS_KEY,
+                    "task",
+                ],
+            ],
+        )
+
+        project = self._load_project()
+        self.assertIsNotNone(
+            project.task_root.get_item_at_path("/category/new_task")
+        )
+        self.assertIsNotNone(
+            project.task_root.get_item_at_path("/category/task/subtask")
+        )
+
+    def test_calendar_item_records(self):
+        """Test scheduled items are recovered from calendar day records."""
+        date = Date(2024, 1, 3)
+        self.project.get_schedule_manager().create_scheduled_item(
+            self.project.calendar,
+            Time(9),
+            Time(10),
+            date,
+            tree_item=self.task,
+        )
+        self.journal.flush()
+        self.journal.wait()
+        records = EditJournal.read_records(self.journal.file_path)
+        self.assertEqual(len(records), 1)
+        self.assertEqual(
+            records[0][EditJournal.KEY_PATH_KEY][-1],
+            date.string(),
+        )
+
+        project = self._load_project()
+        scheduled_items = project.calendar.get_day(date)._scheduled_items
+        self.assertEqual(len(scheduled_items), 1)
+        self.assertEqual(
+            scheduled_items[0].tree_item,
+            project.task_root.get_item_at_path("/category/task"),
+        )
+
+    def test_compaction(self):
+        """Test compacted journal keeps only the latest record of an item."""
+        for i in range(3):
+            self.tree_manager.create_child(
+                self.task.parent,
+                "new_task_{0}".format(i),
+                child_type=Task,
+            )
+            self.journal.flush()
+        self.journal.wait()
+        self.assertEqual(
+            len(EditJournal.read_records(self.journal.file_path)),
+            3,
+        )
+        EditJournal.compact(self.journal.file_path)
+        self.assertEqual(
+            len(EditJournal.read_records(self.journal.file_path)),
+            1,
+        )
+        project = self._load_project()
+        self.assertIsNotNone(
+            project.task_root.get_item_at_path("/category/new_task_2")
+        )
+
+    def test_truncated_journal(self):
+        """Test incomplete final line from a crash during write is ignored."""
+        self.tree_manager.update_task(
+            self.task,
+            Date(2024, 1, 1),
+            status=ItemStatus.COMPLETE,
+        )
+        self.journal.flush()
+        self.journal.wait()
+        with open(self.journal.file_path, "a") as file_:
+            file_.write('{"task": "/category/ta')
+        records = EditJournal.read_records(self.journal.file_path)
+        self.assertEqual(len(records), 1)
+
+    def test_discard(self):
+        """Test discarded journal isn't replayed."""
+        self.tree_manager.update_task(
+            self.task,
+            Date(2024, 1, 1),
+            status=ItemStatus.COMPLETE,
+        )
+        self.journal.flush()
+        self.journal.wait()
+        self.project.discard_edit_journal()
+        self.assertFalse(os.path.exists(self.journal.file_path))
+        project = self._load_project()
+        self.assertFalse(project.has_recovered_edits)
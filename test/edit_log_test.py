@@ -0,0 +1,112 @@
+"""Test for edit log budget and compaction."""
+
+from collections import OrderedDict
+import unittest
+
+from scheduler.api import constants
+from scheduler.api.edit.edit_log import EDIT_LOG
+from scheduler.api.edit.tree_edit import ContainerOp, DictEdit
+
+
+class EditLogBudgetTest(unittest.TestCase):
+    """Test edit log length/size budget and stack compaction."""
+
+    def setUp(self, *args):
+        """Run before each test."""
+        EDIT_LOG.open_registry()
+        EDIT_LOG.set_budget(max_length=None, max_size=None)
+        self.dict_ = OrderedDict([("a", 0), ("b", 0), ("c", 0)])
+        return super(EditLogBudgetTest, self).setUp(*args)
+
+    def tearDown(self, *args):
+        """Run after each test."""
+        EDIT_LOG.reset()
+        EDIT_LOG.set_budget(
+            constants.EDIT_LOG_MAX_LENGTH,
+            constants.EDIT_LOG_MAX_SIZE,
+        )
+        return super(EditLogBudgetTest, self).tearDown(*args)
+
+    def _modify(self, key, value, stack=False):
+        """Run a modify edit on the test dict.
+
+        Args:
+            key (str): key to modify.
+            value (int): new value.
+            stack (bool): whether or not to stack with previous edit.
+        """
+        DictEdit.create_and_run(
+            self.dict_,
+            OrderedDict([(key, value)]),
+            ContainerOp.MODIFY,
+            stack=stack,
+        )
+
+    def test_max_length(self):
+        """Test old edits are dropped beyond max length."""
+        EDIT_LOG.set_budget(max_length=3)
+        for i in range(5):
+            self._modify("a", i + 1)
+        self.assertEqual(len(EDIT_LOG._log), 3)
+        self.assertEqual(EDIT_LOG.num_dropped_edits, 2)
+        for _ in range(3):
+            self.assertTrue(EDIT_LOG.undo())
+        self.assertFalse(EDIT_LOG.undo())
+        self.assertEqual(self.dict_["a"], 2)
+
+    def test_size_tracking(self):
+        """Test size in bytes is tracked through adds, undos and budget."""
+        self.assertEqual(EDIT_LOG.size_in_bytes, 0)
+        self._modify("a", 1)
+        self._modify("b", 1)
+        size = EDIT_LOG.size_in_bytes
+        self.assertEqual(
+            size,
+            sum([edit.size_in_bytes for edit in EDIT_LOG._log])
+        )
+        EDIT_LOG.undo()
+        self.assertEqual(EDIT_LOG.size_in_bytes, size)
+        self._modify("c", 1)
+        self.assertEqual(
+            EDIT_LOG.size_in_bytes,
+            sum([edit.size_in_bytes for edit in EDIT_LOG._log])
+        )
+        EDIT_LOG.set_budget(max_size=EDIT_LOG._log[-1].size_in_bytes)
+        self.assertEqual(len(EDIT_LOG._log), 1)
+
+    def test_stack_compaction(self):
+        """Test stacked modify edits are merged into one net edit."""
+        self._modify("a", 1)
+        self._modify("a", 2, stack=True)
+        self._modify("b", 3, stack=True)
+        self.assertEqual(len(EDIT_LOG._log), 1)
+        self.assertEqual(
+            self.dict_,
+            OrderedDict([("a", 2), ("b", 3), ("c", 0)])
+        )
+        EDIT_LOG.undo()
+        self.assertEqual(
+            self.dict_,
+            OrderedDict([("a", 0), ("b", 0), ("c", 0)])
+        )
+        EDIT_LOG.redo()
+        self.assertEqual(
+            self.dict_,
+            OrderedDict([("a", 2), ("b", 3), ("c", 0)])
+        )
+
+    def test_stacks_dropped_together(self):
+        """Test edit stacks aren't split when dropping old edits."""
+        EDIT_LOG.set_budget(max_length=2, compact_stacks=False)
+        self._modify("a", 1)
+        self._modify("b", 1, stack=True)
+        self._modify("c", 1)
+        self.assertEqual(len(EDIT_LOG._log), 1)
+        self.assertEqual(EDIT_LOG.num_dropped_edits, 2)
+        self._modify("c", 2)
+        self.assertEqual(len(EDIT_LOG._log), 2)
+        EDIT_LOG.undo()
+        EDIT_LOG.undo()
+        self.assertFalse(EDIT_LOG.undo())
+        self.assertEqual(self.dict_["c"], 0)
+        self.assertEqual(self.dict_["a"], 1)
@@ -0,0 +1,95 @@
+"""Test for edit profiler."""
+
+from collections import OrderedDict
+import unittest
+
+from scheduler.api.edit.edit_log import EDIT_LOG
+from scheduler.api.edit.edit_profiler import (
+    EDIT_PROFILER,
+    ProfileCategory,
+    ProfileOp,
+)
+from scheduler.api.edit.tree_edit import ContainerOp, DictEdit
+
+
+class CallbackDictEdit(DictEdit):
+    """Dict edit that accepts callbacks."""
+    def __init__(self, *args, **kwargs):
+        """Initialize edit."""
+        super(CallbackDictEdit, self).__init__(*args, **kwargs)
+        self._callback_args = self._undo_callback_args = []
+
+
+class EditProfilerTest(unittest.TestCase):
+    """Test profiling of edits, subedits and edit callbacks."""
+
+    def setUp(self, *args):
+        """Run before each test."""
+        EDIT_LOG.open_registry()
+        EDIT_LOG.register_post_edit_callback(
+            CallbackDictEdit,
+            "test_callback",
+            lambda *args: None,
+        )
+        EDIT_PROFILER.enable()
+        self.dict_ = OrderedDict([("a", 0)])
+        return super(EditProfilerTest, self).setUp(*args)
+
+    def tearDown(self, *args):
+        """Run after each test."""
+        EDIT_PROFILER.disable()
+        EDIT_PROFILER.reset()
+        EDIT_LOG.remove_callbacks("test_callback")
+        EDIT_LOG.reset()
+        return super(EditProfilerTest, self).tearDown(*args)
+
+    def test_stats(self):
+        """Test edits and callbacks are recorded in stats."""
+        CallbackDictEdit.create_and_run(
+            self.dict_,
+            OrderedDict([("a", 1)]),
+            ContainerOp.MODIFY,
+        )
+        EDIT_LOG.undo()
+        stats = {
+            (category, name, op): count
+            for category, name, op, count, _, _, _ in EDIT_PROFILER.get_stats()
+        }
+        self.assertEqual(
+            stats,
+            {
+                (ProfileCategory.EDIT, "CallbackDictEdit", ProfileOp.RUN): 1,
+                (ProfileCategory.EDIT, "CallbackDictEdit", ProfileOp.UNDO): 1,
+                (
+                    ProfileCategory.CALLBACK,
+                    "test_callback (CallbackDictEdit)",
+                    ProfileOp.POST_EDIT,
+                ): 1,
+            }
+        )
+        self.assertIn("test_callback", EDIT_PROFILER.get_summary_text())
+
+    def test_chrome_trace(self):
+        """Test chrome trace output."""
+        CallbackDictEdit.create_and_run(
+            self.dict_,
+            OrderedDict([("a", 1)]),
+            ContainerOp.MODIFY,
+        )
+        events = EDIT_PROFILER.get_chrome_trace()["traceEvents"]
+        self.assertEqual(len(events), 2)
+        callback_event, edit_event = events
+        self.assertEqual(edit_event["name"], "CallbackDictEdit")
+        self.assertEqual(edit_event["ph"], "X")
+        self.assertGreaterEqual(callback_event["ts"], edit_event["ts"])
+        self.assertLessEqual(callback_event["dur"], edit_event["dur"])
+
+    def test_disabled(self):
+        """Test nothing is recorded when profiler is disabled."""
+        EDIT_PROFILER.disable()
+        CallbackDictEdit.create_and_run(
+            self.dict_,
+            OrderedDict([("a", 1)]),
+            ContainerOp.MODIFY,
+        )
+        self.assertEqual(EDIT_PROFILER.get_stats(), [])
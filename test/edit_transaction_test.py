@@ -0,0 +1,121 @@
+"""Test for edit log transactions."""
+
+import unittest
+
+from scheduler.api.edit import edit_callbacks
+from scheduler.api.edit.edit_callbacks import (
+    CallbackItemType,
+    CallbackType,
+    EditSummary,
+)
+from scheduler.api.edit.edit_log import EDIT_LOG
+from scheduler.api.edit.task_edit import ModifyTaskEdit
+from scheduler.api.edit.tree_edit import RemoveChildrenEdit
+from scheduler.api.tree import Task, TaskCategory, TaskRoot
+
+
+class EditTransactionTest(unittest.TestCase):
+    """Test transactions are registered as one edit with batch callbacks."""
+
+    def setUp(self, *args):
+        """Run before each test."""
+        EDIT_LOG.open_registry()
+        self.task_root = TaskRoot()
+        self.category = TaskCategory("category", parent=self.task_root)
+        self.task_root._children[self.category.name] = self.category
+        for name in ["task1", "task2", "task3"]:
+            self.category._children[name] = Task(name, parent=self.category)
+        self.task_root._activate()
+        self.callbacks = []
+        edit_callbacks.register_general_purpose_post_callback(
+            self,
+            lambda *args: self.callbacks.append(args),
+        )
+        return super(EditTransactionTest, self).setUp(*args)
+
+    def tearDown(self, *args):
+        """Run after each test."""
+        edit_callbacks.remove_callbacks(self)
+        EDIT_LOG.reset()
+        return super(EditTransactionTest, self).tearDown(*args)
+
+    def get_child_names(self):
+        """Get names of children of test category.
+
+        Returns:
+            (list(str)): the child names.
+        """
+        return list(self.category._children.keys())
+
+    def test_transaction(self):
+        """Test edits are undone together and callbacks are coalesced."""
+        task1 = self.category.get_child("task1")
+        task2 = self.category.get_child("task2")
+        task3 = self.category.get_child("task3")
+        with EDIT_LOG.transaction("Test"):
+            RemoveChildrenEdit.create_and_run(self.category, ["task1"])
+            RemoveChildrenEdit.create_and_run(self.category, ["task2"])
+            ModifyTaskEdit.create_and_run(task3, {task3._name: "task4"})
+            self.assertEqual(self.callbacks, [])
+            self.assertEqual(EDIT_LOG._log, [])
+
+        self.assertEqual(len(EDIT_LOG._log), 1)
+        self.assertEqual(self.get_child_names(), ["task4"])
+        self.assertEqual(len(self.callbacks), 1)
+        callback_type, summary = self.callbacks[0]
+        self.assertEqual(callback_type, CallbackType.TREE_BATCH)
+        self.assertEqual(
+            summary.get_removed_items(CallbackItemType.TREE),
+            [task1, task2],
+        )
+        self.assertEqual(
+            summary.get_modified_items(CallbackItemType.TREE),
+            [task3],
+        )
+
+        self.assertTrue(EDIT_LOG.undo())
+        self.assertEqual(
+            self.get_child_names(),
+            ["task1", "task2", "task3"],
+        )
+        summary = self.callbacks[-1][1]
+        self.assertEqual(
+            summary.get_added_items(CallbackItemType.TREE),
+            [task1, task2],
+        )
+        self.assertEqual(summary.get_removed_items(CallbackItemType.TREE), [])
+        self.assertTrue(EDIT_LOG.redo())
+        self.assertEqual(self.get_child_names(), ["task4"])
+
+    def test_rollback(self):
+        """Test edits are undone if the transaction raises an error."""
+        with self.assertRaises(ValueError):
+            with EDIT_LOG.transaction():
+                RemoveChildrenEdit.create_and_run(self.category, ["task1"])
+                raise ValueError()
+        self.assertEqual(
+            self.get_child_names(),
+            ["task1", "task2", "task3"],
+        )
+        self.assertEqual(EDIT_LOG._log, [])
+        self.assertEqual(self.callbacks, [])
+
+    def test_summary_from_callbacks(self):
+        """Test edit summaries can be built up from callback args."""
+        task1 = self.category.get_child("task1")
+        task2 = self.category.get_child("task2")
+        with EDIT_LOG.transaction():
+            RemoveChildrenEdit.create_and_run(self.category, ["task1"])
+        summary = EditSummary()
+        summary.add_callback(*self.callbacks[0])
+        summary.add_callback(CallbackType.TREE_MODIFY, task2, task2)
+        self.assertEqual(summary.item_types, [CallbackItemType.TREE])
+        self.assertEqual(
+            summary.get_removed_items(CallbackItemType.TREE),
+            [task1],
+        )
+        self.assertEqual(
+            summary.get_modified_items(CallbackItemType.TREE),
+            [task2],
+        )
+        self.assertEqual(summary.get_changed_parents(), [self.category])
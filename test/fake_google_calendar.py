@@ -0,0 +1,249 @@
+"""Local fake of the google calendar events api, for testing sync."""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+import urllib.parse
+import uuid
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """Handler passing requests on to the fake calendar."""
+
+    def log_message(self, *args):
+        """Don't log requests."""
+
+    def _handle(self):
+        """Handle request and send response."""
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length) if length else b""
+        status, content_type, response_body = self.server.calendar.handle(
+            self.command,
+            self.path,
+            body,
+            self.headers.get("Content-Type", ""),
+        )
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(response_body)))
+        self.end_headers()
+        self.wfile.write(response_body)
+
+    do_GET = _handle
+    do_POST = _handle
+    do_PUT = _handle
+    do_DELETE = _handle
+
+
+class FakeGoogleCalendar(object):
+    """Fake calendar server, storing events in memory.
+
+    Attributes:
+        events (dict(str, dict)): all events, including cancelled ones,
+            keyed by event id.
+        num_requests (int): number of http requests received.
+        num_batched_requests (int): number of requests received within
+            batch requests.
+    """
+    EVENTS_PATH = "/calendar/v3/calendars/primary/events"
+    BATCH_PATH = "/batch/calendar/v3"
+
+    def __init__(self):
+        """Initialise fake calendar."""
+        self.events = {}
+        self.num_requests = 0
+        self.num_batched_requests = 0
+        self._updates = {}
+        self._update_count = 0
+        self._expired_before = 0
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def url(self):
+        """Get url of server.
+
+        Returns:
+            (str): server url.
+        """
+        return "http://127.0.0.1:{0}".format(self._server.server_port)
+
+    def start(self):
+        """Start server on a free port, on a background thread."""
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _RequestHandler)
+        self._server.daemon_threads = True
+        self._server.calendar = self
+        thread = threading.Thread(target=self._server.serve_forever)
+        thread.daemon = True
+        thread.start()
+
+    def shutdown(self):
+        """Stop server."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def expire_sync_tokens(self):
+        """Make all sync tokens given out so far invalid."""
+        self._expired_before = self._update_count + 1
+
+    def _store(self, event):
+        """Store event, recording it as updated.
+
+        Args:
+            event (dict): event to store.
+        """
+        self._update_count += 1
+        self.events[event["id"]] = event
+        self._updates[event["id"]] = self._update_count
+
+    def handle(self, method, path, body, content_type):
+        """Handle http request.
+
+        Args:
+            method (str): http method.
+            path (str): url path and query.
+            body (bytes): request body.
+            content_type (str): request content type.
+
+        Returns:
+            (int): status code.
+            (str): response content type.
+            (bytes): response body.
+        """
+        with self._lock:
+            self.num_requests += 1
+            if method == "POST" and path == self.BATCH_PATH:
+                return self._handle_batch(body, content_type)
+            status, json_body = self._handle_events(
+                method,
+                path,
+                json.loads(body.decode("utf-8")) if body else None,
+            )
+            return (
+                status,
+                "application/json",
+                json.dumps(json_body).encode("utf-8") if json_body else b"",
+            )
+
+    def _handle_events(self, method, path, json_body):
+        """Handle events api request.
+
+        Args:
+            method (str): http method.
+            path (str): url path and query.
+            json_body (dict or None): request json.
+
+        Returns:
+            (int): status code.
+            (dict or None): response json.
+        """
+        url = urllib.parse.urlparse(path)
+        if not url.path.startswith(self.EVENTS_PATH):
+            return 404, {"error": "Not found"}
+        event_id = url.path[len(self.EVENTS_PATH):].strip("/")
+        event = self.events.get(event_id)
+        if method == "GET" and not event_id:
+            query = dict(urllib.parse.parse_qsl(url.query))
+            return self._list_events(query)
+        if method == "POST" and not event_id:
+            event_id = json_body.get("id", uuid.uuid4().hex)
+            if event_id in self.events:
+                return 409, {"error": "Duplicate"}
+            self._store(dict(json_body, id=event_id, status="confirmed"))
+            return 200, self.events[event_id]
+        if event is None:
+            return 404, {"error": "Not found"}
+        if method == "PUT":
+            self._store(dict(json_body, id=event_id, status="confirmed"))
+            return 200, self.events[event_id]
+        if method == "DELETE":
+            if event["status"] == "cancelled":
+                return 410, {"error": "Deleted"}
+            self._store({"id": event_id, "status": "cancelled"})
+            return 204, None
+        return 405, {"error": "Method not allowed"}
+
+    def _list_events(self, query):
+        """List events changed since the sync token, one page at a time.
+
+        Args:
+            query (dict): query parameters.
+
+        Returns:
+            (int): status code.
+            (dict): response json.
+        """
+        sync_token = query.get("syncToken")
+        if sync_token is not None:
+            if int(sync_token) < self._expired_before:
+                return 410, {"error": "Sync token expired"}
+            event_ids = [
+                event_id for event_id, update in self._updates.items()
+                if update > int(sync_token)
+            ]
+        else:
+            event_ids = [
+                event_id for event_id, event in self.events.items()
+                if event["status"] != "cancelled"
+            ]
+        start = int(query.get("pageToken", 0))
+        end = start + int(query.get("maxResults", 250))
+        result = {"items": [self.events[id_] for id_ in event_ids[start:end]]}
+        if end < len(event_ids):
+            result["nextPageToken"] = str(end)
+        else:
+            result["nextSyncToken"] = str(self._update_count)
+        return 200, result
+
+    def _handle_batch(self, body, content_type):
+        """Handle multipart batch request.
+
+        Args:
+            body (bytes): request body.
+            content_type (str): request content type, including boundary.
+
+        Returns:
+            (int): status code.
+            (str): response content type.
+            (bytes): response body.
+        """
+        boundary = content_type.split("boundary=")[-1]
+        response_boundary = "batch_response"
+        lines = []
+        for part in body.decode("utf-8").split("--{0}".format(boundary)):
+            if not part.strip() or part.strip() == "--":
+                continue
+            outer_headers, _, http_request = part.strip().partition(
+                "\r\n\r\n"
+            )
+            content_id = [
+                header.split(":", 1)[1].strip()
+                for header in outer_headers.split("\r\n")
+                if header.lower().startswith("content-id")
+            ][0]
+            head, _, json_body = http_request.partition("\r\n\r\n")
+            method, path, _ = head.split("\r\n")[0].split(" ")
+            self.num_batched_requests += 1
+            status, response_json = self._handle_events(
+                method,
+                path,
+                json.loads(json_body) if json_body.strip() else None,
+            )
+            lines.extend([
+                "--{0}".format(response_boundary),
+                "Content-Type: application/http",
+                "Content-ID: <response-{0}>".format(content_id.strip("<>")),
+                "",
+                "HTTP/1.1 {0} Status".format(status),
+                "Content-Type: application/json",
+                "",
+                json.dumps(response_json) if response_json else "",
+            ])
+        lines.extend(["--{0}--".format(response_boundary), ""])
+        return (
+            200,
+            "multipart/mixed; boundary={0}".format(response_boundary),
+            "\r\n".join(lines).encode("utf-8"),
+        )
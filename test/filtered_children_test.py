@@ -0,0 +1,109 @@
+"""Test for cached filtered children of tree items."""
+
+import unittest
+
+from scheduler.api.edit.tree_edit import (
+    AddChildrenEdit,
+    MoveTreeItemEdit,
+    RemoveChildrenEdit,
+)
+from scheduler.api.filter.tree_filters import BaseTreeFilter
+from scheduler.api.tree import Task, TaskCategory, TaskRoot
+
+
+class NameFilter(BaseTreeFilter):
+    """Filter that removes items with a given name, and counts calls."""
+    def __init__(self, name):
+        """Initialize.
+
+        Args:
+            name (str): name of items to remove.
+        """
+        super(NameFilter, self).__init__()
+        self.name_to_remove = name
+        self.num_calls = 0
+
+    def _filter_function(self, item):
+        """Check if tree item is filtered.
+
+        Args:
+            item (BaseTreeItem): the item to filter.
+        """
+        self.num_calls += 1
+        return item.name != self.name_to_remove
+
+
+class FilteredChildrenCacheTest(unittest.TestCase):
+    """Test filtered children are cached and invalidated by tree edits."""
+
+    def setUp(self, *args):
+        """Run before each test."""
+        self.task_root = TaskRoot()
+        self.category = TaskCategory("category", parent=self.task_root)
+        self.task_root._children[self.category.name] = self.category
+        for name in ["task1", "task2", "hidden"]:
+            task = Task(name, parent=self.category)
+            self.category._children[name] = task
+        self.other_category = TaskCategory("other", parent=self.task_root)
+        self.task_root._children[self.other_category.name] = (
+            self.other_category
+        )
+        self.task_root._activate()
+        self.filter = NameFilter("hidden")
+        return super(FilteredChildrenCacheTest, self).setUp(*args)
+
+    def get_names(self):
+        """Get names of filtered children of category.
+
+        Returns:
+            (list(str)): names of filtered children.
+        """
+        return [
+            child.name
+            for child in self.category.get_filtered_children(self.filter)
+        ]
+
+    def test_cache(self):
+        """Test filtered children are only computed once until cleared."""
+        self.assertEqual(self.get_names(), ["task1", "task2"])
+        num_calls = self.filter.num_calls
+        self.assertEqual(self.get_names(), ["task1", "task2"])
+        with self.category.filter_children(self.filter):
+            self.assertEqual(self.category.num_children(), 2)
+        self.assertEqual(self.filter.num_calls, num_calls)
+        self.filter.clear_cache()
+        self.assertEqual(self.get_names(), ["task1", "task2"])
+        self.assertGreater(self.filter.num_calls, num_calls)
+
+    def test_edit_invalidation(self):
+        """Test add, remove and move edits invalidate the cache."""
+        self.assertEqual(self.get_names(), ["task1", "task2"])
+        root_version = self.task_root.children_version
+        add_edit = AddChildrenEdit.create_unregistered(
+            self.category,
+            {"task3": Task("task3")},
+        )
+        add_edit._run()
+        self.assertEqual(self.get_names(), ["task1", "task2", "task3"])
+        self.assertGreater(self.task_root.children_version, root_version)
+        add_edit._inverse_run()
+        self.assertEqual(self.get_names(), ["task1", "task2"])
+
+        RemoveChildrenEdit.create_unregistered(
+            self.category,
+            ["task1"],
+        )._run()
+        self.assertEqual(self.get_names(), ["task2"])
+
+        MoveTreeItemEdit.create_unregistered(
+            self.category.get_child("task2"),
+            self.other_category,
+        )._run()
+        self.assertEqual(self.get_names(), [])
+        self.assertEqual(
+            [
+                child.name for child in
+                self.other_category.get_filtered_children(self.filter)
+            ],
+            ["task2"],
+        )
@@ -0,0 +1,135 @@
+"""Test for git backup engine."""
+
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+from scheduler.api.git_backup import GitBackupEngine, GitBackupStage
+
+try:
+    import git
+except ImportError:
+    git = None
+
+
+def _run_git(cwd, *args):
+    """Run git command in given directory.
+
+    Args:
+        cwd (str): directory to run command in.
+        *args: args to pass to git.
+
+    Returns:
+        (str): output of command.
+    """
+    return subprocess.check_output(
+        ["git"] + list(args),
+        cwd=cwd,
+        stderr=subprocess.DEVNULL,
+        universal_newlines=True,
+    ).strip()
+
+
+@unittest.skipIf(git is None, "GitPython is not installed")
+class GitBackupTest(unittest.TestCase):
+    """Test git backup engine against a local bare repo."""
+
+    def setUp(self, *args):
+        """Run before each test."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.remote_dir = os.path.join(self.temp_dir, "remote.git")
+        self.repo_dir = os.path.join(self.temp_dir, "repo")
+        _run_git(self.temp_dir, "init", "--bare", "-q", self.remote_dir)
+        _run_git(self.temp_dir, "clone", "-q", self.remote_dir, self.repo_dir)
+        _run_git(self.repo_dir, "config", "user.name", "test")
+        _run_git(self.repo_dir, "config", "user.email", "test@test.com")
+        self._write_file("tasks.json", "{}")
+        _run_git(self.repo_dir, "add", "-A")
+        _run_git(self.repo_dir, "commit", "-q", "-m", "initial")
+        _run_git(self.repo_dir, "push", "-q", "-u", "origin", "HEAD")
+        return super(GitBackupTest, self).setUp(*args)
+
+    def tearDown(self, *args):
+        """Run after each test."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        return super(GitBackupTest, self).tearDown(*args)
+
+    def _write_file(self, file_name, text):
+        """Write file in repo.
+
+        Args:
+            file_name (str): relative path of file.
+            text (str): text to write.
+        """
+        file_path = os.path.join(self.repo_dir, file_name)
+        if not os.path.isdir(os.path.dirname(file_path)):
+            os.makedirs(os.path.dirname(file_path))
+        with open(file_path, "w") as file_:
+            file_.write(text)
+
+    def _num_remote_commits(self):
+        """Get number of commits in remote repo.
+
+        Returns:
+            (int): number of commits.
+        """
+        return int(_run_git(self.remote_dir, "rev-list", "--count", "HEAD"))
+
+    def test_backup_modified_and_untracked(self):
+        """Test backup of modified and untracked files."""
+        self._write_file("tasks.json", '{"a": 1}')
+        for i in range(20):
+            self._write_file(os.path.join("calendar", str(i)), str(i))
+        stages = []
+        engine = GitBackupEngine(self.repo_dir)
+        error = engine.run(
+            "test backup",
+            progress_callback=lambda stage, _: stages.append(stage),
+        )
+        self.assertIsNone(error)
+        self.assertEqual(self._num_remote_commits(), 2)
+        self.assertEqual(_run_git(self.repo_dir, "status", "--porcelain"), "")
+        self.assertEqual(
+            stages,
+            [
+                GitBackupStage.STAGING,
+                GitBackupStage.COMMITTING,
+                GitBackupStage.PUSHING,
+                GitBackupStage.DONE,
+            ]
+        )
+
+    def test_skip_unchanged(self):
+        """Test that a repeat backup with no changes does no extra work."""
+        self._write_file("tasks.json", '{"a": 1}')
+        engine = GitBackupEngine(self.repo_dir)
+        self.assertIsNone(engine.run())
+        stages = []
+        self.assertIsNone(
+            engine.run(progress_callback=lambda stage, _: stages.append(stage))
+        )
+        self.assertEqual(self._num_remote_commits(), 2)
+        self.assertEqual(
+            stages,
+            [GitBackupStage.STAGING, GitBackupStage.DONE]
+        )
+
+    def test_background_backup(self):
+        """Test running backup on background thread."""
+        self._write_file("tasks.json", '{"b": 2}')
+        results = []
+        engine = GitBackupEngine(self.repo_dir)
+        self.assertTrue(
+            engine.run_in_background(finished_callback=results.append)
+        )
+        self.assertTrue(engine.wait(timeout=60))
+        self.assertEqual(results, [None])
+        self.assertEqual(engine.progress, 1.0)
+        self.assertEqual(self._num_remote_commits(), 2)
+
+    def test_invalid_repo(self):
+        """Test error message for directory that isn't a git repo."""
+        engine = GitBackupEngine(os.path.join(self.temp_dir, "not_a_repo"))
+        self.assertIsNotNone(engine.run())
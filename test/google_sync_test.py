@@ -0,0 +1,331 @@
+"""Test for syncing the calendar with google calendar."""
+
+import unittest
+
+from scheduler.api.calendar.calendar import Calendar
+from scheduler.api.calendar.google.sync import (
+    GoogleCalendarClient,
+    GoogleCalendarSync,
+    GoogleSyncState,
+)
+from scheduler.api.calendar.repeat_pattern import RepeatPattern
+from scheduler.api.calendar.scheduled_item import (
+    RepeatScheduledItem,
+    ScheduledItem,
+    ScheduledItemType,
+)
+from scheduler.api.common.date_time import Date, Time
+from scheduler.api.edit.edit_log import EDIT_LOG
+from scheduler.api.edit.schedule_edit import (
+    AddScheduledItemEdit,
+    ModifyScheduledItemEdit,
+    RemoveScheduledItemEdit,
+)
+from scheduler.api.serialization import item_registry
+from scheduler.api.tree import HistoryData, TaskRoot
+
+from .fake_google_calendar import FakeGoogleCalendar
+
+
+class GoogleSyncTest(unittest.TestCase):
+    """Test incremental sync against a fake google calendar server."""
+
+    def setUp(self, *args):
+        """Run before each test."""
+        self.server = FakeGoogleCalendar()
+        self.server.start()
+        task_root = TaskRoot()
+        task_root._history_data = HistoryData()
+        self.calendar = Calendar(task_root)
+        self.start_date = Date(2024, 1, 1)
+        self.end_date = Date(2024, 1, 31)
+        self.items = []
+        for i in range(3):
+            self.items.append(self.add_item(
+                ScheduledItem,
+                Date(2024, 1, 1 + i),
+                "event{0}".format(i),
+            ))
+        self.week_repeat_item = self.add_item(
+            RepeatScheduledItem,
+            RepeatPattern.week_repeat(self.start_date, ["Mon", "Wed"], 2),
+            "week_repeat",
+        )
+        self.day_repeat_item = self.add_item(
+            RepeatScheduledItem,
+            RepeatPattern.day_repeat(
+                [Date(2024, 1, 1), Date(2024, 1, 2)],
+                5,
+                end_date=Date(2024, 2, 1),
+            ),
+            "day_repeat",
+        )
+        self.client = GoogleCalendarClient("token", base_url=self.server.url)
+        self.state = GoogleSyncState()
+        self.sync = GoogleCalendarSync(self.calendar, self.client, self.state)
+        return super(GoogleSyncTest, self).setUp(*args)
+
+    def tearDown(self, *args):
+        """Run after each test."""
+        self.server.shutdown()
+        EDIT_LOG.reset()
+        item_registry.clear_registry()
+        return super(GoogleSyncTest, self).tearDown(*args)
+
+    def add_item(self, item_class, date_or_pattern, name):
+        """Add event scheduled item to calendar.
+
+        Args:
+            item_class (class): ScheduledItem or RepeatScheduledItem.
+            date_or_pattern (Date or RepeatPattern): date or repeat pattern.
+            name (str): event name.
+
+        Returns:
+            (BaseScheduledItem): the added item.
+        """
+        item = item_class(
+            self.calendar,
+            Time(9),
+            Time(10),
+            date_or_pattern,
+            item_type=ScheduledItemType.EVENT,
+            event_name=name,
+        )
+        AddScheduledItemEdit.create_unregistered(item).run()
+        return item
+
+    def get_remote_event(self, summary):
+        """Get event from server by summary.
+
+        Args:
+            summary (str): event summary.
+
+        Returns:
+            (dict or None): the event, if found.
+        """
+        for event in self.server.events.values():
+            if event.get("summary") == summary:
+                return event
+        return None
+
+    def test_push(self):
+        """Test only local changes are pushed, in batches."""
+        self.assertEqual(self.sync.push(self.start_date, self.end_date), 6)
+        self.assertEqual(self.server.num_requests, 1)
+        self.assertEqual(self.server.num_batched_requests, 6)
+        self.assertEqual(
+            self.get_remote_event("week_repeat")["recurrence"],
+            ["RRULE:FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,WE;WKST=MO"],
+        )
+        self.assertEqual(
+            [
+                event["start"]["dateTime"]
+                for event in self.server.events.values()
+                if event["summary"] == "day_repeat"
+            ],
+            ["2024-01-01T09:00:00", "2024-01-02T09:00:00"],
+        )
+
+        self.assertEqual(self.sync.push(self.start_date, self.end_date), 0)
+        self.assertEqual(self.server.num_requests, 1)
+
+        ModifyScheduledItemEdit.create_unregistered(
+            self.items[0],
+            {self.items[0]._start_time: Time(8)},
+        ).run()
+        RemoveScheduledItemEdit.create_unregistered(self.items[1]).run()
+        self.assertEqual(self.sync.push(self.start_date, self.end_date), 2)
+        self.assertEqual(self.server.num_requests, 2)
+        self.assertEqual(
+            self.get_remote_event("event0")["start"]["dateTime"],
+            "2024-01-01T08:00:00",
+        )
+        self.assertIsNone(self.get_remote_event("event1"))
+
+        # events already on the server are updated if the state is lost
+        self.client._batch_size = 2
+        self.state.events = {}
+        self.assertEqual(self.sync.push(self.start_date, self.end_date), 5)
+        self.assertEqual(self.server.num_requests, 8)
+
+    def test_pull(self):
+        """Test remote changes are pulled incrementally and not pushed back."""
+        EDIT_LOG.open_registry()
+        self.sync.push(self.start_date, self.end_date)
+        self.assertEqual(self.sync.pull(), 0)
+        self.assertEqual(len(EDIT_LOG._log), 0)
+
+        event = self.get_remote_event("event0")
+        self.client.batch([
+            (
+                "PUT",
+                self.client.events_path(event["id"]),
+                dict(
+                    event,
+                    summary="renamed",
+                    start={"dateTime": "2024-01-05T11:00:00Z"},
+                    end={"dateTime": "2024-01-05T12:30:00Z"},
+                ),
+            ),
+            (
+                "DELETE",
+                self.client.events_path(
+                    self.get_remote_event("event1")["id"]
+                ),
+                None,
+            ),
+            (
+                "POST",
+                self.client.events_path(),
+                {
+                    "summary": "external",
+                    "start": {"dateTime": "2024-01-03T14:00:00Z"},
+                    "end": {"dateTime": "2024-01-03T15:00:00Z"},
+                    "recurrence": ["RRULE:FREQ=MONTHLY;INTERVAL=1"],
+                },
+            ),
+            (
+                "POST",
+                self.client.events_path(),
+                {
+                    "summary": "all day",
+                    "start": {"date": "2024-01-03"},
+                    "end": {"date": "2024-01-04"},
+                },
+            ),
+        ])
+        self.assertEqual(self.sync.pull(), 3)
+        self.assertEqual(len(EDIT_LOG._log), 1)
+        self.assertEqual(self.items[0].name, "renamed")
+        self.assertEqual(self.items[0].date, Date(2024, 1, 5))
+        self.assertEqual(self.items[0].end_time, Time(12, 30))
+        self.assertEqual(
+            list(self.calendar.get_day(Date(2024, 1, 2))._scheduled_items),
+            [],
+        )
+        external_item = list(self.calendar._repeat_items)[-1]
+        self.assertEqual(external_item.name, "external")
+        self.assertEqual(
+            external_item.repeat_pattern,
+            RepeatPattern.month_repeat([Date(2024, 1, 3)]),
+        )
+
+        num_requests = self.server.num_requests
+        self.assertEqual(self.sync.pull(), 0)
+        self.assertEqual(self.sync.push(self.start_date, self.end_date), 0)
+        self.assertEqual(self.server.num_requests, num_requests + 1)
+
+        self.server.expire_sync_tokens()
+        self.assertEqual(self.sync.pull(), 0)
+        self.assertEqual(
+            GoogleSyncState.from_dict(self.state.to_dict()).to_dict(),
+            self.state.to_dict(),
+        )
+
+        # the pulled changes are undone as one edit
+        self.assertEqual(len(EDIT_LOG._log), 1)
+        self.assertTrue(EDIT_LOG.undo())
+        self.assertEqual(self.items[0].name, "event0")
+        self.assertEqual(
+            len(self.calendar.get_day(Date(2024, 1, 2))._scheduled_items),
+            1,
+        )
+        self.assertNotIn(external_item, list(self.calendar._repeat_items))
+
+    def test_week_start(self):
+        """Test week repeats crossing a monday keep their dates in google."""
+        EDIT_LOG.open_registry()
+        # the mondays fall in the week after the start date's monday
+        repeat_pattern = RepeatPattern.week_repeat(
+            Date(2024, 1, 4),
+            ["Thu", "Mon"],
+            2,
+        )
+        item = self.add_item(RepeatScheduledItem, repeat_pattern, "gap")
+        self.sync.push(self.start_date, self.end_date)
+        event = self.get_remote_event("gap")
+        self.assertEqual(
+            event["recurrence"],
+            ["RRULE:FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,TH;WKST=TH"],
+        )
+        self.assertEqual(event["start"]["dateTime"], "2024-01-04T09:00:00")
+
+        self.client.batch([
+            (
+                "PUT",
+                self.client.events_path(event["id"]),
+                dict(event, summary="renamed"),
+            ),
+            (
+                "POST",
+                self.client.events_path(),
+                dict(
+                    event,
+                    summary="external",
+                    recurrence=["RRULE:FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,TH"],
+                    extendedProperties={},
+                ),
+            ),
+        ])
+        self.assertEqual(self.sync.pull(), 1)
+        self.assertEqual(item.name, "renamed")
+        self.assertEqual(item.repeat_pattern, repeat_pattern)
+        # with a monday week start, the external event's dates can't be
+        # represented by a week repeat from its start date
+        self.assertNotIn(
+            "external",
+            [item.name for item in self.calendar._repeat_items],
+        )
+
+    def test_until(self):
+        """Test rule end times are sent in UTC for the sync time zone."""
+        repeat_pattern = RepeatPattern.day_repeat(
+            [Date(2024, 1, 1)],
+            3,
+            end_date=Date(2024, 1, 31),
+        )
+        item = self.add_item(RepeatScheduledItem, repeat_pattern, "until")
+        sync = GoogleCalendarSync(
+            self.calendar,
+            self.client,
+            self.state,
+            time_zone="America/Los_Angeles",
+        )
+        sync.push(self.start_date, self.end_date)
+        event = self.get_remote_event("until")
+        self.assertEqual(
+            event["recurrence"],
+            ["RRULE:FREQ=DAILY;INTERVAL=3;UNTIL=20240201T075959Z"],
+        )
+        self.assertEqual(event["start"]["timeZone"], "America/Los_Angeles")
+
+        # the end time is read back as a date in the event's time zone
+        EDIT_LOG.open_registry()
+        self.client.batch([(
+            "PUT",
+            self.client.events_path(event["id"]),
+            dict(event, summary="renamed"),
+        )])
+        self.assertEqual(sync.pull(), 1)
+        self.assertEqual(item.name, "renamed")
+        self.assertEqual(item.repeat_pattern, repeat_pattern)
+
+    def test_conflict(self):
+        """Test local changes win over remote changes to the same item."""
+        self.sync.push(self.start_date, self.end_date)
+        event = self.get_remote_event("event2")
+        self.client.batch([(
+            "PUT",
+            self.client.events_path(event["id"]),
+            dict(event, summary="remote"),
+        )])
+        ModifyScheduledItemEdit.create_unregistered(
+            self.items[2],
+            {self.items[2]._event_name: "local"},
+        ).run()
+        self.assertEqual(
+            self.sync.sync(self.start_date, self.end_date),
+            (0, 1),
+        )
+        self.assertEqual(self.items[2].name, "local")
+        self.assertEqual(self.server.events[event["id"]]["summary"], "local")
@@ -0,0 +1,91 @@
+"""Test for columnar history store."""
+
+import random
+import unittest
+
+from scheduler.api.common.date_time import Date, TimeDelta
+from scheduler.api.enums import ItemStatus
+from scheduler.api.tree import Task, TaskType
+from scheduler.api.tree.history_store import HistoryStore
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, "numpy not installed")
+class HistoryStoreTest(unittest.TestCase):
+    """Test history store batch queries match the task history methods."""
+
+    def setUp(self, *args):
+        """Run before each test."""
+        self.start = Date(2024, 1, 1)
+        self.end = Date(2024, 3, 1)
+        self.tasks = []
+        randomizer = random.Random(0)
+        for i in range(20):
+            task_type = TaskType.ROUTINE if i % 4 == 0 else TaskType.GENERAL
+            task = Task("task{0}".format(i), task_type=task_type)
+            history = task.history
+            for day in range(-10, 70):
+                if randomizer.random() > 0.2:
+                    continue
+                subdict = {}
+                if randomizer.random() > 0.3:
+                    subdict[history.STATUS_KEY] = randomizer.choice(
+                        HistoryStore.STATUSES
+                    )
+                if randomizer.random() > 0.8:
+                    subdict[history.STATUS_OVERRIDE_KEY] = True
+                if randomizer.random() > 0.5:
+                    subdict[history.VALUE_KEY] = randomizer.randint(0, 10)
+                history._dict[self.start + TimeDelta(days=day)] = subdict
+            history.mark_modified()
+            self.tasks.append(task)
+        self.store = HistoryStore()
+        return super(HistoryStoreTest, self).setUp(*args)
+
+    def test_status_matrix(self):
+        """Test status matrix matches get_status_at_date."""
+        matrix = self.store.status_matrix(self.tasks, self.start, self.end)
+        dates = self.store.get_dates(self.start, self.end)
+        self.assertEqual(matrix.shape, (len(self.tasks), len(dates)))
+        for i, task in enumerate(self.tasks):
+            for j, date in enumerate(dates):
+                self.assertEqual(
+                    HistoryStore.STATUSES[matrix[i, j]],
+                    task.history.get_status_at_date(date),
+                )
+
+    def test_value_matrix(self):
+        """Test value matrix matches get_value_at_date."""
+        matrix = self.store.value_matrix(self.tasks, self.start, self.end)
+        dates = self.store.get_dates(self.start, self.end)
+        for i, task in enumerate(self.tasks):
+            for j, date in enumerate(dates):
+                value = task.history.get_value_at_date(date)
+                if value is None:
+                    self.assertTrue(numpy.isnan(matrix[i, j]))
+                else:
+                    self.assertEqual(matrix[i, j], value)
+
+    def test_modified_history(self):
+        """Test store picks up modifications to task histories."""
+        task = self.tasks[1]
+        date = self.end
+        task.history._dict[date] = {
+            task.history.STATUS_KEY: ItemStatus.COMPLETE,
+            task.history.STATUS_OVERRIDE_KEY: True,
+        }
+        self.store.status_matrix(self.tasks, self.start, self.end)
+        task.history._dict[date] = {
+            task.history.STATUS_KEY: ItemStatus.UNSTARTED,
+            task.history.STATUS_OVERRIDE_KEY: True,
+        }
+        task.history.mark_modified()
+        matrix = self.store.status_matrix([task], date, date)
+        self.assertEqual(
+            HistoryStore.STATUSES[matrix[0, 0]],
+            ItemStatus.UNSTARTED,
+        )
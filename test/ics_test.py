@@ -0,0 +1,324 @@
+"""Test for iCalendar import and export of scheduled items."""
+
+import itertools
+import os
+import shutil
+import tempfile
+import unittest
+
+from scheduler.api.calendar.calendar import Calendar
+from scheduler.api.calendar.ics import (
+    import_ics,
+    iter_ics_events,
+    write_ics,
+)
+from scheduler.api.calendar.repeat_pattern import (
+    RepeatPattern,
+    RepeatPatternError,
+)
+from scheduler.api.calendar.scheduled_item import (
+    RepeatScheduledItem,
+    ScheduledItem,
+    ScheduledItemType,
+)
+from scheduler.api.common.date_time import Date, Time
+from scheduler.api.edit.edit_log import EDIT_LOG
+from scheduler.api.edit.schedule_edit import AddScheduledItemEdit
+from scheduler.api.serialization import item_registry
+from scheduler.api.tree import HistoryData, Task, TaskCategory, TaskRoot
+
+
+class IcsTest(unittest.TestCase):
+    """Test scheduled items are exported to and imported from ics files."""
+
+    def setUp(self, *args):
+        """Run before each test."""
+        self.temp_directory = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.temp_directory, "calendar.ics")
+        self.task_root = TaskRoot()
+        self.task_root._history_data = HistoryData()
+        category = TaskCategory("category", parent=self.task_root)
+        self.task_root._children[category.name] = category
+        self.task = Task("task", parent=category)
+        category._children[self.task.name] = self.task
+        self.task_root._activate()
+        self.calendar = self.create_calendar()
+
+        self.add_item(
+            ScheduledItem,
+            Date(2024, 1, 1),
+            event_category="work",
+            event_name="meeting, with a long name; " * 4,
+        )
+        self.add_item(
+            ScheduledItem,
+            Date(2024, 1, 2),
+            item_type=ScheduledItemType.TASK,
+            tree_item=self.task,
+        )
+        self.add_item(ScheduledItem, Date(2024, 3, 1), event_name="later")
+        self.add_item(
+            RepeatScheduledItem,
+            RepeatPattern.week_repeat(Date(2024, 1, 1), ["Mon", "Thu"], 2),
+            event_name="week_repeat",
+        )
+        self.add_item(
+            RepeatScheduledItem,
+            RepeatPattern.day_repeat(
+                [Date(2024, 1, 1), Date(2024, 1, 3)],
+                7,
+                end_date=Date(2024, 6, 30),
+            ),
+            event_name="day_repeat",
+        )
+        return super(IcsTest, self).setUp(*args)
+
+    def tearDown(self, *args):
+        """Run after each test."""
+        EDIT_LOG.reset()
+        item_registry.clear_registry()
+        shutil.rmtree(self.temp_directory, ignore_errors=True)
+        return super(IcsTest, self).tearDown(*args)
+
+    def create_calendar(self):
+        """Create empty calendar using test task root.
+
+        Returns:
+            (Calendar): the calendar.
+        """
+        return Calendar(self.task_root)
+
+    def add_item(self, item_class, date_or_pattern, **kwargs):
+        """Add scheduled item from 9 to 10 to calendar.
+
+        Args:
+            item_class (class): ScheduledItem or RepeatScheduledItem.
+            date_or_pattern (Date or RepeatPattern): date or repeat pattern.
+            kwargs (dict): kwargs to pass to item init.
+        """
+        kwargs.setdefault("item_type", ScheduledItemType.EVENT)
+        item = item_class(
+            self.calendar,
+            Time(9),
+            Time(10),
+            date_or_pattern,
+            **kwargs
+        )
+        AddScheduledItemEdit.create_unregistered(item).run()
+
+    def get_items(self, calendar):
+        """Get details of all items in calendar.
+
+        Args:
+            calendar (Calendar): calendar to check.
+
+        Returns:
+            (list(tuple)): name, category, date, times, tree item and repeat
+                pattern of each item.
+        """
+        items = list(calendar._repeat_items)
+        for date in sorted(calendar._days.keys()):
+            items.extend(calendar._days[date]._scheduled_items)
+        return [
+            (
+                item.name,
+                item.category,
+                item.date,
+                item.start_time,
+                item.end_time,
+                item.tree_item,
+                item.repeat_pattern if item.is_repeat() else None,
+            )
+            for item in items
+        ]
+
+    def test_export(self):
+        """Test items in range are written, with repeats as rrules."""
+        self.assertEqual(
+            write_ics(
+                self.calendar,
+                self.file_path,
+                Date(2024, 1, 1),
+                Date(2024, 1, 31),
+            ),
+            5,
+        )
+        with open(self.file_path, "rb") as file_:
+            lines = file_.read().split(b"\r\n")
+        self.assertTrue(all(len(line) <= 75 for line in lines))
+        self.assertIn(
+            b"RRULE:FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,TH;WKST=MO",
+            lines,
+        )
+        self.assertEqual(
+            lines.count(
+                b"RRULE:FREQ=DAILY;INTERVAL=7;UNTIL=20240630T235959"
+            ),
+            2,
+        )
+        self.assertIn(
+            "X-SCHEDULER-TREE-ITEM:{0}".format(self.task.path).encode(),
+            lines,
+        )
+        self.assertNotIn(b"SUMMARY:later", lines)
+
+    def test_import(self):
+        """Test exported items are imported unchanged in one edit."""
+        write_ics(self.calendar, self.file_path)
+        EDIT_LOG.open_registry()
+        calendar = self.create_calendar()
+        self.assertEqual(import_ics(calendar, self.file_path), (6, 0))
+        self.assertEqual(len(EDIT_LOG._log), 1)
+
+        # the day repeat is imported as one repeat item per initial date
+        items = self.get_items(self.calendar)
+        imported_items = self.get_items(calendar)
+        self.assertEqual(imported_items[0], items[0])
+        self.assertEqual(imported_items[3:], items[2:])
+        self.assertEqual(
+            [item[6] for item in imported_items[1:3]],
+            [
+                RepeatPattern.day_repeat([date], 7, end_date=Date(2024, 6, 30))
+                for date in (Date(2024, 1, 1), Date(2024, 1, 3))
+            ],
+        )
+
+        self.assertTrue(EDIT_LOG.undo())
+        self.assertEqual(self.get_items(calendar), [])
+
+    def test_week_start(self):
+        """Test week repeats count their weeks from their start date."""
+        # the mondays fall in the week after the start date's monday
+        repeat_pattern = RepeatPattern.week_repeat(
+            Date(2026, 10, 22),
+            ["Thu", "Mon"],
+            2,
+        )
+        self.assertEqual(
+            repeat_pattern.to_rrule(),
+            "FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,TH;WKST=TH",
+        )
+        self.calendar = self.create_calendar()
+        self.add_item(RepeatScheduledItem, repeat_pattern, event_name="gap")
+        write_ics(self.calendar, self.file_path)
+        EDIT_LOG.open_registry()
+        imported_calendar = self.create_calendar()
+        self.assertEqual(import_ics(imported_calendar, self.file_path), (1, 0))
+        self.assertEqual(
+            self.get_items(imported_calendar)[0][6],
+            repeat_pattern,
+        )
+
+        # with the default monday week start, the rule gives other dates
+        with self.assertRaises(RepeatPatternError):
+            RepeatPattern.from_rrule(
+                "FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,TH",
+                Date(2026, 10, 22),
+            )
+        self.assertEqual(
+            RepeatPattern.from_rrule(
+                "FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,TH",
+                Date(2026, 10, 19),
+            ),
+            RepeatPattern.week_repeat(Date(2026, 10, 19), ["Mon", "Thu"], 2),
+        )
+
+    def test_until(self):
+        """Test rule end times match the form of the event start times."""
+        repeat_pattern = RepeatPattern.day_repeat(
+            [Date(2024, 1, 1)],
+            1,
+            end_date=Date(2024, 1, 10),
+        )
+        self.assertEqual(
+            repeat_pattern.to_rrule(),
+            "FREQ=DAILY;INTERVAL=1;UNTIL=20240110T235959",
+        )
+        self.assertEqual(
+            repeat_pattern.to_rrule(time_zone="America/Los_Angeles"),
+            "FREQ=DAILY;INTERVAL=1;UNTIL=20240111T075959Z",
+        )
+
+        with open(self.file_path, "w", newline="") as file_:
+            file_.write("\r\n".join([
+                "BEGIN:VCALENDAR",
+                "BEGIN:VEVENT",
+                "DTSTART;TZID=America/Los_Angeles:20240101T090000",
+                "DTEND;TZID=America/Los_Angeles:20240101T100000",
+                "RRULE:FREQ=DAILY;INTERVAL=1;UNTIL=20240111T075959Z",
+                "END:VEVENT",
+                "BEGIN:VEVENT",
+                "DTSTART:20240101T090000",
+                "DTEND:20240101T100000",
+                "RRULE:FREQ=DAILY;INTERVAL=1;UNTIL=20240110T235959",
+                "END:VEVENT",
+                "END:VCALENDAR",
+            ]))
+        EDIT_LOG.open_registry()
+        calendar = self.create_calendar()
+        self.assertEqual(import_ics(calendar, self.file_path), (2, 0))
+        self.assertEqual(
+            [item[6] for item in self.get_items(calendar)],
+            [repeat_pattern, repeat_pattern],
+        )
+
+    def test_streaming_parse(self):
+        """Test events are parsed lazily and unsupported ones are skipped."""
+        def iter_lines():
+            yield "BEGIN:VCALENDAR\r\n"
+            for i in itertools.count():
+                yield "BEGIN:VEVENT\r\n"
+                yield "DTSTART;TZID=\"Europe/London\":20240101T090000\r\n"
+                yield "SUMMARY:event\\, number\r\n"
+                yield " {0}\r\n".format(i)
+                yield "BEGIN:VALARM\r\n"
+                yield "SUMMARY:alarm\r\n"
+                yield "END:VALARM\r\n"
+                yield "END:VEVENT\r\n"
+        events = list(itertools.islice(iter_ics_events(iter_lines()), 3))
+        self.assertEqual(
+            [event["SUMMARY"][1] for event in events],
+            ["event\\, number0", "event\\, number1", "event\\, number2"],
+        )
+        self.assertEqual(
+            events[0]["DTSTART"],
+            ({"TZID": "Europe/London"}, "20240101T090000"),
+        )
+
+        with open(self.file_path, "w", newline="") as file_:
+            file_.write("\r\n".join([
+                "BEGIN:VCALENDAR",
+                "BEGIN:VEVENT",
+                "DTSTART;VALUE=DATE:20240101",
+                "SUMMARY:all day",
+                "END:VEVENT",
+                "BEGIN:VEVENT",
+                "DTSTART:20240101T090000Z",
+                "DURATION:PT1H30M",
+                "SUMMARY:line\\nbreak",
+                "CATEGORIES:personal,other",
+                "RRULE:FREQ=MONTHLY;BYMONTHDAY=1",
+                "END:VEVENT",
+                "BEGIN:VEVENT",
+                "DTSTART:20240101T090000Z",
+                "DURATION:PT1H30M",
+                "SUMMARY:line\\nbreak",
+                "CATEGORIES:personal,other",
+                "END:VEVENT",
+                "END:VCALENDAR",
+            ]))
+        EDIT_LOG.open_registry()
+        calendar = self.create_calendar()
+        self.assertEqual(import_ics(calendar, self.file_path), (1, 2))
+        self.assertEqual(
+            self.get_items(calendar),
+            [(
+                "line\nbreak",
+                "personal",
+                Date(2024, 1, 1),
+                Time(9),
+                Time(10, 30),
+                None,
+                None,
+            )],
+        )
@@ -0,0 +1,54 @@
+"""Test for item registry id allocation."""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from scheduler.api.project import Project
+from scheduler.api.serialization import item_registry
+from scheduler.scripts.generate_project import generate_project
+
+
+class ItemRegistryTest(unittest.TestCase):
+    """Test unique id generation and persistence of calendar item ids."""
+
+    def tearDown(self, *args):
+        """Run after each test."""
+        item_registry.clear_registry()
+        return super(ItemRegistryTest, self).tearDown(*args)
+
+    def test_generate_unique_id(self):
+        """Test ids are suffixed in order and skip reserved ids."""
+        registry = item_registry.ItemRegistry()
+        self.assertEqual(registry.generate_unique_id("item"), "item")
+        self.assertEqual(registry.generate_unique_id("item"), "item01")
+        registry.reserve_id("item02")
+        registry.reserve_id("other")
+        self.assertEqual(registry.generate_unique_id("item"), "item03")
+        self.assertEqual(registry.generate_unique_id("other"), "other01")
+        self.assertEqual(registry.generate_unique_id("item0"), "item0")
+        self.assertEqual(registry.generate_unique_id("item"), "item04")
+
+    def test_persistent_ids(self):
+        """Test calendar items keep their ids when saved and read again."""
+        temp_directory = tempfile.mkdtemp()
+        project_dir = os.path.join(temp_directory, "project")
+        try:
+            generate_project(
+                project_dir,
+                num_categories=1,
+                tasks_per_category=2,
+                subtasks_per_task=0,
+                num_years=0.02,
+                scheduled_items_per_day=1,
+                num_repeat_items=1,
+                planned_items_per_day=1,
+            )
+            item_registry.clear_registry()
+            calendar_dict = Project.read(project_dir).calendar.to_dict()
+            item_registry.clear_registry()
+            project = Project.read(project_dir)
+            self.assertEqual(project.calendar.to_dict(), calendar_dict)
+        finally:
+            shutil.rmtree(temp_directory, ignore_errors=True)
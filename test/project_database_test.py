@@ -0,0 +1,130 @@
+"""Test for storing project components in a project database."""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from scheduler.api.common.date_time import Date
+from scheduler.api.edit import edit_log
+from scheduler.api.edit.edit_log import EDIT_LOG
+from scheduler.api.project import Project
+from scheduler.api.serialization import item_registry
+from scheduler.api.serialization.serializable import SaveType
+from scheduler.scripts.benchmark_project import get_project_sizes
+from scheduler.scripts.generate_project import generate_project
+
+
+class ProjectDatabaseTest(unittest.TestCase):
+    """Test project components are read back from and queried in database."""
+
+    def setUp(self, *args):
+        """Run before each test."""
+        self.temp_directory = tempfile.mkdtemp()
+        self.project_dir = os.path.join(self.temp_directory, "project")
+        self.end_date = Date(2024, 3, 31)
+        generate_project(
+            self.project_dir,
+            num_categories=2,
+            tasks_per_category=3,
+            subtasks_per_task=1,
+            num_years=0.1,
+            scheduled_items_per_day=1,
+            num_repeat_items=2,
+            planned_items_per_day=1,
+            end_date=self.end_date,
+        )
+        return super(ProjectDatabaseTest, self).setUp(*args)
+
+    def tearDown(self, *args):
+        """Run after each test."""
+        EDIT_LOG.reset()
+        item_registry.clear_registry()
+        shutil.rmtree(self.temp_directory, ignore_errors=True)
+        return super(ProjectDatabaseTest, self).tearDown(*args)
+
+    def read_project(self):
+        """Read project, clearing the item registry from previous reads.
+
+        Returns:
+            (Project): the project.
+        """
+        item_registry.clear_registry()
+        return Project.read(self.project_dir)
+
+    def test_convert_to_database(self):
+        """Test converted project is read back from database unchanged."""
+        project = self.read_project()
+        sizes = get_project_sizes(project)
+        calendar_day = project.calendar.get_day(self.end_date)
+        scheduled_item_names = [
+            item.name for item in calendar_day._scheduled_items
+        ]
+        project.convert_to_database()
+        self.assertEqual(project._save_type, SaveType.DATABASE)
+        self.assertEqual(project.get_database().write_dicts({}), 0)
+
+        shutil.rmtree(os.path.join(self.project_dir, "tasks"))
+        shutil.rmtree(os.path.join(self.project_dir, "calendar"))
+        os.remove(os.path.join(self.project_dir, "tracker.json"))
+        project = self.read_project()
+        self.assertEqual(project._save_type, SaveType.DATABASE)
+        self.assertEqual(get_project_sizes(project), sizes)
+        self.assertEqual(
+            [
+                item.name for item in
+                project.calendar.get_day(self.end_date)._scheduled_items
+            ],
+            scheduled_item_names,
+        )
+        self.assertFalse(
+            os.path.exists(os.path.join(self.project_dir, "tasks"))
+        )
+
+    def test_queries(self):
+        """Test date range and task queries and incremental writes."""
+        project = self.read_project()
+        project.convert_to_database()
+        database = project.get_database()
+        start_date = Date(2024, 3, 25)
+        scheduled_items = database.get_scheduled_items(
+            "calendar",
+            start_date,
+            self.end_date,
+        )
+        self.assertEqual(len(scheduled_items), 7)
+        self.assertEqual(
+            scheduled_items["2024-03-25"],
+            [
+                item.to_dict()
+                for item in project.calendar.get_day(
+                    start_date
+                )._scheduled_items
+            ],
+        )
+
+        task = project.task_root.get_item_at_path(
+            [project.task_root.name, "category0", "task1"],
+            strict=True,
+        )
+        histories = database.get_history(
+            "task_root",
+            task_path="category0/task1",
+        )
+        self.assertEqual(
+            histories.get("category0/task1", {}),
+            task.history.to_dict(),
+        )
+
+        edit_log.open_edit_registry()
+        project.get_tree_manager().set_item_name(task, "renamed_task")
+        project.to_directory(self.project_dir)
+        histories = database.get_history("task_root", start_date=start_date)
+        self.assertNotIn("category0/task1", histories)
+        self.assertTrue(
+            all(
+                date_str >= "2024-03-25"
+                for history_dict in histories.values()
+                for date_str in history_dict
+            )
+        )
@@ -0,0 +1,65 @@
+"""Test for the synthetic project generator and project benchmarks."""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from scheduler.api.edit.edit_log import EDIT_LOG
+from scheduler.api.serialization import item_registry
+from scheduler.scripts.benchmark_project import (
+    get_project_sizes,
+    get_report,
+    read_project,
+    run_benchmarks,
+)
+from scheduler.scripts.generate_project import generate_project
+
+
+class ProjectGeneratorTest(unittest.TestCase):
+    """Test generated projects can be read and benchmarked."""
+
+    def setUp(self, *args):
+        """Run before each test."""
+        self.temp_directory = tempfile.mkdtemp()
+        self.project_dir = os.path.join(self.temp_directory, "project")
+        generate_project(
+            self.project_dir,
+            num_categories=2,
+            tasks_per_category=3,
+            subtasks_per_task=1,
+            num_years=0.1,
+            scheduled_items_per_day=1,
+            num_repeat_items=2,
+            planned_items_per_day=1,
+        )
+        return super(ProjectGeneratorTest, self).setUp(*args)
+
+    def tearDown(self, *args):
+        """Run after each test."""
+        EDIT_LOG.reset()
+        item_registry.clear_registry()
+        shutil.rmtree(self.temp_directory, ignore_errors=True)
+        return super(ProjectGeneratorTest, self).tearDown(*args)
+
+    def test_generate_project(self):
+        """Test generated project is read back with all its items."""
+        sizes = get_project_sizes(read_project(self.project_dir))
+        self.assertEqual(sizes["tree_items"], 14)
+        self.assertEqual(sizes["tasks"], 12)
+        self.assertEqual(sizes["scheduled_items"], 36)
+        self.assertEqual(sizes["repeat_items"], 2)
+        self.assertEqual(sizes["planned_items"], 36)
+        self.assertGreater(sizes["history_entries"], 0)
+
+    def test_run_benchmarks(self):
+        """Test benchmarks leave the project unchanged and are reported."""
+        results, sizes = run_benchmarks(self.project_dir, 1)
+        self.assertEqual(sizes["tree_items"], 14)
+        report = get_report(results, sizes, self.project_dir, 1)
+        self.assertEqual(
+            list(report["results"].keys()),
+            list(results.keys()),
+        )
+        self.assertIn("project_read", report["results"])
+        self.assertIn("undo", report["results"])
@@ -0,0 +1,102 @@
+"""Test for loading projects in stages on a background thread."""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from scheduler.api.calendar.calendar import Calendar
+from scheduler.api.calendar.scheduled_item import ScheduledItem
+from scheduler.api.common.date_time import Date, Time
+from scheduler.api.project import Project, ProjectLoadStage
+from scheduler.api.project_loader import ProjectLoader
+from scheduler.api.serialization import item_registry
+from scheduler.api.tree import HistoryData, Task, TaskCategory, TaskRoot
+
+
+class ProjectLoaderTest(unittest.TestCase):
+    """Test project loader and deferred item registry callbacks."""
+
+    def setUp(self, *args):
+        """Run before each test."""
+        self.project_dir = tempfile.mkdtemp()
+        open(os.path.join(self.project_dir, Project._MARKER_FILE), "w").close()
+        task_root = TaskRoot()
+        category = TaskCategory("category", parent=task_root)
+        task_root._children[category.name] = category
+        task = Task("task", parent=category)
+        category._children[task.name] = task
+        task_root.write(os.path.join(self.project_dir, "tasks"))
+        task_root._history_data = HistoryData()
+        task_root._activate()
+        calendar = Calendar(task_root)
+        scheduled_item = ScheduledItem(
+            calendar,
+            Time(9),
+            Time(10),
+            Date(2024, 1, 1),
+            tree_item=task,
+        )
+        scheduled_item._activate()
+        calendar.get_day(Date(2024, 1, 1))._scheduled_items.append(
+            scheduled_item
+        )
+        calendar.write(os.path.join(self.project_dir, "calendar"))
+        item_registry.clear_registry()
+        return super(ProjectLoaderTest, self).setUp(*args)
+
+    def tearDown(self, *args):
+        """Run after each test."""
+        item_registry.ITEM_REGISTRY.set_defer_callbacks(False)
+        item_registry.clear_registry()
+        shutil.rmtree(self.project_dir, ignore_errors=True)
+        return super(ProjectLoaderTest, self).tearDown(*args)
+
+    def test_load_stages(self):
+        """Test all stages are loaded in order and timed."""
+        loader = ProjectLoader(self.project_dir)
+        project = loader.start()
+        self.assertTrue(
+            loader.wait_for_stage(ProjectLoadStage.CORE_STAGES[-1], 10)
+        )
+        self.assertIsNotNone(
+            project.task_root.get_item_at_path("/category/task")
+        )
+        self.assertIsNotNone(project.user_prefs)
+        self.assertTrue(loader.wait_for_stage(timeout=10))
+        self.assertTrue(loader.finish())
+        self.assertTrue(loader.is_finished)
+        self.assertIsNone(loader.error)
+        self.assertEqual(loader.progress, 1.0)
+        self.assertEqual(list(loader.timings.keys()), ProjectLoadStage.ALL)
+        self.assertIsNotNone(project.calendar)
+        self.assertIsNotNone(project.archive_calendar)
+
+    def test_deferred_tree_item_pairing(self):
+        """Test calendar items are only added to tasks when load finishes."""
+        loader = ProjectLoader(self.project_dir)
+        project = loader.start()
+        self.assertTrue(loader.wait_for_stage(timeout=10))
+        task = project.task_root.get_item_at_path("/category/task")
+        scheduled_items = project.calendar.get_day(
+            Date(2024, 1, 1)
+        )._scheduled_items
+        self.assertEqual(len(scheduled_items), 1)
+        self.assertEqual(scheduled_items[0].tree_item, task)
+        self.assertEqual(len(task._calendar_items), 0)
+        self.assertTrue(loader.finish())
+        self.assertEqual(list(task._calendar_items), list(scheduled_items))
+
+    def test_deferred_callbacks(self):
+        """Test deferred callbacks are only run once they're released."""
+        registry = item_registry.ItemRegistry()
+        results = []
+        registry.set_defer_callbacks(True)
+        registry.register_callback("item", results.append)
+        registry.register_item("item", "value")
+        self.assertEqual(results, [])
+        registry.set_defer_callbacks(False)
+        registry.run_deferred_callbacks()
+        self.assertEqual(results, ["value"])
+        registry.run_deferred_callbacks()
+        self.assertEqual(results, ["value"])
@@ -0,0 +1,178 @@
+"""Test for the resident project server."""
+
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+import unittest
+
+from scheduler.api.edit.edit_log import EDIT_LOG
+from scheduler.api.project import Project
+from scheduler.api.project_server import (
+    JsonRpcErrorCode,
+    ProjectClient,
+    ProjectServer,
+    ProjectServerError,
+)
+from scheduler.api.serialization import item_registry
+from scheduler.api.tree import Task, TaskCategory, TaskRoot
+
+
+class ProjectServerTest(unittest.TestCase):
+    """Test project server requests, in process and over a socket."""
+
+    def setUp(self, *args):
+        """Run before each test."""
+        self.project_dir = tempfile.mkdtemp()
+        open(os.path.join(self.project_dir, Project._MARKER_FILE), "w").close()
+        task_root = TaskRoot()
+        category = TaskCategory("category", parent=task_root)
+        task_root._children[category.name] = category
+        task = Task("task", parent=category)
+        category._children[task.name] = task
+        task_root.write(os.path.join(self.project_dir, "tasks"))
+        item_registry.clear_registry()
+        self.server = ProjectServer(
+            Project.read(self.project_dir),
+            socket_path=os.path.join(self.project_dir, "test.sock"),
+            journal_flush_delay=0.01,
+        )
+        return super(ProjectServerTest, self).setUp(*args)
+
+    def tearDown(self, *args):
+        """Run after each test."""
+        self.server.shutdown()
+        EDIT_LOG.reset()
+        item_registry.clear_registry()
+        shutil.rmtree(self.project_dir, ignore_errors=True)
+        return super(ProjectServerTest, self).tearDown(*args)
+
+    def test_requests(self):
+        """Test edits are run in order and invalidate cached reads."""
+        self.server.start()
+        request = self.server.handle_request
+        self.assertEqual(
+            request("get_item", {"path": "category"})["children"],
+            ["task"],
+        )
+        self.assertTrue(
+            request("create_item", {"parent_path": "category", "name": "new"})
+        )
+        self.assertEqual(
+            request("get_item", {"path": "category"})["children"],
+            ["task", "new"],
+        )
+        self.assertTrue(
+            request(
+                "update_task",
+                {
+                    "path": "category/task",
+                    "date": "2024-01-01",
+                    "status": "Complete",
+                },
+            )
+        )
+        self.assertEqual(
+            request("get_history", {"path": "category/task"}),
+            [{"date": "2024-01-01", "status": "Complete"}],
+        )
+        self.assertTrue(request("undo"))
+        self.assertEqual(
+            request("get_history", {"path": "category/task"}),
+            [],
+        )
+        with self.assertRaises(ProjectServerError) as context:
+            request("get_item", {"path": "category/missing"})
+        self.assertEqual(
+            context.exception.code,
+            JsonRpcErrorCode.INVALID_PARAMS,
+        )
+
+    def test_socket(self):
+        """Test json-rpc requests from concurrent clients over the socket."""
+        server_thread = threading.Thread(target=self.server.serve_forever)
+        server_thread.start()
+        for _ in range(100):
+            if os.path.exists(self.server.socket_path):
+                break
+            time.sleep(0.1)
+
+        def create_items(client_name):
+            client = ProjectClient(self.server.socket_path)
+            for i in range(5):
+                client.call(
+                    "create_item",
+                    parent_path="category",
+                    name="{0}_{1}".format(client_name, i),
+                )
+                client.call("get_item", path="category")
+            client.close()
+
+        threads = [
+            threading.Thread(target=create_items, args=(name,))
+            for name in ("a", "b", "c")
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+
+        client = ProjectClient(self.server.socket_path)
+        self.assertEqual(
+            len(client.call("get_item", path="category")["children"]),
+            16,
+        )
+        with self.assertRaises(ProjectServerError) as context:
+            client.call("missing_method")
+        self.assertEqual(
+            context.exception.code,
+            JsonRpcErrorCode.METHOD_NOT_FOUND,
+        )
+        client.connect()
+        client._file.write(b"not json\n")
+        client._file.flush()
+        response = json.loads(client._file.readline().decode("utf-8"))
+        self.assertEqual(
+            response["error"]["code"],
+            JsonRpcErrorCode.PARSE_ERROR,
+        )
+        client.close()
+
+        # a second server refuses to replace the running one's socket
+        other_server = ProjectServer(
+            self.server.project,
+            socket_path=self.server.socket_path,
+        )
+        with self.assertRaises(ProjectServerError):
+            other_server.serve_forever()
+        self.assertTrue(os.path.exists(self.server.socket_path))
+
+        self.server.shutdown()
+        server_thread.join(10)
+        self.assertFalse(server_thread.is_alive())
+        self.assertFalse(os.path.exists(self.server.socket_path))
+
+    def test_stale_socket(self):
+        """Test socket left by a server that's not running is replaced."""
+        stale_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale_socket.bind(self.server.socket_path)
+        stale_socket.close()
+        self.assertTrue(os.path.exists(self.server.socket_path))
+        server_thread = threading.Thread(target=self.server.serve_forever)
+        server_thread.start()
+        for _ in range(100):
+            if self.server._socket_server is not None:
+                break
+            time.sleep(0.1)
+        client = ProjectClient(self.server.socket_path)
+        self.assertEqual(
+            client.call("get_item", path="category")["children"],
+            ["task"],
+        )
+        client.close()
+        self.server.shutdown()
+        server_thread.join(10)
+        self.assertFalse(server_thread.is_alive())
@@ -0,0 +1,113 @@
+"""Test for full-text search index."""
+
+import unittest
+
+from scheduler.api.common.date_time import Date
+from scheduler.api.edit.task_edit import ModifyTaskEdit
+from scheduler.api.edit.tree_edit import (
+    MoveTreeItemEdit,
+    RemoveChildrenEdit,
+    RenameChildrenEdit,
+)
+from scheduler.api.tree import Task, TaskCategory, TaskRoot
+
+
+class SearchIndexTest(unittest.TestCase):
+    """Test search index queries and updates from edits."""
+
+    def setUp(self, *args):
+        """Run before each test."""
+        self.task_root = TaskRoot()
+        self.categories = {}
+        for name in ["work", "home"]:
+            category = TaskCategory(name, parent=self.task_root)
+            self.task_root._children[name] = category
+            self.categories[name] = category
+        self.tasks = {}
+        for category_name, name in [
+                ("work", "write report"),
+                ("work", "email reports"),
+                ("home", "laundry")]:
+            category = self.categories[category_name]
+            task = Task(name, parent=category)
+            category._children[name] = task
+            self.tasks[name] = task
+        self.task_root._activate()
+        self.search_index = self.task_root.search_index
+        return super(SearchIndexTest, self).setUp(*args)
+
+    def search(self, query):
+        """Get names of items matching query.
+
+        Args:
+            query (str): the search query.
+
+        Returns:
+            (list(str)): names of matching items, best first.
+        """
+        return [
+            result.item.name for result in self.search_index.search(query)
+        ]
+
+    def test_search(self):
+        """Test prefix and multi-word queries are matched and ranked."""
+        self.assertEqual(
+            self.search("report"),
+            ["write report", "email reports"],
+        )
+        self.assertEqual(self.search("rep WRI"), ["write report"])
+        self.assertEqual(self.search("work"), ["work"])
+        # ancestor names can match other words in the query
+        self.assertEqual(
+            self.search("work rep"),
+            ["email reports", "write report"],
+        )
+        self.assertEqual(
+            self.search("work report"),
+            ["write report", "email reports"],
+        )
+        self.assertEqual(self.search("work laund"), [])
+        self.assertEqual(self.search("  "), [])
+        self.assertEqual(len(self.search_index.search("w", limit=1)), 1)
+
+    def test_edit_updates(self):
+        """Test index is updated by modify, history and tree edits."""
+        laundry = self.tasks["laundry"]
+        modify_edit = ModifyTaskEdit.create_unregistered(
+            laundry,
+            {laundry._name: "ironing"},
+        )
+        modify_edit._run()
+        self.assertEqual(self.search("laundry"), [])
+        self.assertEqual(self.search("iron"), ["ironing"])
+        modify_edit._inverse_run()
+        self.assertEqual(self.search("iron"), [])
+
+        # comments aren't set by edits, so add one directly
+        date = Date(2023, 1, 1)
+        laundry.history._dict[date] = {
+            laundry.history.COMMENT_KEY: "used new detergent",
+        }
+        laundry.history.mark_modified()
+        results = self.search_index.search("detergent")
+        self.assertEqual([result.item for result in results], [laundry])
+        self.assertEqual(results[0].dates, [date])
+
+        # renaming a category updates paths of its descendants
+        RenameChildrenEdit.create_unregistered(
+            self.task_root,
+            {"home": "house"},
+        )._run()
+        self.assertEqual(self.search("house"), ["house"])
+        self.assertEqual(self.search("house laundry"), ["laundry"])
+        MoveTreeItemEdit.create_unregistered(
+            laundry,
+            self.categories["work"],
+        )._run()
+        self.assertEqual(self.search("house laundry"), [])
+        self.assertEqual(self.search("work laundry"), ["laundry"])
+        RemoveChildrenEdit.create_unregistered(
+            self.categories["work"],
+            ["write report"],
+        )._run()
+        self.assertEqual(self.search("report"), ["email reports"])
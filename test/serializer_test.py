@@ -0,0 +1,75 @@
+"""Test for default serialization of dicts and lists."""
+
+import unittest
+
+from scheduler.api.common.date_time import Date
+from scheduler.api.serialization.default import (
+    SerializableValue,
+    SerializerTable,
+    deserialize_dict,
+    serialize_dict,
+)
+from scheduler.api.tree import Task, TaskCategory, TaskRoot
+
+
+class SerializerTableTest(unittest.TestCase):
+    """Test serializer table matches serializable value serialization."""
+
+    def setUp(self, *args):
+        """Run before each test."""
+        self.task_root = TaskRoot()
+        category = TaskCategory("category", parent=self.task_root)
+        self.task_root._children[category.name] = category
+        self.tasks = []
+        for i in range(3):
+            task = Task("task{0}".format(i), parent=category)
+            category._children[task.name] = task
+            self.tasks.append(task)
+        return super(SerializerTableTest, self).setUp(*args)
+
+    def test_serialize(self):
+        """Test values are serialized the same as by SerializableValue."""
+        serializer_table = SerializerTable(tree_root=self.task_root)
+        for value in [self.tasks[0], "string", 1, 2.5, True, None]:
+            for as_key in (True, False):
+                self.assertEqual(
+                    serializer_table.serialize(value, as_key=as_key),
+                    SerializableValue(
+                        value,
+                        as_key=as_key,
+                        tree_root=self.task_root,
+                    ).serialize(),
+                )
+        self.assertEqual(
+            SerializerTable().serialize(Date(2024, 1, 1)),
+            SerializableValue(Date(2024, 1, 1)).serialize(),
+        )
+
+    def test_round_trip(self):
+        """Test tree item keyed dicts are deserialized back to same dict."""
+        prefs_dict = {
+            "expanded": {task: i for i, task in enumerate(self.tasks)},
+            "selected": [self.tasks[1], "string"],
+            "empty": [],
+        }
+        serialized_dict = serialize_dict(
+            prefs_dict,
+            tree_root=self.task_root,
+            delete_empty_containers=True,
+        )
+        self.assertEqual(
+            serialized_dict["selected"],
+            [
+                {
+                    SerializableValue.VALUE_KEY: self.tasks[1].path,
+                    SerializableValue.SERIALIZER_KEY: "TreeSerializer",
+                },
+                "string",
+            ],
+        )
+        self.assertNotIn("empty", serialized_dict)
+        del prefs_dict["empty"]
+        self.assertEqual(
+            deserialize_dict(serialized_dict, tree_root=self.task_root),
+            prefs_dict,
+        )
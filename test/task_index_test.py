@@ -0,0 +1,193 @@
+"""Test for task attribute indexes."""
+
+import unittest
+
+from scheduler.api.common.date_time import Date
+from scheduler.api.edit.task_edit import ModifyTaskEdit, UpdateTaskHistoryEdit
+from scheduler.api.edit.tree_edit import AddChildrenEdit, RemoveChildrenEdit
+from scheduler.api.enums import ItemImportance, ItemStatus
+from scheduler.api.filter import FilterOperator
+from scheduler.api.filter.tree_filters import (
+    TaskImportanceFilter,
+    TaskStatusFilter,
+)
+from scheduler.api.tracker import Tracker
+from scheduler.api.tree import HistoryData, Task, TaskCategory, TaskRoot
+from scheduler.api.tree.task_index import TaskIndexAttribute
+
+
+class TaskIndexTest(unittest.TestCase):
+    """Test task index queries and updates from edits."""
+
+    def setUp(self, *args):
+        """Run before each test."""
+        self.task_root = TaskRoot()
+        self.task_root._history_data = HistoryData()
+        self.category = TaskCategory("category", parent=self.task_root)
+        self.task_root._children[self.category.name] = self.category
+        self.tasks = {}
+        for name, importance in [
+                ("task1", ItemImportance.MAJOR),
+                ("task2", ItemImportance.MINOR),
+                ("task3", ItemImportance.MAJOR)]:
+            task = Task(name, parent=self.category, importance=importance)
+            self.category._children[name] = task
+            self.tasks[name] = task
+        self.subtask = Task("subtask", parent=self.tasks["task2"])
+        self.tasks["task2"]._children[self.subtask.name] = self.subtask
+        self.task_root._activate()
+        self.task_index = self.task_root.task_index
+        return super(TaskIndexTest, self).setUp(*args)
+
+    def test_queries(self):
+        """Test index queries and filters answered from the index."""
+        self.assertEqual(
+            self.task_index.get_tasks(
+                TaskIndexAttribute.IMPORTANCE,
+                ItemImportance.MAJOR,
+            ),
+            {self.tasks["task1"], self.tasks["task3"]},
+        )
+        self.assertEqual(
+            len(
+                self.task_index.get_tasks(
+                    TaskIndexAttribute.STATUS,
+                    ItemStatus.UNSTARTED,
+                )
+            ),
+            4,
+        )
+        status_filter = TaskStatusFilter(
+            FilterOperator.EQUALS,
+            ItemStatus.UNSTARTED,
+        )
+        importance_filter = TaskImportanceFilter(
+            FilterOperator.GREATER_THAN_EQ,
+            ItemImportance.MODERATE,
+        )
+        self.assertEqual(
+            (status_filter & importance_filter).get_matching_tasks(
+                self.task_root
+            ),
+            {self.tasks["task1"], self.tasks["task3"]},
+        )
+        # subtask isn't major, but task2 has no major descendants either
+        self.assertEqual(
+            [
+                child.name for child in
+                self.category.get_filtered_children(importance_filter)
+            ],
+            ["task1", "task3"],
+        )
+
+    def test_composite_descendant_matches(self):
+        """Test composite matches agree with the composite filter function."""
+        self.subtask._importance.set_value(ItemImportance.MAJOR)
+        major_filter = TaskImportanceFilter(
+            FilterOperator.EQUALS,
+            ItemImportance.MAJOR,
+        )
+        minor_filter = TaskImportanceFilter(
+            FilterOperator.EQUALS,
+            ItemImportance.MINOR,
+        )
+        # task2 is minor and passes the major filter through its subtask
+        for composite_filter in (
+                major_filter & minor_filter,
+                major_filter | minor_filter):
+            self.assertEqual(
+                composite_filter.get_matching_tasks(self.task_root),
+                {
+                    task for task in self.task_root.iter_descendants()
+                    if isinstance(task, Task)
+                    and composite_filter.filter_function(task)
+                },
+            )
+        self.assertEqual(
+            (major_filter & minor_filter).get_matching_tasks(self.task_root),
+            {self.tasks["task2"]},
+        )
+
+    def test_tracker_load(self):
+        """Test tasks tracked by a loaded tracker are reindexed."""
+        self.assertEqual(
+            self.task_index.get_tasks(TaskIndexAttribute.IS_TRACKED, True),
+            set(),
+        )
+        Tracker.from_dict(
+            {Tracker.TRACKED_TASKS_KEY: [self.tasks["task1"].path]},
+            self.task_root,
+        )
+        self.assertEqual(
+            self.task_index.get_tasks(TaskIndexAttribute.IS_TRACKED, True),
+            {self.tasks["task1"]},
+        )
+
+    def test_edit_updates(self):
+        """Test index is updated by modify, history and tree edits."""
+        task1 = self.tasks["task1"]
+        self.assertIn(
+            task1,
+            self.task_index.get_tasks(
+                TaskIndexAttribute.IMPORTANCE,
+                ItemImportance.MAJOR,
+            ),
+        )
+        modify_edit = ModifyTaskEdit.create_unregistered(
+            task1,
+            {task1._importance: ItemImportance.MINOR},
+        )
+        modify_edit._run()
+        self.assertEqual(
+            self.task_index.get_tasks(
+                TaskIndexAttribute.IMPORTANCE,
+                ItemImportance.MINOR,
+            ),
+            {task1, self.tasks["task2"]},
+        )
+        modify_edit._inverse_run()
+        self.assertNotIn(
+            task1,
+            self.task_index.get_tasks(
+                TaskIndexAttribute.IMPORTANCE,
+                ItemImportance.MINOR,
+            ),
+        )
+
+        UpdateTaskHistoryEdit.create_unregistered(
+            task1,
+            task1,
+            new_datetime=Date.now(),
+            new_status=ItemStatus.COMPLETE,
+        )._run()
+        self.assertIn(
+            task1,
+            self.task_index.get_tasks(
+                TaskIndexAttribute.STATUS,
+                ItemStatus.COMPLETE,
+            ),
+        )
+
+        RemoveChildrenEdit.create_unregistered(
+            self.category,
+            ["task2"],
+        )._run()
+        self.assertNotIn(
+            self.subtask,
+            self.task_index.get_tasks(
+                TaskIndexAttribute.STATUS,
+                ItemStatus.UNSTARTED,
+            ),
+        )
+        new_task = Task("task4")
+        AddChildrenEdit.create_unregistered(
+            self.category,
+            {new_task.name: new_task},
+        )._run()
+        self.assertIn(
+            new_task,
+            self.task_index.get_tasks(
+                TaskIndexAttribute.STATUS,
+                ItemStatus.UNSTARTED,
+            ),
+        )
@@ -0,0 +1,74 @@
+"""Test for cached current task statuses."""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from scheduler.api.common.date_time import Date, TimeDelta
+from scheduler.api.edit.edit_log import EDIT_LOG
+from scheduler.api.enums import ItemStatus
+from scheduler.api.project import Project
+from scheduler.api.serialization import item_registry
+from scheduler.api.tree import Task, TaskCategory, TaskRoot
+
+
+class TaskStatusCacheTest(unittest.TestCase):
+    """Test cached task statuses are updated by edits and date changes."""
+
+    def setUp(self, *args):
+        """Run before each test."""
+        self.project_dir = tempfile.mkdtemp()
+        open(os.path.join(self.project_dir, Project._MARKER_FILE), "w").close()
+        task_root = TaskRoot()
+        category = TaskCategory("category", parent=task_root)
+        task_root._children[category.name] = category
+        task = Task("task", parent=category)
+        category._children[task.name] = task
+        task_root.write(os.path.join(self.project_dir, "tasks"))
+        item_registry.clear_registry()
+        self.project = Project(self.project_dir)
+        self.tree_manager = self.project.get_tree_manager()
+        self.task = self.project.task_root.get_item_at_path("/category/task")
+        EDIT_LOG.open_registry()
+        return super(TaskStatusCacheTest, self).setUp(*args)
+
+    def tearDown(self, *args):
+        """Run after each test."""
+        EDIT_LOG.reset()
+        item_registry.clear_registry()
+        shutil.rmtree(self.project_dir, ignore_errors=True)
+        return super(TaskStatusCacheTest, self).tearDown(*args)
+
+    def test_edit_invalidation(self):
+        """Test cached status is updated by history edits and undos."""
+        self.assertEqual(self.task.status, ItemStatus.UNSTARTED)
+        self.tree_manager.update_task(
+            self.task,
+            Date.now(),
+            status=ItemStatus.COMPLETE,
+        )
+        self.assertEqual(self.task.status, ItemStatus.COMPLETE)
+        EDIT_LOG.undo()
+        self.assertEqual(self.task.status, ItemStatus.UNSTARTED)
+        EDIT_LOG.redo()
+        self.assertEqual(self.task.status, ItemStatus.COMPLETE)
+
+    def test_day_change(self):
+        """Test status caches from a previous day are recalculated."""
+        self.assertEqual(self.task.status, ItemStatus.UNSTARTED)
+        self.task.history._dict[Date.now()] = {
+            self.task.history.STATUS_KEY: ItemStatus.COMPLETE,
+        }
+        # simulate cache having been made on the previous day
+        self.task.history._current_status = (
+            Date.now() - TimeDelta(days=1),
+            self.task.type,
+            ItemStatus.UNSTARTED,
+        )
+        self.assertEqual(
+            self.project.task_root.update_status_caches(),
+            [self.task],
+        )
+        self.assertEqual(self.task.status, ItemStatus.COMPLETE)
+        self.assertEqual(self.project.task_root.update_status_caches(), [])
@@ -0,0 +1,114 @@
+"""Test for tracker analytics."""
+
+import unittest
+
+from scheduler.api.common.date_time import Date, TimeDelta
+from scheduler.api.enums import ItemStatus, TimePeriod
+from scheduler.api.tracker import Tracker
+from scheduler.api.tracker.analytics import TrackerAnalytics
+from scheduler.api.tree import Task, TaskRoot, TaskType
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, "numpy not installed")
+class TrackerAnalyticsTest(unittest.TestCase):
+    """Test tracker analytics computed over tracked task histories."""
+
+    def setUp(self, *args):
+        """Run before each test."""
+        self.start = Date(2024, 1, 1)
+        self.end = Date(2024, 1, 14)
+        self.tracker = Tracker(TaskRoot())
+        self.routine = Task("routine", task_type=TaskType.ROUTINE)
+        self.empty_task = Task("empty", task_type=TaskType.ROUTINE)
+        self.routine._activate()
+        self.empty_task._activate()
+        history = self.routine.history
+        # completed on days 0-2, 4-9 and 13, with values on the first week
+        for day in [0, 1, 2, 4, 5, 6, 7, 8, 9, 13]:
+            history._dict[self.start + TimeDelta(days=day)] = {
+                history.STATUS_KEY: ItemStatus.COMPLETE,
+            }
+        for day in range(7):
+            date = self.start + TimeDelta(days=day)
+            history._dict.setdefault(date, {})[history.VALUE_KEY] = day
+        history.mark_modified()
+        self.tracker._tracked_tasks.append(self.routine)
+        self.tracker._tracked_tasks.append(self.empty_task)
+        self.analytics = TrackerAnalytics(self.tracker)
+        return super(TrackerAnalyticsTest, self).setUp(*args)
+
+    def test_streaks(self):
+        """Test current and longest streaks."""
+        current, longest = self.analytics.get_streaks(self.start, self.end)
+        self.assertEqual(list(current), [1, 0])
+        self.assertEqual(list(longest), [6, 0])
+        current, _ = self.analytics.get_streaks(
+            self.start,
+            self.start + TimeDelta(days=10),
+        )
+        # day 10 not completed, so use streak ending the day before
+        self.assertEqual(current[0], 6)
+
+    def test_non_routine_completions(self):
+        """Test completions of non-routine tasks aren't carried forward."""
+        task = Task("task")
+        task._activate()
+        task.history._dict[self.start + TimeDelta(days=2)] = {
+            task.history.STATUS_KEY: ItemStatus.COMPLETE,
+        }
+        task.history.mark_modified()
+        self.tracker._tracked_tasks.append(task)
+        analytics = TrackerAnalytics(self.tracker)
+        completions = analytics.get_completion_matrix(self.start, self.end)
+        self.assertEqual(list(completions[2].nonzero()[0]), [2])
+        current, longest = analytics.get_streaks(self.start, self.end)
+        self.assertEqual((current[2], longest[2]), (0, 1))
+        _, rates = analytics.get_completion_rates(
+            self.start,
+            self.end,
+            period=TimePeriod.WEEK,
+            week_start_day=Date.MON,
+        )
+        self.assertEqual(list(rates[2]), [1 / 7, 0])
+
+    def test_completion_rates(self):
+        """Test weekly completion rates, including partial periods."""
+        period_starts, rates = self.analytics.get_completion_rates(
+            self.start,
+            self.end,
+            period=TimePeriod.WEEK,
+            week_start_day=Date.MON,
+        )
+        self.assertEqual(period_starts, [Date(2024, 1, 1), Date(2024, 1, 8)])
+        self.assertEqual(list(rates[0]), [6 / 7, 4 / 7])
+        self.assertEqual(list(rates[1]), [0, 0])
+        period_starts, rates = self.analytics.get_completion_rates(
+            Date(2024, 1, 3),
+            self.end,
+            period=TimePeriod.MONTH,
+        )
+        self.assertEqual(period_starts, [Date(2024, 1, 3)])
+        self.assertEqual(rates[0, 0], 8 / 12)
+
+    def test_rolling_stats(self):
+        """Test rolling means and percentiles of values."""
+        means = self.analytics.get_rolling_means(self.start, self.end, 3)
+        self.assertEqual(means[0, 0], 0)
+        self.assertEqual(means[0, 2], 1)
+        self.assertEqual(means[0, 7], 5.5)
+        self.assertTrue(numpy.isnan(means[0, 9]))
+        self.assertTrue(numpy.all(numpy.isnan(means[1])))
+        percentiles = self.analytics.get_rolling_percentiles(
+            self.start,
+            self.end,
+            5,
+            [0, 50, 100],
+        )
+        self.assertEqual(percentiles.shape, (3, 2, 14))
+        self.assertEqual(list(percentiles[:, 0, 6]), [2, 4, 6])
+        self.assertTrue(numpy.isnan(percentiles[1, 0, 12]))
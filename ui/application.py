@@ -1,5 +1,6 @@
 """Scheduler Qt application."""
 
+import datetime
 import os
 import sys
 
@@ -7,11 +8,21 @@ from PyQt5 import QtCore, QtGui, QtWidgets
 
 from scheduler.api import constants as api_constants
 from scheduler.api.common import user_prefs
-from scheduler.api.edit import edit_callbacks, edit_log
-from scheduler.api.project import Project
+from scheduler.api.edit import edit_callbacks, edit_log, edit_profiler
+from scheduler.api.filter import FilterType
+from scheduler.api.project import ProjectLoadStage
+from scheduler.api.project_loader import ProjectLoader
 
 from . import constants as ui_constants
-from .tabs import SchedulerTab, HistoryTab, PlannerTab, TaskTab, TrackerTab
+from .callback_dispatcher import CallbackDispatcher
+from .tabs import (
+    HistoryTab,
+    LazyTab,
+    PlannerTab,
+    SchedulerTab,
+    TaskTab,
+    TrackerTab,
+)
 from .utils import (
     custom_message_dialog,
     get_qicon,
@@ -24,6 +35,16 @@ class SchedulerWindow(QtWidgets.QMainWindow):
     """Scheduler window class."""
     CURRENT_TAB_PREF = "current_tab"
     SPLITTER_SIZES = "splitter_sizes"
+    GIT_BACKUP_DIALOG_DELAY = 500
+    GIT_BACKUP_POLL_INTERVAL = 0.05
+    RECOVERED_EDITS_MARKER = "recovered_edits"
+    PREWARM_TABS = True
+    TAB_PREWARM_DELAY = 2000
+    TAB_PREWARM_INTERVAL = 500
+    LOAD_DIALOG_DELAY = 500
+    LOAD_POLL_INTERVAL = 0.05
+    LOAD_CHECK_INTERVAL = 100
+    DAY_CHANGE_MARGIN = 1000
 
     def __init__(self, project_directory=None):
         """Initialise main window.
@@ -36,16 +57,24 @@ class SchedulerWindow(QtWidgets.QMainWindow):
         self.resize(1600, 800)
 
         # TODO: need functionality here for if active project not set
+        # the task tree is shown as soon as the core project stages are
+        # loaded, with the calendar carrying on loading in the background
         project_dir = project_directory or user_prefs.get_active_project()
-        self.project = Project.read(project_dir)
+        self.project_loader = ProjectLoader(project_dir)
+        self.project = self.project_loader.start()
+        self._project_loaded = False
+        self.wait_for_project_load(ProjectLoadStage.CORE_STAGES[-1])
         self.project_user_prefs = self.project.user_prefs
 
         self.setup_tabs()
         self.setup_menu()
         self.saved_edit = edit_log.latest_edit()
+        if self.project.has_recovered_edits:
+            # recovered edits aren't saved, so use a marker that can't
+            # match any edit in the log
+            self.saved_edit = self.RECOVERED_EDITS_MARKER
         self.autosaved_edit = edit_log.latest_edit()
         self.timer_id = self.startTimer(ui_constants.SHORT_TIMER_INTERVAL)
-        edit_log.open_edit_registry()
         edit_callbacks.register_general_purpose_pre_callback(
             self,
             self.pre_edit_callback,
@@ -54,6 +83,81 @@ class SchedulerWindow(QtWidgets.QMainWindow):
             self,
             self.post_edit_callback,
         )
+        if not self._project_loaded:
+            self.statusBar().showMessage("Loading calendar...")
+            self.check_project_load()
+        self.schedule_day_change_update()
+
+    def wait_for_project_load(self, stage=None):
+        """Wait for given project load stage, showing the load progress.
+
+        Args:
+            stage (ProjectLoadStage or None): the stage to wait for. If not
+                given, wait for the whole project to load.
+        """
+        loader = self.project_loader
+        if not loader.is_stage_loaded(stage or ProjectLoadStage.ALL[-1]):
+            progress_dialog = QtWidgets.QProgressDialog(
+                "Loading project...",
+                None,
+                0,
+                100,
+                self,
+            )
+            progress_dialog.setWindowModality(
+                QtCore.Qt.WindowModality.WindowModal
+            )
+            progress_dialog.setMinimumDuration(self.LOAD_DIALOG_DELAY)
+            while not loader.wait_for_stage(
+                    stage,
+                    timeout=self.LOAD_POLL_INTERVAL):
+                if loader.stage is not None:
+                    progress_dialog.setLabelText(
+                        "Loading {0}...".format(loader.stage.lower())
+                    )
+                progress_dialog.setValue(int(loader.progress * 100))
+                QtWidgets.QApplication.processEvents()
+            progress_dialog.setValue(100)
+        if loader.error is not None:
+            raise loader.error
+        if stage is None:
+            self.check_project_load()
+
+    def check_project_load(self):
+        """Check if project has finished loading, and finish setup if so.
+
+        Until then, this reschedules itself to check again later. The edit
+        registry is only opened once the whole project is loaded, so no
+        edits can be made while the calendar is still loading.
+        """
+        if self._project_loaded:
+            return
+        if not self.project_loader.finish():
+            QtCore.QTimer.singleShot(
+                self.LOAD_CHECK_INTERVAL,
+                self.check_project_load,
+            )
+            return
+        self._project_loaded = True
+        edit_log.open_edit_registry()
+        self.project.start_edit_journal()
+        self.statusBar().clearMessage()
+        if api_constants.DEV_MODE:
+            print (self.project_loader.get_timings_text())
+        if self.PREWARM_TABS:
+            QtCore.QTimer.singleShot(
+                self.TAB_PREWARM_DELAY,
+                self.prewarm_tabs,
+            )
+
+    def pre_build_tab(self, tab_class):
+        """Called before building a lazy tab, to wait for any data it needs.
+
+        Args:
+            tab_class (class): BaseTab subclass that will be built.
+        """
+        if tab_class.REQUIRES_CALENDAR:
+            self.wait_for_project_load()
 
     def setup_tabs(self):
         """Setup the tabs widget and different pages."""
@@ -63,6 +167,7 @@ class SchedulerWindow(QtWidgets.QMainWindow):
 
         self.outliner_stack = QtWidgets.QStackedWidget(self)
         self.tabs_widget = QtWidgets.QTabWidget(self)
+        self.callback_dispatcher = CallbackDispatcher()
         self.splitter.addWidget(self.outliner_stack)
         self.splitter.addWidget(self.tabs_widget)
         self.current_active_tab = 0
@@ -72,11 +177,27 @@ class SchedulerWindow(QtWidgets.QMainWindow):
             user_prefs.get_app_user_pref(self.SPLITTER_SIZES, [1, 1])
         )
 
-        self.tasks_tab = self.create_tab_and_outliner(TaskTab)
-        self.planner_tab = self.create_tab_and_outliner(PlannerTab)
-        self.scheduler_tab = self.create_tab_and_outliner(SchedulerTab)
-        self.tracker_tab = self.create_tab_and_outliner(TrackerTab)
-        self.history_tab = self.create_tab_and_outliner(HistoryTab)
+        # tabs are only built when first shown (or prewarmed after startup)
+        self.tasks_tab = self.create_tab_and_outliner(
+            FilterType.TREE,
+            TaskTab,
+        )
+        self.planner_tab = self.create_tab_and_outliner(
+            FilterType.PLANNER,
+            PlannerTab,
+        )
+        self.scheduler_tab = self.create_tab_and_outliner(
+            FilterType.SCHEDULER,
+            SchedulerTab,
+        )
+        self.tracker_tab = self.create_tab_and_outliner(
+            FilterType.TRACKER,
+            TrackerTab,
+        )
+        self.history_tab = self.create_tab_and_outliner(
+            FilterType.HISTORY,
+            HistoryTab,
+        )
 
         self.tabs_widget.currentChanged.connect(self.on_tab_changed)
         self.tabs_widget.setCurrentIndex(
@@ -84,31 +205,77 @@ class SchedulerWindow(QtWidgets.QMainWindow):
         )
         self.tabs_widget.currentWidget().set_active(True)
 
-    def create_tab_and_outliner(self, tab_class, *args, **kwargs):
-        """Create tab and outliner combo for given tab_type.
+    def create_tab_and_outliner(self, tab_name, tab_class):
+        """Create lazy tab and outliner placeholders for given tab_type.
 
         Args:
             tab_name (str): name to use for tab.
             tab_class (class): BaseTab subclass to use for class.
-            args (list): additional args to pass to tab init.
-            kwargs (dict): additional kwargs to pass to tab init.
 
         Returns:
-            (QtWidgets.QTabWidget): the tab widget.
+            (LazyTab): the lazy tab widget, which will build the actual tab
+                when it's first shown.
         """
-        tab = tab_class(
+        lazy_tab = LazyTab(
+            tab_name,
+            tab_class,
             self.project,
-            *args,
-            **kwargs
+            pre_build_callback=self.pre_build_tab,
         )
-        self.outliner_stack.addWidget(tab.outliner_panel)
-        tab_icon = get_qicon("{0}.png".format(tab.name))
+        self.outliner_stack.addWidget(lazy_tab.outliner_placeholder)
+        self.callback_dispatcher.add_view(lazy_tab)
+        tab_icon = get_qicon("{0}.png".format(tab_name))
         self.tabs_widget.addTab(
-            tab,
+            lazy_tab,
             tab_icon,
-            tab.name.capitalize()
+            tab_name.capitalize()
         )
-        return tab
+        return lazy_tab
+
+    def prewarm_tabs(self):
+        """Build the next tab that hasn't been built yet, in idle time.
+
+        This then schedules itself to build the tab after that, so the tabs
+        are built one at a time and the ui stays responsive in between.
+        """
+        for tab_num in range(self.tabs_widget.count()):
+            lazy_tab = self.tabs_widget.widget(tab_num)
+            if not lazy_tab.is_built:
+                lazy_tab.build()
+                QtCore.QTimer.singleShot(
+                    self.TAB_PREWARM_INTERVAL,
+                    self.prewarm_tabs,
+                )
+                return
+
+    def schedule_day_change_update(self):
+        """Schedule update_for_day_change to run just after next midnight."""
+        now = datetime.datetime.now()
+        midnight = datetime.datetime.combine(
+            now.date() + datetime.timedelta(days=1),
+            datetime.time(),
+        )
+        QtCore.QTimer.singleShot(
+            int((midnight - now).total_seconds() * 1000)
+            + self.DAY_CHANGE_MARGIN,
+            self.update_for_day_change,
+        )
+
+    def update_for_day_change(self):
+        """Update cached task statuses and views when the date changes.
+
+        Task statuses can change with the date (eg. routines reset each
+        day), so all cached statuses are recalculated together here and the
+        views are then refreshed once, if any of them have changed.
+        """
+        changed_tasks = self.project.task_root.update_status_caches()
+        if changed_tasks:
+            for tab_num in range(self.tabs_widget.count()):
+                lazy_tab = self.tabs_widget.widget(tab_num)
+                if lazy_tab.is_built:
+                    lazy_tab.tab.filter_manager.clear_filter_caches()
+            self.tabs_widget.currentWidget().on_tab_changed()
+        self.schedule_day_change_update()
 
     def setup_menu(self):
         """Setup the menu actions."""
@@ -130,15 +297,15 @@ class SchedulerWindow(QtWidgets.QMainWindow):
     def pre_edit_callback(self, callback_type, *args):
         """Callback for before an edit of any type is run.
 
+        The callbacks are passed on to the tabs through the callback
+        dispatcher, which defers them for inactive tabs and merges repeated
+        modifications of the same item.
+
         Args:
             callback_type (CallbackType): edit callback type.
             *args: additional args dependent on type of edit.
         """
-        for tab_num in range(self.tabs_widget.count()):
-            self.tabs_widget.widget(tab_num).pre_edit_callback(
-                callback_type,
-                *args
-            )
+        self.callback_dispatcher.pre_edit_callback(callback_type, *args)
 
     def post_edit_callback(self, callback_type, *args):
         """Callback for after an edit of any type is run.
@@ -147,11 +314,7 @@ class SchedulerWindow(QtWidgets.QMainWindow):
             callback_type (CallbackType): edit callback type.
             *args: additional args dependent on type of edit.
         """
-        for tab_num in range(self.tabs_widget.count()):
-            self.tabs_widget.widget(tab_num).post_edit_callback(
-                callback_type,
-                *args
-            )
+        self.callback_dispatcher.post_edit_callback(callback_type, *args)
 
     def on_tab_changed(self, index):
         """Called when changing to different tab.
@@ -165,6 +328,7 @@ class SchedulerWindow(QtWidgets.QMainWindow):
         self.outliner_stack.setCurrentIndex(index)
         current_widget = self.tabs_widget.currentWidget()
         current_widget.set_active(True)
+        self.callback_dispatcher.flush_view(current_widget)
         current_widget.on_tab_changed()
 
     def on_splitter_moved(self, new_pos, index):
@@ -201,11 +365,19 @@ class SchedulerWindow(QtWidgets.QMainWindow):
         elif modifiers == (QtCore.Qt.ControlModifier|QtCore.Qt.ShiftModifier):
             if event.key() == QtCore.Qt.Key_Z:
                 self.redo()
+            # for debugging: toggle edit profiling, printing results at end
+            elif event.key() == QtCore.Qt.Key_P:
+                if edit_profiler.EDIT_PROFILER.is_enabled:
+                    edit_profiler.disable_edit_profiling()
+                    edit_profiler.print_edit_profile()
+                else:
+                    edit_profiler.enable_edit_profiling()
 
         return super(SchedulerWindow, self).keyPressEvent(event)
 
     def save(self):
         """Save scheduler data."""
+        self.wait_for_project_load()
         # self.project.autosave()
         if self.saved_edit != edit_log.latest_edit():
             self.project.write()
@@ -233,7 +405,7 @@ class SchedulerWindow(QtWidgets.QMainWindow):
             self.project.autosave()
 
     def timerEvent(self, event):
-        """Called every timer_interval. Used to make autosaves.
+        """Called every timer_interval. Used to flush the edit journal.
 
         Args:
             event (QtCore.QEvent): the timer event.
@@ -241,8 +413,39 @@ class SchedulerWindow(QtWidgets.QMainWindow):
         # TODO: reenable autosave once I've figured out error (see Notes doc)
         # if event.timerId() == self.timer_id:
         #     self._autosave()
+        if event.timerId() == self.timer_id:
+            self.project.flush_edit_journal()
         super(SchedulerWindow, self).timerEvent(event)
 
+    def run_git_backup(self):
+        """Run git backup in the background while showing its progress.
+
+        Returns:
+            (str or None): error message, if the backup failed.
+        """
+        engine = self.project.get_git_backup_engine()
+        error = self.project.git_backup(background=True)
+        if error:
+            return error
+        progress_dialog = QtWidgets.QProgressDialog(
+            "Backing up scheduler data...",
+            None,
+            0,
+            100,
+            self,
+        )
+        progress_dialog.setWindowModality(QtCore.Qt.WindowModality.WindowModal)
+        progress_dialog.setMinimumDuration(self.GIT_BACKUP_DIALOG_DELAY)
+        while not engine.wait(timeout=self.GIT_BACKUP_POLL_INTERVAL):
+            if engine.stage is not None:
+                progress_dialog.setLabelText(
+                    "{0}...".format(engine.stage)
+                )
+            progress_dialog.setValue(int(engine.progress * 100))
+            QtWidgets.QApplication.processEvents()
+        progress_dialog.setValue(100)
+        return engine.error
+
     def closeEvent(self, event):
         """Called on closing: prompt user to save changes if not done yet.
 
@@ -250,6 +453,7 @@ class SchedulerWindow(QtWidgets.QMainWindow):
             event (QtCore.QEvent): the close event.
         """
         # self._autosave()
+        self.wait_for_project_load()
         # TODO: add user prefs saves to autosave function?
         user_prefs.save_app_user_prefs()
         # TODO: THIS NEEDS ERROR CATCHING:
@@ -272,6 +476,8 @@ class SchedulerWindow(QtWidgets.QMainWindow):
             if result == ui_constants.YES_BUTTON:
                 self.save()
             event.accept()
+        # any unsaved edits have now been rejected by the user
+        self.project.discard_edit_journal()
 
         # hacky, remove this when speed is less of an issue here
         if not api_constants.DEV_MODE:
@@ -281,7 +487,7 @@ class SchedulerWindow(QtWidgets.QMainWindow):
             # a day / one every few days / whatever)
             backup_git = simple_message_dialog("Backup scheduler data on git?")
             if backup_git:
-                error = self.project.git_backup()
+                error = self.run_git_backup()
                 if error:
                     simple_message_dialog(
                         "Git backup failed for {0}".format(
@@ -0,0 +1,157 @@
+"""Dispatcher to pass edit callbacks on to the ui views."""
+
+from collections import OrderedDict
+
+from PyQt5 import QtCore
+
+from scheduler.api.edit.edit_callbacks import (
+    CallbackEditType,
+    CallbackType,
+    EditSummary,
+)
+
+
+class CallbackDispatcher(object):
+    """Dispatcher that queues and merges edit callbacks for each view.
+
+    Views passed to the dispatcher must define pre_edit_callback and
+    post_edit_callback methods, and an is_active property. Callbacks are
+    passed on as follows:
+
+    - active views: callbacks that just modify an item in place (eg. when
+        typing into a field or dragging an item) are queued, so many
+        modifications of the same item are merged into one, and the queue
+        is flushed once per turn of the event loop. All other callbacks
+        are passed on immediately, as the views' models need to be told
+        about structural changes as they happen. Any queued callbacks are
+        flushed first, so the view receives the callbacks in order.
+    - inactive views: callbacks are skipped and instead added to an edit
+        summary, which is passed to the view's batch callbacks when
+        flush_view is called (ie. when the view is next shown).
+    """
+    COALESCED_CALLBACK_TYPES = [
+        CallbackType.TREE_MODIFY,
+        CallbackType.SCHEDULER_MODIFY,
+    ]
+
+    def __init__(self):
+        """Initialize.
+
+        Attributes:
+            _views (list): the views to dispatch callbacks to.
+            _queues (dict(int, OrderedDict)): queued callback type and args
+                for each active view, keyed by view id and then by the
+                callback type and id of the modified item.
+            _summaries (dict(int, EditSummary)): summary of the callbacks
+                skipped for each inactive view, keyed by view id.
+            _flush_scheduled (bool): whether or not a flush of the queues
+                has been scheduled.
+        """
+        self._views = []
+        self._queues = {}
+        self._summaries = {}
+        self._flush_scheduled = False
+
+    def add_view(self, view):
+        """Add view to dispatch callbacks to.
+
+        Args:
+            view (QtWidgets.QWidget): the view to add.
+        """
+        self._views.append(view)
+        self._queues[id(view)] = OrderedDict()
+
+    def _is_coalesced(self, callback_type, *args):
+        """Check if the given callback can be queued and merged.
+
+        Args:
+            callback_type (CallbackType): edit callback type.
+            *args: additional args dependent on type of edit.
+
+        Returns:
+            (bool): whether or not callback just modifies an item in place.
+        """
+        return (
+            callback_type in self.COALESCED_CALLBACK_TYPES
+            and len(args) == 2
+            and args[0] is args[1]
+        )
+
+    def _schedule_flush(self):
+        """Schedule flush of queued callbacks for next turn of event loop."""
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            QtCore.QTimer.singleShot(0, self.flush)
+
+    def _flush_queue(self, view):
+        """Pass queued callbacks on to given view.
+
+        Args:
+            view (QtWidgets.QWidget): the view to flush callbacks for.
+        """
+        queue = self._queues[id(view)]
+        while queue:
+            callback_type, args = queue.popitem(last=False)[1]
+            view.pre_edit_callback(callback_type, *args)
+            view.post_edit_callback(callback_type, *args)
+
+    def flush(self):
+        """Pass queued callbacks on to all views."""
+        self._flush_scheduled = False
+        for view in self._views:
+            self._flush_queue(view)
+
+    def flush_view(self, view):
+        """Pass all queued and skipped callbacks on to given view.
+
+        This should be called when a view is made active. Skipped callbacks
+        are passed on as a batch callback for each edited item type.
+
+        Args:
+            view (QtWidgets.QWidget): the view to flush callbacks for.
+        """
+        self._flush_queue(view)
+        edit_summary = self._summaries.pop(id(view), None)
+        if edit_summary is None:
+            return
+        for item_type in edit_summary.item_types:
+            callback_type = (item_type, CallbackEditType.BATCH)
+            view.pre_edit_callback(callback_type, edit_summary)
+            view.post_edit_callback(callback_type, edit_summary)
+
+    def pre_edit_callback(self, callback_type, *args):
+        """Callback for before an edit of any type is run.
+
+        Args:
+            callback_type (CallbackType): edit callback type.
+            *args: additional args dependent on type of edit.
+        """
+        coalesced = self._is_coalesced(callback_type, *args)
+        for view in self._views:
+            if not view.is_active or coalesced:
+                continue
+            self._flush_queue(view)
+            view.pre_edit_callback(callback_type, *args)
+
+    def post_edit_callback(self, callback_type, *args):
+        """Callback for after an edit of any type is run.
+
+        Args:
+            callback_type (CallbackType): edit callback type.
+            *args: additional args dependent on type of edit.
+        """
+        coalesced = self._is_coalesced(callback_type, *args)
+        for view in self._views:
+            if not view.is_active:
+                edit_summary = self._summaries.setdefault(
+                    id(view),
+                    EditSummary(),
+                )
+                edit_summary.add_callback(callback_type, *args)
+            elif coalesced:
+                key = (callback_type, id(args[0]))
+                self._queues[id(view)][key] = (callback_type, args)
+                self._schedule_flush()
+            else:
+                self._flush_queue(view)
+                view.post_edit_callback(callback_type, *args)
@@ -30,6 +30,12 @@ class HistoryListModel(QtCore.QAbstractItemModel):
             use_long_names (bool): if True, use full path names for history
                 items. Otherwise, we just use their task names.
             parent (QtWidgets.QWidget or None): QWidget that this models.
+
+        Attributes:
+            _task_list (list(BaseTaskItem) or None): cached list of filtered
+                tasks for the calendar day.
+            _task_list_key (tuple or None): the calendar day and filter
+                generation that the cached task list was built for.
         """
         super(HistoryListModel, self).__init__(parent)
         self.tree_manager = tree_manager
@@ -38,6 +44,33 @@ class HistoryListModel(QtCore.QAbstractItemModel):
         self.calendar_day = calendar_day
         self.date = calendar_day.date
         self.use_long_names = use_long_names
+        self._task_list = None
+        self._task_list_key = None
+
+    def get_task_list(self):
+        """Get filtered list of tasks updated in the calendar day.
+
+        Qt calls index and rowCount many times per paint, so the list is
+        cached and only rebuilt when the calendar day or filter changes, or
+        when the model is refreshed after a history change.
+
+        Returns:
+            (list(BaseTaskItem)): list of tasks for the rows of the model.
+        """
+        key = (self.calendar_day, self.filter_manager.filter_generation)
+        if self._task_list is None or key != self._task_list_key:
+            self._task_list = self.history_manager.get_filtered_tasks(
+                self.filter_manager,
+                self.calendar_day,
+            )
+            self._task_list_key = key
+        return self._task_list
+
+    def refresh(self):
+        """Clear cached task list and reset model to pick up changes."""
+        self.beginResetModel()
+        self._task_list = None
+        self.endResetModel()
 
     def index(self, row, column, parent_index):
         """Get index of child item of given parent at given row and column.
@@ -51,10 +84,7 @@ class HistoryListModel(QtCore.QAbstractItemModel):
             (QtCore.QModelIndex): child QModelIndex.
         """
         if self.hasIndex(row, column, parent_index):
-            task_list = self.history_manager.get_filtered_tasks(
-                self.filter_manager,
-                self.calendar_day,
-            )
+            task_list = self.get_task_list()
             if 0 <= row < len(task_list):
                 return self.createIndex(row, column, task_list[row])
         return QtCore.QModelIndex()
@@ -79,12 +109,7 @@ class HistoryListModel(QtCore.QAbstractItemModel):
         Returns:
             (int): number of children.
         """
-        return len(
-            self.history_manager.get_filtered_tasks(
-                self.filter_manager,
-                self.calendar_day,
-            )
-        )
+        return len(self.get_task_list())
 
     def columnCount(self, parent_index=None):
         """Get number of columns of given item.
@@ -497,3 +497,16 @@ class BaseTreeModel(QtCore.QAbstractItemModel):
         index = self.get_index_from_item(old_item)
         if index is not None:
             self.dataChanged.emit(index, index)
+
+    def on_batch_edit(self, edit_summary):
+        """Callback for after a batch of edits has been run.
+
+        The edits in the batch have already added and removed rows, so we
+        reset the model rather than trying to update it row by row. Views
+        are responsible for restoring their state after the reset.
+
+        Args:
+            edit_summary (EditSummary): summary of the edited items.
+        """
+        self.beginResetModel()
+        self.endResetModel()
@@ -35,7 +35,7 @@ class OutlinerTreeModel(BaseTreeModel):
         if hide_filtered_items:
             filter_ = filter_manager.combined_filter
         else:
-            filter_ = filter_manager.field_filter
+            filter_ = filter_manager.tree_field_filter
         self.filter_manager = filter_manager
         super(OutlinerTreeModel, self).__init__(
             tree_manager,
@@ -164,4 +164,4 @@ class OutlinerTreeModel(BaseTreeModel):
         if self._hide_filtered_items:
             return self.set_filter(self.filter_manager.combined_filter)
         else:
-            return self.set_filter(self.filter_manager.field_filter)
+            return self.set_filter(self.filter_manager.tree_field_filter)
@@ -2,6 +2,7 @@
 
 from .scheduler_tab import SchedulerTab
 from .history_tab import HistoryTab
+from .lazy_tab import LazyTab
 from .planner_tab import PlannerTab
 from .task_tab import TaskTab
 from .tracker_tab import TrackerTab
@@ -24,6 +24,7 @@ class BaseCalendarTab(BaseTab):
     START_VIEW_TYPE_PREF = "view_type"
     WEEK_START_PREF = "week_start_days"
     WEEK_START_DAY = Date.SAT
+    REQUIRES_CALENDAR = True
 
     def __init__(
             self,
@@ -156,7 +156,13 @@ class BaseListView(BaseCalendarView, QtWidgets.QTreeView):
 ### MULTI-LIST ###
 class BaseMultiListView(BaseCalendarView, WidgetListView):
     """Base multi-list view for calendar views containing multiple lists."""
-    def __init__(self, name, project, list_views, parent=None):
+    def __init__(
+            self,
+            name,
+            project,
+            list_views,
+            virtualized=False,
+            parent=None):
         """Initialize class instance.
 
         Args:
@@ -165,12 +171,15 @@ class BaseMultiListView(BaseCalendarView, WidgetListView):
             list_views (list(BaseCalendarView)): list of subviews. These
                 subviews each represent a calendar period below the current
                 one.
+            virtualized (bool): if True, only open editors for the subviews
+                that are currently scrolled into view.
             parent (QtGui.QWidget or None): QWidget parent of widget.
         """
         super(BaseMultiListView, self).__init__(
             name,
             project,
             list_views,
+            virtualized=virtualized,
             parent=parent,
         )
 
@@ -288,6 +297,7 @@ class BaseMultiListMonthView(BaseMultiListView):
             name,
             project,
             list_views,
+            virtualized=True,
             parent=parent
         )
         self.calendar_weeks = []
@@ -343,6 +353,7 @@ class BaseMultiListYearView(BaseMultiListView):
             name,
             project,
             list_views,
+            virtualized=True,
             parent=parent
         )
 
@@ -10,6 +10,9 @@ from scheduler.ui.widgets.outliner_panel import OutlinerPanel
 
 class BaseTab(QtWidgets.QWidget):
     """Base Tab class."""
+    # whether the tab needs the project calendar to have been loaded
+    REQUIRES_CALENDAR = False
+
     def __init__(self, filter_type, project, parent=None):
         """Initialise tab.
 
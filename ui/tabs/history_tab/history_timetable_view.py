@@ -29,6 +29,8 @@ class HistoryTimeTableView(BaseWeekTableView):
             parent=parent,
         )
         self.history_manager = project.get_history_manager()
+        self._editor_keys = {}
+        self._editors_outdated = False
         self.setItemDelegate(HistoryDelegate(self))
         self.horizontalHeader().setSectionResizeMode(
             QtWidgets.QHeaderView.ResizeMode.Fixed
@@ -41,11 +43,18 @@ class HistoryTimeTableView(BaseWeekTableView):
         self.open_editors()
 
     def on_view_changed(self):
-        """Callback for when this view is loaded."""
+        """Callback for when this view is loaded.
+
+        Open editors are kept by the update if their day and filter haven't
+        changed, so we also refresh them if they missed any history edits
+        while the view was inactive.
+        """
         super(HistoryTimeTableView, self).on_view_changed()
         self.model().beginResetModel()
         self.model().endResetModel()
         self.update()
+        if self._editors_outdated:
+            self.refresh_editors()
 
     def on_outliner_filter_changed(self, *args):
         """Callback for what to do when filter is changed in outliner."""
@@ -54,21 +63,6 @@ class HistoryTimeTableView(BaseWeekTableView):
         self.model().endResetModel()
         self.update()
 
-    def pre_edit_callback(self, callback_type, *args):
-        """Callback for before an edit of any type is run.
-
-        Args:
-            callback_type (CallbackType): edit callback type.
-            *args: additional args dependent on type of edit.
-        """
-        super(HistoryTimeTableView, self).pre_edit_callback(
-            callback_type,
-            *args,
-        )
-        if (self._is_active
-                and callback_type in [CT.TREE_MODIFY, CT.TREE_REMOVE]):
-            self.model().beginResetModel()
-
     def post_edit_callback(self, callback_type, *args):
         """Callback for after an edit of any type is run.
 
@@ -80,10 +74,11 @@ class HistoryTimeTableView(BaseWeekTableView):
             callback_type,
             *args,
         )
-        if (self._is_active
-                and callback_type in [CT.TREE_MODIFY, CT.TREE_REMOVE]):
-            self.model().endResetModel()
-            self.update()
+        if callback_type in [CT.TREE_MODIFY, CT.TREE_REMOVE, CT.TREE_BATCH]:
+            if self._is_active:
+                self.refresh_editors()
+            else:
+                self._editors_outdated = True
 
     def update(self):
         """Update widget and viewport."""
@@ -106,15 +101,49 @@ class HistoryTimeTableView(BaseWeekTableView):
         self.resize_table()
 
     def open_editors(self):
-        """Open persistent editors on each column."""
+        """Open persistent editors on each column.
+
+        Editors that are already open for the same calendar day and filter
+        generation are kept and just resized, rather than being reopened.
+        """
         model = self.model()
+        size = self.itemDelegate().get_fixed_size()
+        filter_generation = self.filter_manager.filter_generation
+        editor_keys = {}
         for i in range(model.num_rows):
             for j in range(model.num_cols):
                 index = model.index(i, j, QtCore.QModelIndex())
-                if index.isValid():
-                    if self.isPersistentEditorOpen(index):
+                if not index.isValid():
+                    continue
+                key = (
+                    self.calendar_week.get_day_at_index(j),
+                    filter_generation,
+                )
+                editor = None
+                if self.isPersistentEditorOpen(index):
+                    editor = self.indexWidget(index)
+                    if editor is None or self._editor_keys.get((i, j)) != key:
                         self.closePersistentEditor(index)
+                        editor = None
+                if editor is None:
                     self.openPersistentEditor(index)
+                else:
+                    editor.setFixedSize(size)
+                editor_keys[(i, j)] = key
+        self._editor_keys = editor_keys
+        self.viewport().update()
+
+    def refresh_editors(self):
+        """Refresh the models of all open editors after a history change."""
+        model = self.model()
+        for i in range(model.num_rows):
+            for j in range(model.num_cols):
+                index = model.index(i, j, QtCore.QModelIndex())
+                if index.isValid() and self.isPersistentEditorOpen(index):
+                    editor = self.indexWidget(index)
+                    if editor is not None:
+                        editor.model().refresh()
+        self._editors_outdated = False
         self.viewport().update()
 
     def row_count(self):
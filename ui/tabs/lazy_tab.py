@@ -0,0 +1,132 @@
+"""Lazy tab class, to defer construction of a tab until it's needed."""
+
+from PyQt5 import QtWidgets
+
+
+class LazyTab(QtWidgets.QWidget):
+    """Placeholder for a tab and its outliner that builds them when needed.
+
+    This is added to the main tabs widget in place of the actual tab, with
+    a matching outliner placeholder added to the outliner stack. The tab is
+    only built the first time it's shown (or when it's prewarmed), at which
+    point the tab and its outliner panel are added into the placeholders.
+    Until then, the tab has no edit callbacks or models to update, as these
+    will all be built from the current project data when it's created.
+    """
+    def __init__(
+            self,
+            name,
+            tab_class,
+            project,
+            pre_build_callback=None,
+            parent=None):
+        """Initialize placeholder.
+
+        Args:
+            name (str): name of tab.
+            tab_class (class): BaseTab subclass to build.
+            project (Project): the project we're working on.
+            pre_build_callback (function or None): function to call with the
+                tab class before the tab is built, if given. This can be used
+                to make sure the project data the tab needs has been loaded.
+            parent (QtWidgets.QWidget or None): QWidget parent of widget.
+        """
+        super(LazyTab, self).__init__(parent=parent)
+        self.name = name
+        self.tab_class = tab_class
+        self.project = project
+        self.tab = None
+        self._pre_build_callback = pre_build_callback
+        self._is_active = False
+
+        layout = QtWidgets.QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(layout)
+        self.outliner_placeholder = QtWidgets.QWidget()
+        outliner_layout = QtWidgets.QVBoxLayout()
+        outliner_layout.setContentsMargins(0, 0, 0, 0)
+        self.outliner_placeholder.setLayout(outliner_layout)
+
+    @property
+    def is_built(self):
+        """Check if the actual tab has been built yet.
+
+        Returns:
+            (bool): whether or not tab has been built.
+        """
+        return self.tab is not None
+
+    @property
+    def is_active(self):
+        """Check if tab is the one currently shown.
+
+        Returns:
+            (bool): whether or not tab is active.
+        """
+        return self._is_active
+
+    def build(self):
+        """Build the tab and its outliner, if not done already.
+
+        Returns:
+            (BaseTab): the tab.
+        """
+        if self.tab is not None:
+            return self.tab
+        if self._pre_build_callback is not None:
+            self._pre_build_callback(self.tab_class)
+            if self.tab is not None:
+                # tab may have been built while waiting in the callback
+                return self.tab
+        self.tab = self.tab_class(self.project)
+        # clear any filter caches that may be out of date from edits made
+        # before the tab existed
+        self.tab.filter_manager.clear_filter_caches()
+        self.layout().addWidget(self.tab)
+        self.outliner_placeholder.layout().addWidget(self.tab.outliner_panel)
+        if self._is_active:
+            self.tab.set_active(True)
+        return self.tab
+
+    def set_active(self, value):
+        """Mark tab as active/inactive when the user changes tab.
+
+        Args:
+            value (bool): whether to set as inactive.
+        """
+        self._is_active = value
+        if value:
+            self.build()
+        if self.tab is not None:
+            self.tab.set_active(value)
+
+    def on_tab_changed(self):
+        """Callback for when we change to this tab."""
+        self.build().on_tab_changed()
+
+    def update(self):
+        """Update tab and outliner, if built."""
+        super(LazyTab, self).update()
+        if self.tab is not None:
+            self.tab.update()
+            self.tab.outliner_panel.update()
+
+    def pre_edit_callback(self, callback_type, *args):
+        """Callback for before an edit of any type is run.
+
+        Args:
+            callback_type (CallbackType): edit callback type.
+            *args: additional args dependent on type of edit.
+        """
+        if self.tab is not None:
+            self.tab.pre_edit_callback(callback_type, *args)
+
+    def post_edit_callback(self, callback_type, *args):
+        """Callback for after an edit of any type is run.
+
+        Args:
+            callback_type (CallbackType): edit callback type.
+            *args: additional args dependent on type of edit.
+        """
+        if self.tab is not None:
+            self.tab.post_edit_callback(callback_type, *args)
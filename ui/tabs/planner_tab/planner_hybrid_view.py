@@ -213,7 +213,8 @@ class OverlayedPlannerHybridView(BaseOverlayedView):
             titled_list_view = self.left_multilist_view.get_subview(
                 planned_item.calendar_period
             )
-            if titled_list_view is not None:
+            # subviews scrolled out of a virtualized view are hidden
+            if titled_list_view is not None and titled_list_view.isVisible():
                 list_view = titled_list_view.planner_list_view
                 if list_view is not None:
                     return list_view.get_rect_for_item(
@@ -241,7 +242,8 @@ class OverlayedPlannerHybridView(BaseOverlayedView):
             titled_list_view = self.right_multilist_view.get_subview(
                 item.calendar_period
             )
-            if titled_list_view is not None:
+            # subviews scrolled out of a virtualized view are hidden
+            if titled_list_view is not None and titled_list_view.isVisible():
                 list_view = titled_list_view.planner_list_view
                 if list_view is not None:
                     if self.list_view is not None:
@@ -159,7 +159,11 @@ class PlannerListView(BaseListView):
         super(PlannerListView, self).pre_edit_callback(callback_type, *args)
         if not self._is_active:
             return
-        if callback_type in [CallbackType.TREE_REMOVE, CallbackType.TREE_ADD]:
+        if callback_type in [
+                CallbackType.TREE_REMOVE,
+                CallbackType.TREE_ADD,
+                CallbackType.TREE_BATCH,
+                CallbackType.PLANNER_BATCH]:
             self.model().pre_full_update()
         if callback_type[0] != CallbackItemType.PLANNER:
             return
@@ -207,7 +211,11 @@ class PlannerListView(BaseListView):
         super(PlannerListView, self).post_edit_callback(callback_type, *args)
         if not self._is_active:
             return
-        if callback_type in [CallbackType.TREE_REMOVE, CallbackType.TREE_ADD]:
+        if callback_type in [
+                CallbackType.TREE_REMOVE,
+                CallbackType.TREE_ADD,
+                CallbackType.TREE_BATCH,
+                CallbackType.PLANNER_BATCH]:
             self.model().on_full_update()
         if callback_type[0] != CallbackItemType.PLANNER:
             return
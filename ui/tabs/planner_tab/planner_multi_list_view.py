@@ -40,7 +40,9 @@ class BasePlannerMultilist(object):
             callback_type,
             *args
         )
-        if callback_type == CallbackType.TREE_REMOVE:
+        if callback_type in [
+                CallbackType.TREE_REMOVE,
+                CallbackType.TREE_BATCH]:
             self.update_view()
 
 
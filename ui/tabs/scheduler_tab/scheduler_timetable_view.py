@@ -123,7 +123,7 @@ class SchedulerTimetableView(BaseWeekTableView):
             *args: additional args dependent on type of edit.
         """
         if (self._is_active and
-                (callback_type in [CT.TREE_REMOVE, CT.TREE_ADD]
+                (callback_type in [CT.TREE_REMOVE, CT.TREE_ADD, CT.TREE_BATCH]
                 or callback_type[0] == CallbackItemType.SCHEDULER)):
             self.refresh_scheduled_items_list()
         super(SchedulerTimetableView, self).post_edit_callback(
@@ -1,5 +1,7 @@
 """Task Category widget for Task Tab."""
 
+from functools import partial
+
 from PyQt5 import QtCore, QtGui, QtWidgets
 
 from scheduler.ui import utils
@@ -193,6 +195,7 @@ class TaskHeaderListView(WidgetListView):
             tab,
             recursive_depth=0,
             item_spacing=None,
+            virtualized=False,
             parent=None):
         """Initialize.
 
@@ -203,6 +206,8 @@ class TaskHeaderListView(WidgetListView):
             tab (TaskTab): task tab this widget is a descendant of.
             recursive_depth (int): how far down the tree this item is.
             item_spacing (int or None): override of spacing for child items.
+            virtualized (bool): if True, only create header widgets for
+                children once they're scrolled into view.
             parent (QtGui.QWidget or None): QWidget parent of widget.
         """
         tab.task_widget_tree.add_or_update_item(
@@ -214,19 +219,24 @@ class TaskHeaderListView(WidgetListView):
         self.task_item = task_item
         self.tab = tab
         self.recursive_depth = recursive_depth
+        self._header_items = list(task_item.get_all_children())
         widget_list = []
-        for child in task_item.get_all_children():
-            widget = TaskHeaderWidget(
+        for child in self._header_items:
+            widget_factory = partial(
+                TaskHeaderWidget,
                 tree_manager,
                 filter_manager,
                 child,
                 tab=tab,
                 recursive_depth=recursive_depth,
             )
-            widget_list.append(widget)
+            if not virtualized:
+                widget_factory = widget_factory()
+            widget_list.append(widget_factory)
         super(TaskHeaderListView, self).__init__(
             widget_list,
             item_spacing=item_spacing,
+            virtualized=virtualized,
             parent=parent,
         )
         self.apply_filters()
@@ -242,8 +252,10 @@ class TaskHeaderListView(WidgetListView):
                 self.filter_row(i)
             else:
                 self.unfilter_row(i)
-                header_widget = self.get_widget(i)
-                header_widget.apply_filters(update=update)
+                # widgets not created yet will pick up filters on creation
+                header_widget = self.get_widget(i, created_only=True)
+                if header_widget is not None:
+                    header_widget.apply_filters(update=update)
         if update:
             self.update_view()
 
@@ -262,6 +274,7 @@ class TaskHeaderListView(WidgetListView):
             recursive_depth=self.recursive_depth,
         )
         self.insert_widget(row, widget)
+        self._header_items.insert(row, task_header_item)
 
     def remove_header_widget(self, row, task_header_item):
         """Remove header widget at given row.
@@ -271,4 +284,36 @@ class TaskHeaderListView(WidgetListView):
             task_header_item (Task or TaskCategory): item to remove.
         """
         self.remove_widget(row)
+        if 0 <= row < len(self._header_items):
+            del self._header_items[row]
         self.tab.task_widget_tree.remove_item(task_header_item)
+
+    def sync_header_widgets(self):
+        """Update header widgets to match the current children of the item.
+
+        This is used after a batch of edits, in place of inserting, removing
+        or moving the header widget of each edited child individually.
+        """
+        children = self.task_item.get_all_children()
+        child_ids = set(id(child) for child in children)
+        for row in reversed(range(len(self._header_items))):
+            header_item = self._header_items[row]
+            if id(header_item) not in child_ids:
+                self.remove_header_widget(row, header_item)
+        for row, child in enumerate(children):
+            if (row < len(self._header_items)
+                    and self._header_items[row] is child):
+                continue
+            old_rows = [
+                i for i, header_item in enumerate(self._header_items)
+                if header_item is child
+            ]
+            if old_rows:
+                self.move_widget(old_rows[0], row)
+                self._header_items.insert(
+                    row,
+                    self._header_items.pop(old_rows[0]),
+                )
+            else:
+                self.insert_header_widget(row, child)
+        self.apply_filters()
@@ -38,6 +38,7 @@ class TaskTab(BaseTab):
             self.tree_root,
             self,
             item_spacing=self.OUTER_CATEGORY_SPACING,
+            virtualized=True,
         )
         self.outer_layout.addWidget(self.task_header_view)
         self._views_being_reset = []
@@ -134,6 +135,41 @@ class TaskTab(BaseTab):
             self.on_item_moved(*args)
         elif callback_type == CallbackType.TREE_MODIFY:
             self.on_item_modified(*args)
+        elif callback_type == CallbackType.TREE_BATCH:
+            self.on_batch_edit(*args)
+
+    def on_batch_edit(self, edit_summary):
+        """Callback for after a transaction of tree edits.
+
+        This updates each affected header list and task view once, rather
+        than once for each edit in the transaction.
+
+        Args:
+            edit_summary (EditSummary): summary of edited items.
+        """
+        self._views_being_reset = []
+        task_views = []
+        for parent in edit_summary.get_changed_parents():
+            task_header_view = self.task_widget_tree.get_task_header_view(
+                parent
+            )
+            if task_header_view is not None:
+                task_header_view.sync_header_widgets()
+            elif self.tree_manager.is_task(parent):
+                task_views.append(self.task_widget_tree.get_task_view(parent))
+            self.update_task_header_views_for_item(parent)
+        for item in edit_summary.get_modified_items(CallbackItemType.TREE):
+            if self.tree_manager.is_task_category_or_top_level_task(item):
+                widget = self.task_widget_tree.get_task_header_widget(item)
+                if widget:
+                    widget.update_task_item(item)
+            else:
+                task_views.append(self.task_widget_tree.get_task_view(item))
+        for widget in set(task_views):
+            if widget is not None:
+                widget.begin_reset()
+                widget.end_reset()
+        self.task_header_view.update_view()
 
     def pre_item_added(self, item, parent, row):
         """Callback for before an item has been added.
@@ -280,6 +316,25 @@ class TaskTab(BaseTab):
                 widget.update_task_item(new_item)
         self.task_header_view.update_view()
 
+    def _create_task_header_widget(self, task_header):
+        """Scroll to top-level ancestor of header so its widgets get created.
+
+        Args:
+            task_header (BaseTaskItem): task category or top-level task.
+
+        Returns:
+            (TaskHeaderWidget or None): the header widget, if created.
+        """
+        top_level_item = task_header
+        while (top_level_item.parent is not None
+                and top_level_item.parent != self.tree_root):
+            top_level_item = top_level_item.parent
+        row = top_level_item.index()
+        if row is None:
+            return None
+        self.task_header_view.scroll_to_row(row)
+        return self.task_widget_tree.get_task_header_widget(task_header)
+
     def on_outliner_current_changed(self, tree_item):
         """Callback to scroll to item when current is changed in outliner.
 
@@ -290,6 +345,8 @@ class TaskTab(BaseTab):
             tree_item
         )
         widget = self.task_widget_tree.get_task_header_widget(task_header)
+        if not widget:
+            widget = self._create_task_header_widget(task_header)
         if not widget:
             return
         point = widget.mapTo(self.task_header_view, QtCore.QPoint(0,0))
@@ -158,7 +158,8 @@ class TrackerMonthTableView(BaseMonthTableView):
         )
         if (self._is_active
                 and callback_type[0] == CIT.TREE
-                and callback_type[1] in [CET.MODIFY, CET.ADD, CET.REMOVE]):
+                and callback_type[1] in [
+                    CET.MODIFY, CET.ADD, CET.REMOVE, CET.BATCH]):
             self.model().beginResetModel()
 
     def post_edit_callback(self, callback_type, *args):
@@ -174,7 +175,8 @@ class TrackerMonthTableView(BaseMonthTableView):
         )
         if (self._is_active
                 and callback_type[0] == CIT.TREE
-                and callback_type[1] in [CET.MODIFY, CET.ADD, CET.REMOVE]):
+                and callback_type[1] in [
+                    CET.MODIFY, CET.ADD, CET.REMOVE, CET.BATCH]):
             self.model().endResetModel()
             self.update()
 
@@ -81,7 +81,8 @@ class TrackerTimetableView(BaseWeekTableView):
         )
         if (self._is_active
                 and callback_type[0] == CIT.TREE
-                and callback_type[1] in [CET.MODIFY, CET.ADD, CET.REMOVE]):
+                and callback_type[1] in [
+                    CET.MODIFY, CET.ADD, CET.REMOVE, CET.BATCH]):
             self.model().beginResetModel()
 
     def post_edit_callback(self, callback_type, *args):
@@ -97,7 +98,8 @@ class TrackerTimetableView(BaseWeekTableView):
         )
         if (self._is_active
                 and callback_type[0] == CIT.TREE
-                and callback_type[1] in [CET.MODIFY, CET.ADD, CET.REMOVE]):
+                and callback_type[1] in [
+                    CET.MODIFY, CET.ADD, CET.REMOVE, CET.BATCH]):
             self.model().endResetModel()
             self.update()
 
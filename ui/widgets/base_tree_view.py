@@ -63,6 +63,8 @@ class BaseTreeView(QtWidgets.QTreeView):
             self.model().on_item_moved(*args)
         elif callback_type == CallbackType.TREE_MODIFY:
             self.model().on_item_modified(*args)
+        elif callback_type == CallbackType.TREE_BATCH:
+            self.model().on_batch_edit(*args)
 
     def _get_selected_items(self):
         """Get tree items that are selected.
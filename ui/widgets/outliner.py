@@ -4,6 +4,7 @@ from functools import partial
 
 from PyQt5 import QtCore, QtGui, QtWidgets
 
+from scheduler.api.edit.edit_callbacks import CallbackType
 from scheduler.ui.dialogs import TaskItemDialog
 from scheduler.ui.models.tree import OutlinerTreeModel
 from .base_tree_view import BaseTreeView
@@ -58,6 +59,24 @@ class Outliner(BaseTreeView):
         self.expanded.connect(partial(self.mark_item_expanded, value=True))
         self.collapsed.connect(partial(self.mark_item_expanded, value=False))
 
+    def post_edit_callback(self, callback_type, *args):
+        """Callback for after an edit of any type is run.
+
+        Batch edits reset the model, so we restore the expanded items and
+        the current item afterwards.
+
+        Args:
+            callback_type (CallbackType): edit callback type.
+            *args: additional args dependent on type of edit.
+        """
+        current_item = self._get_current_item()
+        super(Outliner, self).post_edit_callback(callback_type, *args)
+        if callback_type == CallbackType.TREE_BATCH:
+            self.expand_items_from_filter_manager()
+            # this does nothing if the item was removed from the tree
+            if current_item is not None:
+                self.select_item(current_item)
+
     def on_tab_changed(self):
         """Callback for when tab is changed.
 
@@ -141,6 +160,35 @@ class Outliner(BaseTreeView):
                 self.filter_manager.set_current_tree_item(item)
                 self.tab.on_outliner_current_changed(item)
 
+    def select_item(self, item):
+        """Make given item current, expanding its ancestors to show it.
+
+        Args:
+            item (BaseTreeItem): item to select.
+
+        Returns:
+            (bool): whether or not item was found in the outliner.
+        """
+        if item.root is not self.root:
+            return False
+        index = QtCore.QModelIndex()
+        for ancestor in item.iter_ancestors():
+            if ancestor.parent is None:
+                continue
+            # rows are indexes in the filtered children of each parent
+            with ancestor.parent.filter_children(self.model().child_filter):
+                row = ancestor.index()
+            if row is None:
+                return False
+            if index.isValid():
+                self.setExpanded(index, True)
+            index = self.model().index(row, 0, index)
+            if not index.isValid():
+                return False
+        self.setCurrentIndex(index)
+        self.scrollTo(index)
+        return True
+
     def on_model_data_change(self, *args):
         """Update view to pick up changes in model."""
         self.viewport().update()
@@ -2,6 +2,7 @@
 
 from PyQt5 import QtCore, QtGui, QtWidgets
 
+from collections import OrderedDict
 from functools import partial
 
 from scheduler.api.filter import BaseFilter
@@ -122,6 +123,8 @@ class FilterWidget(QtWidgets.QWidget):
             start_stretch=True,
             end_stretch=True,
         )
+        self.quick_open_widget = QuickOpenWidget(outliner)
+        main_layout.addWidget(self.quick_open_widget)
         self.filter_view = FilterView(filter_manager, outliner)
         main_layout.addWidget(self.filter_view)
 
@@ -171,3 +174,80 @@ class FilterWidget(QtWidgets.QWidget):
     def launch_filter_dialog(self):
         """Launch filter dialog."""
         FilterDialog(self.filter_manager).exec_()
+
+
+class QuickOpenWidget(QtWidgets.QLineEdit):
+    """Search box to find and select items in the outliner."""
+    MAX_RESULTS = 20
+
+    def __init__(self, outliner, parent=None):
+        """Initialise widget.
+
+        Args:
+            outliner (Outliner): outliner view to select items in.
+            parent (QtGui.QWidget or None): QWidget parent of widget.
+        """
+        super(QuickOpenWidget, self).__init__(parent=parent)
+        self.outliner = outliner
+        self.search_index = outliner.root.search_index
+        self._results = {}
+        self.setPlaceholderText("Quick open...")
+        self.setClearButtonEnabled(True)
+        self.results_model = QtCore.QStringListModel(self)
+        self.completer = QtWidgets.QCompleter(self.results_model, self)
+        # results are already filtered and ranked by the search index
+        self.completer.setCompletionMode(
+            QtWidgets.QCompleter.CompletionMode.UnfilteredPopupCompletion
+        )
+        self.setCompleter(self.completer)
+        self.textEdited.connect(self.update_results)
+        self.completer.activated[str].connect(self.select_result)
+        self.returnPressed.connect(self.select_first_result)
+
+    @staticmethod
+    def _get_result_text(result):
+        """Get text to display for search result.
+
+        Args:
+            result (SearchResult): the search result.
+
+        Returns:
+            (str): the item path, plus the dates of any matching comments.
+        """
+        if not result.dates:
+            return result.item.path
+        return "{0} ({1})".format(
+            result.item.path,
+            ", ".join(date.string() for date in result.dates),
+        )
+
+    def update_results(self, text):
+        """Update search results for new text.
+
+        Args:
+            text (str): the search text.
+        """
+        results = self.search_index.search(text, limit=self.MAX_RESULTS)
+        self._results = OrderedDict([
+            (self._get_result_text(result), result.item)
+            for result in results
+        ])
+        self.results_model.setStringList(list(self._results.keys()))
+        if self._results:
+            self.completer.complete()
+
+    def select_result(self, result_text):
+        """Select item for given search result in outliner.
+
+        Args:
+            result_text (str): display text of search result.
+        """
+        item = self._results.get(result_text)
+        if item is not None and self.outliner.select_item(item):
+            self.outliner.setFocus()
+            self.clear()
+
+    def select_first_result(self):
+        """Select item for best search result in outliner."""
+        if self._results:
+            self.select_result(next(iter(self._results)))
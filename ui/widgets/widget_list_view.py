@@ -9,15 +9,40 @@ from scheduler.api.utils import fallback_value
 
 class WidgetData(object):
     """Simple struct representing a widget used in the view."""
-    def __init__(self, widget, filtered=False):
+    def __init__(self, widget=None, filtered=False, widget_factory=None):
         """Initialize.
 
         Args:
-            widget (QtWidgets.QWidget): the widget.
+            widget (QtWidgets.QWidget or None): the widget.
             filtered (bool): whether or not the widget is filtered out.
+            widget_factory (function or None): if given, this is used to
+                create the widget the first time it's needed, rather than
+                passing in the widget directly.
         """
-        self.widget = widget
+        self._widget = widget
+        self._widget_factory = widget_factory
         self.filtered = filtered
+        self.size_hint = None
+
+    @property
+    def widget(self):
+        """Get widget, creating it from the factory if needed.
+
+        Returns:
+            (QtWidgets.QWidget or None): the widget.
+        """
+        if self._widget is None and self._widget_factory is not None:
+            self._widget = self._widget_factory()
+            self._widget_factory = None
+        return self._widget
+
+    def is_created(self):
+        """Check if the widget for this item has been created yet.
+
+        Returns:
+            (bool): whether or not widget has been created.
+        """
+        return self._widget is not None
 
 
 class WidgetDataList(list):
@@ -32,25 +57,39 @@ class WidgetDataList(list):
 
 
 class WidgetListView(QtWidgets.QListView):
-    """Base list view showing list of other widgets"""
+    """Base list view showing list of other widgets.
+
+    By default every row's widget is created up front and kept open as a
+    persistent editor. In virtualized mode, widgets can instead be passed
+    in as factories so they're only created once their row scrolls into
+    view, and editors are only kept open for the visible rows (plus a small
+    overscan), with a placeholder painted for the rest.
+    """
     ITEM_SPACING = 5
     WIDGET_MARGIN_BUFFER = 2
     SCROLL_BAR_STEP = 20
+    OVERSCAN = 2
+    PLACEHOLDER_HEIGHT = 100
 
     def __init__(
             self,
             widget_list,
             item_spacing=None,
             inbetween_widget_factory=None,
+            virtualized=False,
             parent=None):
         """Initialize class instance.
 
         Args:
-            widget_list (list(QtWidgets.QWidget)): list of widgets to show.
+            widget_list (list(QtWidgets.QWidget or function)): list of widgets
+                to show. Any items that aren't widgets are treated as
+                factories to create the widget when its row is first needed.
             item_spacing (int or None): vertical spacing for widgets, if used.
             inbetween_widget_factory (class, function or None): if given, this
                 is passed to the spacer class and used to create widgets.
                 These widgets will appear inbetween each widget in the list.
+            virtualized (bool): if True, only open editors for rows that are
+                currently visible.
             parent (QtGui.QWidget or None): QWidget parent of widget.
         """
         super(WidgetListView, self).__init__(parent=parent)
@@ -59,6 +98,10 @@ class WidgetListView(QtWidgets.QListView):
         )
         self.setVerticalScrollMode(self.ScrollMode.ScrollPerPixel)
         self.verticalScrollBar().setSingleStep(self.SCROLL_BAR_STEP)
+        self._virtualized = virtualized
+        self._visible_rows = range(0)
+        self._known_heights_total = 0
+        self._num_known_heights = 0
         self._widget_data_list = WidgetDataList()
         self._has_spacers = (
             item_spacing is not None or inbetween_widget_factory is not None
@@ -73,52 +116,104 @@ class WidgetListView(QtWidgets.QListView):
                     widget_factory=inbetween_widget_factory,
                 )
                 self._widget_data_list.append(WidgetData(spacer))
-            self._widget_data_list.append(WidgetData(widget))
+            self._widget_data_list.append(self._make_widget_data(widget))
 
         model = WidgetListModel(self._widget_data_list)
         self.setModel(model)
         self.setItemDelegate(WidgetListDelegate(self))
         self.setSpacing(self.ITEM_SPACING)
+        if virtualized:
+            self.verticalScrollBar().valueChanged.connect(self._on_scroll)
         self.open_editors()
 
-    def get_widgets(self, filtered=False, include_spacers=False):
-        """Get all widgets (ignoring spacer widgets unless sepcidied).
+    @property
+    def is_virtualized(self):
+        """Check if view is virtualized.
+
+        Returns:
+            (bool): whether or not view only opens editors on visible rows.
+        """
+        return self._virtualized
+
+    @staticmethod
+    def _make_widget_data(widget):
+        """Get widget data for given widget or widget factory.
+
+        Args:
+            widget (QtWidgets.QWidget or function): widget or factory.
+
+        Returns:
+            (WidgetData): the widget data.
+        """
+        if isinstance(widget, QtWidgets.QWidget):
+            return WidgetData(widget)
+        return WidgetData(widget_factory=widget)
+
+    def _iter_widget_data(self, filtered=False, include_spacers=False):
+        """Iterate through widget data (ignoring spacers unless specified).
 
         Args:
             filtered (bool): if True, only use filtered widgets.
             include_spacers (bool): if True, include spacer widgets.
 
-        Returns:
-            (list(QtWidget.QWidget)): the widgets.
+        Yields:
+            (WidgetData): the widget data items.
         """
         widget_data_list = self._widget_data_list
         if filtered:
             widget_data_list = widget_data_list.get_filtered()
         if self._has_spacers and not include_spacers:
-            return [w.widget for w in widget_data_list[1::2]]
-        return [w.widget for w in widget_data_list]
+            widget_data_list = widget_data_list[1::2]
+        for widget_data in widget_data_list:
+            yield widget_data
+
+    def get_widgets(
+            self,
+            filtered=False,
+            include_spacers=False,
+            created_only=False):
+        """Get all widgets (ignoring spacer widgets unless sepcidied).
 
-    def iter_widgets(self, filtered=False, include_spacers=False):
+        Args:
+            filtered (bool): if True, only use filtered widgets.
+            include_spacers (bool): if True, include spacer widgets.
+            created_only (bool): if True, skip any widgets that haven't been
+                created yet rather than creating them.
+
+        Returns:
+            (list(QtWidget.QWidget)): the widgets.
+        """
+        return list(
+            self.iter_widgets(filtered, include_spacers, created_only)
+        )
+
+    def iter_widgets(
+            self,
+            filtered=False,
+            include_spacers=False,
+            created_only=False):
         """Iterate through widgets (ignoring spacer widgets unless sepcidied).
 
         Args:
             filtered (bool): if True, only use filtered widgets.
             include_spacers (bool): if True, include spacer widgets.
+            created_only (bool): if True, skip any widgets that haven't been
+                created yet rather than creating them.
 
         Yields:
             (QtWidget.QWidget): the widgets.
         """
-        widget_data_list = self._widget_data_list
-        if filtered:
-            widget_data_list = widget_data_list.get_filtered()
-        if self._has_spacers and not include_spacers:
-            for widget_data in widget_data_list[1::2]:
-                yield widget_data.widget
-        else:
-            for widget_data in widget_data_list:
-                yield widget_data.widget
+        for widget_data in self._iter_widget_data(filtered, include_spacers):
+            if created_only and not widget_data.is_created():
+                continue
+            yield widget_data.widget
 
-    def get_widget(self, index, filtered=False, include_spacers=False):
+    def get_widget(
+            self,
+            index,
+            filtered=False,
+            include_spacers=False,
+            created_only=False):
         """Get widget at index (ignoring spacer widgets unless sepcidied).
 
         Args:
@@ -126,6 +221,8 @@ class WidgetListView(QtWidgets.QListView):
                 too, in the same way as negative list indexing works.
             filtered (bool): if True, only use filtered widgets.
             include_spacers (bool): if True, include spacer widgets.
+            created_only (bool): if True, return None if the widget hasn't
+                been created yet rather than creating it.
 
         Returns:
             (QtWidget.QWidget or None): the widget, if found.
@@ -133,13 +230,18 @@ class WidgetListView(QtWidgets.QListView):
         widget_data_list = self._widget_data_list
         if filtered:
             widget_data_list = widget_data_list.get_filtered()
+        widget_data = None
         if self._has_spacers and not include_spacers:
             if -len(widget_data_list) <= 2 * index < len(widget_data_list):
-                return widget_data_list[2 * index + 1].widget
+                widget_data = widget_data_list[2 * index + 1]
         else:
             if -len(widget_data_list) <= index < len(widget_data_list):
-                return widget_data_list[index].widget
-        return None
+                widget_data = widget_data_list[index]
+        if widget_data is None:
+            return None
+        if created_only and not widget_data.is_created():
+            return None
+        return widget_data.widget
 
     def _row_is_in_range(self, row, allow_equal=False):
         """Check if given row is within range of widget list.
@@ -172,22 +274,23 @@ class WidgetListView(QtWidgets.QListView):
         """Disable first unfiltered spacer and enable the rest."""
         if not self._has_spacers:
             return
-        active_widgets = self.get_widgets(filtered=True, include_spacers=True)
-        if active_widgets:
-            active_widgets[0].disable()
-            for spacer in active_widgets[2::2]:
-                spacer.enable()
+        active_widget_data = self._widget_data_list.get_filtered()
+        if active_widget_data:
+            active_widget_data[0].widget.disable()
+            for spacer_data in active_widget_data[2::2]:
+                spacer_data.widget.enable()
 
     def insert_widget(self, row, widget):
         """Insert widget at given row.
 
         Args:
             row (int): row to insert at.
-            widget (QtWidgets.QWidget): widget to insert.
+            widget (QtWidgets.QWidget or function): widget to insert, or
+                factory to create it with.
         """
         if not self._row_is_in_range(row, allow_equal=True):
             return
-        widget_data = WidgetData(widget)
+        widget_data = self._make_widget_data(widget)
         if self._has_spacers:
             spacer = WidgetData(
                 Spacer(
@@ -213,9 +316,11 @@ class WidgetListView(QtWidgets.QListView):
         if not self._row_is_in_range(row):
             return
         if self._has_spacers:
+            self._forget_size_hint(self._widget_data_list[2 * row + 1])
             self.model().remove_widgets(2 * row, 2)
             self._configure_spacers()
         else:
+            self._forget_size_hint(self._widget_data_list[row])
             self.model().remove_widgets(row, 1)
         self.update_view()
 
@@ -277,6 +382,25 @@ class WidgetListView(QtWidgets.QListView):
         if update:
             self.open_editors()
 
+    def scroll_to_row(self, row):
+        """Scroll to the widget at the given row, opening it if needed.
+
+        Args:
+            row (int): row of widget to scroll to.
+        """
+        if not self._row_is_in_range(row):
+            return
+        if self._has_spacers:
+            row = 2 * row + 1
+        widget_data = self._widget_data_list[row]
+        if widget_data.filtered:
+            return
+        filtered_row = self._widget_data_list.get_filtered().index(widget_data)
+        index = self.model().index(filtered_row, 0, QtCore.QModelIndex())
+        self.scrollTo(index, self.ScrollHint.PositionAtTop)
+        if self._virtualized:
+            self._open_visible_editors()
+
     def resizeEvent(self, event):
         """Resize event.
 
@@ -289,6 +413,18 @@ class WidgetListView(QtWidgets.QListView):
         # NOTE: this was making resizing quite slow and I can't remember why
         # it was there so I'm removing it for now. May need to add back in.
         # self.update_view()
+        if self._virtualized:
+            self._open_visible_editors()
+
+    def showEvent(self, event):
+        """Show event.
+
+        Args:
+            event (QtCore.QEvent): the event.
+        """
+        super(WidgetListView, self).showEvent(event)
+        if self._virtualized:
+            self._open_visible_editors()
 
     def open_editor(self, row, update=True):
         """Open persistent editors on given row.
@@ -312,23 +448,154 @@ class WidgetListView(QtWidgets.QListView):
     def open_editors(self, update=True):
         """Open persistent editors on each row.
 
+        In virtualized mode this only opens editors on the visible rows.
+
         Args:
             update (bool): if True, update view after.
         """
-        for row, _ in enumerate(self._widget_data_list.get_filtered()):
-            self.open_editor(row, update=False)
+        if self._virtualized:
+            self._open_visible_editors(reopen=True)
+        else:
+            for row, _ in enumerate(self._widget_data_list.get_filtered()):
+                self.open_editor(row, update=False)
         if update:
             self.update_view()
 
+    def _get_visible_rows(self):
+        """Get range of rows that are visible, including overscan.
+
+        Rows are laid out top to bottom, so this binary searches for the
+        first visible row and then only checks the rows after it that are
+        in view.
+
+        Returns:
+            (range): range of visible rows in filtered list.
+        """
+        num_rows = self.model().rowCount()
+        if not self.isVisible() or not num_rows:
+            return range(0)
+        self.executeDelayedItemsLayout()
+        viewport_rect = self.viewport().rect()
+
+        def get_rect(row):
+            return self.visualRect(
+                self.model().index(row, 0, QtCore.QModelIndex())
+            )
+
+        low = 0
+        high = num_rows
+        while low < high:
+            middle = (low + high) // 2
+            if get_rect(middle).bottom() < viewport_rect.top():
+                low = middle + 1
+            else:
+                high = middle
+        if low == num_rows or get_rect(low).top() > viewport_rect.bottom():
+            return range(0)
+        first = low
+        last = low
+        while (last + 1 < num_rows
+                and get_rect(last + 1).top() <= viewport_rect.bottom()):
+            last += 1
+        return range(
+            max(first - self.OVERSCAN, 0),
+            min(last + self.OVERSCAN + 1, num_rows),
+        )
+
+    def _on_scroll(self, value):
+        """Open editors on rows scrolled into view.
+
+        Args:
+            value (int): new scroll bar value.
+        """
+        self._open_visible_editors()
+
+    def _open_visible_editors(self, reopen=False):
+        """Open editors on visible rows and close them on any other rows.
+
+        Closed editors aren't destroyed, so their widgets are just hidden
+        until their row becomes visible again. Unless reopening, only the
+        rows that were previously visible need to be checked for closing.
+
+        Args:
+            reopen (bool): if True, reopen editors that are already open,
+                to ensure their widgets are updated, and close editors on
+                all other rows.
+        """
+        visible_rows = self._get_visible_rows()
+        filtered_data_list = self._widget_data_list.get_filtered()
+        if reopen:
+            rows_to_close = range(len(filtered_data_list))
+        else:
+            rows_to_close = self._visible_rows
+        self._visible_rows = visible_rows
+        for row in rows_to_close:
+            if row in visible_rows or row >= len(filtered_data_list):
+                continue
+            index = self.model().index(row, 0, QtCore.QModelIndex())
+            if self.isPersistentEditorOpen(index):
+                self.closePersistentEditor(index)
+
+        created_new_widgets = False
+        for row in visible_rows:
+            index = self.model().index(row, 0, QtCore.QModelIndex())
+            if self.isPersistentEditorOpen(index) and not reopen:
+                continue
+            if not filtered_data_list[row].is_created():
+                created_new_widgets = True
+            self.open_editor(row, update=False)
+        if created_new_widgets:
+            # placeholder sizes have been replaced by real ones
+            self.scheduleDelayedItemsLayout()
+
+    def _forget_size_hint(self, widget_data):
+        """Remove row's size hint from the running total of known heights.
+
+        Args:
+            widget_data (WidgetData): data for the row.
+        """
+        if widget_data.size_hint is not None:
+            self._known_heights_total -= widget_data.size_hint.height()
+            self._num_known_heights -= 1
+            widget_data.size_hint = None
+
+    def get_row_size_hint(self, widget_data):
+        """Get size hint for row, using an estimate if not yet created.
+
+        Args:
+            widget_data (WidgetData): data for the row.
+
+        Returns:
+            (QtCore.QSize): size hint.
+        """
+        if widget_data.is_created():
+            size_hint = widget_data.widget.sizeHint()
+            if isinstance(widget_data.widget, Spacer):
+                # spacers aren't used to estimate placeholder sizes
+                return size_hint
+            self._forget_size_hint(widget_data)
+            widget_data.size_hint = size_hint
+            self._known_heights_total += size_hint.height()
+            self._num_known_heights += 1
+            return size_hint
+        if self._num_known_heights:
+            height = self._known_heights_total // self._num_known_heights
+        else:
+            height = self.PLACEHOLDER_HEIGHT
+        return QtCore.QSize(self.viewport().width(), height)
+
     def sizeHint(self):
         """Get size hint.
 
         Returns:
             (QtCore.QSize): size hint.
         """
+        if self._virtualized:
+            # virtualized views scroll rather than growing to fit contents
+            return super(WidgetListView, self).sizeHint()
         widget_heights = sum([
-            w.sizeHint().height() + self.WIDGET_MARGIN_BUFFER
-            for w in self.iter_widgets(filtered=True, include_spacers=True)
+            self.get_row_size_hint(w).height() + self.WIDGET_MARGIN_BUFFER
+            for w in self._iter_widget_data(filtered=True, include_spacers=True)
         ])
         spacing_heights = self.ITEM_SPACING * (2 * len(self._widget_data_list))
         height = widget_heights + spacing_heights
@@ -548,6 +815,7 @@ class Spacer(QtWidgets.QFrame):
 class WidgetListDelegate(QtWidgets.QStyledItemDelegate):
     """Delegate for multi-list view."""
     WIDTH_BUFFER = 10
+    PLACEHOLDER_RADIUS = 5
 
     def __init__(self, widget_list_view, parent=None):
         """Initialise delegate item.
@@ -558,6 +826,7 @@ class WidgetListDelegate(QtWidgets.QStyledItemDelegate):
             parent (QtWidgets.QWidget or None): Qt parent of delegate.
         """
         super(WidgetListDelegate, self).__init__(parent)
+        self.widget_list_view = widget_list_view
         self.widget_data_list = widget_list_view._widget_data_list
 
     def sizeHint(self, option, index):
@@ -567,8 +836,33 @@ class WidgetListDelegate(QtWidgets.QStyledItemDelegate):
             option (QtWidgets.QStyleOptionViewItem): style options object.
             index (QtCore.QModelIndex): index to get size hint for.
         """
-        widget = self.widget_data_list.get_filtered()[index.row()].widget
-        return widget.sizeHint()
+        widget_data = self.widget_data_list.get_filtered()[index.row()]
+        return self.widget_list_view.get_row_size_hint(widget_data)
+
+    def paint(self, painter, option, index):
+        """Paint placeholder for any rows whose widgets aren't created yet.
+
+        Args:
+            painter (QtGui.QPainter): qt painter object.
+            option (QtWidgets.QStyleOptionViewItem): style options object.
+            index (QtCore.QModelIndex): index of item we're painting.
+        """
+        widget_data = self.widget_data_list.get_filtered()[index.row()]
+        if widget_data.is_created():
+            return super(WidgetListDelegate, self).paint(
+                painter,
+                option,
+                index,
+            )
+        painter.save()
+        painter.setPen(QtCore.Qt.PenStyle.NoPen)
+        painter.setBrush(option.palette.alternateBase())
+        painter.drawRoundedRect(
+            option.rect.adjusted(0, 0, -self.WIDTH_BUFFER, 0),
+            self.PLACEHOLDER_RADIUS,
+            self.PLACEHOLDER_RADIUS,
+        )
+        painter.restore()
 
     def createEditor(self, parent, option, index):
         """Create editor widget for edit role.